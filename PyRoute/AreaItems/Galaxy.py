@@ -80,28 +80,47 @@ class Galaxy(AreaItem):
         ru_calc = options.ru_calc
         fix_pop = options.fix_pop
         fix_econ = options.fix_econ
-        self._set_trade_object(route_reuse, trade_choice, route_btn, mp_threads, debug_flag)
+        self._set_trade_object(route_reuse, trade_choice, route_btn, mp_threads, debug_flag,
+                               options.bidirectional_length, options.optimistic_window, options.resume_dir,
+                               options.route_cache, options.component_partition)
+        if options.landmarks is not None and self.trade is not None:
+            self.trade.landmark_spec = options.landmarks
+        if options.paranoid and self.trade is not None:
+            self.trade.paranoid = True
         star_counter = 0
         loaded_sectors: set[str] = set()
         from PyRoute.Inputs.ParseStarInput import ParseStarInput
         ParseStarInput.deep_space = {} if not isinstance(options.deep_space, dict) else options.deep_space
         logger = self.logger
-        for sector in sectors:
-            headers, starlines = ParseSectorInput.read_sector_file(sector, logger)
-
+        parse_cache = None
+        if options.parse_cache is not None:
+            from PyRoute.Inputs.ParseSectorCache import ParseSectorCache
+            parse_cache = ParseSectorCache(options.parse_cache, pop_code, ru_calc, fix_pop, fix_econ)
+        if 1 < options.parse_workers and 1 < len(sectors):
+            self.logger.info("Parsing {} sectors over {} processes".format(len(sectors), options.parse_workers))
+            parsed = ParseSectorInput.read_sector_files_parallel(sectors, options.parse_workers, pop_code, ru_calc,
+                                                                 fix_pop, fix_econ, ParseStarInput.deep_space,
+                                                                 parse_cache)
+        else:
+            parsed = ((*ParseSectorInput.read_sector_file(sector, logger), None) for sector in sectors)
+
+        for sector, (headers, starlines, payload) in zip(sectors, parsed):
             if 0 == len(headers):
                 continue
 
             sec, raw_counter = ParseSectorInput.read_parsed_sector_to_sector_object(headers, loaded_sectors, logger,
                                                                                     pop_code, ru_calc, sector,
                                                                                     star_counter, starlines, self,
-                                                                                    fix_pop, fix_econ)
+                                                                                    fix_pop, fix_econ, parse_cache,
+                                                                                    payload)
             if sec is None:
                 continue
             star_counter = raw_counter
             self.sectors[sec.name] = sec
             self.logger.info("Sector {} loaded {} worlds".format(sec, len(sec.worlds)))
 
+        if parse_cache is not None:
+            self.logger.info("Parse cache: {} sectors reused, {} parsed".format(parse_cache.hits, parse_cache.misses))
         self.set_bounding_sectors()
         self.set_bounding_subsectors()
         self.set_positions()
@@ -173,13 +192,16 @@ class Galaxy(AreaItem):
     def generate_routes(self) -> None:
         self.trade.generate_routes()
 
-    def _set_trade_object(self, reuse, routes, route_btn, mp_threads, debug_flag):
+    def _set_trade_object(self, reuse, routes, route_btn, mp_threads, debug_flag, bidirectional_length=None,
+                          optimistic_window=None, resume_dir=None, route_cache_dir=None, component_partition=False):
         # if trade object already set, bail out
         if self.trade is not None:
             return
         self.is_well_formed()
         if routes == 'trade':
-            self.trade = TradeCalculation(self, self.min_btn, route_btn, reuse, debug_flag)
+            self.trade = TradeCalculation(self, self.min_btn, route_btn, reuse, debug_flag, bidirectional_length,
+                                          optimistic_window, mp_threads, resume_dir, route_cache_dir,
+                                          component_partition)
         elif routes == 'trade-mp':
             self.trade = TradeMPCalculation(self, self.min_btn, route_btn, reuse, debug_flag, mp_threads)
         elif routes == 'comm':
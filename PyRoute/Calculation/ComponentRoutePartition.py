@@ -0,0 +1,315 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+
+Component-partitioned route processing for the single-process trade calculation.  Routes between stars in different
+connected components of galaxy.stars never share an edge - or a star, a landmark distance, or a historic route - so
+each component's routes, taken in the BTN order the sequential loop uses, come out the same whether or not other
+components' routes are interleaved with them.  This code:
+    Splits the btn list by component, giving each large component its own task and bundling the small ones into one
+    Runs each task's routes in a worker process forked after pathfinding setup, so each worker has its own copy of the
+        DistanceGraph and landmark forest to update
+    Sends back what each task changed - star and edge trade, edge weights, historic routes, range distances, sector,
+        subsector and allegiance trade statistics, and landmark distances - and merges it into the parent
+
+The one piece of shared state is the trade balances, as a sector or allegiance pair can have routes in several
+components.  The order odd units are logged in decides both when a pair's two half-units are settled, and the order
+pairs turn up in for the multilateral balancing, so workers note each odd unit against its route's place in the btn
+list, back out whatever settling they did, and the parent then logs every odd unit in btn order.  That keeps all trade
+outputs identical to the sequential run's.
+
+"""
+from multiprocessing import Pool
+
+import numpy as np
+
+from PyRoute.TradeBalance import IndexedTradeBalance
+
+# Statistics the route loop updates
+TRADE_STATS = ('trade', 'tradeExt', 'tradeDton', 'tradeDtonExt', 'passengers')
+# Star fields the route loop updates
+STAR_FIELDS = ('tradeIn', 'tradeOver', 'tradeCount', 'passIn', 'passOver')
+# Trade balances the route loop logs odd units against
+BALANCES = ('sector_trade_balance', 'sector_passenger_balance', 'sector_trade_volume_balance',
+            'allegiance_trade_balance', 'allegiance_passenger_balance', 'allegiance_trade_volume_balance')
+
+# The trade calculation, and its btn list, the worker processes run routes against, inherited by them when they're
+# forked.
+componentCalculation = None
+componentBtn: list = []
+
+
+class RecordingTradeBalance(IndexedTradeBalance):
+    """
+    IndexedTradeBalance that also notes every odd unit logged, against the btn-list position of the route being processed,
+    and the statistics each settled pair of half-units added to.
+    """
+
+    def __init__(self, balance: IndexedTradeBalance):
+        super().__init__(stat_field=balance.stat_field, region=balance.region, target=balance.target,
+                         field=balance.field, star_field=balance.star_field,
+                         target_property=balance.target_property)
+        super().update(balance)
+        self.stats_added = balance.stats_added
+        self.position = -1
+        self.events: list[tuple[int, int, int]] = []
+        self.settled: list = []
+
+    def log_odd_unit(self, star, target) -> None:
+        self.events.append((self.position, star.index, target.index))
+        pair = self._balance_tuple(star[self.star_field][self.target_property],
+                                   target[self.star_field][self.target_property])
+        if 1 == self.get(pair, 0):
+            self.settled.append(star[self.star_field].stats)
+            self.settled.append(target[self.star_field].stats)
+        super().log_odd_unit(star, target)
+
+
+def stat_holders(galaxy) -> list:
+    """
+    Every statistics object the route loop can update, in an order that's the same in parent and worker processes.
+    """
+    holders = [galaxy.stats]
+    for sector in galaxy.sectors.values():
+        holders.append(sector.stats)
+        holders.extend(subsector.stats for subsector in sector.subsectors.values())
+    holders.extend(alg.stats for alg in galaxy.alg.values())
+    seen = set()
+    result = []
+    for stats in holders:
+        if id(stats) not in seen:
+            seen.add(id(stats))
+            result.append(stats)
+    return result
+
+
+def component_arcs(graph, nodes) -> np.ndarray:
+    """
+    Mask of the arcs in DistanceGraph graph out of nodes.
+    """
+    in_component = np.zeros(len(graph), dtype=bool)
+    in_component[nodes] = True
+    return in_component[np.repeat(np.arange(len(graph)), np.diff(graph._indptr))]
+
+
+def graph_state(graph, nodes) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Arc weights and minimum costs of DistanceGraph graph over nodes.  The route loop only ever lightens edges, each
+    inside a component, so nothing else changes.
+    """
+    return graph._weights[component_arcs(graph, nodes)], graph._min_cost[nodes], graph._min_indirect[nodes]
+
+
+def set_graph_state(graph, nodes, state) -> None:
+    weights, min_cost, min_indirect = state
+    graph._weights[component_arcs(graph, nodes)] = weights
+    graph._min_cost[nodes] = min_cost
+    graph._min_indirect[nodes] = min_indirect
+
+
+def route_components(positions: list[int]) -> dict:
+    """
+    Process the routes at positions in the btn list, in order, and report back everything they changed.
+    :param positions: Increasing btn-list positions, all of whose routes lie in the task's components
+    :return: Dict of changes, as laid out in collect_changes
+    """
+    global componentCalculation, componentBtn
+    trade = componentCalculation
+    assert trade is not None, "Global componentCalculation instance not set"
+    btn = componentBtn
+
+    holders = stat_holders(trade.galaxy)
+    stats_before = [[getattr(stats, field) for field in TRADE_STATS] for stats in holders]
+    counters_before = trade.counters()
+    balances = []
+    for name in BALANCES:
+        balance = getattr(trade, name)
+        if not isinstance(balance, RecordingTradeBalance):
+            balance = RecordingTradeBalance(balance)
+            setattr(trade, name, balance)
+        balance.events = []
+        balance.settled = []
+        balances.append(balance)
+    trade.historic_edges_added = []
+
+    for position in positions:
+        for balance in balances:
+            balance.position = position
+        star, target, _ = btn[position]
+        trade.get_trade_between(star, target)
+    trade.write_route_totals()
+
+    return collect_changes(trade, positions, holders, stats_before, counters_before, balances)
+
+
+def collect_changes(trade, positions, holders, stats_before, counters_before, balances) -> dict:
+    galaxy = trade.galaxy
+    btn = componentBtn
+    components = {btn[position][0].component for position in positions}
+    nodes = [star.index for star in galaxy.star_mapping.values() if star.component in components]
+
+    # Statistics changes, less whatever the worker's own settling of half-unit pairs added
+    holder_index = {id(stats): i for (i, stats) in enumerate(holders)}
+    stats_delta = [[getattr(stats, field) - before for (field, before) in zip(TRADE_STATS, stats_before[i])]
+                   for (i, stats) in enumerate(holders)]
+    for balance in balances:
+        field = TRADE_STATS.index(balance.stat_field)
+        for stats in balance.settled:
+            stats_delta[holder_index[id(stats)]][field] -= 1
+    changed_stats = [(i, delta) for (i, delta) in enumerate(stats_delta) if any(delta)]
+
+    stars = [(index, [galaxy.star_mapping[index][field] for field in STAR_FIELDS]) for index in nodes]
+
+    added = set(trade.historic_edges_added)
+    historic = []
+    for (u, v) in trade.historic_edges_added:
+        data = dict(galaxy.stars._adj[u][v])
+        data['route'] = [star.index for star in data['route']]
+        historic.append((u, v, data))
+    edges = []
+    adj = galaxy.stars._adj
+    for u in nodes:
+        for v, data in adj[u].items():
+            if u < v and (u, v) not in added and (v, u) not in added:
+                edges.append((u, v, data['weight'], data['trade'], data['count']))
+
+    ranges = []
+    for position in positions:
+        data = galaxy.ranges._adj[btn[position][0]][btn[position][1]]
+        if 'actual distance' in data:
+            ranges.append((position, data['actual distance'], data['jumps']))
+
+    counters = trade.counters()
+    return {'stats': changed_stats,
+            'stars': stars,
+            'edges': edges,
+            'historic': historic,
+            'ranges': ranges,
+            'nodes': nodes,
+            'star_graph': graph_state(trade.star_graph, nodes),
+            'tree_graph': graph_state(trade.shortest_path_tree.graph, nodes),
+            'distances': trade.shortest_path_tree.distances[nodes],
+            'balances': [balance.events for balance in balances],
+            'counters': {key: value - counters_before[key] for (key, value) in counters.items()}}
+
+
+class ComponentRoutePartition:
+    """
+    Drop-in replacement for the sequential route loop in TradeCalculation.calculate_routes, running each component's
+    routes in a separate worker process.
+    """
+
+    def __init__(self, trade, btn, processes):
+        self.trade = trade
+        self.btn = btn
+        self.processes = max(1, processes)
+        self.task_list = self.tasks()
+
+    def tasks(self) -> list[list[int]]:
+        """
+        Split btn-list positions by component.  Components with at least a (4 * processes)th share of the routes get
+        a task each, the rest share a task, and tasks are handed out biggest first.
+        """
+        by_component: dict[int, list[int]] = {}
+        for position, (star, _, _) in enumerate(self.btn):
+            by_component.setdefault(star.component, []).append(position)
+        cutoff = max(1, len(self.btn) // (4 * self.processes))
+        tasks = [positions for positions in by_component.values() if cutoff <= len(positions)]
+        small = sorted(position for positions in by_component.values() if cutoff > len(positions)
+                       for position in positions)
+        if 0 < len(small):
+            tasks.append(small)
+        tasks.sort(key=len, reverse=True)
+        return tasks
+
+    def run(self) -> None:
+        global componentCalculation, componentBtn
+        trade = self.trade
+        tasks = self.task_list
+        trade.logger.info(f"Processing {len(self.btn)} routes as {len(tasks)} component tasks over "
+                          f"{self.processes} processes")
+        componentCalculation = trade
+        componentBtn = self.btn
+        # Workers send back star and edge totals as they stand in the galaxy, and the parent merges them in there
+        trade.write_route_totals()
+        try:
+            with Pool(processes=min(self.processes, len(tasks))) as pool:
+                results = pool.map(route_components, tasks, chunksize=1)
+        finally:
+            componentCalculation = None
+            componentBtn = []
+
+        events: list[list[tuple[int, int, int]]] = [[] for _ in BALANCES]
+        for result in results:
+            self.merge(result)
+            for i, balance_events in enumerate(result['balances']):
+                events[i].extend(balance_events)
+        # Log odd units in the order the sequential loop would have
+        mapping = trade.galaxy.star_mapping
+        for name, balance_events in zip(BALANCES, events):
+            balance = getattr(trade, name)
+            balance_events.sort(key=lambda item: item[0])
+            for _, stardex, targdex in balance_events:
+                balance.log_odd_unit(mapping[stardex], mapping[targdex])
+        trade.cross_check_totals()
+
+    def merge(self, result) -> None:
+        """
+        Apply one task's changes to the parent's galaxy and pathfinding state.
+        """
+        trade = self.trade
+        galaxy = trade.galaxy
+        mapping = galaxy.star_mapping
+
+        holders = stat_holders(galaxy)
+        for i, delta in result['stats']:
+            stats = holders[i]
+            for field, value in zip(TRADE_STATS, delta):
+                setattr(stats, field, getattr(stats, field) + value)
+
+        for index, values in result['stars']:
+            star = mapping[index]
+            for field, value in zip(STAR_FIELDS, values):
+                star[field] = value
+
+        adj = galaxy.stars._adj
+        for u, v, weight, trade_cr, count in result['edges']:
+            data = adj[u][v]
+            # Historic routes aren't in the pathfinding graphs, so their reheated weights only go to historic_costs
+            if data['weight'] != weight and 'route' in data:
+                galaxy.historic_costs.lighten_edge(u, v, weight)
+            data['weight'] = weight
+            data['trade'] = trade_cr
+            data['count'] = count
+
+        # Historic routes go in in the order they were found, so each star's neighbours are in sequential-run order
+        for u, v, data in result['historic']:
+            data['route'] = [mapping[index] for index in data['route']]
+            galaxy.stars.add_edge(u, v, **data)
+            galaxy.historic_costs.add_edge(u, v, data['weight'])
+
+        for position, distance, jumps in result['ranges']:
+            star, target, _ = self.btn[position]
+            rangedata = galaxy.ranges._adj[star][target]
+            rangedata['actual distance'] = distance
+            rangedata['jumps'] = jumps
+
+        # Pathfinding weights and landmark distances, so the parent's bounds match the sequential run's
+        nodes = result['nodes']
+        set_graph_state(trade.star_graph, nodes, result['star_graph'])
+        set_graph_state(trade.shortest_path_tree.graph, nodes, result['tree_graph'])
+        trade.shortest_path_tree.distances[nodes] = result['distances']
+
+        for key, value in result['counters'].items():
+            setattr(trade, key, getattr(trade, key) + value)
+
+    def applies(self) -> bool:
+        """
+        Is it worth partitioning the trade calculation's routes, and can they be?  Per-route pathfinding diagnostics,
+        checkpoints, the route cache and the optimistic window all follow the single sequential route order, so they
+        rule it out.
+        """
+        trade = self.trade
+        return 1 < len(self.task_list) and not trade.debug_flag and trade.resume_dir is None and \
+            trade.route_cache_dir is None and trade.optimistic_window is None
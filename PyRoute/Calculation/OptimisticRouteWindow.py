@@ -0,0 +1,222 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+
+Optimistic-parallel route evaluation for the single-process trade calculation.  This code:
+    Takes the next window of routes, in the same BTN order the sequential loop uses, and pathfinds them all at once
+        in worker processes, against the edge weights and landmark distances as they stand at the start of the window
+    Commits the routes one by one, in order, exactly as the sequential loop would - preheating the upper bound (with
+        reheating), then applying the route's trade and edge-weight updates
+    Before committing each route, checks whether anything its speculative search read has since changed, and if so,
+        re-runs that search in the parent against the current state
+
+A search's answer is a function of its upper bound, the weights of edges out of the nodes it expands, and the landmark
+bounds of those nodes, their neighbours, and both route ends.  Every node the search can expand lies within the
+landmark "ellipse" - nodes whose lower bound from the source plus lower bound to the target fits within the upper
+bound - so a speculative route is kept only if its upper bound is unchanged and no changed weight or landmark distance
+touches that ellipse.  That keeps the committed routes, and thus all trade outputs, identical to the sequential run's.
+Rather than diffing the full weight and distance arrays against the published copies, the parent has the star graph
+and the landmark forest record which arcs and labels they change, and marks just those nodes (plus the neighbours of
+relabelled nodes) dirty until the next publish.
+
+"""
+import networkx as nx
+import numpy as np
+from multiprocessing import Pool
+
+from PyRoute.Calculation.TradeMPSharedState import TradeMPSharedState
+from PyRoute.Errors.RouteTooLongError import RouteTooLongError
+
+# Relative slack when deciding which nodes a search can expand.  The compiled pathfinder accumulates costs in single
+# precision, and the bidirectional search prunes with some slack of its own, so this errs on the side of including a
+# node.
+ELLIPSE_TOLERANCE = 1e-4
+
+# The trade calculation the worker processes search against, inherited by them when they're forked.
+windowCalculation = None
+
+
+def speculate_route(task) -> tuple[list, dict, np.ndarray]:
+    """
+    Pathfind one route against the most recently published weights and distances.
+    :param task: (source index, target index, upper bound)
+    :return: Route as list of star indexes (empty if none was found, None if the search gave up on it as too long),
+    pathfinding diagnostics, and indexes of the nodes the search could have expanded
+    """
+    global windowCalculation
+    trade = windowCalculation
+    assert trade is not None, "Global windowCalculation instance not set"
+    stardex, targdex, upbound = task
+    trade.shared_state.attach(trade)
+
+    star = trade.galaxy.star_mapping[stardex]
+    target = trade.galaxy.star_mapping[targdex]
+    try:
+        rawroute, diag = trade._find_route(star, target, upbound)
+    except RouteTooLongError:
+        rawroute, diag = None, {}
+    except nx.NetworkXNoPath:
+        rawroute, diag = [], {}
+
+    tree = trade.shortest_path_tree
+    ellipse = tree.lower_bound_bulk(stardex) + tree.lower_bound_bulk(targdex) <= upbound * (1 + ELLIPSE_TOLERANCE)
+    # The search always expands the source, and reads the target's bounds, whatever the upper bound
+    ellipse[stardex] = True
+    ellipse[targdex] = True
+    return rawroute, diag, np.flatnonzero(ellipse)
+
+
+class OptimisticRouteWindow:
+    """
+    Drop-in replacement for TradeCalculation.get_trade_between that speculatively pathfinds upcoming routes in
+    parallel.  Routes must be fed to get_trade_between in the same order as the btn list supplied.
+    """
+
+    def __init__(self, trade, btn, window_size, processes, start=0):
+        self.trade = trade
+        self.btn = btn
+        self.window_size = max(1, window_size)
+        self.processes = max(1, processes)
+        # Index into btn of the next route to be processed
+        self.first = start
+        self.position = start
+        self.speculated = {}
+        self.reruns = 0
+        self.pool = None
+        # Nodes with a landmark label changed since the last publish, and nodes whose expansion would read something
+        # changed since then - an outgoing arc's weight, or its own or a neighbour's landmark labels
+        self.dirty_labels = None
+        self.dirty_reads = None
+
+    def start(self) -> None:
+        global windowCalculation
+        windowCalculation = self.trade
+        # The shared state has to be in place before the workers are forked, so they inherit it
+        self.trade.shared_state = TradeMPSharedState(self.trade.star_graph, self.trade.shortest_path_tree)
+        self.pool = Pool(processes=self.processes)
+        num_stars = len(self.trade.star_graph)
+        self.dirty_labels = np.zeros(num_stars, dtype=bool)
+        self.dirty_reads = np.zeros(num_stars, dtype=bool)
+        self.trade.star_graph.watch_changes()
+        self.trade.shortest_path_tree.watch_changes()
+
+    def stop(self) -> None:
+        global windowCalculation
+        self.pool.terminate()
+        self.pool.join()
+        self.pool = None
+        self.trade.star_graph.stop_watching()
+        self.trade.shortest_path_tree.stop_watching()
+        self.trade.shared_state.close()
+        self.trade.shared_state = None
+        windowCalculation = None
+        self.trade.logger.info(f"Optimistic route evaluation re-ran {self.reruns} of {self.position - self.first} routes")
+
+    def get_trade_between(self, star, target) -> None:
+        trade = self.trade
+        assert (star, target) == self.btn[self.position][0:2], "Routes must be processed in btn-list order"
+        if trade._cannot_meet_min_btn(star, target):
+            # Never speculated on, as it's given up on without pathfinding once preheated
+            self.position += 1
+            trade.get_trade_between(star, target)
+            return
+        if self.position not in self.speculated:
+            self._speculate()
+        speculated_upbound, rawroute, diag, ellipse = self.speculated.pop(self.position)
+        self.position += 1
+
+        assert 'actual distance' not in trade.galaxy.ranges._adj[target][star],\
+            "This route from " + str(star) + " to " + str(target) + " has already been processed in reverse"
+
+        # Preheat exactly as the sequential loop does, reheating included
+        upbound = trade._preheat_upper_bound(star.index, target.index, allow_reheat=True) * 1.005
+        star, target = trade._route_endpoints(star, target)
+
+        if upbound != speculated_upbound or not self._unchanged(star.index, target.index, ellipse):
+            self.reruns += 1
+            try:
+                rawroute, diag = trade._find_route(star, target, upbound)
+            except RouteTooLongError:
+                trade._give_up_route(star, target)
+                return
+            except nx.NetworkXNoPath:
+                return
+        else:
+            # The search ran in a worker process, so its counts haven't made it back here yet
+            trade._count_route(diag)
+            if rawroute is None:
+                trade._give_up_route(star, target)
+                return
+            if 0 == len(rawroute):
+                return
+
+        trade._commit_route(star, target, rawroute, diag)
+
+    def skip(self) -> None:
+        """
+        Step past the next route in btn order, as it's been handled without pathfinding.
+        """
+        self.speculated.pop(self.position, None)
+        self.position += 1
+
+    def _speculate(self) -> None:
+        """
+        Publish the current weights and distances, then pathfind the next window's routes against them in parallel.
+        """
+        trade = self.trade
+        trade.shared_state.publish()
+        trade.star_graph.take_changes()
+        trade.shortest_path_tree.take_changes()
+        self.dirty_labels[:] = False
+        self.dirty_reads[:] = False
+        window = range(self.position, min(len(self.btn), self.position + self.window_size))
+        positions = []
+        tasks = []
+        for i in window:
+            star, target, _ = self.btn[i]
+            if trade._cannot_meet_min_btn(star, target):
+                continue
+            positions.append(i)
+            # No reheating here - that changes historic costs, and thus has to wait for the route's turn
+            upbound = trade._preheat_upper_bound(star.index, target.index, allow_reheat=False) * 1.005
+            star, target = trade._route_endpoints(star, target)
+            tasks.append((star.index, target.index, upbound))
+
+        chunksize = max(1, len(tasks) // (4 * self.processes))
+        results = self.pool.map(speculate_route, tasks, chunksize=chunksize)
+        for i, task, result in zip(positions, tasks, results):
+            self.speculated[i] = (task[2], *result)
+
+    def _unchanged(self, stardex, targdex, ellipse) -> bool:
+        """
+        Has nothing a speculative search between stardex and targdex, over ellipse, could have read changed since the
+        start of the window?
+        """
+        self._mark_dirty()
+        # Landmark bounds are relative to both route ends, so if either has moved, every bound has
+        if self.dirty_labels[stardex] or self.dirty_labels[targdex]:
+            return False
+        return not self.dirty_reads[ellipse].any()
+
+    def _mark_dirty(self) -> None:
+        """
+        Fold the arcs and landmark labels changed since the last call into the dirty masks.
+        """
+        star_graph = self.trade.star_graph
+        # The search reads the weights of arcs out of the nodes it expands
+        tails = star_graph.take_changes()
+        if 0 < len(tails):
+            self.dirty_reads[tails] = True
+
+        relabelled = np.unique(np.array(self.trade.shortest_path_tree.take_changes(), dtype=np.int64))
+        relabelled = relabelled[~self.dirty_labels[relabelled]]
+        if 0 == len(relabelled):
+            return
+        self.dirty_labels[relabelled] = True
+        self.dirty_reads[relabelled] = True
+        # The search also reads the bounds of the neighbours of every node it expands - only newly-dirty nodes'
+        # neighbours need marking, as the rest were marked when those nodes first went dirty
+        indptr = star_graph._indptr
+        for node in relabelled:
+            self.dirty_reads[star_graph._indices[indptr[node]:indptr[node + 1]]] = True
@@ -0,0 +1,178 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+
+Cache of final trade routes across runs.  Runs over mostly-unchanged sectors would otherwise pathfind every route
+again from scratch, so each route the trade calculation processes is stored, keyed on:
+    Its two endpoints, by sector name and hex, as star indexes aren't stable from run to run
+    The input of every sector within jump reach of the route's bounding box
+    The trade settings that steer route-finding
+When calculate_routes comes across a route whose endpoints and settings match a cached route, and whose neighbourhood
+sectors are unchanged, the cached route is replayed - upper-bound preheating, then the route's trade and edge-weight
+updates - in place of pathfinding it.  Only routes whose neighbourhood changed are pathfound.
+
+A route's best path depends on the edge weights left behind by every route processed before it, so replaying an
+unchanged galaxy reproduces the original run exactly, but when some sectors have changed, routes replayed elsewhere
+are those the earlier run settled on.  That's the trade-off being made.
+
+The cache directory holds routes.pcache - zlib-compressed pickle of the settings fingerprint and the cached routes.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import zlib
+from typing import Optional
+
+
+class RouteCache(object):
+
+    cache_name = 'routes.pcache'
+    # Bump this whenever a change to route-finding or route updates means cached routes should no longer be replayed
+    version = 2
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.logger = logging.getLogger('PyRoute.RouteCache')
+        self.hits = 0
+        self.misses = 0
+        self.fingerprint: Optional[str] = None
+        # Cached routes read in at open, keyed on endpoint key pair, each entry being (region hash, route star keys).
+        # Routes given up on as too long to meet the minimum BTN have no star keys, and their endpoints' region hash.
+        self.cached: dict[tuple[str, str], tuple[str, list[str]]] = {}
+        # Routes processed this run, written back out at close
+        self.routes: dict[tuple[str, str], tuple[str, list[str]]] = {}
+        self.max_jump_range = 0
+        # Each star's key, and galaxy-wide hex column and row, by star index
+        self.star_keys: dict[int, str] = {}
+        self.star_hexes: dict[int, tuple[int, int]] = {}
+        self.star_index: dict[str, int] = {}
+        self.sector_hashes: dict[tuple[int, int], str] = {}
+        # Region hashes, keyed on the block of sectors they cover
+        self.region_hashes: dict[tuple[int, int, int, int], str] = {}
+        # Cached entry most recently replayed, to carry over to this run's cache when the replay is recorded
+        self.replayed: Optional[tuple[tuple[str, str], tuple[str, list[str]]]] = None
+
+    @property
+    def cache_path(self) -> str:
+        return os.path.join(self.directory, self.cache_name)
+
+    @staticmethod
+    def star_key(star) -> str:
+        return star.sector.name + ' ' + star.position
+
+    def open(self, trade) -> None:
+        """
+        Load the cache written by an earlier run, dropping it if it was written with different trade settings.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        galaxy = trade.galaxy
+        self.max_jump_range = galaxy.max_jump_range
+        self.fingerprint = self.settings_fingerprint(trade)
+        self.star_keys = {index: self.star_key(star) for (index, star) in galaxy.star_mapping.items()}
+        self.star_hexes = {index: (star.hex.dx, star.hex.dy) for (index, star) in galaxy.star_mapping.items()}
+        self.star_index = {key: index for (index, key) in self.star_keys.items()}
+        self.sector_hashes = {(sector.x, sector.y): self.sector_hash(sector) for sector in galaxy.sectors.values()}
+
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'rb') as handle:
+                fingerprint, cached = pickle.loads(zlib.decompress(handle.read()))
+        except (OSError, EOFError, ValueError, TypeError, zlib.error, pickle.UnpicklingError):
+            self.logger.warning("Route cache in " + self.directory + " is unreadable, ignoring it")
+            return
+        if fingerprint != self.fingerprint:
+            self.logger.info("Route cache in " + self.directory + " was written with different trade settings, "
+                             "ignoring it")
+            return
+        self.cached = cached
+
+    def lookup(self, star, target) -> Optional[list[int]]:
+        """
+        Return the cached route between star and target, as star indexes, or None if there's no cached route or its
+        neighbourhood has changed since.  An empty route means the route was given up on as too long.
+        """
+        pair = self._pair(star, target)
+        entry = self.cached.get(pair)
+        if entry is None:
+            self.misses += 1
+            return None
+        region, keys = entry
+        if any(key not in self.star_index for key in keys):
+            self.misses += 1
+            return None
+        route = [self.star_index[key] for key in keys]
+        if region != self.region_hash(route if 0 < len(route) else [star.index, target.index]):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.replayed = (pair, entry)
+        return route
+
+    def record(self, star, target, rawroute) -> None:
+        """
+        Note the route processed between star and target, to be written out at close.
+        """
+        pair = self._pair(star, target)
+        if self.replayed is not None and pair == self.replayed[0]:
+            self.routes[pair] = self.replayed[1]
+            self.replayed = None
+            return
+        route = [int(item) for item in rawroute]
+        ends = route if 0 < len(route) else [star.index, target.index]
+        self.routes[pair] = (self.region_hash(ends), [self.star_keys[item] for item in route])
+
+    def close(self) -> None:
+        """
+        Write out the routes processed this run, replacing the earlier cache.
+        """
+        self.logger.info("Route cache: {} routes replayed, {} pathfound".format(self.hits, self.misses))
+        blob = zlib.compress(pickle.dumps((self.fingerprint, self.routes), protocol=pickle.HIGHEST_PROTOCOL))
+        tmp_path = self.cache_path + '.tmp'
+        with open(tmp_path, 'wb') as handle:
+            handle.write(blob)
+        os.replace(tmp_path, self.cache_path)
+
+    def region_hash(self, route: list[int]) -> str:
+        """
+        Hash of the input of every sector overlapping route's bounding box, widened by the maximum jump range.  Sector
+        slots with no sector loaded are included, so a sector turning up next to a route invalidates it too.
+        """
+        hexes = self.star_hexes
+        reach = self.max_jump_range
+        dxs = [hexes[item][0] for item in route]
+        dys = [hexes[item][1] for item in route]
+        block = ((min(dxs) - reach) // 32, (max(dxs) + reach) // 32, (min(dys) - reach) // 40, (max(dys) + reach) // 40)
+        region = self.region_hashes.get(block)
+        if region is None:
+            digest = hashlib.sha256()
+            for x in range(block[0], block[1] + 1):
+                for y in range(block[2], block[3] + 1):
+                    digest.update('{} {} {}\n'.format(x, y, self.sector_hashes.get((x, y), '-')).encode('utf-8'))
+            region = digest.hexdigest()
+            self.region_hashes[block] = region
+        return region
+
+    @staticmethod
+    def sector_hash(sector) -> str:
+        """
+        Hash of a sector's stars as parsed, including their WTNs, so population and RU options are taken into account.
+        """
+        digest = hashlib.sha256(sector.name.encode('utf-8'))
+        for line in sorted(star.parse_to_line() + ' ' + str(star.wtn) for star in sector.worlds):
+            digest.update(line.encode('utf-8'))
+            digest.update(b'\n')
+        return digest.hexdigest()
+
+    def settings_fingerprint(self, trade) -> str:
+        settings = [self.version, trade.min_btn, trade.min_wtn, trade.route_reuse, trade.epsilon,
+                    trade.bidirectional_length, trade.landmark_spec, trade.galaxy.max_jump_range]
+        return hashlib.sha256(json.dumps(settings).encode('utf-8')).hexdigest()
+
+    def _pair(self, star, target) -> tuple[str, str]:
+        left = self.star_key(star)
+        right = self.star_key(target)
+        return (left, right) if left <= right else (right, left)
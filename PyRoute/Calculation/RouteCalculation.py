@@ -15,7 +15,7 @@ import networkx as nx
 
 from PyRoute.Allies.AllyGen import AllyGen
 from PyRoute.Pathfinding.DistanceGraph import DistanceGraph
-from PyRoute.Pathfinding.LandmarkSchemes.LandmarksTriaxialExtremes import LandmarksTriaxialExtremes
+from PyRoute.Pathfinding.LandmarkSchemes.LandmarkRegistry import LandmarkRegistry
 
 
 class RouteCalculation(object):
@@ -47,6 +47,10 @@ class RouteCalculation(object):
 
         self.shortest_path_tree = None
         self.star_graph = None
+        # Gather per-route pathfinding diagnostics even when not debugging, for profiling reports
+        self.collect_diagnostics = False
+        # Landmark selection scheme, as SCHEME[:k] - see LandmarkRegistry
+        self.landmark_spec = LandmarkRegistry.default
 
     def generate_routes(self) -> None:
         raise NotImplementedError("Base Class")
@@ -54,6 +58,12 @@ class RouteCalculation(object):
     def calculate_routes(self) -> None:
         raise NotImplementedError("Base Class")
 
+    def counters(self) -> dict[str, int]:
+        """
+        Running totals of work done by this calculation, for profiling reports.
+        """
+        return {}
+
     def route_weight(self, star, target) -> float:
         raise NotImplementedError("Base Class")
 
@@ -127,6 +137,20 @@ class RouteCalculation(object):
         Calculate the BTN between two stars, which is the sum of the worlds
         WTNs plus a modifier for types, minus a modifier for distance.
         """
+        btn = RouteCalculation._get_btn_base(star1, star2)
+
+        if not distance:
+            distance = star1.distance(star2)
+
+        btn += RouteCalculation.get_btn_offset(distance)
+
+        return min(btn, RouteCalculation.get_max_btn(star1.wtn, star2.wtn))
+
+    @staticmethod
+    def _get_btn_base(star1, star2) -> int:
+        """
+        BTN between two stars before the distance modifier and the cap on BTN.
+        """
         btn = star1.wtn + star2.wtn + RouteCalculation.get_btn_allies(star1.alg_code, star2.alg_code)
         code1 = star1.tradeCode
         code2 = star2.tradeCode
@@ -134,13 +158,24 @@ class RouteCalculation(object):
             btn += 1 if code1.match_ag_codes(code2) else 0
         if code1.in_code_boost and code2.in_code_boost and (code1.industrial or code2.industrial):
             btn += 1 if code1.match_in_codes(code2) else 0
+        return btn
 
-        if not distance:
-            distance = star1.distance(star2)
-
-        btn += RouteCalculation.get_btn_offset(distance)
-
-        return min(btn, RouteCalculation.get_max_btn(star1.wtn, star2.wtn))
+    @staticmethod
+    def get_btn_max_distance(star1, star2, min_btn) -> float:
+        """
+        Longest route, in parsecs, between two stars whose BTN still meets min_btn - the BTN distance modifier only
+        gets worse with distance, so a longer route between them falls short.  Negative if no route meets min_btn,
+        infinite if every route does.
+        """
+        if RouteCalculation.get_max_btn(star1.wtn, star2.wtn) < min_btn:
+            return -1
+        # Each breakpoint in btn_jump_range passed knocks another point off the BTN
+        slack = RouteCalculation._get_btn_base(star1, star2) - min_btn
+        if 0 > slack:
+            return -1
+        if slack >= len(RouteCalculation.btn_jump_range):
+            return float('+inf')
+        return RouteCalculation.btn_jump_range[slack]
 
     @staticmethod
     @functools.cache
@@ -250,8 +285,7 @@ class RouteCalculation(object):
         return
 
     def get_landmarks(self, btn=None) -> tuple[list[dict], defaultdict[Any, set]]:
-        schema = LandmarksTriaxialExtremes(self.galaxy)
-        return schema.get_landmarks(btn=btn)
+        return LandmarkRegistry.get_landmarks(self.galaxy, self.landmark_spec, btn=btn)
 
     def unilateral_filter(self, star) -> bool:
         """
@@ -0,0 +1,164 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+
+Checkpoint and resume for the single-process trade calculation.  Rather than snapshotting the many pieces of state a
+route touches - edge weights, trade and counts, historic costs, landmark distances, star, sector and allegiance
+counters, balance objects, penumbra count - this code journals each processed route's outcome: the route found, if
+any, or that it was given up on as too long.  Route processing is deterministic once the route is known, so on resume:
+    The routes are set up and sorted exactly as before
+    Each journalled route is replayed - upper-bound preheating (including any reheat), then the route's trade and
+        edge-weight updates - without pathfinding, which is where the time goes
+    The remaining routes are processed as normal, and journalled in turn
+This makes checkpointing an append of a line per route, with the journal flushed to disk every few thousand routes,
+and when route processing stops early.
+
+The checkpoint directory holds:
+    checkpoint.json - fingerprint of the route list, sector data, starting edge weights and trade settings the journal
+        belongs to
+    routes.jsonl - one line per processed route, in processing order - a null route means the route was given up on
+        as too long to meet the minimum BTN, and an empty one that there was no route
+"""
+import hashlib
+import json
+import os
+from typing import Optional, TextIO
+
+from PyRoute.Calculation.RouteCache import RouteCache
+
+
+class RouteCheckpoint(object):
+
+    header_name = 'checkpoint.json'
+    journal_name = 'routes.jsonl'
+    version = 4
+
+    def __init__(self, directory: str, interval: int = 2000):
+        self.directory = directory
+        # Number of routes between journal flushes
+        self.interval = max(1, interval)
+        self.pending: Optional[list] = None
+        self.pending_diag: Optional[dict] = None
+        self.pending_given_up = False
+        self.buffer: list[str] = []
+        self.handle: Optional[TextIO] = None
+
+    @property
+    def header_path(self) -> str:
+        return os.path.join(self.directory, self.header_name)
+
+    @property
+    def journal_path(self) -> str:
+        return os.path.join(self.directory, self.journal_name)
+
+    def open(self, trade, btn) -> list[tuple[Optional[list], dict]]:
+        """
+        Open the checkpoint for the sorted route list btn, returning the journalled (route, diagnostics) outcomes to
+        replay, with a route of None for each route given up on - empty if there's no checkpoint yet.  Raises ValueError if the checkpoint was written for different
+        input or settings.
+        """
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        header = {'version': self.version, 'fingerprint': self.fingerprint(trade, btn), 'routes': len(btn)}
+
+        replay = []
+        if os.path.exists(self.header_path):
+            with open(self.header_path, 'r', encoding='utf-8') as handle:
+                existing = json.load(handle)
+            if existing != header:
+                raise ValueError("Checkpoint in " + self.directory + " was written for different sectors or trade "
+                                 "settings, not resuming from it")
+            replay = self._read_journal()
+        else:
+            tmp_path = self.header_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as handle:
+                json.dump(header, handle)
+            os.replace(tmp_path, self.header_path)
+            with open(self.journal_path, 'w', encoding='utf-8'):
+                pass
+
+        # Held open across route processing, and closed by close()
+        self.handle = open(self.journal_path, 'a', encoding='utf-8')  # noqa: SIM115
+        return replay
+
+    def record(self, rawroute, diag) -> None:
+        """
+        Note the route found for the route currently being processed.
+        """
+        self.pending = [int(item) for item in rawroute]
+        self.pending_diag = diag
+
+    def give_up(self) -> None:
+        """
+        Note that the route currently being processed was given up on as too long.
+        """
+        self.pending_given_up = True
+
+    def route_done(self) -> None:
+        """
+        Journal the outcome of the route just processed, flushing to disk every interval routes.
+        """
+        record: dict = {'route': None if self.pending_given_up else [] if self.pending is None else self.pending}
+        if self.pending is not None and self.pending_diag:
+            record['diag'] = {key: float(value) for key, value in self.pending_diag.items()}
+        self.buffer.append(json.dumps(record, separators=(',', ':')) + '\n')
+        self.pending = None
+        self.pending_diag = None
+        self.pending_given_up = False
+        if len(self.buffer) >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.handle is None or 0 == len(self.buffer):
+            return
+        self.handle.write(''.join(self.buffer))
+        self.handle.flush()
+        os.fsync(self.handle.fileno())
+        self.buffer = []
+
+    def close(self) -> None:
+        self.flush()
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+    @staticmethod
+    def fingerprint(trade, btn) -> str:
+        """
+        Hash of everything the journalled routes depend on - the routes themselves, in order, the parsed sector data,
+        the jump graph's starting edge weights, and the trade settings that steer pathfinding.
+        """
+        digest = hashlib.sha256()
+        settings = [trade.min_btn, trade.min_wtn, trade.route_reuse, trade.epsilon, trade.bidirectional_length,
+                    trade.debug_flag, trade.landmark_spec, trade.galaxy.max_jump_range, len(trade.galaxy.stars),
+                    trade.galaxy.stars.number_of_edges()]
+        digest.update(json.dumps(settings).encode('utf-8'))
+        # Star and edge counts alone don't catch edited sector data, so hash the stars as parsed, and the edge weights
+        # as they stand before any route has been processed
+        for name in sorted(trade.galaxy.sectors):
+            digest.update(RouteCache.sector_hash(trade.galaxy.sectors[name]).encode('utf-8'))
+        digest.update(trade.star_graph._weights.tobytes())
+        for (star, neighbor, data) in btn:
+            digest.update('{} {} {}\n'.format(star.index, neighbor.index, data['btn']).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _read_journal(self) -> list[tuple[Optional[list], dict]]:
+        """
+        Read back the journal, dropping any partly-written trailing line left by an interrupted run.
+        """
+        replay = []
+        valid_length = 0
+        with open(self.journal_path, 'rb') as handle:
+            raw = handle.read()
+        for line in raw.split(b'\n')[:-1]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            replay.append((record['route'], record.get('diag', {})))
+            valid_length += len(line) + 1
+        if valid_length != len(raw):
+            with open(self.journal_path, 'r+b') as handle:
+                handle.truncate(valid_length)
+        return replay
@@ -0,0 +1,168 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+
+Per-star and per-edge trade accumulators for the trade calculation's route updates.  Rather than adding trade and
+passenger totals to Star attributes, and trade, count and weight to each networkx edge dict, hop by hop, route updates
+go through this:
+    Star totals - tradeIn, tradeOver, tradeCount, passIn, passOver - and edge trade are only ever added to, and nothing
+        reads them back until route processing is done, so each route's star indexes, edge ids and trade amounts are
+        queued up, and every so often added into NumPy arrays in bulk with np.add.at
+    Edge counts and weights are read back by later routes, so they're kept up to date as each route goes through, in
+        flat lists indexed by edge id
+Edge ids cover the edges in galaxy.stars when the totals were loaded.  Historic-route edges added later aren't on any
+route the trade calculation pathfinds, so they stay in their edge dicts.
+
+The totals are loaded from the stars and edge dicts once, before the first route update, and written back once, when
+route processing is done and before any outputs are generated.
+"""
+import numpy as np
+
+
+class RouteTotals(object):
+
+    star_fields = ('tradeIn', 'tradeOver', 'tradeCount', 'passIn', 'passOver')
+    # Number of queued star indexes that triggers adding the queue into the arrays, to keep its memory in check
+    flush_size = 1000000
+
+    def __init__(self, galaxy):
+        self.galaxy = galaxy
+        mapping = galaxy.star_mapping
+        self.num_stars = 1 + max(mapping) if 0 < len(mapping) else 0
+        # Unset values load as zero, and are only written back if a route changes them
+        self.star_values: dict[str, np.ndarray] = {}
+        for field in self.star_fields:
+            values = np.zeros(self.num_stars, dtype=np.int64)
+            for index, star in mapping.items():
+                values[index] = star[field] or 0
+            self.star_values[field] = values
+
+        # Edge ids, keyed on source star index * num_stars + target star index, for both orientations of each edge
+        self.edge_ids: dict[int, int] = {}
+        self.edge_data: list[dict] = []
+        for u, neighbours in galaxy.stars._adj.items():
+            for v, data in neighbours.items():
+                if u < v and 'route' not in data:
+                    self.edge_ids[u * self.num_stars + v] = len(self.edge_data)
+                    self.edge_ids[v * self.num_stars + u] = len(self.edge_data)
+                    self.edge_data.append(data)
+        self.weight: list[float] = [data['weight'] for data in self.edge_data]
+        self.distance: list[float] = [data['distance'] for data in self.edge_data]
+        self.exhaust: list[int] = [data['exhaust'] for data in self.edge_data]
+        self.count: list[int] = [data['count'] for data in self.edge_data]
+        self.count_loaded = np.array(self.count, dtype=np.int64)
+        self.trade = np.array([data['trade'] for data in self.edge_data], dtype=np.int64)
+
+        # Routes queued up to add to the star and edge trade totals - their star indexes and edge ids end to end, and
+        # each route's length, trade and passengers
+        self.route_stars: list[int] = []
+        self.route_edges: list[int] = []
+        self.route_lengths: list[int] = []
+        self.route_trade: list[int] = []
+        self.route_passengers: list[int] = []
+        # Stars and edges whose trade totals have changed since loading
+        self.stars_changed = np.zeros(self.num_stars, dtype=bool)
+        self.edges_changed = np.zeros(len(self.edge_data), dtype=bool)
+
+    def edges(self, indexes: list[int]) -> list[int]:
+        """
+        Edge ids of the hops along a route, given as star indexes.
+        """
+        edge_ids = self.edge_ids
+        num_stars = self.num_stars
+        return [edge_ids[u * num_stars + v] for (u, v) in zip(indexes[:-1], indexes[1:])]
+
+    def add_route(self, indexes: list[int], hops: list[int], trade: int, passengers: int) -> None:
+        """
+        Queue up a route's trade and passengers to add to its stars' and edges' totals.
+        :param indexes: Route's star indexes, in order
+        :param hops: Route's edge ids, as from edges()
+        """
+        self.route_stars.extend(indexes)
+        self.route_edges.extend(hops)
+        self.route_lengths.append(len(indexes))
+        self.route_trade.append(trade)
+        self.route_passengers.append(passengers)
+        if self.flush_size <= len(self.route_stars):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Add the queued routes into the star and edge trade totals.
+        """
+        if 0 == len(self.route_lengths):
+            return
+        stars = np.array(self.route_stars, dtype=np.int64)
+        lengths = np.array(self.route_lengths, dtype=np.int64)
+        trade = np.repeat(np.array(self.route_trade, dtype=np.int64), lengths)
+        passengers = np.repeat(np.array(self.route_passengers, dtype=np.int64), lengths)
+        # Mark each route's first and last stars as its ends
+        last = np.cumsum(lengths) - 1
+        is_end = np.zeros(len(stars), dtype=bool)
+        is_end[last] = True
+        is_end[last - lengths + 1] = True
+        ends = stars[is_end]
+        mids = stars[~is_end]
+
+        values = self.star_values
+        np.add.at(values['tradeIn'], ends, trade[is_end] // 2)
+        np.add.at(values['passIn'], ends, passengers[is_end])
+        np.add.at(values['tradeOver'], mids, trade[~is_end])
+        np.add.at(values['tradeCount'], mids, 1)
+        np.add.at(values['passOver'], mids, passengers[~is_end])
+        self.stars_changed[stars] = True
+
+        edges = np.array(self.route_edges, dtype=np.int64)
+        np.add.at(self.trade, edges, np.repeat(np.array(self.route_trade, dtype=np.int64), lengths - 1))
+        self.edges_changed[edges] = True
+
+        self.route_stars = []
+        self.route_edges = []
+        self.route_lengths = []
+        self.route_trade = []
+        self.route_passengers = []
+
+    def route_cost(self, route) -> float:
+        """
+        Total cost of route's edges at the moment, added up hop by hop as Galaxy.route_cost does.
+        """
+        edge_ids = self.edge_ids
+        num_stars = self.num_stars
+        weight = self.weight
+        adj = self.galaxy.stars._adj
+        total_weight = 0.0
+        start = route[0].index
+        for star in route[1:]:
+            end = star.index
+            edge = edge_ids.get(start * num_stars + end)
+            total_weight += adj[start][end]['weight'] if edge is None else weight[edge]
+            start = end
+        return total_weight
+
+    def write_back(self) -> None:
+        """
+        Copy the totals back to the Star attributes and edge dicts they were loaded from, for those stars and edges
+        routes have passed through since.
+        """
+        self.flush()
+        mapping = self.galaxy.star_mapping
+        changed = np.flatnonzero(self.stars_changed)
+        columns = [self.star_values[field][changed].tolist() for field in self.star_fields]
+        for i, index in enumerate(changed.tolist()):
+            star = mapping[index]
+            for field, values in zip(self.star_fields, columns):
+                star[field] = values[i]
+        self.stars_changed[:] = False
+
+        trade = self.trade.tolist()
+        for edge in np.flatnonzero(self.edges_changed).tolist():
+            self.edge_data[edge]['trade'] = trade[edge]
+        self.edges_changed[:] = False
+        # An edge's weight only changes alongside its count
+        count = np.array(self.count, dtype=np.int64)
+        for edge in np.flatnonzero(count != self.count_loaded).tolist():
+            data = self.edge_data[edge]
+            data['weight'] = self.weight[edge]
+            data['count'] = self.count[edge]
+        self.count_loaded = count
@@ -12,7 +12,13 @@ import networkx as nx
 
 from PyRoute.Pathfinding.DistanceGraph import DistanceGraph
 from PyRoute.Allies.AllyGen import AllyGen
+from PyRoute.Calculation.ComponentRoutePartition import ComponentRoutePartition
+from PyRoute.Calculation.OptimisticRouteWindow import OptimisticRouteWindow
+from PyRoute.Calculation.RouteCache import RouteCache
+from PyRoute.Calculation.RouteCheckpoint import RouteCheckpoint
+from PyRoute.Calculation.RouteTotals import RouteTotals
 from PyRoute.Calculation.RouteCalculation import RouteCalculation
+from PyRoute.Errors.RouteTooLongError import RouteTooLongError
 try:
     from PyRoute.Pathfinding.ApproximateShortestPathForestUnified import ApproximateShortestPathForestUnified
 except ModuleNotFoundError:
@@ -21,7 +27,7 @@ except ImportError:
     from PyRoute.Pathfinding.ApproximateShortestPathForestUnifiedFallback import ApproximateShortestPathForestUnified  # type: ignore
 except AttributeError:
     from PyRoute.Pathfinding.ApproximateShortestPathForestUnifiedFallback import ApproximateShortestPathForestUnified  # type: ignore
-from PyRoute.TradeBalance import TradeBalance
+from PyRoute.TradeBalance import IndexedTradeBalance
 try:
     from PyRoute.Pathfinding.TradeCalculationRawRoutes import TradeCalculationRawRoutes
 except ModuleNotFoundError:
@@ -38,8 +44,26 @@ except ImportError:
     from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy
 except AttributeError:
     from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy
+try:
+    from PyRoute.Pathfinding.astar_bidirectional import astar_path_bidirectional
+except ModuleNotFoundError:
+    from PyRoute.Pathfinding.astar_bidirectional_fallback import astar_path_bidirectional
+except ImportError:
+    from PyRoute.Pathfinding.astar_bidirectional_fallback import astar_path_bidirectional
+except AttributeError:
+    from PyRoute.Pathfinding.astar_bidirectional_fallback import astar_path_bidirectional
 from PyRoute.Star import Star
 
+# Trade balances the running audit checks, with the galaxy statistic each balances against, and how to describe them
+AUDITED_TOTALS = (
+    ('sector_passenger_balance', 'passengers', 'Sector', 'pax'),
+    ('sector_trade_balance', 'trade', 'Sector', 'trade'),
+    ('sector_trade_volume_balance', 'tradeDton', 'Sector', 'trade volume'),
+    ('allegiance_passenger_balance', 'passengers', 'Allegiance', 'pax'),
+    ('allegiance_trade_balance', 'trade', 'Allegiance', 'trade'),
+    ('allegiance_trade_volume_balance', 'tradeDton', 'Allegiance', 'trade volume')
+)
+
 
 class TradeCalculation(RouteCalculation):
     """
@@ -77,7 +101,9 @@ class TradeCalculation(RouteCalculation):
     # Maximum WTN to process routes for
     max_wtn = 15
 
-    def __init__(self, galaxy, min_btn=13, route_btn=8, route_reuse=10, debug_flag=False):
+    def __init__(self, galaxy, min_btn=13, route_btn=8, route_reuse=10, debug_flag=False, bidirectional_length=None,
+                 optimistic_window=None, mp_threads=1, resume_dir=None, route_cache_dir=None,
+                 component_partition=False):
         super(TradeCalculation, self).__init__(galaxy)
 
         # Minimum BTN to calculate routes for. BTN between two worlds less than
@@ -99,28 +125,62 @@ class TradeCalculation(RouteCalculation):
 
         # Are debugging gubbins turned on?
         self.debug_flag = debug_flag
+
+        # Routes whose landmark lower bound on length, in parsecs, reaches this get searched from both ends.
+        # None keeps every route on the forward-only search.
+        self.bidirectional_length = bidirectional_length
+        # Number of upcoming routes to pathfind at once, over mp_threads worker processes.  None pathfinds them one at a
+        # time, in-process.
+        self.optimistic_window = optimistic_window
+        self.mp_threads = mp_threads
+        # Shared-memory copy of the pathfinding state, for worker processes to search against
+        self.shared_state = None
         self.pathfinding_data = None
+        # Directory to journal processed routes to, and resume from if it already holds a journal
+        self.resume_dir = resume_dir
+        self.checkpoint_interval = 2000
+        self.checkpoint = None
+        # Directory to cache final routes in across runs, replaying those whose neighbourhood hasn't changed
+        self.route_cache_dir = route_cache_dir
+        self.route_cache = None
+        # Process each large connected component's routes in its own worker process, over mp_threads processes
+        self.component_partition = component_partition
+        # Historic-route edges added to galaxy.stars, in the order they were added, if they're being tracked
+        self.historic_edges_added: Optional[list[tuple[int, int]]] = None
+        # Recount trade totals over every sector and allegiance at each audit, rather than checking running totals
+        self.paranoid = False
+        # Running total of sector or allegiance statistics, less what the balance settled, that each trade balance is
+        # audited against.  None until a full recount sets them.
+        self.audit_totals: Optional[dict[str, int]] = None
 
         # Count routes that get trimmed by as-found route length
         self.penumbra_routes = 0
+        # Count route searches, and the nodes they expanded and queued if diagnostics are being collected
+        self.routes_pathfound = 0
+        self.nodes_expanded = 0
+        self.nodes_queued = 0
 
         self.shortest_path_tree = None
         self.shortest_dist_tree = None
+        # Per-star and per-edge totals route updates add into, between loading and writing back
+        self.route_totals: Optional[RouteTotals] = None
         # Track inter-sector passenger imbalances
-        self.sector_passenger_balance = TradeBalance(stat_field="passengers", region=galaxy)
+        self.sector_passenger_balance = IndexedTradeBalance(stat_field="passengers", region=galaxy)
         # Track inter-sector trade imbalances
-        self.sector_trade_balance = TradeBalance(stat_field="tradeExt", region=galaxy, target="trade")
+        self.sector_trade_balance = IndexedTradeBalance(stat_field="tradeExt", region=galaxy, target="trade")
         # Track inter-sector trade volume imbalances
-        self.sector_trade_volume_balance = TradeBalance(stat_field="tradeDtonExt", region=galaxy, target="trade")
+        self.sector_trade_volume_balance = IndexedTradeBalance(stat_field="tradeDtonExt", region=galaxy, target="trade")
         # Track inter-allegiance passenger imbalances
-        self.allegiance_passenger_balance = TradeBalance(stat_field="passengers", region=galaxy, field="alg",
-                                                         star_field="allegiance_base", target_property="code")
+        self.allegiance_passenger_balance = IndexedTradeBalance(stat_field="passengers", region=galaxy, field="alg",
+                                                                star_field="allegiance_base",
+                                                                target_property="code")
         # Track inter-allegiance trade imbalances
-        self.allegiance_trade_balance = TradeBalance(stat_field="trade", region=galaxy, field="alg",
-                                                     star_field="allegiance_base", target_property="code")
+        self.allegiance_trade_balance = IndexedTradeBalance(stat_field="trade", region=galaxy, field="alg",
+                                                            star_field="allegiance_base", target_property="code")
         # Track inter-allegiance trade imbalances
-        self.allegiance_trade_volume_balance = TradeBalance(stat_field="tradeDtonExt", region=galaxy, field="alg",
-                                                     star_field="allegiance_base", target_property="code")
+        self.allegiance_trade_volume_balance = IndexedTradeBalance(stat_field="tradeDtonExt", region=galaxy,
+                                                                   field="alg", star_field="allegiance_base",
+                                                                   target_property="code")
         self.raw_ranges = TradeCalculationRawRoutes(self)
 
     def base_route_filter(self, star, neighbor) -> bool:
@@ -244,24 +304,69 @@ class TradeCalculation(RouteCalculation):
         self.star_len_root = max(1, math.floor(math.sqrt(len(self.star_graph))) // 2)
 
         np.seterr(invalid="ignore")
-        btn = [(s, n, d) for (s, n, d) in btn if (lobound := self.shortest_dist_tree.lower_bound(s.index, n.index) > 0)
-               and (self.get_btn(s, n, lobound) >= self.min_btn)]
+        # Drop routes that can't be found, or can't meet the minimum BTN however short they are.  Routes that could, but
+        # only if shorter than the landmark bounds allow, still have to be preheated in turn, so get_trade_between gives
+        # up on those.
+        btn = [(s, n, d) for (s, n, d) in btn if 0 < self.shortest_dist_tree.lower_bound(s.index, n.index)
+               and self.get_btn(s, n, 1) >= self.min_btn]
+
+        if self.route_cache_dir is not None:
+            route_cache = RouteCache(self.route_cache_dir)
+            route_cache.open(self)
+            self.route_cache = route_cache
+        resumed = 0
+        if self.resume_dir is not None:
+            checkpoint = RouteCheckpoint(self.resume_dir, self.checkpoint_interval)
+            resumed = self._replay_checkpoint(checkpoint.open(self, btn), btn)
+            self.checkpoint = checkpoint
 
         base_btn = 0  # pragma: no mutate
         counter = 0
-        processed = 0
+        processed = resumed
         total = len(btn)
-        for (star, neighbor, data) in btn:
-            if base_btn != data['btn']:
-                if counter > 0:
-                    self.logger.info('processed {} routes at BTN {}'.format(counter, base_btn))
-                base_btn = data['btn']
-                counter = 0
-            if total > 100 and processed % (total // 20) == 0:  # pragma: no mutate
-                self.logger.info('processed {} routes, at {}%'.format(processed, processed // (total // 100)))  # pragma: no mutate
-            self.get_trade_between(star, neighbor)
-            counter += 1
-            processed += 1
+        window = None
+        get_trade_between = self.get_trade_between
+        partition = ComponentRoutePartition(self, btn, self.mp_threads) if self.component_partition else None
+        if partition is not None and partition.applies():
+            partition.run()
+            # Every route's been dealt with, so skip the sequential loop
+            resumed = processed = total
+        elif self.optimistic_window is not None:
+            window = OptimisticRouteWindow(self, btn, self.optimistic_window, self.mp_threads, start=resumed)
+            window.start()
+            get_trade_between = window.get_trade_between
+        try:
+            for (star, neighbor, data) in btn[resumed:]:
+                if base_btn != data['btn']:
+                    if counter > 0:
+                        self.logger.info('processed {} routes at BTN {}'.format(counter, base_btn))
+                    base_btn = data['btn']
+                    counter = 0
+                if total > 100 and processed % (total // 20) == 0:  # pragma: no mutate
+                    self.logger.info('processed {} routes, at {}%'.format(processed, processed // (total // 100)))  # pragma: no mutate
+                if self.route_cache is not None and self._replay_cached_route(star, neighbor):
+                    if window is not None:
+                        window.skip()
+                else:
+                    get_trade_between(star, neighbor)
+                if self.checkpoint is not None:
+                    self.checkpoint.route_done()
+                counter += 1
+                processed += 1
+        finally:
+            # Don't leave the window's worker pool and shared memory behind if processing was interrupted
+            if window is not None:
+                window.stop()
+            # Keep every route finished so far, even if processing was interrupted
+            if self.checkpoint is not None:
+                self.checkpoint.close()
+                self.checkpoint = None
+            if self.route_cache is not None:
+                self.route_cache.close()
+                self.route_cache = None
+            self.write_route_totals()
+        # Routes are done, so recount in full what the audits along the way only checked against running totals
+        self.cross_check_totals()
         self.multilateral_balance_trade()
         self.multilateral_balance_pass()
         self.logger.info('processed {} routes at BTN {}'.format(counter, base_btn))
@@ -299,6 +404,51 @@ class TradeCalculation(RouteCalculation):
             self.logger.info('Total target-exhausted nodes {}'.format(total_targ_exhausted))
             self.logger.info('Total un-exhausted nodes {}'.format(total_un_exhausted))
 
+    def _replay_checkpoint(self, replay, btn) -> int:
+        """
+        Re-apply the journalled outcomes of the first len(replay) routes in btn, without pathfinding them, returning
+        how many routes were replayed.
+        """
+        if 0 == len(replay):
+            return 0
+        self.logger.info(f"Resuming from checkpoint, replaying {len(replay)} of {len(btn)} routes")
+        for (left, right, _), (rawroute, diag) in zip(btn, replay):
+            self._replay_preheat(left.index, right.index)
+            star, target = self._route_endpoints(left, right)
+            if rawroute is None:
+                self._give_up_route(star, target)
+            elif 0 < len(rawroute):
+                self._commit_route(star, target, rawroute, diag)
+        self.logger.info(f"Replayed {len(replay)} routes")
+        return len(replay)
+
+    def _replay_cached_route(self, left, right) -> bool:
+        """
+        Re-apply the cached route between left and right, if there is one still valid, without pathfinding it.
+        Returns whether a route was replayed.
+        """
+        rawroute = self.route_cache.lookup(left, right)
+        if rawroute is None:
+            return False
+        self._replay_preheat(left.index, right.index)
+        star, target = self._route_endpoints(left, right)
+        if 0 == len(rawroute):
+            self._give_up_route(star, target)
+            return True
+        if rawroute[0] != star.index:
+            rawroute.reverse()
+        self._commit_route(star, target, rawroute, {})
+        return True
+
+    def _replay_preheat(self, stardex, targdex) -> None:
+        """
+        Preheat exactly as pathfinding the route between stardex and targdex would have, as any reheating changes
+        historic costs.  The upper bound itself isn't needed, so skip routes that don't reheat, as preheating them has
+        no side effects.
+        """
+        if (stardex + targdex) % self.star_len_root == 0:
+            self._preheat_upper_bound(stardex, targdex, allow_reheat=True)
+
     def get_trade_between(self, star, target) -> None:
         """
         Calculate the route between star and target
@@ -311,34 +461,116 @@ class TradeCalculation(RouteCalculation):
         try:
             # Get upper bound value, and increase by 0.5% to ensure it _is_ an upper bound
             upbound = self._preheat_upper_bound(star.index, target.index, allow_reheat=True) * 1.005
+            star, target = self._route_endpoints(star, target)
+            # Only once preheated, as preheating can reheat historic costs, which later routes' bounds depend on
+            if self._cannot_meet_min_btn(star, target):
+                self._give_up_route(star, target)
+                return
+            rawroute, diag = self._find_route(star, target, upbound)
+        except RouteTooLongError:
+            self._give_up_route(star, target)
+            return
+        except nx.NetworkXNoPath:
+            return
 
-            comp_id = star.component
-            if star.index in self.component_landmarks[comp_id] and \
-                    target.index not in self.component_landmarks[comp_id]:
-                target, star = star, target
-
-            rawroute, diag = astar_path_numpy(self.star_graph, star.index, target.index,
-                                              self.shortest_path_tree.lower_bound_bulk, upbound=upbound,
-                                              diagnostics=self.debug_flag)
-
-            if self.debug_flag:
-                moshdex = np.where(self.pathfinding_data['branch_factor'] == -1.0)[0][0]
-                # Now load up this route's summary data
-                self.pathfinding_data['nodes_expanded'][moshdex] = diag['nodes_expanded']
-                self.pathfinding_data['nodes_queued'][moshdex] = diag['nodes_queued']
-                self.pathfinding_data['branch_factor'][moshdex] = diag['branch_factor']
-                self.pathfinding_data['nodes_revisited'][moshdex] = diag['nodes_revisited']
-                self.pathfinding_data['neighbour_bound'][moshdex] = diag['neighbour_bound']
-                self.pathfinding_data['new_upbounds'][moshdex] = diag['new_upbounds']
-                self.pathfinding_data['g_exhausted'][moshdex] = diag['g_exhausted']
-                self.pathfinding_data['f_exhausted'][moshdex] = diag['f_exhausted']
-                self.pathfinding_data['targ_exhausted'][moshdex] = diag['targ_exhausted']
-                self.pathfinding_data['un_exhausted'][moshdex] = diag['un_exhausted']
-                neighbourhood_size = 1 if diag['un_exhausted'] == 0 else diag['nodes_queued'] / diag['un_exhausted']
-                self.pathfinding_data['neighbourhood_size'][moshdex] = neighbourhood_size
+        self._commit_route(star, target, rawroute, diag)
+
+    def _cannot_meet_min_btn(self, star, target) -> bool:
+        """
+        Would the route between star and target fall short of the minimum BTN even if it turned out as short as it
+        possibly can - no shorter than the landmark lower bound on its length, nor the hex distance between its ends?
+        """
+        lobound = self.shortest_dist_tree.lower_bound(star.index, target.index)
+        return max(lobound, star.distance(target)) > self.get_btn_max_distance(star, target, self.min_btn)
+
+    def _route_endpoints(self, star, target) -> tuple[Star, Star]:
+        """
+        Pick which end of the route to search from.
+        """
+        comp_id = star.component
+        if star.index in self.component_landmarks[comp_id] and \
+                target.index not in self.component_landmarks[comp_id]:
+            return target, star
+        return star, target
 
+    def _find_route(self, star, target, upbound) -> tuple[list, dict]:
+        """
+        Search for the route from star to target against the current edge weights, raising NetworkXNoPath if there is
+        none within upbound.
+        """
+        diagnostics = self.debug_flag or self.collect_diagnostics
+        heuristic = self.shortest_path_tree.lower_bound_lazy
+        max_distance = self._route_cap(star, target)
+        try:
+            if self._bidirectional(star, target):
+                rawroute, diag = astar_path_bidirectional(self.star_graph, star.index, target.index, heuristic,
+                                                          upbound=upbound, diagnostics=diagnostics)
+            else:
+                rawroute, diag = astar_path_numpy(self.star_graph, star.index, target.index, heuristic,
+                                                  upbound=upbound, diagnostics=diagnostics, max_distance=max_distance)
         except nx.NetworkXNoPath:
-            return
+            self._count_route({})
+            raise
+        self._count_route(diag)
+        return rawroute, diag
+
+    def _count_route(self, diag) -> None:
+        self.routes_pathfound += 1
+        if diag:
+            self.nodes_expanded += diag['nodes_expanded']
+            self.nodes_queued += diag['nodes_queued']
+
+    def _bidirectional(self, star, target) -> bool:
+        return self.bidirectional_length is not None and \
+            self.shortest_dist_tree.lower_bound(star.index, target.index) >= self.bidirectional_length
+
+    def _route_cap(self, star, target) -> float:
+        """
+        Longest route between star and target worth finding - any longer falls short of the minimum BTN, so the
+        forward-only search gives up on it early.  The bidirectional search isn't capped.
+        """
+        if self._bidirectional(star, target):
+            return float('+inf')
+        return self.get_btn_max_distance(star, target, self.min_btn)
+
+    def _give_up_route(self, star, target) -> None:
+        """
+        Record that the route between star and target was given up on as too long to meet the minimum BTN, and count
+        it as a penumbra route, the same as if it had been found and then trimmed.
+        """
+        self.penumbra_routes += 1
+        if self.checkpoint is not None:
+            self.checkpoint.give_up()
+        if self.route_cache is not None:
+            self.route_cache.record(star, target, [])
+
+    def counters(self) -> dict[str, int]:
+        return {'routes_pathfound': self.routes_pathfound, 'penumbra_routes': self.penumbra_routes,
+                'nodes_expanded': self.nodes_expanded, 'nodes_queued': self.nodes_queued}
+
+    def _commit_route(self, star, target, rawroute, diag) -> None:
+        """
+        Record the route found between star and target, and apply its trade to the stars and edges along it.
+        """
+        if self.checkpoint is not None:
+            self.checkpoint.record(rawroute, diag if self.debug_flag else None)
+        if self.route_cache is not None:
+            self.route_cache.record(star, target, rawroute)
+        if self.debug_flag and diag:
+            moshdex = np.where(self.pathfinding_data['branch_factor'] == -1.0)[0][0]
+            # Now load up this route's summary data
+            self.pathfinding_data['nodes_expanded'][moshdex] = diag['nodes_expanded']
+            self.pathfinding_data['nodes_queued'][moshdex] = diag['nodes_queued']
+            self.pathfinding_data['branch_factor'][moshdex] = diag['branch_factor']
+            self.pathfinding_data['nodes_revisited'][moshdex] = diag['nodes_revisited']
+            self.pathfinding_data['neighbour_bound'][moshdex] = diag['neighbour_bound']
+            self.pathfinding_data['new_upbounds'][moshdex] = diag['new_upbounds']
+            self.pathfinding_data['g_exhausted'][moshdex] = diag['g_exhausted']
+            self.pathfinding_data['f_exhausted'][moshdex] = diag['f_exhausted']
+            self.pathfinding_data['targ_exhausted'][moshdex] = diag['targ_exhausted']
+            self.pathfinding_data['un_exhausted'][moshdex] = diag['un_exhausted']
+            neighbourhood_size = 1 if diag['un_exhausted'] == 0 else diag['nodes_queued'] / diag['un_exhausted']
+            self.pathfinding_data['neighbourhood_size'][moshdex] = neighbourhood_size
 
         route = [self.galaxy.star_mapping[item] for item in rawroute]
 
@@ -370,14 +602,15 @@ class TradeCalculation(RouteCalculation):
         upbound = self.shortest_path_tree.triangle_upbound(stardex, targdex)
 
         # Case 0 - Source and target are directly connected
-        keep = self.star_graph._arcs[stardex][0] == targdex
+        src_nodes, src_weights = self.star_graph.neighbours(stardex)
+        keep = src_nodes == targdex
         if keep.any():
-            flip = self.star_graph._arcs[stardex][1][keep]
+            flip = src_weights[keep]
             return min(upbound, flip[0])
 
-        # Grab arrays to support Case 1
-        hist_targ = self.galaxy.historic_costs._arcs[targdex]
-        hist_src = self.galaxy.historic_costs._arcs[stardex]
+        # Grab arrays to support Case 1 - these are views straight into the historic-route graph's storage
+        hist_targ = self.galaxy.historic_costs.neighbours(targdex)
+        hist_src = self.galaxy.historic_costs.neighbours(stardex)
 
         # Case 1 - Historic-route source neighbour to historic-route target neighbour
         if 0 < len(hist_src[0]) and 0 < len(hist_targ[0]):
@@ -399,7 +632,7 @@ class TradeCalculation(RouteCalculation):
 
                         # The 0.5% bump is to _ensure_ the newcost remains an _upper_ bound
                         # on the historic-route cost
-                        newcost = round(self.galaxy.route_cost(edge['route']) * 1.005, 3)
+                        newcost = round(self.route_cost(edge['route']) * 1.005, 3)
                         if edge['weight'] > newcost:
                             edge['weight'] = newcost
                             self.galaxy.historic_costs.lighten_edge(pair[0], pair[1], newcost)
@@ -418,6 +651,9 @@ class TradeCalculation(RouteCalculation):
             target.sector.stats.passengers += tradePass // 2
             star.sector.stats.tradeDtonExt += tradeDton // 2
             target.sector.stats.tradeDtonExt += tradeDton // 2
+            sector_trade = tradeCr - (tradeCr & 1)
+            sector_pass = tradePass - (tradePass & 1)
+            sector_volume = tradeDton - (tradeDton & 1)
             if 1 == (tradeCr & 1):
                 self.sector_trade_balance.log_odd_unit(star, target)
             if 1 == (tradePass & 1):
@@ -428,6 +664,9 @@ class TradeCalculation(RouteCalculation):
             star.sector.stats.trade += tradeCr
             star.sector.stats.passengers += tradePass
             star.sector.stats.tradeDton += tradeDton
+            sector_trade = tradeCr
+            sector_pass = tradePass
+            sector_volume = tradeDton
             if star.subsector() == target.subsector():
                 star.sector.subsectors[star.subsector()].stats.trade += tradeCr
                 star.sector.subsectors[star.subsector()].stats.tradeDton += tradeDton
@@ -448,6 +687,9 @@ class TradeCalculation(RouteCalculation):
             self.galaxy.alg[starcode].stats.trade += tradeCr
             self.galaxy.alg[starcode].stats.passengers += tradePass
             self.galaxy.alg[starcode].stats.tradeDton += tradeDton
+            alg_trade = tradeCr
+            alg_pass = tradePass
+            alg_volume = tradeDton
         else:
             self.galaxy.alg[starcode].stats.tradeExt += tradeCr // 2
             self.galaxy.alg[targcode].stats.tradeExt += tradeCr // 2
@@ -455,19 +697,25 @@ class TradeCalculation(RouteCalculation):
             self.galaxy.alg[targcode].stats.passengers += tradePass // 2
             self.galaxy.alg[starcode].stats.tradeDtonExt += tradeDton // 2
             self.galaxy.alg[targcode].stats.tradeDtonExt += tradeDton // 2
+            alg_trade = tradeCr - (tradeCr & 1)
+            alg_pass = tradePass - (tradePass & 1)
+            alg_volume = tradeDton - (tradeDton & 1)
             if 1 == (tradeCr & 1):
                 if double_up:
                     self.galaxy.alg[starcode].stats.tradeExt += 1
+                    alg_trade += 1
                 else:
                     self.allegiance_trade_balance.log_odd_unit(star, target)
             if 1 == (tradePass & 1):
                 if double_up:
                     self.galaxy.alg[starcode].stats.passengers += 1
+                    alg_pass += 1
                 else:
                     self.allegiance_passenger_balance.log_odd_unit(star, target)
             if 1 == (tradeDton & 1):
                 if double_up:
                     self.galaxy.alg[starcode].stats.tradeDtonExt += 1
+                    alg_volume += 1
                 else:
                     self.allegiance_trade_volume_balance.log_odd_unit(star, target)
 
@@ -475,9 +723,18 @@ class TradeCalculation(RouteCalculation):
         self.galaxy.stats.passengers += tradePass
         self.galaxy.stats.tradeDton += tradeDton
 
+        audit = self.audit_totals
+        if audit is not None:
+            audit['sector_trade_balance'] += sector_trade
+            audit['sector_passenger_balance'] += sector_pass
+            audit['sector_trade_volume_balance'] += sector_volume
+            audit['allegiance_trade_balance'] += alg_trade
+            audit['allegiance_passenger_balance'] += alg_pass
+            audit['allegiance_trade_volume_balance'] += alg_volume
+
         try:
             if 0 == (star.index + target.index) % (self.star_len_root):
-                self.cross_check_totals()
+                self.check_running_totals()
         except AssertionError as e:
             msg = str(star.name) + "-" + str(target.name) + ": " + str(e)
             raise AssertionError(msg)
@@ -511,40 +768,35 @@ class TradeCalculation(RouteCalculation):
             self.galaxy.stars.add_edge(source.index, target.index, distance=distance, weight=cost, trade=0, btn=0,
                                        count=0, exhaust=0, route=route)
             self.galaxy.historic_costs.add_edge(source.index, target.index, cost)
+            if self.historic_edges_added is not None:
+                self.historic_edges_added.append((source.index, target.index))
 
         # Gather basic statistics.
         tradeBTN = self.get_btn(source, target, distance)
         tradeDton = self.calc_trade_tonnage(tradeBTN, distance)
         tradeCr = self.calc_trade(tradeBTN)
-        source.tradeIn += tradeCr // 2
-        target.tradeIn += tradeCr // 2
         tradePassBTN = self.get_passenger_btn(tradeBTN, source, target)
         tradePass = self.calc_passengers(tradePassBTN)
 
-        source.passIn += tradePass
-        target.passIn += tradePass
+        totals = self.get_route_totals()
+        indexes = [star.index for star in route]
+        hops = totals.edges(indexes)
+        totals.add_route(indexes, hops, tradeCr, tradePass)
 
         edges = []
-        start = source
-        for end in route[1:-1]:
-            end.tradeOver += tradeCr
-            end.tradeCount += 1
-            end.passOver += tradePass
-
-        for end in route[1:]:
-            data = self.galaxy.stars._adj[start.index][end.index]
-            # exhausted = data['count'] >= data['exhaust']
-            if reweight and (data['count'] < data['exhaust']):
-                data['weight'] -= (data['weight'] - data['distance']) / self.route_reuse
-                startdex = start.index
-                enddex = end.index
-                self.star_graph.lighten_edge(startdex, enddex, data['weight'])
-                self.shortest_path_tree.lighten_edge(startdex, enddex, data['weight'])
+        if reweight:
+            weight = totals.weight
+            count = totals.count
+            exhaust = totals.exhaust
+            edge_distance = totals.distance
+            for startdex, enddex, edge in zip(indexes, indexes[1:], hops):
                 # Edge can only trip an update if it's not exhausted
-                edges.append((startdex, enddex))
-                data['count'] += 1
-            data['trade'] += tradeCr
-            start = end
+                if count[edge] < exhaust[edge]:
+                    weight[edge] -= (weight[edge] - edge_distance[edge]) / self.route_reuse
+                    self.star_graph.lighten_edge(startdex, enddex, weight[edge])
+                    self.shortest_path_tree.lighten_edge(startdex, enddex, weight[edge])
+                    edges.append((startdex, enddex))
+                    count[edge] += 1
 
         # Feed the list of touched edges into the approximate-shortest-path machinery, so it can update whatever
         # distance labels it needs to stay within its approximation bound.
@@ -568,8 +820,27 @@ class TradeCalculation(RouteCalculation):
         """
         Given a route, return its total cost _at the moment_
         """
+        if self.route_totals is not None:
+            return self.route_totals.route_cost(route)
         return self.galaxy.route_cost(route)
 
+    def get_route_totals(self) -> RouteTotals:
+        """
+        Per-star and per-edge route totals, loading them from the galaxy's stars and edges if they aren't already.
+        """
+        if self.route_totals is None:
+            self.route_totals = RouteTotals(self.galaxy)
+        return self.route_totals
+
+    def write_route_totals(self) -> None:
+        """
+        Write the route totals back to the galaxy's stars and edges, and drop them, so any later route updates start
+        from what's in the galaxy.
+        """
+        if self.route_totals is not None:
+            self.route_totals.write_back()
+            self.route_totals = None
+
     def route_weight(self, star, target) -> float:
         dist = star.distance(target)
         weight = self.distance_weight[dist]
@@ -647,3 +918,29 @@ class TradeCalculation(RouteCalculation):
         assert grand_total_pax == total_allegiance_pax + self.allegiance_passenger_balance.sum, "Allegiance total pax " + str(total_allegiance_pax + self.allegiance_passenger_balance.sum) + " not balanced with galaxy pax " + str(grand_total_pax)
         assert grand_total_trade == total_allegiance_trade + self.allegiance_trade_balance.sum, "Allegiance total trade not balanced with galaxy trade"
         assert grand_total_volume == total_allegiance_volume + self.allegiance_trade_volume_balance.sum, "Allegiance total trade volume not balanced with galaxy trade volume"
+
+        # Restart the running totals from the recount
+        self.audit_totals = {
+            'sector_passenger_balance': total_sector_pax - self.sector_passenger_balance.stats_added,
+            'sector_trade_balance': total_sector_trade - self.sector_trade_balance.stats_added,
+            'sector_trade_volume_balance': total_sector_volume - self.sector_trade_volume_balance.stats_added,
+            'allegiance_passenger_balance': total_allegiance_pax - self.allegiance_passenger_balance.stats_added,
+            'allegiance_trade_balance': total_allegiance_trade - self.allegiance_trade_balance.stats_added,
+            'allegiance_trade_volume_balance': total_allegiance_volume - self.allegiance_trade_volume_balance.stats_added
+        }
+
+    def check_running_totals(self) -> None:
+        """
+        Check galaxy trade totals balance against the running sector and allegiance totals update_statistics keeps, in
+        constant time.  Recount in full instead if paranoid, or if there are no running totals yet.
+        """
+        audit = self.audit_totals
+        if self.paranoid or audit is None:
+            self.cross_check_totals()
+            return
+        stats = self.galaxy.stats
+        for name, stat_field, region, quantity in AUDITED_TOTALS:
+            balance = getattr(self, name)
+            running_total = audit[name] + balance.stats_added + balance.sum
+            assert stats[stat_field] == running_total, \
+                f"{region} total {quantity} {running_total} not balanced with galaxy {quantity} {stats[stat_field]}"
@@ -10,6 +10,8 @@ from multiprocessing import Queue, Pool
 from queue import Empty
 
 from PyRoute.Calculation.TradeCalculation import TradeCalculation
+from PyRoute.Calculation.TradeMPSharedState import TradeMPSharedState
+from PyRoute.Errors.RouteTooLongError import RouteTooLongError
 from PyRoute.Pathfinding.DistanceGraph import DistanceGraph
 try:
     from PyRoute.Pathfinding.ApproximateShortestPathForestUnified import ApproximateShortestPathForestUnified
@@ -29,9 +31,39 @@ except AttributeError:
     from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy
 
 # Convert the TradeMPCalculation to a global variable to allow the child processes to access it, and all the data.
+# The edge weights and landmark distances the children search over are swapped out for shared-memory copies the
+# parent publishes to, so the children see the parent's updates rather than a snapshot from when they were forked.
 tradeCalculation = None
 
 
+def find_shared_route(star, neighbor, pad_upbound) -> list:
+    """
+    Find the route between star and neighbor indexes against the parent's most recently published weights and
+    distances, returning an empty list if there is none.
+    :param pad_upbound: Whether to widen a finite upper bound by 0.5%, rounding up to 3 decimal places
+    :return: Route, as list of star indexes
+    """
+    global tradeCalculation
+    assert isinstance(tradeCalculation, TradeMPCalculation), "Global tradeCalculation instance not TradeMPCalculation"
+    shared = tradeCalculation.shared_state
+    while True:
+        generation = shared.attach(tradeCalculation)
+        rawroute = []
+        try:
+            # Reheating updates edge weights, which only the parent is allowed to do
+            upbound = tradeCalculation._preheat_upper_bound(star, neighbor, allow_reheat=False)
+            if pad_upbound and float('+inf') != upbound:
+                upbound = round(upbound * 1.005 + 0.0005, 3)
+
+            rawroute, _ = astar_path_numpy(tradeCalculation.star_graph, star, neighbor,
+                                           tradeCalculation.galaxy.heuristic_distance_bulk, upbound=upbound)
+        except nx.NetworkXNoPath:
+            pass
+        # If the parent has rewritten the arrays out from under this search, the result can't be trusted - redo it
+        if not shared.is_stale(generation):
+            return rawroute
+
+
 def intrasector_process(working_queue, processed_queue) -> None:
     """
     This is the core working function used by the child processes spawned by the start_mp_services() functions.
@@ -65,22 +97,13 @@ def intrasector_process(working_queue, processed_queue) -> None:
                 if data.get('jumps', False):
                     continue
 
-                try:
-                    upbound = tradeCalculation._preheat_upper_bound(star.index, neighbor.index)
-                    # Increase a finite upbound value by 0.5%, and round result up to 3 decimal places
-                    if float('+inf') != upbound:
-                        upbound = round(upbound * 1.005 + 0.0005, 3)
-
-                    rawroute, _ = astar_path_numpy(tradeCalculation.star_graph, star.index, neighbor.index,
-                                               tradeCalculation.galaxy.heuristic_distance_bulk, upbound=upbound)
-                except nx.NetworkXNoPath:
+                rawroute = find_shared_route(star.index, neighbor.index, True)
+                if 0 == len(rawroute):
                     continue
 
-                # Update the routes in the child's internal list, like we would for the primary one,
-                # But only for the child data. This makes sure the routes are properly reduced in weights for the next
-                # route search.
-                route = [tradeCalculation.galaxy.star_mapping[item] for item in rawroute]
-                tradeCalculation.route_update_simple(route, True)
+                # Mark the route done in the child's copy of the ranges graph, so it's not redone in reverse.  The
+                # weight reductions are left to the parent, which publishes them back to all the children.
+                data['jumps'] = len(rawroute) - 1
 
                 # Put the rawroute (list of indexes) on the return queue to the parent process.
                 processed_queue.put(rawroute)
@@ -104,12 +127,8 @@ def long_route_process(working_queue, processed_queue) -> None:
         except Empty:
             break
 
-        try:
-            upbound = tradeCalculation._preheat_upper_bound(star, neighbor)
-
-            rawroute, _ = astar_path_numpy(tradeCalculation.star_graph, star, neighbor,
-                                       tradeCalculation.galaxy.heuristic_distance_bulk, upbound=upbound)
-        except nx.NetworkXNoPath:
+        rawroute = find_shared_route(star, neighbor, False)
+        if 0 == len(rawroute):
             continue
 
         # Route is a list of star indexes, which is what the parent process is assuming.
@@ -177,6 +196,9 @@ class TradeMPCalculation(TradeCalculation):
         self.start_mp_services()
         # Do the remaining routes, which are long and will take a while
         self.process_long_routes(self.btn[large_btn_index:])
+        self.write_route_totals()
+        # Routes are done, so recount in full what the audits along the way only checked against running totals
+        self.cross_check_totals()
         self.multilateral_balance_trade()
         self.multilateral_balance_pass()
 
@@ -185,103 +207,119 @@ class TradeMPCalculation(TradeCalculation):
     def start_mp_services(self) -> None:
         global tradeCalculation
         tradeCalculation = self
+        self.shared_state = TradeMPSharedState(self.star_graph, self.shortest_path_tree)
 
-        # Create the Queues for sending data between processes.
-        sector_queue = Queue()  # type: ignore
-        routes_queue = Queue()  # type: ignore
-        count = 0
-        # write sector names to the queue
-        for sector in self.galaxy.sectors:
-            sector_queue.put(sector)
-
-        # This starts the child processes.
-        # Use a "with ... as ..." to ensure the workers and everything is cleaned up
-        # when the workers are completed.
-        self.logger.info(f"Starting {self.mp_threads} child processes for sector route calculations")
-        with Pool(processes=self.mp_threads, initializer=intrasector_process, initargs=(sector_queue, routes_queue)):
-            # Loop over the routes found by the child processes.
-            while True:
-                try:
-                    # Get a route from the child processes. This assumes the child processes (collectively)
-                    # won't take more than 3 seconds to produce a route. And they will produce routes faster
-                    # than the parent process can consume them. Which is why we have the queue.
-                    # Once we run out of routes to process, break from the loop
-                    route_list = routes_queue.get(block=True, timeout=3)
-                except Empty:
-                    if not sector_queue.empty():
+        try:
+            # Create the Queues for sending data between processes.
+            sector_queue = Queue()  # type: ignore
+            routes_queue = Queue()  # type: ignore
+            count = 0
+            # write sector names to the queue
+            for sector in self.galaxy.sectors:
+                sector_queue.put(sector)
+
+            # This starts the child processes.
+            # Use a "with ... as ..." to ensure the workers and everything is cleaned up
+            # when the workers are completed.
+            self.logger.info(f"Starting {self.mp_threads} child processes for sector route calculations")
+            with Pool(processes=self.mp_threads, initializer=intrasector_process, initargs=(sector_queue, routes_queue)):
+                # Loop over the routes found by the child processes.
+                while True:
+                    try:
+                        # Get a route from the child processes. This assumes the child processes (collectively)
+                        # won't take more than 3 seconds to produce a route. And they will produce routes faster
+                        # than the parent process can consume them. Which is why we have the queue.
+                        # Once we run out of routes to process, break from the loop
+                        route_list = routes_queue.get(block=True, timeout=3)
+                    except Empty:
+                        if not sector_queue.empty():
+                            continue
+                        break
+                    # convert route_list (list of star indexes) to route (list of stars)
+                    route = [self.galaxy.star_mapping[item] for item in route_list]
+
+                    assert is_path(self.galaxy.stars, route_list), f"Route returned by mp process is not a correct path: {route}"
+
+                    distance = self.route_distance(route)
+                    btn = self.get_btn(route[0], route[-1], distance)
+                    count += 1
+                    if self.min_btn > btn:
+                        self.penumbra_routes += 1
                         continue
-                    break
-                # convert route_list (list of star indexes) to route (list of stars)
-                route = [self.galaxy.star_mapping[item] for item in route_list]
-
-                assert is_path(self.galaxy.stars, route_list), f"Route returned by mp process is not a correct path: {route}"
-
-                distance = self.route_distance(route)
-                btn = self.get_btn(route[0], route[-1], distance)
-                count += 1
-                if self.min_btn > btn:
-                    self.penumbra_routes += 1
-                    continue
-
-                # Using the route found by the child process update the stars / routes graphs in the parent process
-                start = route[0]
-                target = route[-1]
-                tradeCr, tradePass, tradeDton = self.route_update_simple(route, True)
-                self.update_statistics(start, target, tradeCr, tradePass, tradeDton)
 
+                    # Using the route found by the child process update the stars / routes graphs in the parent process
+                    start = route[0]
+                    target = route[-1]
+                    tradeCr, tradePass, tradeDton = self.route_update_simple(route, True)
+                    self.update_statistics(start, target, tradeCr, tradePass, tradeDton)
+                    self.shared_state.route_processed()
+        finally:
+            # Release the shared memory even if route processing fell over
+            self.shared_state.close()
+            self.shared_state = None
         self.logger.info(f"Intra-sector route processing completed. Processed {count} routes")
         self.total_processed += count
 
     def process_long_routes(self, btn) -> None:
 
+        global tradeCalculation
+        tradeCalculation = self
+        # The rebuilt forest reads its edge weights from galaxy.stars, so bring them up to date first
+        self.write_route_totals()
         self.shortest_path_tree = ApproximateShortestPathForestUnified(0, self.galaxy.stars,
                                              0, sources=self.shortest_path_tree.sources)
+        # Long routes don't reweight edges, so the weights and distances published here stay current throughout
+        self.shared_state = TradeMPSharedState(self.star_graph, self.shortest_path_tree)
 
-        # Create the Queues for sending data between processes.
-        find_queue: Queue[tuple[int, int]] = Queue()
-        routes_queue: Queue[tuple[int, int]] = Queue()
-        processed = 0
-
-        for (start, target, data) in btn:
-            # skip the routes already that have been processed, in the intra-sector processing
-            if data.get('jumps', False):
-                continue
-            find_queue.put((start.index, target.index))
-
-        total = find_queue.qsize()
-        self.logger.info(f"Starting {self.mp_threads} child processes for long route calculations. processing {total} routes")
-
-        with Pool(processes=self.mp_threads, initializer=long_route_process, initargs=(find_queue, routes_queue)):
-            # Loop over the routes found by the child processes.
-            while True:
-                try:
-                    # Get a route from the child processes. This assumes the child processes (collectively)
-                    # won't take more than 5 seconds to produce a route. And they will produce routes faster
-                    # than the parent process can consume them. Which is why we have the queue.
-                    route_list = routes_queue.get(block=True, timeout=5)
-                except Empty:
-                    if not find_queue.empty():
-                        continue
-                    break
-                route = [self.galaxy.star_mapping[item] for item in route_list]
-                assert is_path(self.galaxy.stars, route_list), f"Route returned by mp process is not a correct path: {route}"
+        try:
+            # Create the Queues for sending data between processes.
+            find_queue: Queue[tuple[int, int]] = Queue()
+            routes_queue: Queue[tuple[int, int]] = Queue()
+            processed = 0
 
-                distance = self.route_distance(route)
-                btn = self.get_btn(route[0], route[-1], distance)
-                processed += 1
-                if self.min_btn > btn:
-                    self.penumbra_routes += 1
+            for (start, target, data) in btn:
+                # skip the routes already that have been processed, in the intra-sector processing
+                if data.get('jumps', False):
                     continue
+                find_queue.put((start.index, target.index))
+
+            total = find_queue.qsize()
+            self.logger.info(f"Starting {self.mp_threads} child processes for long route calculations. processing {total} routes")
+
+            with Pool(processes=self.mp_threads, initializer=long_route_process, initargs=(find_queue, routes_queue)):
+                # Loop over the routes found by the child processes.
+                while True:
+                    try:
+                        # Get a route from the child processes. This assumes the child processes (collectively)
+                        # won't take more than 5 seconds to produce a route. And they will produce routes faster
+                        # than the parent process can consume them. Which is why we have the queue.
+                        route_list = routes_queue.get(block=True, timeout=5)
+                    except Empty:
+                        if not find_queue.empty():
+                            continue
+                        break
+                    route = [self.galaxy.star_mapping[item] for item in route_list]
+                    assert is_path(self.galaxy.stars, route_list), f"Route returned by mp process is not a correct path: {route}"
+
+                    distance = self.route_distance(route)
+                    btn = self.get_btn(route[0], route[-1], distance)
+                    processed += 1
+                    if self.min_btn > btn:
+                        self.penumbra_routes += 1
+                        continue
 
-                if total > 100 and processed % (total // 20) == 0:
-                    self.logger.info(f'processed {processed} routes, at {processed // (total // 100)}%')
-
-                # Using the route found by the child process update the stars / routes graphs in the parent process
-                start = route[0]
-                target = route[-1]
-                tradeCr, tradePass, tradeDton = self.route_update_simple(route, False)
-                self.update_statistics(start, target, tradeCr, tradePass, tradeDton)
-
+                    if total > 100 and processed % (total // 20) == 0:
+                        self.logger.info(f'processed {processed} routes, at {processed // (total // 100)}%')
+
+                    # Using the route found by the child process update the stars / routes graphs in the parent process
+                    start = route[0]
+                    target = route[-1]
+                    tradeCr, tradePass, tradeDton = self.route_update_simple(route, False)
+                    self.update_statistics(start, target, tradeCr, tradePass, tradeDton)
+        finally:
+            # Release the shared memory even if route processing fell over
+            self.shared_state.close()
+            self.shared_state = None
         self.logger.info(f"Long route processing completed. process {processed} routes")
         self.total_processed += processed
         self.logger.info('{} penumbra routes included out of {}'.format(self.penumbra_routes, self.total_processed))
@@ -327,6 +365,7 @@ class TradeMPCalculation(TradeCalculation):
         assert 'actual distance' not in self.galaxy.ranges[target][star],\
             f"This route from {star} to {target} has already been processed in reverse"
 
+        max_distance = self._route_cap(star, target)
         try:
             upbound = self._preheat_upper_bound(star.index, target.index)
             # Increase a finite upbound value by 0.5%, and round result up to 3 decimal places
@@ -338,7 +377,11 @@ class TradeMPCalculation(TradeCalculation):
                     target, star = star, target
 
             rawroute, _ = astar_path_numpy(self.star_graph, star.index, target.index,
-                                           self.galaxy.heuristic_distance_bulk, upbound=upbound)
+                                           self.galaxy.heuristic_distance_bulk, upbound=upbound,
+                                           max_distance=max_distance)
+        except RouteTooLongError:
+            self._give_up_route(star, target)
+            return
         except nx.NetworkXNoPath:
             return
 
@@ -0,0 +1,102 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+"""
+from multiprocessing import shared_memory
+from typing import Literal
+
+import numpy as np
+
+
+class TradeMPSharedState:
+    """
+    Shared-memory copies of the arrays trade-mp worker processes pathfind over - the star graph's edge weights and
+    the approximate-shortest-path forest's landmark distances.
+
+    The parent process stays authoritative.  Only it updates weights and distances, in its own private arrays, and it
+    publishes them here every publish_batch routes.  Workers attach to the published arrays without copying them, and
+    never write to them.
+
+    Each array has two slots, so a publication never writes over the slot workers were most recently pointed at.  Two
+    counters track publications started and finished.  A worker reads the slot for the finished count when it starts a
+    route.  If two or more publications have started by the time it's done, its slot may have been rewritten under
+    it, so the route must be redone.
+    """
+
+    NUM_SLOTS = 2
+
+    def __init__(self, star_graph, shortest_path_tree, publish_batch=25):
+        self._star_graph = star_graph
+        self._tree = shortest_path_tree
+        self.publish_batch = publish_batch
+        self._blocks = []
+        # Publications started, publications finished
+        self._counters = self._allocate(np.zeros(2, dtype=np.int64))
+        self._weights = [self._allocate(star_graph._weights) for _ in range(self.NUM_SLOTS)]
+        self._distances = [self._allocate(shortest_path_tree.distances) for _ in range(self.NUM_SLOTS)]
+        self._pending = 0
+
+    def _allocate(self, source: np.ndarray) -> np.ndarray:
+        block = shared_memory.SharedMemory(create=True, size=max(1, source.nbytes))
+        self._blocks.append(block)
+        order: Literal['C', 'F'] = 'F' if source.flags.f_contiguous and not source.flags.c_contiguous else 'C'
+        result: np.ndarray = np.ndarray(source.shape, dtype=source.dtype, buffer=block.buf, order=order)
+        result[...] = source
+        return result
+
+    @property
+    def generation(self) -> int:
+        return int(self._counters[1])
+
+    def publish(self) -> None:
+        """
+        Copy the parent's current weights and distances into the slot workers aren't pointed at, then point them at it.
+        """
+        slot = (self._counters[1] + 1) % self.NUM_SLOTS
+        self._counters[0] += 1
+        self._weights[slot][...] = self._star_graph._weights
+        self._distances[slot][...] = self._tree.distances
+        self._counters[1] += 1
+        self._pending = 0
+
+    def route_processed(self) -> None:
+        """
+        Note the parent has applied another route's updates, publishing once a full batch has built up.
+        """
+        self._pending += 1
+        if self._pending >= self.publish_batch:
+            self.publish()
+
+    def attach(self, trade) -> int:
+        """
+        Point a worker's star graph and shortest-path forest at the most recent publication, returning its generation.
+        """
+        generation = self.generation
+        slot = generation % self.NUM_SLOTS
+        trade.star_graph._weights = self._weights[slot]
+        trade.shortest_path_tree.set_distances(self._distances[slot])
+        return generation
+
+    def published(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the most recently published weights and distances.
+        """
+        slot = self.generation % self.NUM_SLOTS
+        return self._weights[slot], self._distances[slot]
+
+    def is_stale(self, generation: int) -> bool:
+        """
+        Has the slot published at generation been (or started being) rewritten since?
+        """
+        return self.NUM_SLOTS <= self._counters[0] - generation
+
+    def close(self) -> None:
+        # Drop the array views first, as a shared block can't be closed while anything still points into it
+        self._counters = None
+        self._weights = []
+        self._distances = []
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
@@ -20,3 +20,12 @@ class ReadSectorOptions:
     fix_econ: bool = False
     deep_space: dict = None
     map_type: str = 'classic'
+    parse_cache: str = None
+    parse_workers: int = 1
+    bidirectional_length: int = None
+    optimistic_window: int = None
+    resume_dir: str = None
+    route_cache: str = None
+    component_partition: bool = False
+    paranoid: bool = False
+    landmarks: str = None
@@ -0,0 +1,14 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+import networkx as nx
+
+
+class RouteTooLongError(nx.NetworkXNoPath):
+    """
+    Raised when a route-length-capped search gives up, as every route it could still return is longer than the cap.
+    """
+
+    pass
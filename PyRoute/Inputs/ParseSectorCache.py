@@ -0,0 +1,170 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+
+On-disk cache of fully-parsed sector starlines.  Parsing a starline (Lark grammar, transformer, trade codes, UWP,
+star list, then the importance/WTN/GWP/RU derivations) dominates start-up on big runs, so once a sector file has
+been parsed, the resulting Star objects - before they are attached to the galaxy - are stored, keyed on the file
+contents, the options that alter parsing, and PARSER_VERSION.  A warm start rebuilds the stars from that blob
+without going near the grammar.
+"""
+import hashlib
+import io
+import logging
+import os
+import pickle
+import zlib
+from typing import Optional
+
+from PyRoute.Star import Star
+
+
+def _restore_slot_state(obj, state) -> None:
+    for key, value in state.items():
+        setattr(obj, key, value)
+
+
+class _StarPickler(pickle.Pickler):
+    """
+    Several of the star-support classes (Star, TradeCodes, ...) combine __slots__ with a __getstate__ written for
+    the JSONPickle output, which drops fields and can't be round-tripped by the default pickle machinery.  Instead,
+    dump every populated slot and __dict__ entry, and put them back with setattr.
+    Star.sector is dropped - the cache is per-sector, so it gets re-attached on load.
+    Star._hash is dropped too - string hashing is salted per process (PYTHONHASHSEED), so it, and the star's Hex
+    hash, would be stale in whichever process loads them.  loads() recalculates both.
+    """
+
+    def reducer_override(self, obj):
+        cls = type(obj)
+        if not cls.__module__.startswith('PyRoute.') or not hasattr(cls, '__slots__'):
+            return NotImplemented
+
+        state = {}
+        for klass in cls.__mro__:
+            slots = klass.__dict__.get('__slots__', ())
+            slots = (slots,) if isinstance(slots, str) else slots
+            for item in slots:
+                if item in ('__dict__', '__weakref__') or item in state:
+                    continue
+                if hasattr(obj, item):
+                    state[item] = getattr(obj, item)
+        if hasattr(obj, '__dict__'):
+            state.update(obj.__dict__)
+        state.pop('_hash', None)
+        if isinstance(obj, Star):
+            state.pop('sector', None)
+
+        return object.__new__, (cls,), state, None, None, _restore_slot_state
+
+
+class ParseSectorCache(object):
+    # Bump this whenever parse_line_into_star_core, or anything it calls, changes what ends up on a Star
+    PARSER_VERSION = 2
+    suffix = '.pcache'
+
+    def __init__(self, cache_dir: str, pop_code: str, ru_calc: str, fix_pop: bool = False, fix_econ: bool = False):
+        self.cache_dir = cache_dir
+        self.pop_code = pop_code
+        self.ru_calc = ru_calc
+        self.fix_pop = fix_pop
+        self.fix_econ = fix_econ
+        self.logger = logging.getLogger('PyRoute.ParseSectorCache')
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        # Benford population codes are randomised per parse, so caching them would freeze one roll of the dice
+        return 'benford' != self.pop_code
+
+    def cache_key(self, headers: list[str], starlines: list[str], deep_space: Optional[list[str]] = None) -> str:
+        digest = hashlib.sha256()
+        options = "{}|{}|{}|{}|{}".format(self.PARSER_VERSION, self.pop_code, self.ru_calc, self.fix_pop,
+                                          self.fix_econ)
+        digest.update(options.encode('utf-8'))
+        # Deep space stations are parsed with a different grammar, so the station list for this sector is an input
+        stations = '|'.join(sorted(deep_space)) if deep_space else ''
+        digest.update(b'\x00' + stations.encode('utf-8'))
+        for line in headers:
+            digest.update(b'\x00' + line.encode('utf-8'))
+        digest.update(b'\x01')
+        for line in starlines:
+            digest.update(b'\x00' + line.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + self.suffix)
+
+    def load(self, key: str, sector) -> Optional[list[Star]]:
+        """
+        Return the cached, parsed stars for key (re-attached to sector), or None if there is no usable entry.
+        """
+        payload = self.load_payload(key)
+        if payload is None:
+            return None
+        try:
+            stars = ParseSectorCache.loads(payload, sector)
+        except (EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            self.logger.warning("Parse cache entry %s unreadable, re-parsing", self._path(key))
+            self.hits -= 1
+            self.misses += 1
+            return None
+        return stars
+
+    def load_payload(self, key: str) -> Optional[bytes]:
+        """
+        Return the raw (uncompressed, still pickled) cache entry for key, or None if there isn't one.
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+        try:
+            with open(path, 'rb') as infile:
+                payload = zlib.decompress(infile.read())
+        except (OSError, zlib.error):
+            self.logger.warning("Parse cache entry %s unreadable, re-parsing", path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return payload
+
+    def store(self, key: str, stars: list[Star]) -> None:
+        """
+        Dump stars under key.  Must be called before the stars are added to the galaxy, as that step hangs
+        galaxy-level state (allegiance population codes, indexes) off them.
+        """
+        if not self.enabled:
+            return
+        self.store_payload(key, ParseSectorCache.dumps(stars))
+
+    def store_payload(self, key: str, payload: bytes) -> None:
+        if not self.enabled:
+            return
+        path = self._path(key)
+        tmp_path = path + '.' + str(os.getpid()) + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as outfile:
+                outfile.write(zlib.compress(payload))
+            os.replace(tmp_path, path)
+        except OSError:
+            self.logger.warning("Unable to write parse cache entry %s", path, exc_info=True)
+
+    @staticmethod
+    def dumps(stars: list[Star]) -> bytes:
+        buffer = io.BytesIO()
+        _StarPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(stars)
+        return buffer.getvalue()
+
+    @staticmethod
+    def loads(payload: bytes, sector) -> list[Star]:
+        stars = pickle.loads(payload)
+        for star in stars:
+            star.sector = sector
+            star.hex.calc_hash()
+            star.calc_hash()
+        return stars
@@ -7,16 +7,53 @@ import codecs
 import logging
 import os
 from logging import Logger
-from typing import Union
+from multiprocessing import Pool
+from typing import Optional, Union
 
 from PyRoute.Allies.AllyGen import AllyGen
 from PyRoute.AreaItems.Allegiance import Allegiance
 from PyRoute.AreaItems.Sector import Sector
 from PyRoute.AreaItems.Subsector import Subsector
 from PyRoute.DeltaDebug.DeltaDictionary import SectorDictionary, SubsectorDictionary
+from PyRoute.Inputs.StarlineColumnParser import StarlineColumnParser
 from PyRoute.Star import Star
 
 
+def parse_sector_file_worker(job: tuple) -> tuple[list[str], list[str], Optional[bytes], bool]:
+    """
+    Child-process half of ParseSectorInput.read_sector_files_parallel.  Read and parse a single sector file, handing
+    back its headers, starlines and the parsed stars as a ParseSectorCache payload, plus whether the payload came
+    from the parse cache.  Star indexes, allegiances and the like are left for the parent to assign.
+    """
+    from PyRoute.Inputs.ParseSectorCache import ParseSectorCache
+    from PyRoute.Inputs.ParseStarInput import ParseStarInput
+    filename, pop_code, ru_calc, fix_pop, fix_econ, deep_space, parse_cache = job
+    logger = logging.getLogger('PyRoute.ParseSectorInput')
+    ParseStarInput.deep_space = deep_space
+
+    headers, starlines = ParseSectorInput.read_sector_file(filename, logger)
+    if 5 > len(headers):
+        return headers, starlines, None, False
+    try:
+        sec = Sector(headers[3], headers[4])
+    except ValueError:
+        # Let the parent trip over (and report) the bad sector header in its own time
+        return headers, starlines, None, False
+
+    cache_key = None
+    if parse_cache is not None:
+        cache_key = parse_cache.cache_key(headers, starlines, deep_space.get(sec.name, None))
+        payload = parse_cache.load_payload(cache_key)
+        if payload is not None:
+            return headers, starlines, payload, True
+
+    stars = ParseSectorInput.parse_starlines(starlines, sec, pop_code, ru_calc, fix_pop, fix_econ, headers)
+    payload = ParseSectorCache.dumps(stars)
+    if parse_cache is not None:
+        parse_cache.store_payload(cache_key, payload)
+    return headers, starlines, payload, False
+
+
 class ParseSectorInput:
 
     @staticmethod
@@ -59,6 +96,25 @@ class ParseSectorInput:
 
         return headers, lines
 
+    @staticmethod
+    def read_sector_files_parallel(sectors: list[str], workers: int, pop_code: str, ru_calc: str, fix_pop: bool,
+                                   fix_econ: bool, deep_space: dict, parse_cache=None):
+        """
+        Read and parse sector files over a pool of worker processes, yielding (headers, starlines, payload) for each
+        in the same order as sectors.  As each sector's starlines are independent of every other sector's, all the
+        heavy lifting can happen in the children, leaving the parent to number stars and register allegiances in
+        the original, deterministic, order.
+        """
+        jobs = [(sector, pop_code, ru_calc, fix_pop, fix_econ, deep_space, parse_cache) for sector in sectors]
+        with Pool(processes=workers) as pool:
+            for headers, starlines, payload, cache_hit in pool.imap(parse_sector_file_worker, jobs):
+                if parse_cache is not None and payload is not None:
+                    if cache_hit:
+                        parse_cache.hits += 1
+                    elif parse_cache.enabled:
+                        parse_cache.misses += 1
+                yield headers, starlines, payload
+
     @staticmethod
     def parse_allegiance(headers: list[str], alg_object) -> None:
         allegiances = [line for line in headers if line.startswith('# Alleg:')]
@@ -136,7 +192,7 @@ class ParseSectorInput:
 
     @staticmethod
     def read_parsed_sector_to_sector_object(headers, loaded_sectors, logger, pop_code, ru_calc, sector, star_counter,
-                                            starlines, galaxy, fix_pop, fix_econ):
+                                            starlines, galaxy, fix_pop, fix_econ, parse_cache=None, payload=None):
         logger.debug('reading %s ' % sector)
 
         sec = Sector(headers[3], headers[4])
@@ -153,9 +209,36 @@ class ParseSectorInput:
         # dig out subsector names, and use them to seed the dict entries
         ParseSectorInput.parse_subsectors(headers, sec.name, sec)
 
-        for line in starlines:
-            star = Star.parse_line_into_star(line, sec, pop_code, ru_calc, fix_pop=fix_pop, fix_econ=fix_econ)
-            if star:
-                star_counter = galaxy.add_star_to_galaxy(star, star_counter, sec)
+        stars = None
+        cache_key = None
+        if payload is not None:
+            from PyRoute.Inputs.ParseSectorCache import ParseSectorCache
+            stars = ParseSectorCache.loads(payload, sec)
+        elif parse_cache is not None:
+            from PyRoute.Inputs.ParseStarInput import ParseStarInput
+            deep_space = ParseStarInput.deep_space.get(sec.name, None) if \
+                isinstance(ParseStarInput.deep_space, dict) else None
+            cache_key = parse_cache.cache_key(headers, starlines, deep_space)
+            stars = parse_cache.load(cache_key, sec)
+
+        if stars is None:
+            stars = ParseSectorInput.parse_starlines(starlines, sec, pop_code, ru_calc, fix_pop, fix_econ, headers)
+            if parse_cache is not None:
+                parse_cache.store(cache_key, stars)
+
+        for star in stars:
+            star_counter = galaxy.add_star_to_galaxy(star, star_counter, sec)
 
         return sec, star_counter
+
+    @staticmethod
+    def parse_starlines(starlines: list[str], sec: Sector, pop_code: str, ru_calc: str, fix_pop: bool,
+                        fix_econ: bool, headers: Optional[list[str]] = None) -> list[Star]:
+        column_parser = StarlineColumnParser.from_headers(headers) if headers is not None else None
+        stars = []
+        for line in starlines:
+            star = Star.parse_line_into_star(line, sec, pop_code, ru_calc, fix_pop=fix_pop, fix_econ=fix_econ,
+                                             column_parser=column_parser)
+            if star:
+                stars.append(star)
+        return stars
@@ -57,10 +57,11 @@ class ParseStarInput:
     valid_nobles = 'BCcDEeFfGH-'
 
     @staticmethod
-    def parse_line_into_star_core(star, line, sector, pop_code, ru_calc, fix_pop=False, fix_econ=False):
+    def parse_line_into_star_core(star, line, sector, pop_code, ru_calc, fix_pop=False, fix_econ=False,
+                                  column_parser=None):
         star.sector = sector
         star.logger.debug(line)
-        data, is_station = ParseStarInput._unpack_starline(star, line, sector)
+        data, is_station = ParseStarInput._unpack_starline(star, line, sector, column_parser)
         if data is None:
             return None
 
@@ -194,7 +195,7 @@ class ParseStarInput:
         return star
 
     @staticmethod
-    def _unpack_starline(star, line, sector) -> Union[tuple[list[Optional[str]], bool], tuple[None, None]]:
+    def _unpack_starline(star, line, sector, column_parser=None) -> Union[tuple[list[Optional[str]], bool], tuple[None, None]]:
         is_station = False
         # This was added to stop tests blowing up, and to _ensure_ that deep_space is a dict by time it gets used
         if not isinstance(ParseStarInput.deep_space, dict):
@@ -211,6 +212,12 @@ class ParseStarInput:
                 is_station = True
 
         line = ParseStarInput._unpack_starline_pre_tweak(line)
+        # Cleanly column-aligned lines can skip the full grammar entirely
+        if column_parser is not None and not is_station:
+            sliced = column_parser.parse(line)
+            if sliced is not None:
+                return sliced, is_station
+
         if ParseStarInput.parser is None:
             ParseStarInput.parser = StarlineParser()
         if ParseStarInput.station_parser is None:
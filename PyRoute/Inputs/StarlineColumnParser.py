@@ -0,0 +1,110 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+
+Fast path for column-aligned (TravellerMap SecondSurvey) starlines.  The dashed separator line under the column
+headers gives every field's offsets, so a well-formed line can be sliced apart and each field checked against the
+same patterns the StarlineParser grammar uses, without going anywhere near Lark.  Anything that doesn't validate
+cleanly - overflowing columns, spilled-over remarks, missing extensions and the like - is refused, so the caller can
+fall through to the full grammar, and its repair heuristics, as before.
+"""
+import re
+from typing import Optional
+
+from PyRoute.Inputs.StarlineParser import dashrepl
+
+
+class StarlineColumnParser:
+
+    columns = ['Hex', 'Name', 'UWP', 'Remarks', '{Ix}', '(Ex)', '[Cx]', 'N', 'B', 'Z', 'PBG', 'W', 'A', 'Stellar']
+    optional_columns = ['Routes']
+
+    position_match = re.compile(r'^(?:0[1-9]|[1-2]\d|3[0-2])(?:0[1-9]|40|[1-3]\d)$')
+    uwp_match = re.compile(r'^[A-HXYa-hxy?][0-9A-Fa-f?][\w?]{2}[0-9A-Fa-f?][0-9A-Xa-x?][0-9A-Ka-k?]-[\w?]$')
+    trade_match = re.compile(
+        r'^(?:[A-Z][a-z]|[A-Z][a-z!]{1,3}[W\d]?|\([^\)\{\(\s]+\)[WX\d?]?|Di\([^\)\s]+\)\d?|\[[^\]\{\s]+\][WX\d?]?'
+        r'|[OC]:[X\d?]{0,4}|[OC]:[A-Z][A-Za-z]{3}[-:]?\d{4})$')
+    ix_match = re.compile(r'^\{ *[ +-]?[0-6] ?\}$')
+    ex_match = re.compile(r'^\([0-9A-Za-z]{3}[+-]\d\)$')
+    cx_match = re.compile(r'^\[[0-9A-Za-z]{4}\]$')
+    nobles_match = re.compile(r'^(?:[BcCDeEfFGH]{1,5}|-)$')
+    base_match = re.compile(r'^(?:[A-Z]{1,3}|-|\*)$')
+    zone_match = re.compile(r'^[ARUFGBarufgb-]$')
+    pbg_match = re.compile(r'^[0-9X?][0-9A-FX?][0-9A-FX?]$')
+    worlds_match = re.compile(r'^(?:\d+|-)?$')
+    allegiance_match = re.compile(r'^(?:[A-Z0-9?][A-Za-z0-9?-]{1,3}|--|----)$')
+    double_space = re.compile(r'[\w\-]  [\w\-]')
+
+    def __init__(self, spans: list[tuple[int, int]]):
+        assert len(self.columns) <= len(spans), "Need at least " + str(len(self.columns)) + " column spans"
+        self.spans = spans
+        self.residual_start = spans[len(self.columns) - 1][0]
+        # Every inter-column gap, up to the start of the stellar data, must be blank on a well-formed line
+        self.gaps = [end for (_, end) in spans[:len(self.columns) - 1]]
+
+    @staticmethod
+    def from_headers(headers: list[str]) -> Optional['StarlineColumnParser']:
+        """
+        Build a column parser from a sector file's header lines, or return None if they don't contain a
+        recognisable SecondSurvey column header and dashed separator line.
+        """
+        for i in range(len(headers) - 1):
+            if not headers[i].startswith('Hex '):
+                continue
+            names = headers[i].split()
+            dashes = headers[i + 1].rstrip('\n')
+            spans = [match.span() for match in re.finditer(r'-+', dashes)]
+            if names not in (StarlineColumnParser.columns,
+                             StarlineColumnParser.columns + StarlineColumnParser.optional_columns):
+                return None
+            if len(names) != len(spans):
+                return None
+            return StarlineColumnParser(spans)
+        return None
+
+    def parse(self, line: str) -> Optional[list[Optional[str]]]:
+        """
+        Slice line into the same field list StarlineTransformer produces, or return None if line can't be
+        validated as a clean, column-aligned, starline.
+        """
+        line = line.rstrip('\n')
+        if len(line) <= self.residual_start:
+            return None
+        for gap in self.gaps:
+            if ' ' != line[gap]:
+                return None
+
+        fields = [line[start:end].strip() for (start, end) in self.spans[:len(self.columns) - 1]]
+        position, name, uwp, trade, ix, ex, cx, nobles, base, zone, pbg, worlds, allegiance = fields
+
+        if not self.position_match.match(position) or '' == name or not self.uwp_match.match(uwp):
+            return None
+        if not self.ix_match.match(ix) or not self.ex_match.match(ex) or not self.cx_match.match(cx):
+            return None
+        if not self.nobles_match.match(nobles) or not self.base_match.match(base) or not self.zone_match.match(zone):
+            return None
+        if not self.pbg_match.match(pbg) or not self.worlds_match.match(worlds):
+            return None
+        if not self.allegiance_match.match(allegiance):
+            return None
+
+        trade_codes = trade.split()
+        for code in trade_codes:
+            if not self.trade_match.match(code):
+                return None
+
+        # Mirror the double-space squashing StarlineParser applies to the line as a whole - starting from the
+        # allegiance column keeps any match straddling the slice point out of the residual
+        tail = line[self.spans[len(self.columns) - 2][0]:]
+        tail = self.double_space.sub(dashrepl, tail)
+        residual = tail.lstrip()[len(allegiance):].strip()
+        if '' == residual:
+            return None
+
+        ix = ' '.join(ix.split())
+        extensions = ix + ' ' + ex + ' ' + cx
+        worlds = '0' if '' == worlds else worlds
+
+        return [position, ' '.join(name.split()), uwp, ' '.join(trade_codes), extensions, ix, ex, cx, None, None,
+                None, nobles, base, zone.upper(), pbg, worlds, allegiance, residual]
@@ -12,6 +12,7 @@ from typing import Any
 import numpy as np
 from PyRoute.Star import Star
 from PyRoute.Pathfinding.DistanceGraph import DistanceGraph
+from PyRoute.Pathfinding.LazyLowerBound import LazyLowerBound
 from PyRoute.Pathfinding.single_source_dijkstra import implicit_shortest_path_dijkstra_distance_graph
 try:
     from single_source_dijkstra_core import dijkstra_core
@@ -40,6 +41,8 @@ class ApproximateShortestPathForestUnified:
     _graph_len: cython.int
     _distances: cython.declare(cnp.ndarray(cython.float, ndim=2), 'readonly')
     _max_labels: cnp.ndarray(cython.float, ndim=2)
+    _parents: cnp.ndarray(cython.long, ndim=2)
+    _changed: object
 
     def __init__(self, source, graph, epsilon, sources=None, use_distances: bool = False):
         seeds, source, num_trees = self._get_sources(graph, source, sources)
@@ -53,18 +56,24 @@ class ApproximateShortestPathForestUnified:
         self._num_trees = num_trees
         self._graph_len = len(self._graph)
         self._distances = np.ones((self._graph_len, self._num_trees), dtype=float, order='F') * float('+inf')
-        self._max_labels = np.ones((self._graph_len, self._num_trees), dtype=float) * float('+inf')
+        self._max_labels = np.ones((self._graph_len, self._num_trees), dtype=float, order='F') * float('+inf')
+        # Each tree's shortest-path parent pointers, -1 flagging roots and -100 nodes the tree doesn't reach
+        self._parents = np.ones((self._graph_len, self._num_trees), dtype=np.int64, order='F') * -100
+        # Nodes whose labels have dropped since the last take_changes(), collected only while someone is watching
+        self._changed = None
 
         min_cost = self._graph._min_cost
         # spin up initial distances
         for i in range(self._num_trees):
             raw_seeds = self._seeds[i] if isinstance(self._seeds[i], list) else list(self._seeds[i].values())
             self._distances[raw_seeds, i] = 0
+            self._parents[raw_seeds, i] = -1
             result = implicit_shortest_path_dijkstra_distance_graph(self._graph, self._source,
                                                                                    self._distances[:, i],
                                                                                    seeds=raw_seeds,
                                                                                    min_cost=min_cost,
-                                                                                   divisor=self._divisor)
+                                                                                   divisor=self._divisor,
+                                                                                   parents=self._parents[:, i])
             self._distances[:, i], self._max_labels[:, i], _ = result
 
     def lower_bound(self, source, target) -> float:
@@ -101,6 +110,13 @@ class ApproximateShortestPathForestUnified:
 
         return np.max(np.abs(raw), axis=1)
 
+    def lower_bound_lazy(self, target_node: int) -> LazyLowerBound:
+        """
+        Lower bounds to target_node, as lower_bound_bulk() gives them, but only worked out for the nodes a search
+        actually looks at.
+        """
+        return LazyLowerBound(self._distances, target_node)
+
     def triangle_upbound(self, source: cython.int, target: cython.int) -> float:
         raw: cnp.ndarray[cython.float]
         raw = self._distances[source, :] + self._distances[target, :]
@@ -125,40 +141,40 @@ class ApproximateShortestPathForestUnified:
     @cython.initializedcheck(False)
     @cython.nonecheck(False)
     @cython.wraparound(False)
-    def update_edges(self, edges: list[tuple[cython.int, cython.int]]):  # noqa: ANN201
-        dropnodes = cython.set()
-        dropspecific: list[list[cython.int]] = []
-        tree_dex = list(range(self._num_trees))
+    def update_edges(self, edges: list[tuple[cython.int, cython.int]]) -> dict:
+        seeds: list[list[cython.int]] = []
         i: cython.int
+        j: cython.int
         min_cost: cnp.ndarray[cython.float]
-        shelf: cython.tuple[cnp.ndarray[cython.int], cnp.ndarray[cython.float]]
-        floatinf = float('+inf')
-        arcs: list[tuple[cnp.ndarray[cython.int], cnp.ndarray[cython.float], dict, cnp.ndarray[float]]] = self._graph._arcs
-        weight: cython.float
-        weight_sq: cython.float
+        floatinf: cython.double = float('+inf')
+        indptr: cython.long[:] = self._graph._indptr
+        indices: cython.long[:] = self._graph._indices
+        weights: cython.double[:] = self._graph._weights
+        distances: cython.double[:, :] = self._distances
+        weight: cython.double
         left: cython.int
         right: cython.int
-        leftdist: cnp.ndarray[cython.float]
-        rightdist: cnp.ndarray[cython.float]
-
-        for _ in tree_dex:
-            dropspecific.append([])
+        left_label: cython.double
+        right_label: cython.double
+        lighter: cython.int
+        updated: cython.int = 0
+        diagnostics = {'trees_updated': 0, 'nodes_processed': 0, 'nodes_queued': 0, 'nodes_exceeded': 0,
+                       'nodes_min_exceeded': 0, 'nodes_tailed': 0}
+
+        for _ in range(self._num_trees):
+            seeds.append([])
         for item in edges:
             targdex: cython.int = -1
             left = item[0]
             right = item[1]
-            leftdist = self._distances[left, :]
-            rightdist = self._distances[right, :]
 
-            shelf = arcs[left]
-            for i in range(len(shelf[0])):
-                if shelf[0][i] == right:
+            for i in range(indptr[left], indptr[left + 1]):
+                if indices[i] == right:
                     targdex = i
                     break
             if 0 > targdex:
                 raise ValueError("Selected target index out of range")
-            weight = shelf[1][targdex]
-            weight_sq = weight * weight
+            weight = weights[targdex]
             # Given distance labels, L, on nodes u and v, assuming u's label being smaller,
             # and edge cost between u and v of d(u, v):
             # L(u) + d(u, v) <= L(v)
@@ -170,56 +186,72 @@ class ApproximateShortestPathForestUnified:
             # d(u, v) * (1 + epsilon) <= L(v) - L(u)
 
             # If that bound no longer holds, it's due to the edge (u, v) having its weight decreased during pathfinding.
-            # Tag each incident node as needing updates.
-            dropped: cython.bint = False
-            for j in tree_dex:
-                if floatinf == rightdist[j]:
-                    rightdist[j] = 0
-                delta = leftdist[j] - rightdist[j]
-                if delta * delta >= weight_sq:
-                    dropspecific[j].append(left)
-                    dropspecific[j].append(right)
-                    dropped = True
-
-            if dropped:
-                dropnodes.add(left)
-                dropnodes.add(right)
-
-        # if no nodes are to be dropped, nothing to do - bail out
-        if 0 == len(dropnodes):
-            return
+            # Edge weights only ever drop, so the only labels that can need updating are v's and those of nodes whose
+            # shortest paths now run through v - restart dijkstra from u alone, which then only relaxes v and
+            # whichever of v's descendants (in the post-drop tree) have labels breaking the bound, stopping wherever
+            # labels are back within tolerance.
+            for j in range(self._num_trees):
+                left_label = distances[left, j]
+                right_label = distances[right, j]
+                # Tree j doesn't reach this edge's component, so has nothing to update
+                if not (left_label < floatinf and right_label < floatinf):
+                    continue
+                if left_label + weight < right_label:
+                    lighter = left
+                elif right_label + weight < left_label:
+                    lighter = right
+                else:
+                    continue
+                if lighter not in seeds[j]:
+                    seeds[j].append(lighter)
+                    updated += 1
+
+        # if no labels break the bound, nothing to do - bail out
+        if 0 == updated:
+            return diagnostics
 
         # Now we're updating at least one tree, grab the current min-cost vector to feed into implicit-dijkstra
         min_cost = self._graph._min_cost
 
-        # Now we have the nodes incident to edges that bust the (1+eps) approximation bound, feed them into restarted
-        # dijkstra to update the approx-SP tree/forest.  Some nodes in dropnodes may well be SP descendants of others,
-        # but it wasn't worth the time or complexity cost to filter them out here.
-        for i in tree_dex:
-            if 0 == len(dropspecific[i]):
+        # Labels, max-labels and parents are all updated in place, so each tree's update only touches the nodes whose
+        # labels change, and their neighbours.
+        for i in range(self._num_trees):
+            if 0 == len(seeds[i]):
                 continue
-            self._distances[:, i], _, self._max_labels[:, i], _ = dijkstra_core(
-                                                                  arcs,
-                                                                  self._distances[:, i],
-                                                                  self._divisor,
-                                                                  dropspecific[i],
-                                                                  self._max_labels[:, i],
-                                                                  min_cost)
+            _, _, _, tree_diagnostics = dijkstra_core(self._graph._indptr,
+                                                      self._graph._indices,
+                                                      self._graph._weights,
+                                                      self._distances[:, i],
+                                                      self._divisor,
+                                                      seeds[i],
+                                                      self._max_labels[:, i],
+                                                      min_cost,
+                                                      self._parents[:, i],
+                                                      self._changed)
+            diagnostics['trees_updated'] += 1
+            for key, value in tree_diagnostics.items():
+                diagnostics[key] += value
+
+        return diagnostics
 
     def expand_forest(self, nu_seeds) -> None:
         raw_seeds = nu_seeds if isinstance(nu_seeds, list) else list(nu_seeds.values())
         nu_distances = np.ones((self._graph_len)) * float('+inf')
         nu_distances[raw_seeds] = 0
+        nu_parents = np.ones((self._graph_len), dtype=np.int64) * -100
+        nu_parents[raw_seeds] = -1
         nu_distances, nu_max_labels, _ = implicit_shortest_path_dijkstra_distance_graph(self._graph, self._source,
                                                                 nu_distances,
                                                                 seeds=raw_seeds,
-                                                                divisor=self._divisor)
+                                                                divisor=self._divisor,
+                                                                parents=nu_parents)
         result = np.zeros((self._graph_len, 1), dtype=float)
         result[:, 0] = list(nu_distances)
         maxresult = np.zeros((self._graph_len, 1), dtype=float)
         maxresult[:, 0] = list(nu_max_labels)
-        self._distances = np.append(self._distances, result, 1)
-        self._max_labels = np.append(self._distances, maxresult, 1)
+        self._distances = np.asfortranarray(np.append(self._distances, result, 1))
+        self._max_labels = np.asfortranarray(np.append(self._max_labels, maxresult, 1))
+        self._parents = np.asfortranarray(np.append(self._parents, nu_parents.reshape((self._graph_len, 1)), 1))
         self._num_trees += 1
 
     def _get_sources(self, graph, source, sources):
@@ -258,6 +290,32 @@ class ApproximateShortestPathForestUnified:
     def lighten_edge(self, u, v, weight) -> None:
         self._graph.lighten_edge(u, v, weight)
 
+    def watch_changes(self) -> None:
+        """
+        Start collecting every node whose distance label drops in update_edges from here on.
+        """
+        self._changed = []
+
+    def take_changes(self) -> list:
+        """
+        Return the nodes whose labels have dropped since watching started, or since the last call, and clear them.
+        """
+        assert self._changed is not None, "Not watching for changes"
+        changed = self._changed
+        self._changed = []
+        return changed
+
+    def stop_watching(self) -> None:
+        self._changed = None
+
+    def set_distances(self, distances: cnp.ndarray) -> None:
+        """
+        Swap in a same-shaped distance matrix, such as a shared-memory copy published by a parent process.
+        """
+        if np.shape(distances) != np.shape(self._distances):
+            raise ValueError("Replacement distances must have shape " + str(np.shape(self._distances)))
+        self._distances = distances
+
     @property
     def num_trees(self) -> int:
         return self._num_trees
@@ -266,6 +324,10 @@ class ApproximateShortestPathForestUnified:
     def distances(self) -> cnp.ndarray:
         return self._distances
 
+    @property
+    def parents(self) -> cnp.ndarray:
+        return self._parents
+
     @property
     def graph(self) -> object:
         return self._graph
@@ -9,6 +9,7 @@ from typing import Any
 import numpy as np
 from PyRoute.Star import Star
 from PyRoute.Pathfinding.DistanceGraph import DistanceGraph
+from PyRoute.Pathfinding.LazyLowerBound import LazyLowerBound
 from PyRoute.Pathfinding.single_source_dijkstra import implicit_shortest_path_dijkstra_distance_graph
 
 float64max = np.finfo(np.float64).max
@@ -28,14 +29,20 @@ class ApproximateShortestPathForestUnified:
         self._num_trees = num_trees
         self._graph_len = len(self._graph)
         self._distances = np.ones((self._graph_len, self._num_trees), order='F') * float('+inf')    # pragma: no mutate
-        self._max_labels = np.ones((self._graph_len, self._num_trees)) * float('+inf')  # pragma: no mutate
+        self._max_labels = np.ones((self._graph_len, self._num_trees), order='F') * float('+inf')  # pragma: no mutate
+        # Each tree's shortest-path parent pointers, -1 flagging roots and -100 nodes the tree doesn't reach
+        self._parents = np.ones((self._graph_len, self._num_trees), dtype=np.int64, order='F') * -100  # pragma: no mutate
+        # Nodes whose labels have dropped since the last take_changes(), collected only while someone is watching
+        self._changed = None
 
         min_cost = self._graph.min_cost(self._source, True)  # pragma: no mutate
         # spin up initial distances
         for i in range(self._num_trees):
             raw_seeds = self._seeds[i] if isinstance(self._seeds[i], list) else list(self._seeds[i].values())
             self._distances[raw_seeds, i] = 0
-            self._distances[:, i], self._max_labels[:, i], _ = self._dijkstra(self._distances[:, i], None, min_cost, raw_seeds)
+            self._parents[raw_seeds, i] = -1
+            self._distances[:, i], self._max_labels[:, i], _ = self._dijkstra(self._distances[:, i], None, min_cost, raw_seeds,
+                                                                             self._parents[:, i])
 
     def lower_bound(self, source, target) -> float:
         raw = np.abs(self._distances[source, :] - self._distances[target, :])
@@ -60,6 +67,13 @@ class ApproximateShortestPathForestUnified:
 
         return np.max(np.abs(raw), axis=1)
 
+    def lower_bound_lazy(self, target_node: int) -> LazyLowerBound:
+        """
+        Lower bounds to target_node, as lower_bound_bulk() gives them, but only worked out for the nodes a search
+        actually looks at.
+        """
+        return LazyLowerBound(self._distances, target_node)
+
     def triangle_upbound(self, source: int, target: int) -> float:
         raw = self._distances[source, :] + self._distances[target, :]
         raw = raw[raw != float('+inf')]  # pragma: no mutate
@@ -75,25 +89,24 @@ class ApproximateShortestPathForestUnified:
         result = self._distances[target_node, :] != float('+inf')
         return result, result.all(), result.any()
 
-    def update_edges(self, edges: list[tuple[int, int]]) -> None:
-        dropnodes = False  # pragma: no mutate
-        dropspecific = []
+    def update_edges(self, edges: list[tuple[int, int]]) -> dict:
+        seeds: list[list[int]] = []
         tree_dex = np.array(list(range(self._num_trees)))
         i: int
         min_cost: np.ndarray[float]
         shelf: tuple[np.ndarray[int], np.ndarray[float]]
+        diagnostics = {'trees_updated': 0, 'nodes_processed': 0, 'nodes_queued': 0, 'nodes_exceeded': 0,
+                       'nodes_min_exceeded': 0, 'nodes_tailed': 0}
 
         for _ in range(self._num_trees):
-            dropspecific.append(set())
+            seeds.append([])
         for item in edges:
             targdex: int = None  # deliberately invalid target index to trip an IndexError as fall-back  # pragma: no mutate
             left = item[0]
             right = item[1]
-            leftdist = self._distances[left, :].copy()
-            rightdist = self._distances[right, :].copy()
-            leftdist[np.isinf(leftdist)] = 0  # pragma: no mutate
-            rightdist[np.isinf(rightdist)] = 0  # pragma: no mutate
-            shelf = self._graph._arcs[left]
+            leftdist = self._distances[left, :]
+            rightdist = self._distances[right, :]
+            shelf = self._graph.neighbours(left)
             for i in range(len(shelf[0])):
                 if shelf[0][i] == right:
                     targdex = i
@@ -101,7 +114,6 @@ class ApproximateShortestPathForestUnified:
             if not isinstance(targdex, int):
                 raise ValueError("Selected target index out of range")
             weight = shelf[1][targdex]
-            delta = abs(leftdist - rightdist)
             # Given distance labels, L, on nodes u and v, assuming u's label being smaller,
             # and edge cost between u and v of d(u, v):
             # L(u) + d(u, v) <= L(v)
@@ -113,54 +125,65 @@ class ApproximateShortestPathForestUnified:
             # d(u, v) * (1 + epsilon) <= L(v) - L(u)
 
             # If that bound no longer holds, it's due to the edge (u, v) having its weight decreased during pathfinding.
-            # Tag each incident node as needing updates.
-            if np.max(delta) >= weight:  # pragma: no mutate
-                dropnodes = True
-                overdrive = tree_dex[delta >= weight]  # pragma: no mutate
-                for i in overdrive:
-                    dropspecific[i].add(left)
-                    dropspecific[i].add(right)
-
-        # if no nodes are to be dropped, nothing to do - bail out
-        if not dropnodes:
-            return
-
-        # Now we're updating at least one tree, grab the current min-cost vector to feed into implicit-dijkstra
+            # Edge weights only ever drop, so the only labels that can need updating are v's and those of nodes whose
+            # shortest paths now run through v - restart dijkstra from u alone, which then only relaxes v and
+            # whichever of v's descendants (in the post-drop tree) have labels breaking the bound, stopping wherever
+            # labels are back within tolerance.  Trees that don't reach the edge's component have infinite labels at
+            # both ends, so never trip either comparison.
+            for i in tree_dex[leftdist + weight < rightdist]:
+                if left not in seeds[i]:
+                    seeds[i].append(left)
+            for i in tree_dex[rightdist + weight < leftdist]:
+                if right not in seeds[i]:
+                    seeds[i].append(right)
+
+        # Grab the current min-cost vector to feed into implicit-dijkstra
         min_cost = self._graph._min_cost
 
-        # Now we have the nodes incident to edges that bust the (1+eps) approximation bound, feed them into restarted
-        # dijkstra to update the approx-SP tree/forest.  Some nodes in dropnodes may well be SP descendants of others,
-        # but it wasn't worth the time or complexity cost to filter them out here.
+        # Labels, max-labels and parents are all updated in place, so each tree's update only touches the nodes whose
+        # labels change, and their neighbours.  Trees with no labels breaking the bound are left alone.
         for i in range(self._num_trees):
-            if 0 == len(dropspecific[i]):  # pragma: no mutate
+            if 0 == len(seeds[i]):  # pragma: no mutate
                 continue
-            self._distances[:, i], self._max_labels[:, i], _ = self._dijkstra(self._distances[:, i], self._max_labels[:, i], min_cost, dropspecific[i])
+            _, _, tree_diagnostics = self._dijkstra(self._distances[:, i], self._max_labels[:, i], min_cost, seeds[i],
+                                                    self._parents[:, i], self._changed)
+            diagnostics['trees_updated'] += 1
+            for key, value in tree_diagnostics.items():
+                diagnostics[key] += value
+
+        return diagnostics
 
     def expand_forest(self, nu_seeds) -> None:
         raw_seeds = nu_seeds if isinstance(nu_seeds, list) else list(nu_seeds.values())
         nu_distances = np.ones((self._graph_len)) * float('+inf')  # pragma: no mutate
         nu_distances[raw_seeds] = 0
-        nu_distances, nu_max_labels, _ = self._dijkstra(nu_distances, None, None, raw_seeds)
+        nu_parents = np.ones((self._graph_len), dtype=np.int64) * -100  # pragma: no mutate
+        nu_parents[raw_seeds] = -1
+        nu_distances, nu_max_labels, _ = self._dijkstra(nu_distances, None, None, raw_seeds, nu_parents)
         result = np.zeros((self._graph_len, 1))
         result[:, 0] = list(nu_distances)
         maxresult = np.zeros((self._graph_len, 1))
         maxresult[:, 0] = list(nu_max_labels)
-        self._distances = np.append(self._distances, result, 1)
-        self._max_labels = np.append(self._max_labels, maxresult, 1)
+        self._distances = np.asfortranarray(np.append(self._distances, result, 1))
+        self._max_labels = np.asfortranarray(np.append(self._max_labels, maxresult, 1))
+        self._parents = np.asfortranarray(np.append(self._parents, nu_parents.reshape((self._graph_len, 1)), 1))
         self._num_trees += 1
 
-    def _dijkstra(self, distances, max_labels, min_cost, seeds):
+    def _dijkstra(self, distances, max_labels, min_cost, seeds, parents=None, changed=None):
         assert isinstance(distances, np.ndarray)
         assert isinstance(max_labels, (np.ndarray, type(None)))
         assert isinstance(min_cost, (np.ndarray, type(None)))
         assert isinstance(seeds, (list, set))
+        assert isinstance(parents, (np.ndarray, type(None)))
         result = implicit_shortest_path_dijkstra_distance_graph(
             self._graph, self._source,
             distance_labels=distances,
             seeds=seeds,
             divisor=self._divisor,
             # min_cost=min_cost,  # pragma: no mutate
-            max_labels=max_labels)  # pragma: no mutate
+            max_labels=max_labels,  # pragma: no mutate
+            parents=parents,
+            changed=changed)
         return result
 
     def _get_sources(self, graph, source, sources):
@@ -203,6 +226,32 @@ class ApproximateShortestPathForestUnified:
     def lighten_edge(self, u, v, weight) -> None:
         self._graph.lighten_edge(u, v, weight)
 
+    def watch_changes(self) -> None:
+        """
+        Start collecting every node whose distance label drops in update_edges from here on.
+        """
+        self._changed = []
+
+    def take_changes(self) -> list:
+        """
+        Return the nodes whose labels have dropped since watching started, or since the last call, and clear them.
+        """
+        assert self._changed is not None, "Not watching for changes"
+        changed = self._changed
+        self._changed = []
+        return changed
+
+    def stop_watching(self) -> None:
+        self._changed = None
+
+    def set_distances(self, distances: np.ndarray) -> None:
+        """
+        Swap in a same-shaped distance matrix, such as a shared-memory copy published by a parent process.
+        """
+        if np.shape(distances) != np.shape(self._distances):
+            raise ValueError("Replacement distances must have shape " + str(np.shape(self._distances)))
+        self._distances = distances
+
     @property
     def num_trees(self) -> int:
         return self._num_trees
@@ -211,6 +260,10 @@ class ApproximateShortestPathForestUnified:
     def distances(self) -> np.ndarray:
         return self._distances
 
+    @property
+    def parents(self) -> np.ndarray:
+        return self._parents
+
     @property
     def graph(self) -> DistanceGraph:
         return self._graph
@@ -3,11 +3,17 @@ Created on Feb 25, 2024
 
 @author: CyberiaResurrection
 """
+from typing import Optional
+
 import numpy as np
 from networkx.classes import Graph
 
 
 class DistanceBase:
+    """
+    Adjacency is held in compressed sparse row form - node u's neighbours live in _indices[start:end], with the
+    matching edge weights in _weights[start:end].  Subclasses define where each node's row starts and ends.
+    """
 
     def __init__(self, graph: Graph):
         raw_nodes = graph.nodes()
@@ -20,6 +26,8 @@ class DistanceBase:
         self._positions = np.zeros((num_nodes, 2), dtype=int)
         for i in range(num_nodes):
             self._positions[i, :] = np.array(positions[i])
+        # Tails of arcs lightened since the last take_changes(), collected only while someone is watching
+        self._changed: Optional[list[int]] = None
 
     def __len__(self) -> int:
         return len(self._nodes)
@@ -27,6 +35,16 @@ class DistanceBase:
     def lighten_edge(self, u: int, v: int, weight: float) -> None:
         raise NotImplementedError("Base Class")
 
+    def _span(self, u: int) -> tuple[int, int]:
+        raise NotImplementedError("Base Class")
+
+    def neighbours(self, u: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return views of u's neighbour indexes and the matching edge weights.
+        """
+        start, end = self._span(u)
+        return self._indices[start:end], self._weights[start:end]
+
     def distances_from_target(self, active_nodes, target: int) -> int:
         if len(active_nodes) == len(self):
             dq = self._positions[:, 0] - self._positions[target, 0]
@@ -37,5 +55,26 @@ class DistanceBase:
 
         return (abs(dq) + abs(dr) + abs(dq + dr)) // 2
 
+    def watch_changes(self) -> None:
+        """
+        Start collecting the tail of every arc lightened from here on.
+        """
+        self._changed = []
+
+    def take_changes(self) -> list[int]:
+        """
+        Return the tails of the arcs lightened since watching started, or since the last call, and clear them.
+        """
+        assert self._changed is not None, "Not watching for changes"
+        changed = self._changed
+        self._changed = []
+        return changed
+
+    def stop_watching(self) -> None:
+        self._changed = None
+
     def _lighten_arc(self, u: int, v: int, weight: float) -> None:
-        self._arcs[u][1][self._arcs[u][0] == v] = weight
+        start, end = self._span(u)
+        self._weights[start:end][self._indices[start:end] == v] = weight
+        if self._changed is not None:
+            self._changed.append(u)
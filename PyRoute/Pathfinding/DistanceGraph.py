@@ -15,32 +15,33 @@ from PyRoute.Pathfinding.DistanceBase import DistanceBase
 
 class DistanceGraph(DistanceBase):
 
-    __slots__ = '_arcs', '_positions', '_nodes', '_indexes', '_min_cost', '_min_indirect'
+    __slots__ = '_indptr', '_indices', '_weights', '_positions', '_nodes', '_indexes', '_min_cost', '_min_indirect'
 
     def __init__(self, graph: Graph, use_distances: bool = False):
         super().__init__(graph)
         inline = 'distance' if use_distances else 'weight'
-        outline = 'weight' if use_distances else 'distance'
-
-        self._arcs = [
-            (
-                np.array(graph.adj[u], dtype=int),
-                np.array([data[inline] for data in list(graph.adj[u].values())], dtype=float),
-                {v: k for (k, v) in enumerate(list(graph.adj[u].keys()))},
-                np.array([data[outline] for data in list(graph.adj[u].values())], dtype=float)
-            )
-            for u in self._nodes
-        ]
-        self._min_cost = np.zeros(len(self._nodes))
-        self._min_indirect = np.zeros(len(self._nodes))
-        for i in range(0, len(self._nodes)):
-            node_edges = self._arcs[i][1]
-            if 0 < len(node_edges):
-                self._min_cost[i] = min(node_edges)
-        for i in range(0, len(self._nodes)):
-            node_neighbours = self._arcs[i][0]
-            if 0 < len(node_neighbours):
-                self._min_indirect[i] = min(self._min_cost[node_neighbours])
+        num_nodes = len(self._nodes)
+
+        # Node u's neighbours are _indices[_indptr[u]:_indptr[u + 1]], with matching weights in the same slice of
+        # _weights.  Both are single contiguous arrays, rather than a pair of small arrays per node.
+        degrees = np.array([len(graph.adj[u]) for u in self._nodes], dtype=np.int64)
+        self._indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(degrees, out=self._indptr[1:])
+        num_arcs = int(self._indptr[-1])
+        self._indices = np.fromiter((v for u in self._nodes for v in graph.adj[u]), dtype=np.int64, count=num_arcs)
+        self._weights = np.fromiter((data[inline] for u in self._nodes for data in graph.adj[u].values()),
+                                    dtype=np.float64, count=num_arcs)
+
+        self._min_cost = np.zeros(num_nodes)
+        self._min_indirect = np.zeros(num_nodes)
+        starts = self._indptr[:-1][0 < degrees]
+        if 0 < len(starts):
+            # Empty rows have been dropped from starts, so each reduction runs exactly over one node's row
+            self._min_cost[0 < degrees] = np.minimum.reduceat(self._weights, starts)
+            self._min_indirect[0 < degrees] = np.minimum.reduceat(self._min_cost[self._indices], starts)
+
+    def _span(self, u: int) -> tuple[int, int]:
+        return self._indptr[u], self._indptr[u + 1]
 
     def min_cost(self, target: int, indirect: bool = False) -> np.ndarray:
         if not isinstance(target, int):
@@ -52,7 +53,7 @@ class DistanceGraph(DistanceBase):
             return min_cost
 
         min_indirect = copy.deepcopy(self._min_indirect)
-        neighbours = self._arcs[target][0]  # Skip neighbours of target and target itself in the indirect leg
+        neighbours = self.neighbours(target)[0]  # Skip neighbours of target and target itself in the indirect leg
         min_indirect[target] = 0
         min_indirect[neighbours] = 0
 
@@ -61,7 +62,8 @@ class DistanceGraph(DistanceBase):
         return min_cost
 
     def lighten_edge(self, u: int, v: int, weight: float) -> None:
-        if v not in self._arcs[u][2]:
+        u_neighbours = self.neighbours(u)[0]
+        if not (u_neighbours == v).any():
             assert False
         self._lighten_arc(u, v, weight)
         self._lighten_arc(v, u, weight)
@@ -70,5 +72,6 @@ class DistanceGraph(DistanceBase):
         if weight < self._min_cost[v]:
             self._min_cost[v] = weight
 
-        self._min_indirect[self._arcs[u][0]] = np.fmin(self._min_indirect[self._arcs[u][0]], weight)
-        self._min_indirect[self._arcs[v][0]] = np.fmin(self._min_indirect[self._arcs[v][0]], weight)
+        self._min_indirect[u_neighbours] = np.fmin(self._min_indirect[u_neighbours], weight)
+        v_neighbours = self.neighbours(v)[0]
+        self._min_indirect[v_neighbours] = np.fmin(self._min_indirect[v_neighbours], weight)
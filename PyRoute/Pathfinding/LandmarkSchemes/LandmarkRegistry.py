@@ -0,0 +1,105 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+
+Registry of landmark selection schemes, so route calculations can pick one by name, eg from route.py's --landmarks
+option, rather than hard-coding the triaxial-extremes scheme.  A scheme is selected with a spec of the form
+SCHEME[:k]:
+    SCHEME is a registered scheme name
+    k, if given, caps the number of landmark slots the scheme fills per component
+
+Every scheme's landmarks come back in the same form as LandmarksTriaxialExtremes gives them - the list of
+per-slot {component_id: star index} dicts, and the set of landmark star indexes in each component.
+"""
+from collections import defaultdict
+from typing import Any, Callable, Optional
+
+from PyRoute.Pathfinding.LandmarkSchemes.LandmarksQExtremes import LandmarksQExtremes
+from PyRoute.Pathfinding.LandmarkSchemes.LandmarksRExtremes import LandmarksRExtremes
+from PyRoute.Pathfinding.LandmarkSchemes.LandmarksSExtremes import LandmarksSExtremes
+from PyRoute.Pathfinding.LandmarkSchemes.LandmarksTriaxialExtremes import LandmarksTriaxialExtremes
+from PyRoute.Pathfinding.LandmarkSchemes.LandmarksWTNExtremes import LandmarksWTNExtremes
+
+LandmarkResult = tuple[list[dict], defaultdict[Any, set]]
+
+
+class LandmarkRegistry(object):
+
+    default = 'triaxial'
+    # Scheme name to function taking (galaxy, k, btn) and returning that scheme's landmarks
+    schemes: dict[str, Callable[[Any, Optional[int], Any], LandmarkResult]] = {}
+
+    @classmethod
+    def register(cls, name: str, scheme: Callable[[Any, Optional[int], Any], LandmarkResult]) -> None:
+        if ':' in name:
+            raise ValueError("Landmark scheme name " + name + " cannot contain ':'")
+        cls.schemes[name] = scheme
+
+    @classmethod
+    def names(cls) -> list[str]:
+        return sorted(cls.schemes.keys())
+
+    @classmethod
+    def parse(cls, spec: str) -> tuple[str, Optional[int]]:
+        """
+        Split a SCHEME[:k] spec into scheme name and slot cap, raising ValueError if it's malformed or names an
+        unregistered scheme.
+        """
+        name, _, raw_k = spec.partition(':')
+        if name not in cls.schemes:
+            raise ValueError("Landmark scheme must be one of " + str(cls.names()) + ", not " + name)
+        if '' == raw_k:
+            return name, None
+        try:
+            k = int(raw_k)
+        except ValueError:
+            raise ValueError("Landmark count in " + spec + " must be an integer") from None
+        if 1 > k:
+            raise ValueError("Landmark count in " + spec + " must be at least 1")
+        return name, k
+
+    @classmethod
+    def check_spec(cls, spec: str) -> str:
+        """
+        Validate a SCHEME[:k] spec, handing it back unchanged - for use as an argparse type.
+        """
+        cls.parse(spec)
+        return spec
+
+    @classmethod
+    def get_landmarks(cls, galaxy, spec: Optional[str] = None, btn=None) -> LandmarkResult:
+        name, k = cls.parse(cls.default if spec is None else spec)
+        return cls.schemes[name](galaxy, k, btn)
+
+    @staticmethod
+    def _component_landmarks(result: list[dict]) -> LandmarkResult:
+        component_landmarks: defaultdict[Any, set] = defaultdict(set)
+        for slot in result:
+            for component_id, index in slot.items():
+                component_landmarks[component_id].add(index)
+        return result, component_landmarks
+
+    @staticmethod
+    def _triaxial(galaxy, k: Optional[int], btn) -> LandmarkResult:
+        scheme = LandmarksTriaxialExtremes(galaxy)
+        if k is not None:
+            scheme.max_slots = k
+        return scheme.get_landmarks(btn=btn)
+
+    @staticmethod
+    def _simple(scheme_class: type) -> Callable[[Any, Optional[int], Any], LandmarkResult]:
+        """
+        Adapt one of the single-axis extremes schemes, which ignore btn and hand back only the per-slot dicts.
+        """
+        def get_landmarks(galaxy, k: Optional[int], btn) -> LandmarkResult:
+            result = scheme_class(galaxy).get_landmarks()
+            return LandmarkRegistry._component_landmarks(result if k is None else result[:k])
+        return get_landmarks
+
+
+LandmarkRegistry.register('triaxial', LandmarkRegistry._triaxial)
+LandmarkRegistry.register('q', LandmarkRegistry._simple(LandmarksQExtremes))
+LandmarkRegistry.register('r', LandmarkRegistry._simple(LandmarksRExtremes))
+LandmarkRegistry.register('s', LandmarkRegistry._simple(LandmarksSExtremes))
+LandmarkRegistry.register('wtn', LandmarkRegistry._simple(LandmarksWTNExtremes))
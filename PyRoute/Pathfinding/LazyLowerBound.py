@@ -0,0 +1,83 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+
+Landmark lower bounds to a single target, worked out for each node only when a search first asks for it.
+
+lower_bound_bulk() works out the bound for every node in the graph up front - an n x k temporary of landmark distance
+differences, then an abs/max reduction over it - even though A* only ever looks at the nodes on its frontier.  This
+holds a reference to the forest's landmark distances, the target's own distances and which landmarks are usable, and
+fills in node bounds as they're looked up, a single node or a batch of neighbours at a time.  Each bound is the same
+max |d(node, L) - d(target, L)| over the usable landmarks L that lower_bound_bulk() gives.
+
+Only valid for the duration of a search - once the forest's distances are updated, take a fresh one.
+"""
+from typing import Union
+
+import numpy as np
+
+
+class LazyLowerBound(object):
+
+    def __init__(self, distances: np.ndarray, target_node: int):
+        self.distances = distances
+        self.target_node = target_node
+        target_row = distances[target_node, :]
+        # Landmarks that can't reach the target say nothing about distance to it
+        self.active = np.flatnonzero(target_row != float('+inf'))
+        self.target = np.ascontiguousarray(target_row[self.active], dtype=float)
+        num_nodes = distances.shape[0]
+        # np.empty and np.zeros don't touch the memory they hand back, so only pages holding looked-up nodes get used
+        self.values = np.empty(num_nodes, dtype=float)
+        self.known = np.zeros(num_nodes, dtype=np.uint8)
+
+    @classmethod
+    def settled(cls, potentials: np.ndarray) -> 'LazyLowerBound':
+        """
+        Wrap bounds already worked out for every node, eg by a bulk heuristic, so there's nothing left to fill in.
+        """
+        bound = cls.__new__(cls)
+        bound.distances = np.zeros((0, 0), dtype=float)
+        bound.target_node = -1
+        bound.active = np.zeros(0, dtype=np.intp)
+        bound.target = np.zeros(0, dtype=float)
+        bound.values = np.asarray(potentials, dtype=float)
+        bound.known = np.ones(len(bound.values), dtype=np.uint8)
+        return bound
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, nodes: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Bound for a single node, or array of bounds for an array of nodes.
+        """
+        if np.isscalar(nodes):
+            if not self.known[nodes]:
+                self._fill(np.array([nodes]))
+            return self.values[nodes]
+        nodes = np.asarray(nodes)
+        self._fill(nodes[0 == self.known[nodes]])
+        return self.values[nodes]
+
+    def bulk(self) -> np.ndarray:
+        """
+        Bounds for every node, as lower_bound_bulk() would give them.
+        """
+        self._fill(np.flatnonzero(0 == self.known))
+        return self.values.copy()
+
+    @property
+    def num_known(self) -> int:
+        return int(np.count_nonzero(self.known))
+
+    def _fill(self, nodes: np.ndarray) -> None:
+        if 0 == len(nodes):
+            return
+        if 0 == len(self.active):
+            self.values[nodes] = 0.0
+        else:
+            raw = self.distances[np.ix_(nodes, self.active)] - self.target
+            self.values[nodes] = np.max(np.abs(raw), axis=1)
+        self.known[nodes] = 1
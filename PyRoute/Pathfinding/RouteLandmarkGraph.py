@@ -10,17 +10,34 @@ from PyRoute.Pathfinding.DistanceBase import DistanceBase
 
 
 class RouteLandmarkGraph(DistanceBase):
+    """
+    Historic-route edges turn up one at a time, so unlike DistanceGraph, rows can't be packed back to back up front.
+    Instead, each node's row sits in a slab with some slack on the end.  When a node's slab fills up, its row moves
+    to a fresh slab of double the size at the tail of the arrays, which themselves grow geometrically, so adding
+    edges stays amortised constant time and abandoned slabs never exceed the live ones.
+    """
+
+    # Capacity of a node's first slab
+    SLACK = 4
 
     def __init__(self, graph):
         super().__init__(graph)
-        self._arcs = [
-            (np.array([], dtype=int), np.array([], dtype=float), dict())
-            for u in self._nodes
-        ]
+        num_nodes = len(self._nodes)
+        # Node u's neighbours are _indices[_starts[u]:_starts[u] + _degrees[u]], with room for _capacity[u] in all
+        self._starts = np.zeros(num_nodes, dtype=np.int64)
+        self._degrees = np.zeros(num_nodes, dtype=np.int64)
+        self._capacity = np.zeros(num_nodes, dtype=np.int64)
+        self._indices = np.zeros(max(num_nodes, self.SLACK), dtype=np.int64)
+        self._weights = np.zeros(max(num_nodes, self.SLACK), dtype=np.float64)
+        self._used = 0
 
     def __getitem__(self, item):
         self._check_index(item)
-        return self._arcs[item]
+        nodes, weights = self.neighbours(item)
+        return nodes, weights, {v: k for (k, v) in enumerate(nodes.tolist())}
+
+    def _span(self, u: int) -> tuple[int, int]:
+        return self._starts[u], self._starts[u] + self._degrees[u]
 
     def add_edge(self, u, v, weight) -> None:
         self._check_index(u)
@@ -29,15 +46,30 @@ class RouteLandmarkGraph(DistanceBase):
         self._extend_arc(v, u, weight)
 
     def _extend_arc(self, u, v, weight):
-        arcs = self._arcs[u]
-        u_dict = arcs[2]
-        if v not in u_dict:
-            u_dict[v] = len(u_dict)
-            u_first = np.append(arcs[0], [v], 0)
-            u_last = np.append(arcs[1], [weight], 0)
-            self._arcs[u] = (u_first, u_last, u_dict)
-        else:
+        if (self.neighbours(u)[0] == v).any():
             self._lighten_arc(u, v, weight)
+            return
+        if self._degrees[u] == self._capacity[u]:
+            self._relocate(u)
+        slot = self._starts[u] + self._degrees[u]
+        self._indices[slot] = v
+        self._weights[slot] = weight
+        self._degrees[u] += 1
+
+    def _relocate(self, u):
+        capacity = max(self.SLACK, 2 * self._capacity[u])
+        needed = self._used + capacity
+        if needed > len(self._indices):
+            size = max(needed, 2 * len(self._indices))
+            self._indices = np.concatenate((self._indices, np.zeros(size - len(self._indices), dtype=np.int64)))
+            self._weights = np.concatenate((self._weights, np.zeros(size - len(self._weights), dtype=np.float64)))
+        start, end = self._span(u)
+        degree = end - start
+        self._indices[self._used:self._used + degree] = self._indices[start:end]
+        self._weights[self._used:self._used + degree] = self._weights[start:end]
+        self._starts[u] = self._used
+        self._capacity[u] = capacity
+        self._used = needed
 
     @functools.cache
     def _check_index(self, item):
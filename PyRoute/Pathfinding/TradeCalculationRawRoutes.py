@@ -4,8 +4,11 @@ Created on Jul 22, 2026
 
 @author: CyberiaResurrection
 """
+import itertools
+
 import cython
 from cython.cimports.numpy import numpy as cnp
+from cython.parallel import prange
 import time
 import numpy as np
 
@@ -15,6 +18,8 @@ except ImportError:
     def profile(func) -> object:
         return func
 
+from typing import Iterator
+
 from PyRoute import Star
 from PyRoute.Calculation.RouteCalculation import RouteCalculation
 from PyRoute.TradeCodes import TradeCodes
@@ -35,9 +40,28 @@ class TradeCalculationRawRoutes(object):
     btn_offset_by_dist_view: cython.int[:]
     max_range: cython.int
     min_wtn: cython.int
-    pairs_primed: cython.long
-    pairs_considered: cython.long
-    pairs_kept: cython.long
+    pairs_primed = cython.declare(cython.long, visibility='readonly')
+    pairs_considered = cython.declare(cython.long, visibility='readonly')
+    pairs_kept = cython.declare(cython.long, visibility='readonly')
+    # Smallest hex-grid cell, in parsecs, so short-reach stars don't get spread over a multitude of tiny cells
+    min_cell_size: cython.int
+    # Per-star tables and hex-grid cells read by the hi-hi scan, which runs without the GIL
+    max_dist_view: cython.int[:, :]
+    wtn_view: cython.int[:]
+    q_view: cython.int[:]
+    r_view: cython.int[:]
+    reach_view: cython.int[:]
+    alg_view: cython.int[:]
+    allies_view: cython.int[:, :]
+    ag_boost_view: cython.uchar[:]
+    ag_view: cython.uchar[:]
+    in_boost_view: cython.uchar[:]
+    in_view: cython.uchar[:]
+    cell_view: cython.int[:]
+    cell_start_view: cython.int[:]
+    bucket_view: cython.int[:]
+    cell_q_count: cython.int
+    cell_r_count: cython.int
 
     def __init__(self, trade):
         from PyRoute.Calculation.TradeCalculation import TradeCalculation
@@ -57,6 +81,7 @@ class TradeCalculationRawRoutes(object):
         self.pairs_primed = 0
         self.pairs_considered = 0
         self.pairs_kept = 0
+        self.min_cell_size = 32
         self._seed_btn_offset_by_dist()
 
     @profile
@@ -64,7 +89,7 @@ class TradeCalculationRawRoutes(object):
     @cython.initializedcheck(False)
     @cython.wraparound(False)
     @cython.nonecheck(False)
-    def raw_ranges(self) -> list[tuple[Star, Star]]:
+    def raw_ranges(self) -> Iterator[tuple[Star, Star]]:
         for s in self.trade.galaxy.ranges:
             self.algs.add(s.alg_code)
 
@@ -84,22 +109,32 @@ class TradeCalculationRawRoutes(object):
         loball = [item for item in self.trade.galaxy.ranges if item.wtn < min_wtn and not item.is_redzone]
         t2 = time.perf_counter()
 
-        hi_hi_ranges = self._base_ranges(hiball, max_range, min_btn)
+        first, second = self._base_ranges(hiball, max_range, min_btn)
         t3 = time.perf_counter()
         t4 = time.perf_counter()
         lo_lo_ranges = self._lo_lo_ranges(loball, offsets)
         t5 = time.perf_counter()
         hi_lo_ranges = self._hi_lo_ranges(hiball, loball, offsets)
         t6 = time.perf_counter()
-        hi_hi_ranges.extend(lo_lo_ranges)
-        hi_hi_ranges.extend(hi_lo_ranges)
         self.trade.logger.info("Routes with endpoints more than " + str(max_route_dist) + " pc apart, trimmed")
         self.trade.logger.info(
             f"raw_ranges phases: init {t1 - t0:.6f}s, split {t2 - t1:.6f}s, ranges {t3 - t2:.6f}s, hi-hi filters {t4 - t3:.6f}s, lo-lo filters {t5 - t4:.6f}s, hi-lo filters {t6 - t5:.6f}s"
         )
         self.trade.logger.info("Pairs spun up: " + str(self.pairs_primed) + ", pairs considered: " + str(self.pairs_considered) + ", pairs kept: " + str(self.pairs_kept))
 
-        return hi_hi_ranges
+        # Only build hi-hi Star pairs as they're asked for, rather than tens of millions at once
+        hi_hi_ranges = TradeCalculationRawRoutes._star_pairs(hiball, first, second)
+        return itertools.chain(hi_hi_ranges, lo_lo_ranges, hi_lo_ranges)
+
+    @staticmethod
+    def _star_pairs(stars: list, first, second, chunk_size: int = 65536) -> Iterator[tuple[Star, Star]]:
+        """
+        Turn arrays of star-index pairs into star pairs, a chunk at a time.
+        """
+        for start in range(0, len(first), chunk_size):
+            chunk = zip(first[start:start + chunk_size].tolist(), second[start:start + chunk_size].tolist())
+            for (i, j) in chunk:
+                yield stars[i], stars[j]
 
     @cython.cfunc
     def _seed_btn_offset_by_dist(self):
@@ -109,27 +144,30 @@ class TradeCalculationRawRoutes(object):
         self.btn_offset_by_dist_view = self.btn_offset_by_dist
 
     @cython.cfunc
+    @cython.nogil
+    @cython.exceptval(check=False)
+    @cython.profile(False)
     @cython.returns(cython.int)
-    def _get_btn_upper_bound(self, star1: Star, star2: Star, max_range: cython.int, min_btn: cython.int, distance: cython.int):
+    def _get_btn_upper_bound(self, wtn1: cython.int, wtn2: cython.int, allies: cython.int, max_range: cython.int,
+                             min_btn: cython.int, distance: cython.int):
         """
-        Return an _upper bound_ on the BTN between star1 and star2.  If the upper bound on BTN
-        doesn't meet/beat the minimum BTN, then the _actual_ BTN, which also doesn't meet/beat
-        the minimum, doesn't need to be calculated.  If star1 and star2 are less than the supplied
+        Return an _upper bound_ on the BTN between two stars of the given WTNs and allegiance modifier.  If the upper
+        bound on BTN doesn't meet/beat the minimum BTN, then the _actual_ BTN, which also doesn't meet/beat
+        the minimum, doesn't need to be calculated.  If the stars are less than the supplied
         max_range apart in pc, set the returned BTN upper bound to greater of upper-bounded BTN and
         supplied min_btn.
         """
         # Default assumes BTN is boosted by both agricultural and industrial matches
-        wtn1: cython.int = star1.wtn
-        wtn2: cython.int = star2.wtn
-
-        # btn: cython.int = wtn1 + wtn2 + 2 + RouteCalculation.get_btn_allies(star1.alg_code, star2.alg_code)
-        btn: cython.int = wtn1 + wtn2 + 2 + self._get_btn_allies(star1.alg_code, star2.alg_code)
+        btn: cython.int = wtn1 + wtn2 + 2 + allies
 
         btn += self.btn_offset_by_dist_view[distance]
         btn = min(btn, self._get_max_btn(wtn1, wtn2))
         return min_btn if min_btn > btn and distance <= max_range else btn
 
     @cython.cfunc
+    @cython.nogil
+    @cython.exceptval(check=False)
+    @cython.profile(False)
     @cython.returns(cython.int)
     def _get_rough_btn_upper_bound(self, wtn1: cython.int, wtn2: cython.int, max_range: cython.int, min_btn: cython.int, distance: cython.int):
         btn: cython.int = wtn1 + wtn2 + 2
@@ -140,6 +178,10 @@ class TradeCalculationRawRoutes(object):
     @staticmethod
     @cython.cfunc
     @cython.inline
+    @cython.nogil
+    @cython.exceptval(check=False)
+    @cython.profile(False)
+    @cython.profile(False)
     @cython.returns(cython.int)
     def _distance(del_q: cython.int, del_r: cython.int):
         aq: cython.int = del_q if del_q >= 0 else -del_q
@@ -155,25 +197,17 @@ class TradeCalculationRawRoutes(object):
     @cython.initializedcheck(False)
     @cython.nonecheck(False)
     @cython.wraparound(False)
-    @cython.returns(cython.list[cython.tuple[Star, Star]])
     def _base_ranges(self, hiball: cython.list[Star], max_range: cython.int, min_btn: cython.int):
+        """
+        Find the hi-hi pairs that could meet min_btn, returning them as two arrays of hiball indexes - lower index
+        first, ordered by lower index then higher index.
+        """
         n: cython.Py_ssize_t = len(hiball)
-        ranges: cython.list[cython.tuple[Star, Star]] = []
         i: cython.Py_ssize_t
         j: cython.Py_ssize_t
+        k: cython.Py_ssize_t
         histar: Star
-        lostar: Star
-        dist: cython.int
-        q1: cython.int
-        del_q: cython.int
-        r1: cython.int
-        del_r: cython.int
-        hi_wtn: cython.int
-        lo_wtn: cython.int
         max_dist: cython.int
-        upper2: cython.int
-        upper1: cython.int
-        upper0: cython.int
         zero: TradeCodes
 
         max_dist_fn = self._max_dist
@@ -182,7 +216,6 @@ class TradeCalculationRawRoutes(object):
             for j in range(16):
                 max_dist = max_dist_fn(i, j, True)
                 max_dist_array[i][j] = max_dist
-        max_dist_array_view: cython.int[:, :] = max_dist_array
         wtn_array: cnp.ndarray[cython.int] = np.zeros(n, dtype=np.int32)
         q_array: cnp.ndarray[cython.int] = np.zeros(n, dtype=np.int32)
         r_array: cnp.ndarray[cython.int] = np.zeros(n, dtype=np.int32)
@@ -190,6 +223,9 @@ class TradeCalculationRawRoutes(object):
         ag_array: cnp.ndarray[cython.ushort] = np.zeros(n, dtype=np.uint8)
         in_boost_array: cnp.ndarray[cython.ushort] = np.zeros(n, dtype=np.uint8)
         in_array: cnp.ndarray[cython.ushort] = np.zeros(n, dtype=np.uint8)
+        # Allegiance BTN modifiers, by pair of allegiance-code indexes
+        alg_index: dict = {}
+        alg_array: cnp.ndarray[cython.int] = np.zeros(n, dtype=np.int32)
         for i in range(n):
             histar = hiball[i]
             wtn_array[i] = histar.wtn
@@ -200,72 +236,212 @@ class TradeCalculationRawRoutes(object):
             ag_array[i] = 1 if zero.agricultural else 0
             in_boost_array[i] = 1 if zero.in_code_boost else 0
             in_array[i] = 1 if zero.industrial else 0
-        wtn_array_view: cython.int[:] = wtn_array
-        q_array_view: cython.int[:] = q_array
-        r_array_view: cython.int[:] = r_array
-        ag_boost_array_view: cython.uchar[:] = ag_boost_array
-        ag_array_view: cython.uchar[:] = ag_array
-        in_boost_array_view: cython.uchar[:] = in_boost_array
-        in_array_view: cython.uchar[:] = in_array
+            alg_array[i] = alg_index.setdefault(histar.alg_code, len(alg_index))
+        allies_array: cnp.ndarray[cython.int] = np.zeros((len(alg_index), len(alg_index)), dtype=np.int32)
+        for alg_code1, i in alg_index.items():
+            for alg_code2, j in alg_index.items():
+                allies_array[i][j] = self._get_btn_allies(alg_code1, alg_code2)
+
+        # A pair's maximum distance is the reach of its higher-WTN star, so handle pairs by that reach.  For each reach,
+        # bucket the stars of no greater reach into a hex grid of cells at least that reach wide, and compare each
+        # star of that reach only against the stars in its own and neighbouring buckets - rather than against every
+        # other star.
+        reach_array: cnp.ndarray[cython.int] = np.ascontiguousarray(max_dist_array[wtn_array, wtn_array],
+                                                                    dtype=np.int32)
+
+        self.max_dist_view = max_dist_array
+        self.wtn_view = wtn_array
+        self.q_view = q_array
+        self.r_view = r_array
+        self.reach_view = reach_array
+        self.alg_view = alg_array
+        self.allies_view = allies_array
+        self.ag_boost_view = ag_boost_array
+        self.ag_view = ag_array
+        self.in_boost_view = in_boost_array
+        self.in_view = in_array
+
+        num_threads: cython.int = max(1, self.trade.mp_threads)
         pairs_primed: cython.long = 0
         pairs_considered: cython.long = 0
         pairs_kept: cython.long = 0
-        ag_boost: cython.bint
-        in_boost: cython.bint
-
-        for i in range(n - 1):
-            histar = hiball[i]
-            q1 = q_array_view[i]
-            r1 = r_array_view[i]
-            hi_wtn = wtn_array_view[i]
-
-            for j in range(i + 1, n):
-                pairs_primed += 1
-                lo_wtn = wtn_array_view[j]
-                max_dist = max_dist_array_view[hi_wtn][lo_wtn]
-                del_q = q1 - q_array_view[j]
-                if del_q > max_dist or del_q < -max_dist:
-                    continue
-                del_r = r1 - r_array_view[j]
-                if del_r > max_dist or del_r < -max_dist:
-                    continue
-
-                dist = TradeCalculationRawRoutes._distance(del_q, del_r)
-                if dist > max_dist:
-                    continue
-                upper2 = self._get_rough_btn_upper_bound(hi_wtn, lo_wtn, max_range, min_btn, dist)
-                if min_btn > upper2:
-                    continue
-                lostar = hiball[j]
-                pairs_considered += 1
-                upper2 = self._get_btn_upper_bound(histar, lostar, max_range, min_btn, dist)
-                if min_btn > upper2:
-                    continue
-                if dist <= max_range:
-                    upper1 = max(min_btn, upper2 - 1)
-                    upper0 = max(min_btn, upper2 - 2)
-                else:
-                    upper1 = upper2 - 1
-                    upper0 = upper2 - 2
-
-                pairs_kept += 1
-                ag_boost = (ag_boost_array_view[i] & ag_boost_array_view[j]
-                            & (ag_array_view[i] | ag_array_view[j]))
-                in_boost = (in_boost_array_view[i] & in_boost_array_view[j]
-                            & (in_array_view[i] | in_array_view[j]))
-                if ag_boost & in_boost:
-                    ranges.append((histar, lostar))
-                elif ag_boost ^ in_boost:
-                    if upper1 >= min_btn:
-                        ranges.append((histar, lostar))
-                else:
-                    if upper0 >= min_btn:
-                        ranges.append((histar, lostar))
+        first_parts: list = []
+        second_parts: list = []
+        no_pairs: cython.int[:] = np.zeros(0, dtype=np.int32)
+        sources_view: cython.int[:]
+        counts_view: cython.long[:]
+        offsets_view: cython.long[:]
+        counters_view: cython.long[:, :]
+        first_view: cython.int[:]
+        second_view: cython.int[:]
+        num_sources: cython.Py_ssize_t
+        reach: cython.int
+
+        for reach in np.unique(reach_array).tolist():
+            self._grid_stars(np.flatnonzero(reach_array <= reach).astype(np.int32), q_array, r_array,
+                             max(reach, self.min_cell_size))
+            sources = np.flatnonzero(reach_array == reach).astype(np.int32)
+            sources_view = sources
+            num_sources = len(sources)
+            counts = np.zeros(num_sources, dtype=np.int64)
+            counts_view = counts
+            counters = np.zeros((num_sources, 3), dtype=np.int64)
+            counters_view = counters
+
+            # Each star's pairs are counted, then written, by whichever thread picks up that star's block of rows.
+            # Counting first gives every star its own slice of the output arrays, so no thread needs the GIL or
+            # a lock to store its pairs.
+            for k in prange(num_sources, nogil=True, schedule='dynamic', chunksize=64, num_threads=num_threads):
+                counts_view[k] = self._scan_star(sources_view[k], reach, max_range, min_btn, counters_view, k,
+                                                 no_pairs, no_pairs, 0, False)
+            offsets = np.cumsum(counts) - counts
+            offsets_view = offsets
+            total = int(counts.sum())
+            first = np.zeros(total, dtype=np.int32)
+            second = np.zeros(total, dtype=np.int32)
+            first_view = first
+            second_view = second
+            for k in prange(num_sources, nogil=True, schedule='dynamic', chunksize=64, num_threads=num_threads):
+                self._scan_star(sources_view[k], reach, max_range, min_btn, counters_view, k, first_view,
+                                second_view, offsets_view[k], True)
+
+            first_parts.append(first)
+            second_parts.append(second)
+            totals = counters.sum(axis=0).tolist()
+            pairs_primed += totals[0]
+            pairs_considered += totals[1]
+            pairs_kept += totals[2]
 
         self.pairs_primed = pairs_primed
         self.pairs_considered = pairs_considered
         self.pairs_kept = pairs_kept
-        return ranges
+
+        # Hand pairs back in the same order an all-pairs scan would find them - lower index, then higher - however
+        # the rows were shared out between threads
+        if 0 == len(first_parts):
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
+        first = np.concatenate(first_parts)
+        second = np.concatenate(second_parts)
+        order = np.lexsort((second, first))
+        return first[order], second[order]
+
+    def _grid_stars(self, indexes, q_array, r_array, cell_size: cython.int):
+        """
+        Bucket the given star indexes by hex-grid cell, storing the indexes arranged so each cell's stars are
+        contiguous and in ascending index order, where each cell starts in that arrangement, and each star's cell.
+        """
+        cell_q = q_array // cell_size
+        cell_r = r_array // cell_size
+        cell_q -= cell_q.min()
+        cell_r -= cell_r.min()
+        self.cell_q_count = int(cell_q.max()) + 1
+        self.cell_r_count = int(cell_r.max()) + 1
+        cells = np.ascontiguousarray(cell_q * self.cell_r_count + cell_r, dtype=np.int32)
+        order = np.lexsort((indexes, cells[indexes]))
+        self.bucket_view = np.ascontiguousarray(indexes[order], dtype=np.int32)
+        self.cell_start_view = np.searchsorted(cells[indexes][order],
+                                               np.arange(self.cell_q_count * self.cell_r_count + 1)).astype(np.int32)
+        self.cell_view = cells
+
+    @cython.cfunc
+    @cython.nogil
+    @cython.exceptval(check=False)
+    @cython.profile(False)
+    @cython.boundscheck(False)
+    @cython.initializedcheck(False)
+    @cython.nonecheck(False)
+    @cython.wraparound(False)
+    @cython.returns(cython.long)
+    def _scan_star(self, i: cython.int, reach: cython.int, max_range: cython.int, min_btn: cython.int,
+                   counters: cython.long[:, :], row: cython.Py_ssize_t, first: cython.int[:], second: cython.int[:],
+                   offset: cython.long, write: cython.bint):
+        """
+        Check star i against every star of no greater reach in its own and neighbouring cells, returning how many
+        pairs could meet min_btn, and writing them out from offset if asked to.
+        """
+        q1: cython.int = self.q_view[i]
+        r1: cython.int = self.r_view[i]
+        hi_wtn: cython.int = self.wtn_view[i]
+        cell: cython.int = self.cell_view[i]
+        cell_q: cython.int = cell // self.cell_r_count
+        cell_r: cython.int = cell % self.cell_r_count
+        added: cython.long = 0
+        primed: cython.long = 0
+        considered: cython.long = 0
+        kept: cython.long = 0
+        dq: cython.int
+        dr: cython.int
+        near: cython.int
+        k: cython.Py_ssize_t
+        j: cython.int
+        lo_wtn: cython.int
+        max_dist: cython.int
+        del_q: cython.int
+        del_r: cython.int
+        dist: cython.int
+        upper2: cython.int
+        upper1: cython.int
+        upper0: cython.int
+        ag_boost: cython.bint
+        in_boost: cython.bint
+
+        for dq in range(-1, 2):
+            if cell_q + dq < 0 or cell_q + dq >= self.cell_q_count:
+                continue
+            for dr in range(-1, 2):
+                if cell_r + dr < 0 or cell_r + dr >= self.cell_r_count:
+                    continue
+                near = cell + dq * self.cell_r_count + dr
+                for k in range(self.cell_start_view[near], self.cell_start_view[near + 1]):
+                    j = self.bucket_view[k]
+                    # Stars of equal reach meet each other from both sides, so only take the pair once
+                    if j == i or (self.reach_view[j] == reach and j < i):
+                        continue
+                    primed += 1
+                    lo_wtn = self.wtn_view[j]
+                    max_dist = self.max_dist_view[hi_wtn, lo_wtn]
+                    del_q = q1 - self.q_view[j]
+                    if del_q > max_dist or del_q < -max_dist:
+                        continue
+                    del_r = r1 - self.r_view[j]
+                    if del_r > max_dist or del_r < -max_dist:
+                        continue
+
+                    dist = TradeCalculationRawRoutes._distance(del_q, del_r)
+                    if dist > max_dist:
+                        continue
+                    upper2 = self._get_rough_btn_upper_bound(hi_wtn, lo_wtn, max_range, min_btn, dist)
+                    if min_btn > upper2:
+                        continue
+                    considered += 1
+                    upper2 = self._get_btn_upper_bound(hi_wtn, lo_wtn,
+                                                       self.allies_view[self.alg_view[i], self.alg_view[j]],
+                                                       max_range, min_btn, dist)
+                    if min_btn > upper2:
+                        continue
+                    if dist <= max_range:
+                        upper1 = max(min_btn, upper2 - 1)
+                        upper0 = max(min_btn, upper2 - 2)
+                    else:
+                        upper1 = upper2 - 1
+                        upper0 = upper2 - 2
+
+                    kept += 1
+                    ag_boost = (self.ag_boost_view[i] & self.ag_boost_view[j]
+                                & (self.ag_view[i] | self.ag_view[j]))
+                    in_boost = (self.in_boost_view[i] & self.in_boost_view[j]
+                                & (self.in_view[i] | self.in_view[j]))
+                    if (ag_boost & in_boost) or ((ag_boost ^ in_boost) and upper1 >= min_btn) \
+                            or (not (ag_boost | in_boost) and upper0 >= min_btn):
+                        if write:
+                            first[offset + added] = min(i, j)
+                            second[offset + added] = max(i, j)
+                        added += 1
+
+        counters[row, 0] = primed
+        counters[row, 1] = considered
+        counters[row, 2] = kept
+        return added
 
     @cython.ccall
     @cython.infer_types(True)
@@ -364,6 +540,9 @@ class TradeCalculationRawRoutes(object):
         return max_dist
 
     @cython.cfunc
+    @cython.nogil
+    @cython.exceptval(check=False)
+    @cython.profile(False)
     @cython.returns(cython.int)
     def _get_max_btn(self, star_wtn: cython.int, neighbour_wtn: cython.int):
         if neighbour_wtn > star_wtn:
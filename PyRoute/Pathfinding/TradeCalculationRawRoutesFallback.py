@@ -4,19 +4,23 @@ Created on Jul 22, 2026
 @author: CyberiaResurrection
 """
 import functools
+import itertools
 import time
-from array import array
-from typing import Optional
+from typing import Iterator, Optional
 
 import numpy as np
 
 from PyRoute import Star
 from PyRoute.Calculation.RouteCalculation import RouteCalculation
-from PyRoute.TradeCodes import TradeCodes
 
 
 class TradeCalculationRawRoutes(object):
 
+    # Smallest spatial-hash cell, in parsecs, so short-reach stars don't get spread over a multitude of tiny cells
+    min_cell_size = 32
+    # Rough cap on star pairs checked in a single NumPy block
+    block_size = 1 << 20
+
     def __init__(self, trade):
         from PyRoute.Calculation.TradeCalculation import TradeCalculation
         if not isinstance(trade, TradeCalculation):
@@ -29,7 +33,7 @@ class TradeCalculationRawRoutes(object):
         self.pairs_rough: int = 0
         self.pairs_smooth: int = 0
 
-    def raw_ranges(self) -> list[tuple[Star, Star]]:
+    def raw_ranges(self) -> Iterator[tuple[Star, Star]]:
         t0 = time.perf_counter()
         max_route_dist = max(self.trade.btn_range)
         max_range = self.trade.galaxy.max_jump_range
@@ -43,15 +47,13 @@ class TradeCalculationRawRoutes(object):
         offsets = TradeCalculationRawRoutes._axial_offsets_within(max_range)
         t2 = time.perf_counter()
 
-        hi_hi_ranges = self._base_ranges(hiball, max_range, min_btn)
+        first, second = self._base_ranges(hiball, max_range, min_btn)
         t3 = time.perf_counter()
         t4 = time.perf_counter()
         lo_lo_ranges = self._lo_lo_ranges(loball, offsets)
         t5 = time.perf_counter()
         hi_lo_ranges = self._hi_lo_ranges(hiball, loball, offsets)
         t6 = time.perf_counter()
-        hi_hi_ranges.extend(lo_lo_ranges)
-        hi_hi_ranges.extend(hi_lo_ranges)
         self.trade.logger.info("Routes with endpoints more than " + str(max_route_dist) + " pc apart, trimmed")
         self.trade.logger.info(
             f"raw_ranges phases: init {t1 - t0:.6f}s, split {t2 - t1:.6f}s, ranges {t3 - t2:.6f}s, hi-hi filters {t4 - t3:.6f}s, lo-lo filters {t5 - t4:.6f}s, hi-lo filters {t6 - t5:.6f}s"
@@ -60,7 +62,20 @@ class TradeCalculationRawRoutes(object):
                                ", pairs kept: " + str(self.pairs_kept) + ", pairs added: " + str(self.pairs_added))
         self.trade.logger.info("Pairs passing rough BTN upper bound: " + str(self.pairs_rough) + ", pairs passing smooth BTN upper bound: " + str(self.pairs_smooth))
 
-        return hi_hi_ranges
+        # Only build hi-hi Star pairs as they're asked for, rather than tens of millions at once
+        hi_hi_ranges = TradeCalculationRawRoutes._star_pairs(hiball, first, second)
+        return itertools.chain(hi_hi_ranges, lo_lo_ranges, hi_lo_ranges)
+
+    @staticmethod
+    def _star_pairs(stars: list[Star], first: np.ndarray, second: np.ndarray,
+                    chunk_size: int = 65536) -> Iterator[tuple[Star, Star]]:
+        """
+        Turn arrays of star-index pairs into star pairs, a chunk at a time.
+        """
+        for start in range(0, len(first), chunk_size):
+            chunk = zip(first[start:start + chunk_size].tolist(), second[start:start + chunk_size].tolist())
+            for (i, j) in chunk:
+                yield stars[i], stars[j]
 
     def _hi_lo_ranges(self, hiball, loball, offsets: list[tuple[int, int, int]]):
         # Count the shorter of hiball and loball as hiball for this, since the main loop depends on hiball length
@@ -106,160 +121,147 @@ class TradeCalculationRawRoutes(object):
         return list(lo_lo_ranges)
 
     def _base_ranges(self, hiball: list[Star], max_range: int, min_btn: int):
+        """
+        Find the hi-hi pairs that could meet min_btn, returning them as two arrays of hiball indexes - lower index
+        first, ordered by lower index then higher index, as the compiled version does.
+
+        A pair's maximum distance is the reach of its higher-WTN star, so pairs are grouped by that reach.  For each
+        reach, the stars with that reach are binned into a spatial hash of axial-coordinate cells at least that reach
+        wide, and checked, a block of cells at a time, against every star of no greater reach in the surrounding cells.
+        The distance, rough and smooth BTN upper bounds and ag/in boost checks are all done with NumPy broadcasting.
+        """
         n: int = len(hiball)
-        pairs_primed: int = 0
-        pairs_considered: int = 0
-        pairs_kept: int = 0
-        pairs_added: int = 0
-        pairs_rough: int = 0
-        pairs_smooth: int = 0
-        world_wtn = np.zeros(n, dtype=np.int64)
-        q_array = np.zeros(n, dtype=np.int64)
-        r_array = np.zeros(n, dtype=np.int64)
-        max_wtn_distances = np.zeros(n, dtype=np.int64)
-        offsets: dict[int, list[tuple[int, int, int]]] = {}
-        i_map: dict[tuple[int, int], int] = {}
-        ag_boost_array = np.zeros(n, dtype=np.uint8)
-        ag_array = np.zeros(n, dtype=np.uint8)
-        in_boost_array = np.zeros(n, dtype=np.uint8)
-        in_array = np.zeros(n, dtype=np.uint8)
-        alg_code_array: list[Optional[str]] = [None] * n
-
-        get_rough = self._get_rough_btn_upper_bound
-        get_upper = self._get_btn_upper_bound
+        self.pairs_primed = 0
+        self.pairs_considered = 0
+        self.pairs_kept = 0
+        self.pairs_added = 0
+        self.pairs_rough = 0
+        self.pairs_smooth = 0
+        if 2 > n:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        wtn_array = np.array([star.wtn for star in hiball], dtype=np.int64)
+        q_array = np.array([star.hex.q for star in hiball], dtype=np.int64)
+        r_array = np.array([star.hex.r for star in hiball], dtype=np.int64)
+        ag_boost_array = np.array([star.tradeCode.ag_code_boost for star in hiball], dtype=bool)
+        ag_array = np.array([star.tradeCode.agricultural for star in hiball], dtype=bool)
+        in_boost_array = np.array([star.tradeCode.in_code_boost for star in hiball], dtype=bool)
+        in_array = np.array([star.tradeCode.industrial for star in hiball], dtype=bool)
+        alg_codes = {}
+        alg_array = np.array([alg_codes.setdefault(star.alg_code, len(alg_codes)) for star in hiball], dtype=np.int64)
+        allies = np.zeros((len(alg_codes), len(alg_codes)), dtype=np.int64)
+        for code1, i in alg_codes.items():
+            for code2, j in alg_codes.items():
+                allies[i, j] = RouteCalculation.get_btn_allies(code1, code2)
+
+        # How far away each star's partners can be, as set by its own WTN - the pair's maximum distance is the greater
+        # of its two stars' reaches
+        reach_array = np.array([self.trade._max_dist(wtn, wtn, True) for wtn in wtn_array.tolist()], dtype=np.int64)
+        btn_offsets = np.array([self.btn_offset(dist) for dist in range(int(reach_array.max()) + 1)], dtype=np.int64)
+        arrays = (wtn_array, q_array, r_array, reach_array, alg_array, allies, btn_offsets, ag_boost_array, ag_array,
+                  in_boost_array, in_array)
 
-        for i in range(n):
-            histar: Star = hiball[i]
-            world_wtn[i] = histar.wtn
-            q_array[i] = histar.hex.q
-            r_array[i] = histar.hex.r
-            max_dist: int = self.trade._max_dist(world_wtn[i], world_wtn[i], True)
-            max_wtn_distances[i] = max_dist
-            i_map[(q_array[i], r_array[i])] = i
-            hi_trade: TradeCodes = histar.tradeCode
-            ag_boost_array[i] = 1 if hi_trade.ag_code_boost else 0
-            ag_array[i] = 1 if hi_trade.agricultural else 0
-            in_boost_array[i] = 1 if hi_trade.in_code_boost else 0
-            in_array[i] = 1 if hi_trade.industrial else 0
-            alg_code_array[i] = histar.alg_code
-
-        half_offset = max(max_wtn_distances)
-        max_q = max(q_array) + half_offset
-        min_q = min(q_array) - half_offset
-        max_r = max(r_array) + half_offset
-        min_r = min(r_array) - half_offset
-        q_size = (max_q - min_q) + 1
-        r_size = (max_r - min_r) + 1
-        idx_map = array('i', [-1]) * q_size * r_size
         out_i = []
         out_j = []
-
-        for i in range(n):
-            q = q_array[i] - min_q
-            r = r_array[i] - min_r
-            idx_map[q * r_size + r] = i
-            max_dist = max_wtn_distances[i]
-            if max_dist not in offsets:
-                offsets[max_dist] = TradeCalculationRawRoutes._axial_offsets_within(max_dist, r_size=int(r_size))
-                offsets[max_dist] = [(dist, delta, btn_minimum) for (dq, dr, dist, delta) in offsets[max_dist] if
-                                     (btn_minimum := min_btn if dist <= max_range else 1)
-                                     and not (dq == 0 and dr == 0)]
-
-        for i in range(n):
-            hi_wtn: int = world_wtn[i]
-            hi_ag_boost = ag_boost_array[i]
-            hi_in_boost = in_boost_array[i]
-            hi_ag = ag_array[i]
-            hi_in = in_array[i]
-            hi_alg = alg_code_array[i]
-
-            offset = offsets[max_wtn_distances[i]]
-            base_idx = (q_array[i] - min_q) * r_size + (r_array[i] - min_r)
-            for dist, delta, btn_minimum in offset:
-                j = idx_map[base_idx + delta]
-                if -1 == j or j < i:
-                    continue
-
-                pairs_primed += 1
-                lo_wtn = world_wtn[j]
-
-                pairs_considered += 1
-                if get_rough(hi_wtn, lo_wtn, max_range, min_btn, dist) < min_btn:
-                    continue
-                pairs_rough += 1
-
-                upbound = get_upper(hi_wtn, lo_wtn, hi_alg, alg_code_array[j], max_range, min_btn, dist)
-                if upbound < min_btn:
-                    continue
-                pairs_smooth += 1
-
-                ag_code_boost: np.uint8 = hi_ag_boost & ag_boost_array[j] & (hi_ag | ag_array[j])
-                in_code_boost: np.uint8 = hi_in_boost & in_boost_array[j] & (hi_in | in_array[j])
-
-                case = (ag_code_boost & in_code_boost) * 2 + (ag_code_boost ^ in_code_boost)
-
-                if 2 == case:
-                    pairs_added += 1
-                    out_i.append(i)
-                    out_j.append(j)
-                else:
-                    shift = 2 - case
-                    if max(btn_minimum, upbound - shift) >= min_btn:
-                        pairs_added += 1
-                        out_i.append(i)
-                        out_j.append(j)
-
-                pairs_kept += 1
-
-        self.pairs_primed = pairs_primed
-        self.pairs_considered = pairs_considered
-        self.pairs_kept = pairs_kept
-        self.pairs_added = pairs_added
-        self.pairs_rough = pairs_rough
-        self.pairs_smooth = pairs_smooth
-
-        return [(hiball[a], hiball[b]) for a, b in zip(out_i, out_j)]
+        for reach in np.unique(reach_array).tolist():
+            cell_size = max(reach, self.min_cell_size)
+            sources = self._bin_cells(np.flatnonzero(reach_array == reach), q_array, r_array, cell_size)
+            targets = self._bin_cells(np.flatnonzero(reach_array <= reach), q_array, r_array, cell_size)
+
+            for (cell_q, cell_r), rows in sources.items():
+                cols = [targets[key] for dq in (-1, 0, 1) for dr in (-1, 0, 1)
+                        if (key := (cell_q + dq, cell_r + dr)) in targets]
+                cols = np.concatenate(cols)
+                step = max(1, self.block_size // len(cols))
+                for start in range(0, len(rows), step):
+                    pair_i, pair_j = self._block_pairs(rows[start:start + step], cols, reach, max_range, min_btn,
+                                                       arrays)
+                    out_i.append(pair_i)
+                    out_j.append(pair_j)
+
+        out_i = np.concatenate(out_i)
+        out_j = np.concatenate(out_j)
+        # Each pair goes out lower index first, in lower-index-then-higher-index order
+        first = np.minimum(out_i, out_j)
+        second = np.maximum(out_i, out_j)
+        order = np.lexsort((second, first))
+
+        return first[order], second[order]
 
     @staticmethod
-    @functools.cache
-    def _get_btn_upper_bound(wtn1: int, wtn2: int, alg_code1: Optional[str], alg_code2: Optional[str], max_range: int,
-                             min_btn: int, distance: int) -> int:
+    def _bin_cells(indexes: np.ndarray, q_array: np.ndarray, r_array: np.ndarray, cell_size: int) -> dict:
         """
-        Return an _upper bound_ on the BTN between star1 and star2.  If the upper bound on BTN
-        doesn't meet/beat the minimum BTN, then the _actual_ BTN, which also doesn't meet/beat
-        the minimum, doesn't need to be calculated.  If star1 and star2 are less than the supplied
-        max_range apart in pc, set the returned BTN upper bound to greater of upper-bounded BTN and
-        supplied min_btn.
+        Bin the given star indexes by axial-coordinate cell, returning a dict of cell to array of indexes.
         """
-        # Assumes BTN is boosted by both agricultural and industrial matches
-        btn = TradeCalculationRawRoutes._get_btn_upper_bound_core(wtn1, wtn2, alg_code1, alg_code2) \
-              + 2 + TradeCalculationRawRoutes.btn_offset(distance)
-
-        btn = min(btn, TradeCalculationRawRoutes.max_btn(wtn1, wtn2))
-        return min_btn if min_btn > btn and distance <= max_range else btn
-
-    @staticmethod
-    @functools.cache
-    def _get_btn_upper_bound_core(wtn1: int, wtn2: int, ally1: Optional[str], ally2: Optional[str]) -> int:
-        return wtn1 + wtn2 + RouteCalculation.get_btn_allies(ally1, ally2)
+        cell_q = q_array[indexes] // cell_size
+        cell_r = r_array[indexes] // cell_size
+        order = np.lexsort((cell_r, cell_q))
+        indexes = indexes[order]
+        cell_q = cell_q[order]
+        cell_r = cell_r[order]
+        breaks = np.flatnonzero((cell_q[1:] != cell_q[:-1]) | (cell_r[1:] != cell_r[:-1])) + 1
+        starts = np.concatenate(([0], breaks)).tolist()
+        ends = np.concatenate((breaks, [len(indexes)])).tolist()
+        cells = {}
+        for start, end in zip(starts, ends):
+            cells[(int(cell_q[start]), int(cell_r[start]))] = indexes[start:end]
+        return cells
+
+    def _block_pairs(self, rows: np.ndarray, cols: np.ndarray, reach: int, max_range: int, min_btn: int,
+                     arrays: tuple) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Check every (row, col) star pair in the block, returning the index pairs that could meet min_btn.  Rows all
+        have the given reach, and cols no more, so a col of equal reach is only paired with lower-indexed rows, to
+        count each such pair once.
+        """
+        wtn_array, q_array, r_array, reach_array, alg_array, allies, btn_offsets, ag_boost_array, ag_array, \
+            in_boost_array, in_array = arrays
+        self.pairs_primed += len(rows) * len(cols)
+
+        del_q = q_array[rows][:, None] - q_array[cols][None, :]
+        del_r = r_array[rows][:, None] - r_array[cols][None, :]
+        dist = (np.abs(del_q) + np.abs(del_r) + np.abs(del_q + del_r)) // 2
+        keep = (dist <= reach) & ((reach_array[cols][None, :] < reach) | (rows[:, None] < cols[None, :]))
+        row_pos, col_pos = np.nonzero(keep)
+        i = rows[row_pos]
+        j = cols[col_pos]
+        dist = dist[row_pos, col_pos]
+        self.pairs_considered += len(i)
+
+        wtn1 = wtn_array[i]
+        wtn2 = wtn_array[j]
+        in_jump = dist <= max_range
+        max_btn = 2 * np.minimum(wtn1, wtn2) + 1
+        # Rough upper bound assumes BTN is boosted by both agricultural and industrial matches, and the best
+        # possible allegiance modifier
+        base = wtn1 + wtn2 + 2 + btn_offsets[dist]
+        rough = np.minimum(base, max_btn)
+        keep = in_jump | (rough >= min_btn)
+        i, j, dist, in_jump, base, max_btn = i[keep], j[keep], dist[keep], in_jump[keep], base[keep], max_btn[keep]
+        self.pairs_rough += len(i)
+
+        upper2 = np.minimum(base + allies[alg_array[i], alg_array[j]], max_btn)
+        upper2 = np.where(in_jump & (upper2 < min_btn), min_btn, upper2)
+        keep = upper2 >= min_btn
+        i, j, in_jump, upper2 = i[keep], j[keep], in_jump[keep], upper2[keep]
+        self.pairs_smooth += len(i)
+        self.pairs_kept += len(i)
+
+        # Now knock off what the ag and in boosts can't actually supply
+        upper1 = np.where(in_jump, np.maximum(min_btn, upper2 - 1), upper2 - 1)
+        upper0 = np.where(in_jump, np.maximum(min_btn, upper2 - 2), upper2 - 2)
+        ag_boost = ag_boost_array[i] & ag_boost_array[j] & (ag_array[i] | ag_array[j])
+        in_boost = in_boost_array[i] & in_boost_array[j] & (in_array[i] | in_array[j])
+        keep = (ag_boost & in_boost) | ((ag_boost ^ in_boost) & (upper1 >= min_btn)) | \
+               (~(ag_boost | in_boost) & (upper0 >= min_btn))
+        self.pairs_added += int(np.count_nonzero(keep))
+        return i[keep], j[keep]
 
     @staticmethod
     @functools.cache
     def btn_offset(dist: int) -> int:
         return RouteCalculation.get_btn_offset(dist)
 
-    @staticmethod
-    @functools.cache
-    def max_btn(w1: int, w2: int) -> int:
-        return RouteCalculation.get_max_btn(w1, w2)
-
-    @staticmethod
-    @functools.cache
-    def _get_rough_btn_upper_bound(wtn1: int, wtn2: int, max_range: int, min_btn: int, distance: int) -> int:
-        btn = wtn1 + wtn2 + 2 + TradeCalculationRawRoutes.btn_offset(distance)
-        btn = min(btn, TradeCalculationRawRoutes.max_btn(wtn1, wtn2))
-        return min_btn if min_btn > btn and distance <= max_range else btn
-
     @staticmethod
     def _axial_offsets_within(R: int, r_size: Optional[int] = None):
         offsets: list[tuple[int, int, int]] = []
@@ -0,0 +1,146 @@
+// Indexed d-ary min-heap, holding at most one entry per graph node, with decrease-key.
+//
+// Compared to MinMaxHeap, pushing a node that's already queued replaces its entry if the new one is smaller (and is
+// otherwise ignored), rather than queueing a duplicate to be thrown away when it's popped.  The heap never holds more
+// entries than there are nodes, and every pop is live.
+//
+// Equal entries come off in an order set by where they sit in the heap, which differs from MinMaxHeap's, so the heap
+// only suits entries that order fully - eg dijkstra_t, which breaks ties on label by node.  A* stays on MinMaxHeap, as
+// no key on its (augment, dist) entries reproduces MinMaxHeap's order on ties, and its routes would change.
+
+#ifndef INDEXEDHEAP_H
+#define INDEXEDHEAP_H
+
+#include <vector>
+#include <stdint.h>
+
+#include "_minmaxheap.h"
+
+namespace indexedheap {
+    using minmaxheap::dijkstra_t;
+
+    // Node each entry type is keyed on
+    inline int heap_node(const dijkstra_t& item) {
+        return item.act_nod;
+    }
+
+    template <typename T>
+    class IndexedHeap {
+        std::vector<T> heap;
+        // Position of each node's entry in heap, -1 if it's not queued
+        std::vector<int64_t> position;
+        size_t arity;
+
+        private:
+            void siftup(size_t i);
+            void siftdown(size_t i);
+
+        public:
+            IndexedHeap() : arity(4) {}
+
+            // Size the heap for num_nodes nodes, emptying it.  Position storage is only reallocated when num_nodes
+            // changes, so a heap can be reused across searches of the same graph without an O(n) reset each time.
+            void reset(size_t num_nodes, size_t arity) {
+                clear();
+                if (position.size() != num_nodes) {
+                    position.assign(num_nodes, -1);
+                }
+                this->arity = arity < 2 ? 2 : arity;
+            }
+
+            size_t size() const {
+                return heap.size();
+            }
+
+            bool contains(int node) const {
+                return 0 <= position[node];
+            }
+
+            T peekmin() const {
+                return heap[0];
+            }
+
+            // Queue item, or, if its node is already queued, replace that node's entry if item is smaller.
+            // Returns whether the heap changed.
+            bool push(T item) {
+                int node = heap_node(item);
+                int64_t pos = position[node];
+                if (0 > pos) {
+                    heap.push_back(item);
+                    siftup(heap.size() - 1);
+                    return true;
+                }
+                if (item < heap[pos]) {
+                    heap[pos] = item;
+                    siftup(pos);
+                    return true;
+                }
+                return false;
+            }
+
+            T popmin() {
+                T result = heap[0];
+                position[heap_node(result)] = -1;
+                T last = heap.back();
+                heap.pop_back();
+                if (0 < heap.size()) {
+                    heap[0] = last;
+                    siftdown(0);
+                }
+                return result;
+            }
+
+            // Empty the heap, only touching the positions of nodes still queued
+            void clear() {
+                for (size_t i = 0; i < heap.size(); i++) {
+                    position[heap_node(heap[i])] = -1;
+                }
+                heap.clear();
+            }
+    };
+
+    template <typename T>
+    void IndexedHeap<T>::siftup(size_t i) {
+        T item = heap[i];
+        while (0 < i) {
+            size_t parent = (i - 1) / arity;
+            if (!(item < heap[parent])) {
+                break;
+            }
+            heap[i] = heap[parent];
+            position[heap_node(heap[i])] = i;
+            i = parent;
+        }
+        heap[i] = item;
+        position[heap_node(item)] = i;
+    }
+
+    template <typename T>
+    void IndexedHeap<T>::siftdown(size_t i) {
+        T item = heap[i];
+        size_t num = heap.size();
+        while (true) {
+            size_t first = i * arity + 1;
+            if (first >= num) {
+                break;
+            }
+            size_t last = first + arity < num ? first + arity : num;
+            size_t best = first;
+            for (size_t child = first + 1; child < last; child++) {
+                if (heap[child] < heap[best]) {
+                    best = child;
+                }
+            }
+            if (!(heap[best] < item)) {
+                break;
+            }
+            heap[i] = heap[best];
+            position[heap_node(heap[i])] = i;
+            i = best;
+        }
+        heap[i] = item;
+        position[heap_node(item)] = i;
+    }
+}
+
+#endif
@@ -0,0 +1,310 @@
+# distutils: language = c++
+# cython: profile=True
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+
+Meet-in-the-middle counterpart to astar_path_numpy, for the long, low-BTN routes whose forward-only frontier
+balloons.  This code:
+    Searches forward from the source and backward from the target simultaneously, using the average of the
+        landmark bounds to the target and to the source as a common potential, so both searches see the same
+        non-negative reduced edge costs
+    Prunes candidates on either side whose landmark-bounded path cost busts the externally-supplied upper bound,
+        or the best complete path found so far
+    Stops once the two frontiers' minimum keys sum _strictly_ past the best complete path, so every other path
+        within tolerance of the best has been seen
+    Hands the route back to astar_path_numpy whenever it cannot vouch that astar_path_numpy would return the same
+        path:
+        - any scanned edge on which the landmark bounds are not consistent
+        - any other path, complete or partial, costing within tolerance of the one found - ties are broken by
+            astar_path_numpy's queue order, which this search doesn't replicate
+        - a best path cost within tolerance of the upper bound
+    That keeps routes, and thus trade outputs, identical to the unidirectional search's regardless of which one is
+    picked for a given route.
+
+"""
+import cython
+from cython.cimports.numpy import numpy as cnp
+from cython.cimports.minmaxheap import MinMaxHeap, astar_t
+from cython.cimports.libc.math import fabs
+
+import networkx as nx
+import numpy as np
+
+from PyRoute.Pathfinding.astar_numpy import _calc_branching_factor, astar_path_numpy
+from PyRoute.Pathfinding.LazyLowerBound import LazyLowerBound
+
+cnp.import_array()
+
+float64max = np.finfo(np.float64).max
+# Relative slack used when comparing path costs.  The compiled unidirectional search accumulates costs in single
+# precision, so anything closer than this is treated as a tie that only that search can settle.
+TIE_TOLERANCE = 1e-5
+# Absolute slack allowed for rounding when checking landmark bounds for consistency
+CONSISTENCY_TOLERANCE = 1e-9
+ROOT_NODE: cython.const[cython.int] = -1
+
+
+@cython.ccall
+def astar_path_bidirectional(G, source: cython.int, target: cython.int, bulk_heuristic,
+                             upbound: cython.double = float64max, diagnostics: cython.bint = False) -> tuple[list, dict]:
+    fwd_potentials: cnp.ndarray[cython.double]
+    rev_potentials: cnp.ndarray[cython.double]
+
+    # pre-calc heuristics for all nodes to both ends of the route.  The common potential needs both in full, so lazy
+    # bounds get filled in straight away.
+    fwd_heuristic = bulk_heuristic(target)
+    if fwd_heuristic is None:
+        raise ValueError("Bulk heuristic function cannot be None")
+    rev_heuristic = bulk_heuristic(source)
+    fwd_potentials = fwd_heuristic.bulk() if isinstance(fwd_heuristic, LazyLowerBound) else fwd_heuristic
+    rev_potentials = rev_heuristic.bulk() if isinstance(rev_heuristic, LazyLowerBound) else rev_heuristic
+
+    result = None
+    if source != target:
+        result = bidirectional_core(G._indptr, G._indices, G._weights, source, target, fwd_potentials, rev_potentials,
+                                    upbound, diagnostics)
+
+    if result is None:
+        return astar_path_numpy(G, source, target, bulk_heuristic, upbound=upbound, diagnostics=diagnostics)
+
+    path, diag = result
+    if 0 == len(path):
+        raise nx.NetworkXNoPath(f"Node {target} not reachable from {source}")
+    return path, diag
+
+
+@cython.cfunc
+@cython.infer_types(True)
+@cython.boundscheck(False)
+@cython.initializedcheck(False)
+@cython.nonecheck(False)
+@cython.wraparound(False)
+def bidirectional_core(indptr: cython.long[:], indices: cython.long[:], weights: cython.double[:], source: cython.int,
+                       target: cython.int, fwd_potentials: cnp.ndarray, rev_potentials: cnp.ndarray,
+                       upbound: cython.double, diagnostics: cython.bint) -> tuple:
+    """
+    Return (path, diagnostics) if the meet-in-the-middle search can vouch for its answer, with an empty path meaning
+    no route exists within upbound, or None if the route needs handing back to the unidirectional search.
+    """
+    num_nodes: cython.int = len(indptr) - 1
+    floatinf: cython.double = float('inf')
+    tolerance: cython.double = TIE_TOLERANCE
+    consistency: cython.double = CONSISTENCY_TOLERANCE
+    bound_limit: cython.double = upbound * (1 + tolerance)
+
+    # Per-side distance labels, parents, settled flags and gap to the nearest alternative parent, indexed by side
+    labels_arr = np.full((2, num_nodes), floatinf)
+    parents_arr = np.full((2, num_nodes), ROOT_NODE, dtype=int)
+    settled_arr = np.zeros((2, num_nodes), dtype=np.uint8)
+    gaps_arr = np.full((2, num_nodes), floatinf)
+    bounds_arr = np.vstack((fwd_potentials, rev_potentials))
+    # Common potential - fwd_potentials bounds distance _to_ the target, rev_potentials distance _to_ the source
+    potentials_arr = 0.5 * (fwd_potentials - rev_potentials)
+
+    labels: cython.double[:, :] = labels_arr
+    parents: cython.long[:, :] = parents_arr
+    settled: cython.uchar[:, :] = settled_arr
+    gaps: cython.double[:, :] = gaps_arr
+    bounds: cython.double[:, :] = bounds_arr
+    potentials: cython.double[:] = potentials_arr
+
+    labels[0, source] = 0.0
+    labels[1, target] = 0.0
+
+    # Each queue stores key, cost to reach and node.  Comparisons are handled by astar_t directly.
+    fwd_queue: MinMaxHeap[astar_t] = MinMaxHeap[astar_t]()
+    rev_queue: MinMaxHeap[astar_t] = MinMaxHeap[astar_t]()
+    fwd_queue.insert({'augment': potentials[source], 'dist': 0.0, 'curnode': source, 'parent': ROOT_NODE})
+    rev_queue.insert({'augment': -potentials[target], 'dist': 0.0, 'curnode': target, 'parent': ROOT_NODE})
+
+    best: cython.double = floatinf
+    meet_fwd: cython.int = ROOT_NODE
+    meet_rev: cython.int = ROOT_NODE
+    candidates: list = []
+
+    node_counter: cython.int = 0
+    queue_counter: cython.int = 0
+    revisited: cython.int = 0
+    g_exhausted: cython.int = 0
+    f_exhausted: cython.int = 0
+    new_upbounds: cython.int = 0
+
+    side: cython.int
+    other: cython.int
+    sign: cython.double
+    dist: cython.double
+    curnode: cython.int
+    act_nod: cython.int
+    act_wt: cython.double
+    cost: cython.double
+    current: cython.double
+    gap: cython.double
+    node: cython.int
+    total: cython.double
+    bounded: cython.double
+    better: cython.bint
+    num_better: cython.int
+    num_queued: cython.int
+
+    while True:
+        # Drop stale entries off the top of both queues before comparing them
+        while 0 < fwd_queue.size():
+            top = fwd_queue.peekmin()
+            if not settled[0, top.curnode] and top.dist <= labels[0, top.curnode]:
+                break
+            fwd_queue.popmin()
+            revisited += 1
+        while 0 < rev_queue.size():
+            top = rev_queue.peekmin()
+            if not settled[1, top.curnode] and top.dist <= labels[1, top.curnode]:
+                break
+            rev_queue.popmin()
+            revisited += 1
+        if 0 == fwd_queue.size() or 0 == rev_queue.size():
+            break
+        if fwd_queue.peekmin().augment + rev_queue.peekmin().augment > best + tolerance * best:
+            break
+
+        if fwd_queue.size() <= rev_queue.size():
+            side = 0
+            sign = 1.0
+            result = fwd_queue.popmin()
+        else:
+            side = 1
+            sign = -1.0
+            result = rev_queue.popmin()
+        other = 1 - side
+        dist = result.dist
+        curnode = result.curnode
+        settled[side, curnode] = 1
+        node_counter += 1
+
+        num_better = 0
+        num_queued = 0
+
+        for i in range(indptr[curnode], indptr[curnode + 1]):
+            act_nod = indices[i]
+            cost = weights[i]
+            # The reduced costs both sides see are only non-negative if both landmark bounds are consistent
+            if fabs(bounds[0, act_nod] - bounds[0, curnode]) > cost + consistency:
+                return None
+            if fabs(bounds[1, act_nod] - bounds[1, curnode]) > cost + consistency:
+                return None
+
+            act_wt = dist + cost
+            current = labels[side, act_nod]
+            better = False
+            # Track how close the runner-up parent of each neighbour comes to its current one
+            if settled[side, act_nod]:
+                # A settled node getting a markedly cheaper label means the potentials are lying
+                if act_wt < current * (1 - tolerance):
+                    return None
+                gap = fabs(act_wt - current)
+                if gap < gaps[side, act_nod]:
+                    gaps[side, act_nod] = gap
+            elif act_wt < current:
+                gaps[side, act_nod] = current - act_wt
+                better = True
+            else:
+                gap = act_wt - current
+                if gap < gaps[side, act_nod]:
+                    gaps[side, act_nod] = gap
+
+            # Check for a complete path through this neighbour
+            if labels[other, act_nod] < floatinf:
+                total = act_wt + labels[other, act_nod]
+                if total < best:
+                    best = total
+                    meet_fwd = curnode if 0 == side else act_nod
+                    meet_rev = act_nod if 0 == side else curnode
+                    new_upbounds += 1
+                if total <= best + tolerance * best:
+                    candidates.append((total, curnode if 0 == side else act_nod, act_nod if 0 == side else curnode))
+
+            if not better:
+                continue
+            num_better += 1
+            labels[side, act_nod] = act_wt
+            parents[side, act_nod] = curnode
+
+            bounded = act_wt + bounds[side, act_nod]
+            if bounded > bound_limit or bounded > best + tolerance * best:
+                continue
+            num_queued += 1
+            if 0 == side:
+                fwd_queue.insert({'augment': act_wt + sign * potentials[act_nod], 'dist': act_wt, 'curnode': act_nod,
+                                  'parent': curnode})
+            else:
+                rev_queue.insert({'augment': act_wt + sign * potentials[act_nod], 'dist': act_wt, 'curnode': act_nod,
+                                  'parent': curnode})
+
+        if 0 == num_better:
+            g_exhausted += 1
+        elif 0 == num_queued:
+            f_exhausted += 1
+        else:
+            queue_counter += num_queued
+
+    if meet_fwd == ROOT_NODE or best > bound_limit:
+        return [], {}
+    # Too close to the upper bound to be sure the unidirectional search would have kept the route
+    if best >= upbound * (1 - tolerance):
+        return None
+
+    path = _trace(parents, meet_fwd, meet_rev)
+    if len(path) != len(set(path)):
+        return None
+
+    # Any node on the path with a near-equal alternative parent means a near-equal alternative path
+    best_tolerance: cython.double = tolerance * best
+    node = meet_fwd
+    while node != ROOT_NODE:
+        if gaps[0, node] <= best_tolerance:
+            return None
+        node = parents[0, node]
+    node = meet_rev
+    while node != ROOT_NODE:
+        if gaps[1, node] <= best_tolerance:
+            return None
+        node = parents[1, node]
+    # As does any other near-best meeting that traces out a different path
+    for total, fwd, rev in candidates:
+        if total > best + best_tolerance:
+            continue
+        if (fwd != meet_fwd or rev != meet_rev) and _trace(parents, fwd, rev) != path:
+            return None
+
+    if diagnostics is not True:
+        return path, {}
+    branch = _calc_branching_factor(queue_counter, len(path) - 1)
+    neighbour_bound = node_counter
+    un_exhausted = neighbour_bound - f_exhausted - g_exhausted
+    diag = {'nodes_expanded': node_counter, 'nodes_queued': queue_counter, 'branch_factor': branch,
+            'num_jumps': len(path) - 1, 'nodes_revisited': revisited, 'neighbour_bound': neighbour_bound,
+            'new_upbounds': new_upbounds, 'g_exhausted': g_exhausted, 'f_exhausted': f_exhausted,
+            'un_exhausted': un_exhausted, 'targ_exhausted': 0}
+    return path, diag
+
+
+@cython.cfunc
+@cython.boundscheck(False)
+@cython.initializedcheck(False)
+@cython.nonecheck(False)
+@cython.wraparound(False)
+def _trace(parents: cython.long[:, :], meet_fwd: cython.int, meet_rev: cython.int) -> list:
+    """
+    Stitch the forward search's parents back to the source onto the backward search's parents out to the target.
+    """
+    node: cython.int = meet_fwd
+    path: list = []
+    while ROOT_NODE != node:
+        path.append(node)
+        node = parents[0, node]
+    path.reverse()
+    node = meet_rev
+    while ROOT_NODE != node:
+        path.append(node)
+        node = parents[1, node]
+    return path
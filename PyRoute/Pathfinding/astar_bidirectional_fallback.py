@@ -0,0 +1,228 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+
+Meet-in-the-middle counterpart to astar_path_numpy, for the long, low-BTN routes whose forward-only frontier
+balloons.  This code:
+    Searches forward from the source and backward from the target simultaneously, using the average of the
+        landmark bounds to the target and to the source as a common potential, so both searches see the same
+        non-negative reduced edge costs
+    Prunes candidates on either side whose landmark-bounded path cost busts the externally-supplied upper bound,
+        or the best complete path found so far
+    Stops once the two frontiers' minimum keys sum _strictly_ past the best complete path, so every other path
+        within tolerance of the best has been seen
+    Hands the route back to astar_path_numpy whenever it cannot vouch that astar_path_numpy would return the same
+        path:
+        - any scanned edge on which the landmark bounds are not consistent
+        - any other path, complete or partial, costing within tolerance of the one found - ties are broken by
+            astar_path_numpy's queue order, which this search doesn't replicate
+        - a best path cost within tolerance of the upper bound
+    That keeps routes, and thus trade outputs, identical to the unidirectional search's regardless of which one is
+    picked for a given route.
+
+"""
+import heapq
+
+import networkx as nx
+import numpy as np
+
+from PyRoute.Pathfinding.astar_numpy_fallback import _calc_branching_factor, astar_path_numpy
+from PyRoute.Pathfinding.LazyLowerBound import LazyLowerBound
+
+float64max = np.finfo(np.float64).max
+# Relative slack used when comparing path costs.  The compiled unidirectional search accumulates costs in single
+# precision, so anything closer than this is treated as a tie that only that search can settle.
+TIE_TOLERANCE = 1e-5
+# Absolute slack allowed for rounding when checking landmark bounds for consistency
+CONSISTENCY_TOLERANCE = 1e-9
+
+
+def astar_path_bidirectional(G, source, target, bulk_heuristic, upbound=float64max, diagnostics=False) -> tuple[list, dict]:
+    # pre-calc heuristics for all nodes to both ends of the route.  The common potential needs both in full, so lazy
+    # bounds get filled in straight away.
+    fwd_heuristic = bulk_heuristic(target)
+    if fwd_heuristic is None:
+        raise ValueError("Bulk heuristic function cannot be None")
+    rev_heuristic = bulk_heuristic(source)
+    fwd_potentials = fwd_heuristic.bulk() if isinstance(fwd_heuristic, LazyLowerBound) else fwd_heuristic
+    rev_potentials = rev_heuristic.bulk() if isinstance(rev_heuristic, LazyLowerBound) else rev_heuristic
+
+    upbound = float('inf') if upbound is None else upbound
+    assert upbound != float('inf'), "Supplied upbound must not be infinite"
+
+    result = None
+    if source != target:
+        result = _bidirectional_core(G._indptr, G._indices, G._weights, source, target, fwd_potentials, rev_potentials,
+                                     upbound, diagnostics)
+
+    if result is None:
+        return astar_path_numpy(G, source, target, bulk_heuristic, upbound=upbound, diagnostics=diagnostics)
+
+    path, diag = result
+    if 0 == len(path):
+        raise nx.NetworkXNoPath(f"Node {target} not reachable from {source}")
+    return path, diag
+
+
+def _bidirectional_core(indptr, indices, weights, source, target, fwd_potentials, rev_potentials, upbound,
+                        diagnostics) -> tuple:
+    """
+    Return (path, diagnostics) if the meet-in-the-middle search can vouch for its answer, with an empty path meaning
+    no route exists within upbound, or None if the route needs handing back to the unidirectional search.
+    """
+    num_nodes = len(indptr) - 1
+    floatinf = float('inf')
+    # Common potential - fwd_potentials bounds distance _to_ the target, rev_potentials distance _to_ the source
+    potentials = 0.5 * (fwd_potentials - rev_potentials)
+    bound_limit = upbound * (1 + TIE_TOLERANCE)
+
+    # Per-side distance labels, parents, settled flags and gap to the nearest alternative parent, indexed by side
+    labels = [np.ones(num_nodes) * floatinf, np.ones(num_nodes) * floatinf]
+    parents = [np.ones(num_nodes, dtype=int) * -1, np.ones(num_nodes, dtype=int) * -1]
+    settled = [np.zeros(num_nodes, dtype=bool), np.zeros(num_nodes, dtype=bool)]
+    gaps = [np.ones(num_nodes) * floatinf, np.ones(num_nodes) * floatinf]
+    bounds = [fwd_potentials, rev_potentials]
+    signs = [1.0, -1.0]
+    labels[0][source] = 0
+    labels[1][target] = 0
+
+    # Each queue stores key, cost to reach and node.  The nodes themselves, being integers, are directly comparable.
+    queues = [[(potentials[source], 0.0, source)], [(-potentials[target], 0.0, target)]]
+
+    best = floatinf
+    meet = None
+    candidates = []
+
+    node_counter = 0
+    queue_counter = 0
+    revisited = 0
+    g_exhausted = 0
+    f_exhausted = 0
+    new_upbounds = 0
+
+    while True:
+        # Drop stale entries off the top of both queues before comparing them
+        for side in (0, 1):
+            queue = queues[side]
+            while queue and (settled[side][queue[0][2]] or queue[0][1] > labels[side][queue[0][2]]):
+                heapq.heappop(queue)
+                revisited += 1
+        if not queues[0] or not queues[1]:
+            break
+        if queues[0][0][0] + queues[1][0][0] > best + TIE_TOLERANCE * best:
+            break
+
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        other = 1 - side
+        _, dist, curnode = heapq.heappop(queues[side])
+        settled[side][curnode] = True
+        node_counter += 1
+
+        row_start = indptr[curnode]
+        row_end = indptr[curnode + 1]
+        if row_start == row_end:
+            g_exhausted += 1
+            continue
+        active_nodes = indices[row_start:row_end]
+        active_costs = weights[row_start:row_end]
+
+        # The reduced costs both sides see are only non-negative if both landmark bounds are consistent
+        for bound in bounds:
+            if np.any(np.abs(bound[active_nodes] - bound[curnode]) > active_costs + CONSISTENCY_TOLERANCE):
+                return None
+
+        active_weights = dist + active_costs
+        side_labels = labels[side]
+        current = side_labels[active_nodes]
+        closed = settled[side][active_nodes]
+        # A settled node getting a markedly cheaper label means the potentials are lying
+        if np.any(np.logical_and(closed, active_weights < current * (1 - TIE_TOLERANCE))):
+            return None
+        better = np.logical_and(active_weights < current, np.logical_not(closed))
+        # Track how close the runner-up parent of each neighbour comes to its current one
+        side_gaps = gaps[side]
+        side_gaps[active_nodes] = np.where(better, current - active_weights,
+                                           np.fmin(side_gaps[active_nodes], np.abs(active_weights - current)))
+
+        # Check for complete paths through each neighbour
+        other_labels = labels[other][active_nodes]
+        meeting = other_labels < floatinf
+        if meeting.any():
+            totals = active_weights[meeting] + other_labels[meeting]
+            meet_nodes = active_nodes[meeting]
+            for i in range(len(totals)):
+                total = totals[i]
+                if total < best:
+                    best = total
+                    meet = (curnode, meet_nodes[i]) if 0 == side else (meet_nodes[i], curnode)
+                    new_upbounds += 1
+                if total <= best + TIE_TOLERANCE * best:
+                    candidates.append((total, curnode, meet_nodes[i]) if 0 == side else (total, meet_nodes[i], curnode))
+
+        active_nodes = active_nodes[better]
+        if 0 == len(active_nodes):
+            g_exhausted += 1
+            continue
+        active_weights = active_weights[better]
+        side_labels[active_nodes] = active_weights
+        parents[side][active_nodes] = curnode
+
+        bounded_weights = active_weights + bounds[side][active_nodes]
+        keep = np.logical_and(bounded_weights <= bound_limit, bounded_weights <= best + TIE_TOLERANCE * best)
+        active_nodes = active_nodes[keep]
+        if 0 == len(active_nodes):
+            f_exhausted += 1
+            continue
+        active_weights = active_weights[keep]
+        keys = active_weights + signs[side] * potentials[active_nodes]
+
+        num_active = len(active_nodes)
+        queue_counter += num_active
+        queue = queues[side]
+        for i in range(num_active):
+            heapq.heappush(queue, (keys[i], active_weights[i], active_nodes[i]))
+
+    if meet is None or best > bound_limit:
+        return [], {}
+    # Too close to the upper bound to be sure the unidirectional search would have kept the route
+    if best >= upbound * (1 - TIE_TOLERANCE):
+        return None
+
+    tolerance = TIE_TOLERANCE * best
+    fwd_half = _trace(parents[0], meet[0])
+    fwd_len = len(fwd_half)
+    path = fwd_half[::-1] + _trace(parents[1], meet[1])
+    if len(path) != len(set(path)):
+        return None
+
+    # Any node on the path with a near-equal alternative parent means a near-equal alternative path
+    if np.any(gaps[0][path[:fwd_len]] <= tolerance) or np.any(gaps[1][path[fwd_len:]] <= tolerance):
+        return None
+    # As does any other near-best meeting that traces out a different path
+    for total, fwd, rev in candidates:
+        if total > best + tolerance:
+            continue
+        if (fwd, rev) != meet and _trace(parents[0], fwd)[::-1] + _trace(parents[1], rev) != path:
+            return None
+
+    if diagnostics is not True:
+        return path, {}
+    branch = _calc_branching_factor(queue_counter, len(path) - 1)
+    neighbour_bound = node_counter
+    un_exhausted = neighbour_bound - f_exhausted - g_exhausted
+    diag = {'nodes_expanded': node_counter, 'nodes_queued': queue_counter, 'branch_factor': branch,
+            'num_jumps': len(path) - 1, 'nodes_revisited': revisited, 'neighbour_bound': neighbour_bound,
+            'new_upbounds': new_upbounds, 'g_exhausted': g_exhausted, 'f_exhausted': f_exhausted,
+            'un_exhausted': un_exhausted, 'targ_exhausted': 0}
+    return path, diag
+
+
+def _trace(parents, node) -> list:
+    path = [int(node)]
+    node = parents[node]
+    while -1 != node:
+        assert node not in path, "Node " + str(node) + " duplicated in discovered path"
+        path.append(int(node))
+        node = parents[node]
+    return path
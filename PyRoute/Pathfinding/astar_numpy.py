@@ -13,6 +13,12 @@ Compared to the ancestral networkx version of astar_path, this code:
     Takes an optional externally-supplied upper bound
         - Sanity and correctness of this upper bound are the _caller_'s responsibility
         - If the supplied upper bound produces a pathfinding failure, so be it
+    Takes an optional cap on route length in parsecs
+        - Every path the search can yet return extends one that's queued, so once every queued path's length so far,
+          plus the hex distance on to the target, runs past the cap, the route will too, and the search gives up
+          by raising RouteTooLongError, rather than the NetworkXNoPath it raises when there's no route within the
+          upper bound
+        - Until then, the search runs exactly as it would uncapped, so any route it does return is unchanged
 
 
 """
@@ -24,6 +30,9 @@ import networkx as nx
 import numpy as np
 import math
 
+from PyRoute.Errors.RouteTooLongError import RouteTooLongError
+from PyRoute.Pathfinding.LazyLowerBound import LazyLowerBound
+
 cnp.import_array()
 
 float64max = np.finfo(np.float64).max
@@ -74,22 +83,34 @@ def _calc_branching_factor(nodes_queued: cython.int, path_len: cython.int):
 @cython.wraparound(False)
 @cython.nonecheck(False)
 def astar_path_numpy(G, source: cython.int, target: cython.int, bulk_heuristic,
-                     upbound: cython.float = float64max, diagnostics: cython.bint = False) -> tuple[list, dict]:
-    G_succ: list[tuple[cnp.ndarray[cython.int], cnp.ndarray[cython.float]]]
+                     upbound: cython.float = float64max, diagnostics: cython.bint = False,
+                     max_distance: cython.double = float64max) -> tuple[list, dict]:
     potentials: cnp.ndarray[cython.float]
     upbound: cython.float
     distances: cnp.ndarray[cython.float]
-    G_succ = G._arcs  # For speed-up
+    capped: cython.bint = max_distance < float64max
 
-    # pre-calc heuristics for all nodes to the target node
-    potentials = bulk_heuristic(target)
-    if potentials is None:
+    # pre-calc heuristics for all nodes to the target node - or, if handed a lazy bound, work them out as nodes are
+    # reached
+    heuristic = bulk_heuristic(target)
+    if heuristic is None:
         raise ValueError("Bulk heuristic function cannot be None")
+    if isinstance(heuristic, LazyLowerBound):
+        lazy = heuristic
+    else:
+        potentials = heuristic
+        lazy = LazyLowerBound.settled(potentials)
 
     # Traces lowest distance from source node found for each node
-    distances = np.ones(len(G_succ), dtype=float) * upbound
+    distances = np.ones(len(G), dtype=float) * upbound
+    # Traces length in parsecs of the path each node was explored along, and which nodes have a queued path that
+    # could yet be extended to the target within max_distance - only needed when route length is capped
+    parsecs = np.zeros(len(G) if capped else 1, dtype=np.int64)
+    counted = np.zeros(len(G) if capped else 1, dtype=np.uint8)
 
-    bestpath, diag = astar_numpy_core(G_succ, diagnostics, distances, potentials, source, target, upbound)
+    bestpath, diag = astar_numpy_core(G._indptr, G._indices, G._weights, diagnostics, distances, lazy.values,
+                                      lazy.known, lazy.distances, lazy.target, lazy.active, source, target, upbound,
+                                      G._positions, parsecs, counted, max_distance, capped)
 
     if 0 == len(bestpath):
         raise nx.NetworkXNoPath(f"Node {target} not reachable from {source}")
@@ -103,14 +124,18 @@ def astar_path_numpy(G, source: cython.int, target: cython.int, bulk_heuristic,
 @cython.nonecheck(False)
 @cython.wraparound(False)
 @cython.returns(tuple[list[cython.int], dict])
-def astar_numpy_core(G_succ: cython.list[cython.tuple[cnp.ndarray[cython.int], cnp.ndarray[cython.float]]], diagnostics: cython.bint,
-                     distances: cnp.ndarray[cython.float], potentials: cnp.ndarray[cython.float], source: cython.int,
-                     target: cython.int, upbound: cython.float) -> tuple[list, dict]:
+def astar_numpy_core(indptr: cython.long[:], indices: cython.long[:], weights: cython.double[:],
+                     diagnostics: cython.bint, distances: cnp.ndarray[cython.float],
+                     potentials: cnp.ndarray[cython.float], known: cython.uchar[:], landmarks: cython.double[:, :],
+                     target_row: cython.double[:], active: cython.Py_ssize_t[:], source: cython.int,
+                     target: cython.int, upbound: cython.float, positions: cython.long[:, :],
+                     parsecs: cython.long[:], counted: cython.uchar[:], max_distance: cython.double,
+                     capped: cython.bint) -> tuple[list, dict]:
     distances_view: cython.double[:] = distances
     distances_view[source] = 0.0
     potentials_view: cython.double[:] = potentials
-    active_nodes_view: cython.long[:]
-    active_costs_view: cython.double[:]
+    row_start: cython.long
+    row_end: cython.long
 
     node_counter: cython.int = 0
     queue_counter: cython.int = 0
@@ -122,6 +147,9 @@ def astar_numpy_core(G_succ: cython.list[cython.tuple[cnp.ndarray[cython.int], c
     revis_continue: cython.int = 0
     path: cython.list[cython.int] = []
     diag = {}
+    # Number of nodes with queued paths that could yet be extended to the target within max_distance
+    within_cap: cython.int = 0
+    act_len: cython.long
 
     act_nod: cython.int
     act_wt: cython.float
@@ -137,15 +165,26 @@ def astar_numpy_core(G_succ: cython.list[cython.tuple[cnp.ndarray[cython.int], c
     # The queue stores priority, cost to reach, node, and parent.
     # Comparisons are handled by astar_t directly.
     queue: MinMaxHeap[astar_t] = MinMaxHeap[astar_t]()
-    queue.insert({'augment': potentials_view[source], 'dist': 0.0, 'curnode': source, 'parent': ROOT_NODE})
+    queue.insert({'augment': _potential(source, potentials_view, known, landmarks, target_row, active), 'dist': 0.0,
+                  'curnode': source, 'parent': ROOT_NODE})
+    if capped and _hex_distance(positions, source, target) <= max_distance:
+        counted[source] = 1
+        within_cap = 1
 
     while 0 < queue.size():
+        # Whatever's left in the queue can only lead to routes longer than max_distance
+        if capped and 0 == within_cap:
+            raise RouteTooLongError(f"Node {target} not reachable from {source} within {max_distance} parsecs")
         # Pop the smallest item from queue.
         result = queue.popmin()
         dist = result.dist
         curnode = result.curnode
         parent = result.parent
         node_counter += 1
+        # Stale paths to a node always come off the queue after its live ones, so only the first pop counts
+        if capped and counted[curnode]:
+            counted[curnode] = 0
+            within_cap -= 1
 
         if curnode == target:
             path.append(curnode)
@@ -181,27 +220,36 @@ def astar_numpy_core(G_succ: cython.list[cython.tuple[cnp.ndarray[cython.int], c
             distances_view[curnode] = dist
 
         explored[curnode] = parent
+        if capped and ROOT_NODE != parent:
+            parsecs[curnode] = parsecs[parent] + _hex_distance(positions, parent, curnode)
 
-        active_nodes_view = G_succ[curnode][0]
-        active_costs_view = G_succ[curnode][1]
+        row_start = indptr[curnode]
+        row_end = indptr[curnode + 1]
 
         targdex = -1
 
-        num_nodes = len(active_nodes_view)
-
         # Now unconditionally queue _all_ nodes that are still active, worrying about filtering out the bound-busting
         # neighbours later.
         counter = 0
-        for i in range(num_nodes):
-            act_nod = active_nodes_view[i]
-            act_wt = dist + active_costs_view[i]
+        for i in range(row_start, row_end):
+            act_nod = indices[i]
+            act_wt = dist + weights[i]
             if target == act_nod:
                 targdex = i
             if act_wt > distances_view[act_nod]:
                 continue
-            aug_wt = act_wt + potentials_view[act_nod]
+            aug_wt = act_wt + _potential(act_nod, potentials_view, known, landmarks, target_row, active)
             if aug_wt > upbound:
                 continue
+            if capped:
+                # A strictly shorter path leaves those already queued to act_nod stale, taking them out of the count
+                if counted[act_nod] and act_wt < distances_view[act_nod]:
+                    counted[act_nod] = 0
+                    within_cap -= 1
+                act_len = parsecs[curnode] + _hex_distance(positions, curnode, act_nod)
+                if not counted[act_nod] and act_len + _hex_distance(positions, act_nod, target) <= max_distance:
+                    counted[act_nod] = 1
+                    within_cap += 1
             distances_view[act_nod] = act_wt
             queue.insert({'augment': aug_wt, 'dist': act_wt, 'curnode': act_nod, 'parent': curnode})
             counter += 1
@@ -218,3 +266,51 @@ def astar_numpy_core(G_succ: cython.list[cython.tuple[cnp.ndarray[cython.int], c
             queue_counter += counter
 
     return path, diag
+
+
+@cython.cfunc
+@cython.inline
+@cython.boundscheck(False)
+@cython.initializedcheck(False)
+@cython.nonecheck(False)
+@cython.wraparound(False)
+@cython.exceptval(check=False)
+@cython.profile(False)
+@cython.returns(cython.double)
+def _potential(node: cython.int, potentials: cython.double[:], known: cython.uchar[:], landmarks: cython.double[:, :],
+               target_row: cython.double[:], active: cython.Py_ssize_t[:]):
+    """
+    Landmark lower bound from node to the target, worked out and stashed in potentials the first time it's asked for.
+    """
+    i: cython.Py_ssize_t
+    diff: cython.double
+    bound: cython.double
+    if not known[node]:
+        bound = 0.0
+        for i in range(active.shape[0]):
+            diff = landmarks[node, active[i]] - target_row[i]
+            if diff < 0:
+                diff = -diff
+            if diff > bound:
+                bound = diff
+        potentials[node] = bound
+        known[node] = 1
+    return potentials[node]
+
+
+@cython.cfunc
+@cython.inline
+@cython.boundscheck(False)
+@cython.initializedcheck(False)
+@cython.nonecheck(False)
+@cython.wraparound(False)
+@cython.exceptval(check=False)
+@cython.profile(False)
+@cython.returns(cython.long)
+def _hex_distance(positions: cython.long[:, :], left: cython.int, right: cython.int):
+    """
+    Distance in parsecs between two nodes' axial hex positions.
+    """
+    dq: cython.long = positions[left, 0] - positions[right, 0]
+    dr: cython.long = positions[left, 1] - positions[right, 1]
+    return (abs(dq) + abs(dr) + abs(dq + dr)) // 2
@@ -11,6 +11,12 @@ Compared to the ancestral networkx version of astar_path, this code:
     Takes an optional externally-supplied upper bound
         - Sanity and correctness of this upper bound are the _caller_'s responsibility
         - If the supplied upper bound produces a pathfinding failure, so be it
+    Takes an optional cap on route length in parsecs
+        - Every path the search can yet return extends one that's queued, so once every queued path's length so far,
+          plus the hex distance on to the target, runs past the cap, the route will too, and the search gives up
+          by raising RouteTooLongError, rather than the NetworkXNoPath it raises when there's no route within the
+          upper bound
+        - Until then, the search runs exactly as it would uncapped, so any route it does return is unchanged
     Grooms the node queue in the following cases:
         When a new upper bound is found, discards queue entries whose f-values bust the new upper bound
         When a _longer_ path is found to a previously-queued node, discards queue entries whose g-values bust
@@ -23,6 +29,8 @@ from heapq import heappop, heappush, heapify
 import networkx as nx
 import numpy as np
 
+from PyRoute.Errors.RouteTooLongError import RouteTooLongError
+
 float64max = np.finfo(np.float64).max
 
 
@@ -59,9 +67,12 @@ def _calc_branching_factor(nodes_queued, path_len):
     return round(new, 3)
 
 
-def astar_path_numpy(G, source, target, bulk_heuristic, upbound=float64max, diagnostics=False) -> tuple[list, dict]:
+def astar_path_numpy(G, source, target, bulk_heuristic, upbound=float64max, diagnostics=False,
+                     max_distance=float64max) -> tuple[list, dict]:
 
-    G_succ = G._arcs  # For speed-up
+    indptr = G._indptr  # For speed-up
+    indices = G._indices
+    weights = G._weights
 
     # pre-calc heuristics for all nodes to the target node
     potentials = bulk_heuristic(target)
@@ -83,6 +94,14 @@ def astar_path_numpy(G, source, target, bulk_heuristic, upbound=float64max, diag
     # Traces lowest distance from source node found for each node
     distances = np.ones(len(G)) * floatinf
     distances[source] = 0
+    # Traces length in parsecs of the path each node was explored along, which nodes have a queued path that could yet
+    # be extended to the target within max_distance, and how many of them there are
+    capped = max_distance < float64max
+    parsecs = np.zeros(len(G), dtype=np.int64)
+    to_target = G.distances_from_target(np.arange(len(G)), target) if capped else parsecs
+    counted = np.zeros(len(G), dtype=bool)
+    counted[source] = to_target[source] <= max_distance
+    within_cap = 1 if counted[source] else 0
 
     node_counter = 0
     queue_counter = 0
@@ -94,9 +113,16 @@ def astar_path_numpy(G, source, target, bulk_heuristic, upbound=float64max, diag
     revis_continue = 0
 
     while queue:
+        # Whatever's left in the queue can only lead to routes longer than max_distance
+        if capped and 0 == within_cap:
+            raise RouteTooLongError(f"Node {target} not reachable from {source} within {max_distance} parsecs")
         # Pop the smallest item from queue.
         _, dist, curnode, parent = heappop(queue)
         node_counter += 1
+        # Stale paths to a node always come off the queue after its live ones, so only the first pop counts
+        if capped and counted[curnode]:
+            counted[curnode] = False
+            within_cap -= 1
 
         if curnode == target:
             path = [curnode]
@@ -133,10 +159,13 @@ def astar_path_numpy(G, source, target, bulk_heuristic, upbound=float64max, diag
             distances[curnode] = dist
 
         explored[curnode] = parent
+        if capped and parent is not None:
+            parsecs[curnode] = parsecs[parent] + G.distances_from_target([parent], curnode)[0]
 
-        raw_nodes = G_succ[curnode]
-        active_nodes = raw_nodes[0]
-        active_weights = dist + raw_nodes[1]
+        row_start = indptr[curnode]
+        row_end = indptr[curnode + 1]
+        active_nodes = indices[row_start:row_end]
+        active_weights = dist + weights[row_start:row_end]
         augmented_weights = active_weights + potentials[active_nodes]
 
         # Even if we have the target node as a candidate neighbour, of itself, that's _no_ guarantee that the target
@@ -149,6 +178,16 @@ def astar_path_numpy(G, source, target, bulk_heuristic, upbound=float64max, diag
         active_weights = active_weights[keep]
         augmented_weights = augmented_weights[keep]
 
+        if capped:
+            # A strictly shorter path leaves those already queued to a node stale, taking them out of the count
+            stale = np.logical_and(counted[active_nodes], active_weights < distances[active_nodes])
+            within_cap -= np.count_nonzero(stale)
+            counted[active_nodes[stale]] = False
+            active_lengths = parsecs[curnode] + G.distances_from_target(active_nodes, curnode)
+            fresh = np.logical_and(~counted[active_nodes], active_lengths + to_target[active_nodes] <= max_distance)
+            within_cap += np.count_nonzero(fresh)
+            counted[active_nodes[fresh]] = True
+
         # Now unconditionally queue _all_ nodes that are still active, worrying about filtering out the bound-busting
         # neighbours later.
         distances[active_nodes] = active_weights
@@ -0,0 +1,12 @@
+# distutils: language = c++
+
+cdef extern from "_indexedheap.h" namespace "indexedheap":
+	cdef cppclass IndexedHeap[T]:
+		IndexedHeap()
+		void reset(size_t num_nodes, size_t arity)
+		size_t size()
+		bint contains(int node)
+		T peekmin()
+		bint push(T item)
+		T popmin()
+		void clear()
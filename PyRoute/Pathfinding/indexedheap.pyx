@@ -0,0 +1,3 @@
+# distutils: language = c++
+
+from indexedheap cimport IndexedHeap
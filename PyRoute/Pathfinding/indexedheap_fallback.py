@@ -0,0 +1,112 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+
+Pure-Python twin of the IndexedHeap in _indexedheap.h - an indexed d-ary min-heap holding at most one entry per graph
+node, with decrease-key.  Pushing a node that's already queued replaces its entry if the new priority is smaller, and
+is otherwise ignored, so there are never stale entries to discard when popping, and the heap never holds more entries
+than there are nodes.
+
+Priorities are anything comparable, and should order fully - eg the (label, node) tuples Dijkstra orders its queue on.
+Equal priorities come off in an order set by where they sit in the heap, not by when they were pushed.
+"""
+from typing import Any
+
+
+class IndexedHeap(object):
+
+    def __init__(self, num_nodes: int, arity: int = 4):
+        self.arity = max(2, arity)
+        self.priorities: list = []
+        self.nodes: list[int] = []
+        # Position of each node's entry in the heap, -1 if it's not queued
+        self.position = [-1] * num_nodes
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node: int) -> bool:
+        return 0 <= self.position[node]
+
+    def peekmin(self) -> tuple[Any, int]:
+        return self.priorities[0], self.nodes[0]
+
+    def push(self, node: int, priority: Any) -> bool:
+        """
+        Queue node, or, if it's already queued, lower its priority if the new one is smaller.  Returns whether the heap
+        changed.
+        """
+        pos = self.position[node]
+        if 0 > pos:
+            self.priorities.append(priority)
+            self.nodes.append(node)
+            self._siftup(len(self.nodes) - 1)
+            return True
+        if priority < self.priorities[pos]:
+            self.priorities[pos] = priority
+            self._siftup(pos)
+            return True
+        return False
+
+    def popmin(self) -> tuple[Any, int]:
+        priority = self.priorities[0]
+        node = self.nodes[0]
+        self.position[node] = -1
+        last_priority = self.priorities.pop()
+        last_node = self.nodes.pop()
+        if self.nodes:
+            self.priorities[0] = last_priority
+            self.nodes[0] = last_node
+            self._siftdown(0)
+        return priority, node
+
+    def clear(self) -> None:
+        for node in self.nodes:
+            self.position[node] = -1
+        self.priorities = []
+        self.nodes = []
+
+    def _siftup(self, i: int) -> None:
+        priorities = self.priorities
+        nodes = self.nodes
+        position = self.position
+        priority = priorities[i]
+        node = nodes[i]
+        while 0 < i:
+            parent = (i - 1) // self.arity
+            if not priority < priorities[parent]:
+                break
+            priorities[i] = priorities[parent]
+            nodes[i] = nodes[parent]
+            position[nodes[i]] = i
+            i = parent
+        priorities[i] = priority
+        nodes[i] = node
+        position[node] = i
+
+    def _siftdown(self, i: int) -> None:
+        priorities = self.priorities
+        nodes = self.nodes
+        position = self.position
+        priority = priorities[i]
+        node = nodes[i]
+        num = len(nodes)
+        while True:
+            first = i * self.arity + 1
+            if first >= num:
+                break
+            last = min(first + self.arity, num)
+            best = first
+            for child in range(first + 1, last):
+                if priorities[child] < priorities[best]:
+                    best = child
+            if not priorities[best] < priority:
+                break
+            priorities[i] = priorities[best]
+            nodes[i] = nodes[best]
+            position[nodes[i]] = i
+            i = best
+        priorities[i] = priority
+        nodes[i] = node
+        position[node] = i
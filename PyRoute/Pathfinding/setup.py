@@ -1,12 +1,25 @@
+import sys
+
 import numpy
-from setuptools import setup
+from setuptools import Extension, setup
 from Cython.Build import cythonize
 
+# The hi-hi raw-range scan runs its rows across OpenMP threads - Apple's clang doesn't ship OpenMP, so build it
+# single-threaded there
+if 'win32' == sys.platform:
+    openmp = ['/openmp']
+elif 'darwin' == sys.platform:
+    openmp = []
+else:
+    openmp = ['-fopenmp']
 
 setup(
     ext_modules=cythonize(
         ['astar_numpy.py', 'single_source_dijkstra_core.py', 'ApproximateShortestPathForestUnified.py',
-         'minmaxheap.pyx', 'TradeCalculationRawRoutes.py'],
+         'minmaxheap.pyx', 'indexedheap.pyx',
+         Extension('TradeCalculationRawRoutes', ['TradeCalculationRawRoutes.py'], extra_compile_args=openmp,
+                   extra_link_args=openmp),
+         'astar_bidirectional.py'],
         annotate=False
     ),
     include_dirs=[numpy.get_include()]
@@ -22,17 +22,19 @@ except AttributeError:
     from PyRoute.Pathfinding.single_source_dijkstra_core_fallback import dijkstra_core
 
 
-def implicit_shortest_path_dijkstra_distance_graph(graph, source, distance_labels, seeds=None, divisor=1.0, min_cost=None, max_labels=None) -> tuple:
+def implicit_shortest_path_dijkstra_distance_graph(graph, source, distance_labels, seeds=None, divisor=1.0, min_cost=None, max_labels=None, parents=None, changed=None) -> tuple:
     # return only distance_labels from the explicit version
     distance_labels, _, max_neighbour_labels, diagnostics = explicit_shortest_path_dijkstra_distance_graph(graph, source,
                                                                                               distance_labels, seeds,
                                                                                               divisor,
                                                                                               min_cost=min_cost,
-                                                                                              max_labels=max_labels)
+                                                                                              max_labels=max_labels,
+                                                                                              parents=parents,
+                                                                                              changed=changed)
     return distance_labels, max_neighbour_labels, diagnostics
 
 
-def explicit_shortest_path_dijkstra_distance_graph(graph, source, distance_labels, seeds=None, divisor=1.0, min_cost=None, max_labels=None) -> tuple:
+def explicit_shortest_path_dijkstra_distance_graph(graph, source, distance_labels, seeds=None, divisor=1.0, min_cost=None, max_labels=None, parents=None, changed=None) -> tuple:
     if not isinstance(source, int):
         raise ValueError("source must be integer")
     if not isinstance(distance_labels, np.ndarray):
@@ -52,6 +54,4 @@ def explicit_shortest_path_dijkstra_distance_graph(graph, source, distance_label
     min_cost = np.zeros(len(graph)) if min_cost is None else min_cost
     max_neighbour_labels = max_labels if max_labels is not None else np.ones(len(graph)) * float('+inf')  # pragma: no mutate
 
-    arcs = graph._arcs
-
-    return dijkstra_core(arcs, distance_labels, divisor, seeds, max_neighbour_labels, min_cost)
+    return dijkstra_core(graph._indptr, graph._indices, graph._weights, distance_labels, divisor, seeds, max_neighbour_labels, min_cost, parents, changed)
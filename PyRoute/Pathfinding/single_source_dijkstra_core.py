@@ -7,12 +7,18 @@ Created on Aug 19, 2024
 """
 import cython
 from cython.cimports.numpy import numpy as cnp
-from cython.cimports.minmaxheap import MinMaxHeap, dijkstra_t
+from cython.cimports.indexedheap import IndexedHeap
+from cython.cimports.minmaxheap import dijkstra_t
 
 import numpy as np
 
 cnp.import_array()
 ROOT_NODE: cython.const[cython.int] = -1
+# Children per node in the queue
+HEAP_ARITY: cython.const[cython.int] = 4
+# Reused across calls, so restarted runs that only touch a handful of nodes don't pay to size a fresh queue for the
+# whole graph
+_heap = cython.declare(IndexedHeap[dijkstra_t])
 
 
 @cython.ccall
@@ -20,10 +26,11 @@ ROOT_NODE: cython.const[cython.int] = -1
 @cython.initializedcheck(False)
 @cython.nonecheck(False)
 @cython.wraparound(False)
-def dijkstra_core(arcs: cython.list[cython.ctuple[cnp.ndarray[cython.int], cnp.ndarray[cython.float]]],
+def dijkstra_core(indptr: cython.long[:], indices: cython.long[:], weights: cython.double[:],
                   distance_labels: cnp.ndarray[cython.float], divisor: cython.float,
                   seeds: cython.list[cython.int],
-                  max_neighbour_labels: cnp.ndarray[cython.float], min_cost: cnp.ndarray[cython.float]) -> tuple:
+                  max_neighbour_labels: cnp.ndarray[cython.float], min_cost: cnp.ndarray[cython.float],
+                  parents: cnp.ndarray = None, changed: list = None) -> tuple:
     if not isinstance(min_cost, cnp.ndarray):
         raise ValueError("min_cost must be ndarray")
     if not isinstance(max_neighbour_labels, cnp.ndarray):
@@ -33,41 +40,43 @@ def dijkstra_core(arcs: cython.list[cython.ctuple[cnp.ndarray[cython.int], cnp.n
     if not 0 < divisor <= 1.0:
         raise ValueError("divisor must be positive and <= 1.0")
 
-    neighbours: cython.ctuple[cnp.ndarray[cython.int], cnp.ndarray[cython.float]]
     act_wt: cython.float
     act_nod: cython.int
-    num_nodes: cython.size_t
     index: cython.size_t
     distance_labels_view: cython.double[:] = distance_labels
     max_neighbour_labels_view: cython.double[:] = max_neighbour_labels
     min_cost_view: cython.double[:] = min_cost
-    # Using -100 to track "not considered during processing"
-    parents: cnp.ndarray[cython.int] = np.ones(len(arcs), dtype=np.int64) * -100
+    # A caller-supplied parents array is updated in place, with the caller having already set seeds' parents -
+    # otherwise, start a fresh one, using -100 to track "not considered during processing"
+    fresh_parents: cython.bint = parents is None
+    if fresh_parents:
+        parents = np.ones(len(indptr) - 1, dtype=np.int64) * -100
     parents_view: cython.long[:] = parents
-    active_nodes_view: cython.long[:]
-    active_costs_view: cython.double[:]
     tail: cython.int
     dist_tail: cython.float
-    heap: MinMaxHeap[dijkstra_t]
     nodes_processed: cython.int = 0
     nodes_queued: cython.int = 0
     nodes_exceeded: cython.int = 0
     nodes_min_exceeded: cython.int = 0
     nodes_tailed: cython.int = 0
     max_label: cython.float
+    # Callers watching for changes get every node whose label drops appended to changed
+    track_changes: cython.bint = changed is not None
 
-    heap = MinMaxHeap[dijkstra_t]()
-    heap.reserve(len(seeds))
+    # Labels only ever drop while the queue is live, so decreasing a queued node's key in place leaves nothing stale
+    # to pop
+    _heap.reset(len(indptr) - 1, HEAP_ARITY)
     for index in range(0, len(seeds)):
         act_nod = seeds[index]
-        if ROOT_NODE == parents_view[act_nod]:
-            continue
-        parents_view[act_nod] = ROOT_NODE
-        heap.insert({'act_wt': distance_labels_view[act_nod], 'act_nod': act_nod})
+        if fresh_parents:
+            if ROOT_NODE == parents_view[act_nod]:
+                continue
+            parents_view[act_nod] = ROOT_NODE
+        _heap.push({'act_wt': distance_labels_view[act_nod], 'act_nod': act_nod})
         nodes_queued += 1
 
-    while 0 < heap.size():
-        result = heap.popmin()
+    while 0 < _heap.size():
+        result = _heap.popmin()
         dist_tail = result.act_wt
         tail = result.act_nod
 
@@ -84,17 +93,12 @@ def dijkstra_core(arcs: cython.list[cython.ctuple[cnp.ndarray[cython.int], cnp.n
         # the corresponding node's distance label at the other end of the candidate edge, trim that edge.  Such edges
         # cannot _possibly_ result in smaller distance labels.  By a similar argument, filter the remaining edges
         # when the sum of dist_tail and that edge's weight equals or exceeds the corresponding node's distance label.
-        neighbours = arcs[tail]
-        active_nodes_view = neighbours[0]
-        num_nodes = len(active_nodes_view)
-
-        active_costs_view = neighbours[1]
         max_label = 0
 
         # update max_label while processing neighbours, as we've got the lid off anyway
-        for index in range(0, num_nodes):
-            act_nod = active_nodes_view[index]
-            act_cost = active_costs_view[index]
+        for index in range(indptr[tail], indptr[tail + 1]):
+            act_nod = indices[index]
+            act_cost = weights[index]
             if dist_tail + act_cost >= distance_labels_view[act_nod]:
                 if distance_labels_view[act_nod] > max_label:
                     max_label = distance_labels_view[act_nod]
@@ -106,7 +110,12 @@ def dijkstra_core(arcs: cython.list[cython.ctuple[cnp.ndarray[cython.int], cnp.n
 
             distance_labels_view[act_nod] = act_wt
             parents_view[act_nod] = tail
-            heap.insert({'act_wt': act_wt, 'act_nod': act_nod})
+            if track_changes:
+                changed.append(act_nod)
+            # Replacing a queued entry in place drops what would otherwise be a stale entry, popped and thrown out
+            if _heap.contains(act_nod):
+                nodes_exceeded += 1
+            _heap.push({'act_wt': act_wt, 'act_nod': act_nod})
             nodes_queued += 1
 
         max_neighbour_labels_view[tail] = max_label
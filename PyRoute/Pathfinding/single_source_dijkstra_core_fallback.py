@@ -3,11 +3,13 @@ Created on 15 Sep, 2024
 
 @author: CyberiaResurrection
 """
-import heapq
 import numpy as np
 
+from PyRoute.Pathfinding.indexedheap_fallback import IndexedHeap
 
-def dijkstra_core(arcs, distance_labels, divisor, seeds, max_neighbour_labels, min_cost) -> tuple:
+
+def dijkstra_core(indptr, indices, weights, distance_labels, divisor, seeds, max_neighbour_labels, min_cost,
+                  parents=None, changed=None) -> tuple:
     if not isinstance(min_cost, np.ndarray):
         raise ValueError("min_cost must be ndarray")
     if not isinstance(max_neighbour_labels, np.ndarray):
@@ -19,28 +21,39 @@ def dijkstra_core(arcs, distance_labels, divisor, seeds, max_neighbour_labels, m
     if not 0 < divisor <= 1.0:
         raise ValueError("divisor must be positive and <= 1.0")
 
-    heap = [(distance_labels[seed], seed) for seed in seeds if 0 < len(arcs[seed][0])]  # pragma: no mutate
-    heapq.heapify(heap)
+    # Labels only ever drop while the queue is live, so decreasing a queued node's key in place leaves nothing stale
+    # to pop.  Ties on label are broken on node index.
+    heap = IndexedHeap(len(indptr) - 1)
+    for seed in seeds:
+        if indptr[seed] < indptr[seed + 1]:  # pragma: no mutate
+            heap.push(seed, (distance_labels[seed], seed))
     diagnostics = {'nodes_processed': 0, 'nodes_queued': len(heap), 'nodes_exceeded': 0, 'nodes_min_exceeded': 0,
                    'nodes_tailed': 0}
 
-    parents = np.ones(len(arcs), dtype=int) * -100  # Using -100 to track "not considered during processing"
-    parents[list(seeds)] = -1  # Using -1 to flag "root node of tree"
+    # A caller-supplied parents array is updated in place, with the caller having already set seeds' parents
+    if parents is None:
+        parents = np.ones(len(indptr) - 1, dtype=int) * -100  # Using -100 to track "not considered during processing"
+        parents[list(seeds)] = -1  # Using -1 to flag "root node of tree"
+
+    # A queue without decrease-key would hold a stale entry for each one replaced here, and the first of them to be
+    # popped would count as exceeded and sweep out the rest, as would any other bad pop.  Keep the smallest entry
+    # replaced since the last such sweep, to count exceeded nodes the same way.
+    replaced = None
 
     while heap:
-        dist_tail, tail = heapq.heappop(heap)
+        priority, _ = heap.peekmin()
+        if replaced is not None and replaced < priority:
+            diagnostics['nodes_exceeded'] += 1
+            replaced = None
+        (dist_tail, _), tail = heap.popmin()
 
         if dist_tail > distance_labels[tail] or dist_tail + min_cost[tail] > max_neighbour_labels[tail]:  # pragma: no mutate
-            # Since we've just dequeued a bad node (distance exceeding its current label, or too close to max-label),
-            # remove other bad nodes from the list to avoid tripping over them later, and chuck out nodes who
-            # can't give better distance labels
+            # Chuck out nodes who can't give better distance labels
             if dist_tail > distance_labels[tail] - 1e-8:  # pragma: no mutate
                 diagnostics['nodes_exceeded'] += 1
             else:
                 diagnostics['nodes_min_exceeded'] += 1  # pragma: no mutate
-            if heap:
-                heap = [(distance, tail) for (distance, tail) in heap if distance <= distance_labels[tail]]  # pragma: no mutate
-                heapq.heapify(heap)
+            replaced = None
             continue
 
         diagnostics['nodes_processed'] += 1
@@ -49,9 +62,9 @@ def dijkstra_core(arcs, distance_labels, divisor, seeds, max_neighbour_labels, m
         # the corresponding node's distance label at the other end of the candidate edge, trim that edge.  Such edges
         # cannot _possibly_ result in smaller distance labels.  By a similar argument, filter the remaining edges
         # when the sum of dist_tail and that edge's weight equals or exceeds the corresponding node's distance label.
-        neighbours = arcs[tail]
-        active_nodes = neighbours[0]
-        active_costs = neighbours[1]
+        neighbours = indices[indptr[tail]:indptr[tail + 1]]
+        active_nodes = neighbours
+        active_costs = weights[indptr[tail]:indptr[tail + 1]]
         # It's not worth (time wise) being cute and trying to break this up, forcing jumps in and out of numpy
         keep = active_costs < (distance_labels[active_nodes] - dist_tail)  # pragma: no mutate
         active_nodes = active_nodes[keep]
@@ -61,25 +74,25 @@ def dijkstra_core(arcs, distance_labels, divisor, seeds, max_neighbour_labels, m
             diagnostics['nodes_tailed'] += 1
             continue
         active_weights = dist_tail + divisor * active_costs[keep]
+        # Each queued node's entry is keyed on its label, until that label drops below it
+        for node in active_nodes:
+            if node in heap and (replaced is None or (distance_labels[node], node) < replaced):
+                replaced = (distance_labels[node], node)
         distance_labels[active_nodes] = active_weights
 
         parents[active_nodes] = tail
+        # Callers watching for changes get every node whose label drops appended to changed
+        if changed is not None:
+            changed.extend(active_nodes.tolist())
 
         # update max label _after_ neighbours are processed, to minimise the max_label as far as possible
-        max_neighbour_labels[tail] = max(distance_labels[neighbours[0]])
+        max_neighbour_labels[tail] = max(distance_labels[neighbours])
         diagnostics['nodes_queued'] += num_nodes
 
-        if 1 == num_nodes:
-            heapq.heappush(heap, (active_weights[0], active_nodes[0]))
-        elif 2 == num_nodes:  # pragma: no mutate
-            heapq.heappush(heap, (active_weights[0], active_nodes[0]))
-            heapq.heappush(heap, (active_weights[1], active_nodes[1]))
-        elif 3 == num_nodes:  # pragma: no mutate
-            heapq.heappush(heap, (active_weights[0], active_nodes[0]))
-            heapq.heappush(heap, (active_weights[1], active_nodes[1]))
-            heapq.heappush(heap, (active_weights[2], active_nodes[2]))
-        else:  # Only cop the iterator overhead if there's at least 4 neighbours to queue
-            for index in range(num_nodes):
-                heapq.heappush(heap, (active_weights[index], active_nodes[index]))
+        for index in range(num_nodes):
+            heap.push(active_nodes[index], (active_weights[index], active_nodes[index]))
+
+    if replaced is not None:
+        diagnostics['nodes_exceeded'] += 1
 
     return distance_labels, parents, max_neighbour_labels, diagnostics
@@ -48,6 +48,9 @@ class Hex(object):
         self.dx = sector.x * 32 + self.col - 1
         self.dy = sector.y * 40 + self.row - 1
         self.q, self.r = Hex.hex_to_axial(self.dx, Hex.dy_offset(self.row, sector.y))
+        self.calc_hash()
+
+    def calc_hash(self) -> None:
         self._hash = hash((self.position, self.dx, self.dy))
 
     def __str__(self):
@@ -139,10 +139,11 @@ class Star(object):
         setattr(self, key, value)
 
     @staticmethod
-    def parse_line_into_star(line, sector, pop_code, ru_calc, fix_pop=False, fix_econ=False):
+    def parse_line_into_star(line, sector, pop_code, ru_calc, fix_pop=False, fix_econ=False, column_parser=None):
         from PyRoute.Inputs.ParseStarInput import ParseStarInput
         star = Star()
-        return ParseStarInput.parse_line_into_star_core(star, line, sector, pop_code, ru_calc, fix_pop=fix_pop, fix_econ=fix_econ)
+        return ParseStarInput.parse_line_into_star_core(star, line, sector, pop_code, ru_calc, fix_pop=fix_pop,
+                                                        fix_econ=fix_econ, column_parser=column_parser)
 
     def parse_to_line(self) -> str:
         result = str(self.position) + " "
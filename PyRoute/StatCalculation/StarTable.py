@@ -0,0 +1,288 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+
+Columnar star table for the statistics calculation.  Rather than calling StatCalculation.add_stats once per star per
+ObjectStatistics it rolls up into - sector, galaxy, subsector, allegiances at each level and UWP collections - each
+star's values are pulled out once into NumPy columns, each (star, statistics) pairing is noted as a member, and then:
+    Numeric totals are added up per statistics with np.add.at, which adds members in order, so float totals come out
+        the same as adding star by star
+    Maximum TL, population code and starport go through np.maximum.at and np.minimum.at, for those members that take
+        them
+    Counters - port sizes, trade codes, bases, star counts and primary types - and sophont populations are grouped
+        by (statistics, key), then written back in the order each key first turns up, so dict ordering is unchanged
+    Homeworld lists are appended to member by member, as they're short
+"""
+from typing import Callable, Optional
+
+import numpy as np
+
+from PyRoute.Star import Star
+from PyRoute.StatCalculation.ObjectStatistics import ObjectStatistics
+
+
+class StarTable(object):
+
+    # ObjectStatistics fields summed from integer columns
+    int_fields = ('population', 'economy', 'number', 'sum_ru', 'shipyards', 'tradeVol', 'passengers', 'spa_people',
+                  'gg_count', 'worlds', 'stars', 'eti_worlds', 'eti_cargo', 'eti_pass')
+    # ObjectStatistics fields summed from columns that can hold ints or floats
+    float_fields = ('col_be', 'im_be')
+    # ObjectStatistics counter dicts
+    counter_fields = ('port_size', 'code_counts', 'bases', 'star_count', 'primary_count')
+    ports = 'ABCDEX?'
+    split_bases = {'A': 'NS', 'B': 'NW', 'F': 'KM', 'H': 'CK', 'U': 'TR', 'Z': 'KM'}
+
+    def __init__(self, stars: list[Star], sophont_populations: Callable):
+        """
+        :param stars: Stars to tabulate, in the order they'd be added to statistics one by one
+        :param sophont_populations: As StatCalculation.sophont_populations, called once for each star's first
+        statistics and again, if the first call suppressed the star's sophont percent warning, for the rest
+        """
+        self.stars = stars
+        self.sophont_populations = sophont_populations
+        num_stars = len(stars)
+
+        ints = np.zeros((num_stars, len(self.int_fields)), dtype=np.int64)
+        floats = np.zeros((num_stars, len(self.float_fields)), dtype=np.float64)
+        is_float = np.zeros((num_stars, len(self.float_fields)), dtype=bool)
+        self.tl = np.zeros(num_stars, dtype=np.int64)
+        self.pop_code = np.zeros(num_stars, dtype=np.int64)
+        self.port = np.zeros(num_stars, dtype=np.int64)
+        self.homeworld = np.zeros(num_stars, dtype=bool)
+        # Counter keys, interned per counter, and each star's keys end to end
+        self.keys: dict[str, list] = {field: [] for field in self.counter_fields}
+        key_ids: dict[str, dict] = {field: {} for field in self.counter_fields}
+        star_keys: dict[str, list[int]] = {field: [] for field in self.counter_fields}
+        key_lengths: dict[str, list[int]] = {field: [] for field in self.counter_fields}
+        base_mapping = ObjectStatistics.base_mapping
+
+        for pos, star in enumerate(stars):
+            star_list = star.star_list
+            ints[pos] = (star.population, star.gwp, 1, star.ru, star.ship_capacity, star.tradeOver + star.tradeIn,
+                         star.passIn, star.starportPop, 1 if star.ggCount else 0, star.worlds,
+                         len(star_list) if star_list else 0,
+                         1 if star.eti_cargo_volume > 0 or star.eti_pass_volume > 0 else 0,
+                         star.eti_cargo_volume, star.eti_pass_volume)
+            for i, value in enumerate((star.col_be, star.im_be)):
+                floats[pos, i] = value
+                is_float[pos, i] = isinstance(value, float)
+            self.tl[pos] = star.tl
+            self.pop_code[pos] = star.popCode
+            self.port[pos] = self.ports.index(star.uwpCodes['Starport'])
+            self.homeworld[pos] = bool(star.tradeCode.homeworld)
+
+            bases: list[str] = []
+            for code in star.baseCode:
+                if code != '-':
+                    bases.extend(base_mapping[item] for item in self.split_bases.get(code, code))
+            counters: dict[str, list] = {'port_size': [star.starportSize, star.port],
+                                         'code_counts': star.tradeCode.codes, 'bases': bases,
+                                         'star_count': [], 'primary_count': []}
+            if star_list:
+                primary_type = star.primary_type
+                assert primary_type is not None, "Null primary type will blow up templating"
+                counters['star_count'] = [len(star_list)]
+                counters['primary_count'] = [primary_type]
+            for field, keys in counters.items():
+                ids = key_ids[field]
+                for key in keys:
+                    if key not in ids:
+                        ids[key] = len(self.keys[field])
+                        self.keys[field].append(key)
+                    star_keys[field].append(ids[key])
+                key_lengths[field].append(len(keys))
+
+        self.ints = ints
+        self.floats = floats
+        self.is_float = is_float
+        self.star_keys = {field: np.array(star_keys[field], dtype=np.int64) for field in self.counter_fields}
+        self.key_offsets = {field: self._offsets(key_lengths[field]) for field in self.counter_fields}
+
+        # Statistics the stars are added to, and members - star position, statistics index, whether it takes max TL
+        self.targets: list[ObjectStatistics] = []
+        self.target_ids: dict[int, int] = {}
+        self.member_stars: list[int] = []
+        self.member_targets: list[int] = []
+        self.member_max_tl: list[bool] = []
+
+    @staticmethod
+    def _offsets(lengths: list[int]) -> np.ndarray:
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return offsets
+
+    @staticmethod
+    def _expand(offsets: np.ndarray, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Join rows against CSR-style offsets, returning, for each item of each row in turn, the position in rows it
+        came from and its item index.
+        """
+        lengths = offsets[rows + 1] - offsets[rows]
+        total = int(lengths.sum())
+        source = np.repeat(np.arange(len(rows), dtype=np.int64), lengths)
+        ends = np.cumsum(lengths)
+        items = np.arange(total, dtype=np.int64) - np.repeat(ends - lengths, lengths) + np.repeat(offsets[rows], lengths)
+        return source, items
+
+    @staticmethod
+    def _first_seen(combined: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Distinct values in combined, in the order they first turn up, along with each item's group and each group's
+        item count.
+        """
+        uniques, first, inverse, counts = np.unique(combined, return_index=True, return_inverse=True,
+                                                    return_counts=True)
+        order = np.argsort(first, kind='stable')
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order), dtype=np.int64)
+        return uniques[order], rank[inverse], counts[order]
+
+    def add(self, pos: int, stats: ObjectStatistics, max_tl: bool = False) -> None:
+        """
+        Note that the star at pos is to be added to stats, as by StatCalculation.add_stats, and also, if max_tl is set,
+        by StatCalculation.max_tl.  Each star's statistics must be added in the order add_stats would be called.
+        """
+        target = self.target_ids.get(id(stats))
+        if target is None:
+            target = len(self.targets)
+            self.target_ids[id(stats)] = target
+            self.targets.append(stats)
+        self.member_stars.append(pos)
+        self.member_targets.append(target)
+        self.member_max_tl.append(max_tl)
+
+    def aggregate(self) -> None:
+        """
+        Roll each star up into the statistics it was added to.
+        """
+        stars = np.array(self.member_stars, dtype=np.int64)
+        targets = np.array(self.member_targets, dtype=np.int64)
+        self._add_totals(stars, targets)
+        self._add_max_tl(stars, targets)
+        for field in self.counter_fields:
+            self._add_counter(field, stars, targets)
+        for member in np.flatnonzero(self.homeworld[stars]).tolist():
+            self.targets[self.member_targets[member]].homeworlds.append(self.stars[self.member_stars[member]])
+        self._add_sophonts(stars, targets)
+
+    def _add_totals(self, stars: np.ndarray, targets: np.ndarray) -> None:
+        num_targets = len(self.targets)
+        ints = np.array([[stats[field] for field in self.int_fields] for stats in self.targets], dtype=np.int64)
+        ints = ints.reshape(num_targets, len(self.int_fields))
+        np.add.at(ints, targets, self.ints[stars])
+        floats = np.array([[stats[field] for field in self.float_fields] for stats in self.targets], dtype=np.float64)
+        floats = floats.reshape(num_targets, len(self.float_fields))
+        np.add.at(floats, targets, self.floats[stars])
+        # A total only turns float once a float is added to it
+        any_float = np.array([[isinstance(stats[field], float) for field in self.float_fields]
+                              for stats in self.targets], dtype=bool).reshape(num_targets, len(self.float_fields))
+        np.logical_or.at(any_float, targets, self.is_float[stars])
+
+        for stats, int_row, float_row, float_flags in zip(self.targets, ints.tolist(), floats.tolist(),
+                                                          any_float.tolist()):
+            for field, value in zip(self.int_fields, int_row):
+                stats[field] = value
+            for field, value, is_float in zip(self.float_fields, float_row, float_flags):
+                stats[field] = value if is_float else int(value)
+
+    def _add_max_tl(self, stars: np.ndarray, targets: np.ndarray) -> None:
+        taking = np.array(self.member_max_tl, dtype=bool)
+        stars = stars[taking]
+        targets = targets[taking]
+        max_tl = np.array([stats.maxTL for stats in self.targets], dtype=np.int64)
+        max_pop = np.array([stats.maxPop for stats in self.targets], dtype=np.int64)
+        max_port = np.array([self.ports.index(stats.maxPort) for stats in self.targets], dtype=np.int64)
+        np.maximum.at(max_tl, targets, self.tl[stars])
+        np.maximum.at(max_pop, targets, self.pop_code[stars])
+        np.minimum.at(max_port, targets, self.port[stars])
+        for target in np.unique(targets).tolist():
+            stats = self.targets[target]
+            stats.maxTL = int(max_tl[target])
+            stats.maxPop = int(max_pop[target])
+            stats.maxPort = self.ports[max_port[target]]
+
+    def _add_counter(self, field: str, stars: np.ndarray, targets: np.ndarray) -> None:
+        source, items = self._expand(self.key_offsets[field], stars)
+        if 0 == len(items):
+            return
+        keys = self.keys[field]
+        num_keys = len(keys)
+        groups, _, counts = self._first_seen(targets[source] * num_keys + self.star_keys[field][items])
+        for group, count in zip(groups.tolist(), counts.tolist()):
+            self.targets[group // num_keys][field][keys[group % num_keys]] += count
+
+    def _add_sophonts(self, stars: np.ndarray, targets: np.ndarray) -> None:
+        # Each star gets two rows of sophont populations - one for its first statistics, one for the rest, as the
+        # first can suppress the star's sophont percent warning and so change what the rest add
+        first = np.ones(len(stars), dtype=bool)
+        first[1:] = stars[1:] != stars[:-1]
+        rows = 2 * stars + np.where(first, 0, 1)
+        has_row = np.zeros(2 * len(self.stars), dtype=bool)
+        has_row[rows] = True
+
+        codes: list[str] = []
+        code_ids: dict[str, int] = {}
+        item_codes: list[int] = []
+        item_populations: list[int] = []
+        item_homes: list[Optional[Star]] = []
+        item_dieback: list[bool] = []
+        row_lengths: list[int] = []
+        for pos, star in enumerate(self.stars):
+            entries: list = []
+            rest: Optional[list] = []
+            if has_row[2 * pos]:
+                suppressed = star.suppress_soph_percent_warning
+                entries = self.sophont_populations(star)
+                rest = entries if suppressed == star.suppress_soph_percent_warning else None
+            if not has_row[2 * pos + 1]:
+                rest = []
+            elif rest is None:
+                rest = self.sophont_populations(star)
+            for row in (entries, rest):
+                for soph_code, population, home in row:
+                    if soph_code not in code_ids:
+                        code_ids[soph_code] = len(codes)
+                        codes.append(soph_code)
+                    item_codes.append(code_ids[soph_code])
+                    item_populations.append(0 if population is None else population)
+                    item_homes.append(home)
+                    item_dieback.append(population is None)
+                row_lengths.append(len(row))
+
+        source, items = self._expand(self._offsets(row_lengths), rows)
+        if 0 == len(items):
+            return
+        num_codes = len(codes)
+        groups, group_of, _ = self._first_seen(targets[source] * num_codes + np.array(item_codes, dtype=np.int64)[items])
+        populations = np.zeros(len(groups), dtype=np.int64)
+        np.add.at(populations, group_of, np.array(item_populations, dtype=np.int64)[items])
+        dieback = np.array(item_dieback, dtype=bool)[items]
+        counts = np.zeros(len(groups), dtype=np.int64)
+        np.add.at(counts, group_of, ~dieback)
+        has_dieback = np.zeros(len(groups), dtype=bool)
+        has_dieback[group_of[dieback]] = True
+
+        # Create each statistics' populations in the order they first turn up
+        group_stats = [self.targets[group // num_codes].populations[codes[group % num_codes]]
+                       for group in groups.tolist()]
+        for stats, population, count, replay in zip(group_stats, populations.tolist(), counts.tolist(),
+                                                    has_dieback.tolist()):
+            if not replay:
+                stats.count += count
+                stats.population += population
+        # Dieback or extinct sophonts reset the population, so their groups are replayed item by item
+        replays = np.flatnonzero(has_dieback[group_of])
+        replays = replays[np.argsort(group_of[replays], kind='stable')]
+        for group, item in zip(group_of[replays].tolist(), items[replays].tolist()):
+            stats = group_stats[group]
+            if item_dieback[item]:
+                stats.population = -1
+            else:
+                stats.count += 1
+                stats.population += item_populations[item]
+
+        has_home = np.array([home is not None for home in item_homes], dtype=bool)[items] & ~dieback
+        for position in np.flatnonzero(has_home).tolist():
+            group_stats[group_of[position]].homeworlds.append(item_homes[items[position]])
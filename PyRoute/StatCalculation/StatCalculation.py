@@ -5,11 +5,13 @@ Created on Mar 17, 2014
 """
 import logging
 import math
+from typing import Optional
 
 from PyRoute.Star import Star
 from PyRoute.wikistats import WikiStats
 from PyRoute.Allies.AllyGen import AllyGen
 from PyRoute.StatCalculation.ObjectStatistics import ObjectStatistics
+from PyRoute.StatCalculation.StarTable import StarTable
 from PyRoute.StatCalculation.UWPCollection import UWPCollection
 
 
@@ -24,6 +26,9 @@ class StatCalculation(object):
         self.galaxy = galaxy
         self.all_uwp = UWPCollection()
         self.imp_uwp = UWPCollection()
+        # Number of processes to render sector wiki pages over, and whether to leave unchanged pages alone
+        self.wiki_workers = 1
+        self.wiki_manifest = False
 
     def calculate_statistics(self, ally_match) -> None:
         self.galaxy.trade.is_sector_trade_balanced()
@@ -35,41 +40,48 @@ class StatCalculation(object):
         self.galaxy.trade.cross_check_totals()
 
         self.logger.info('Calculating statistics for {:d} worlds'.format(len(self.galaxy.stars)))
-        for sector in self.galaxy.sectors.values():
-            for star in sector.worlds:
-                star.starportSize = max(self.trade_to_btn(star.tradeIn + star.tradeOver) - 5, 0)
-                star.uwpCodes['Starport Size'] = star.starportSize
-                # Budget in MCr
-                star.starportBudget = \
-                    ((star.tradeIn // 10000) * 150 + (star.tradeOver // 10000) * 140 +  # pragma: no mutate
-                     (star.passIn) * 500 + (star.passOver) * 460) // 1000000  # pragma: no mutate
-
-                # Population in people employed.
-                star.starportPop = int(star.starportBudget / 0.2)
-
-                self.add_stats(sector.stats, star)
-                self.add_stats(self.galaxy.stats, star)
-                self.add_stats(sector.subsectors[star.subsector()].stats, star)
-
-                self.max_tl(sector.stats, star)
-                self.max_tl(sector.subsectors[star.subsector()].stats, star)
-
-                self.add_alg_stats(self.galaxy, star, star.alg_code)
-                self.add_alg_stats(sector, star, star.alg_code)
-                self.add_alg_stats(sector.subsectors[star.subsector()], star, star.alg_code)
-
-                if star.alg_base_code != star.alg_code:
-                    self.add_alg_stats(self.galaxy, star, star.alg_base_code)
-                    self.add_alg_stats(sector, star, star.alg_base_code)
-                    self.add_alg_stats(sector.subsectors[star.subsector()], star, star.alg_base_code)
-
-                if AllyGen.imperial_align(star.alg_code):
-                    for uwpCode, uwpValue in star.uwpCodes.items():
-                        self.add_stats(self.imp_uwp.stats(uwpCode, uwpValue), star)
-
-                for uwpCode, uwpValue in star.uwpCodes.items():
-                    self.add_stats(self.all_uwp.stats(uwpCode, uwpValue), star)
+        stars = [star for sector in self.galaxy.sectors.values() for star in sector.worlds]
+        for star in stars:
+            star.starportSize = max(self.trade_to_btn(star.tradeIn + star.tradeOver) - 5, 0)
+            star.uwpCodes['Starport Size'] = star.starportSize
+            # Budget in MCr
+            star.starportBudget = \
+                ((star.tradeIn // 10000) * 150 + (star.tradeOver // 10000) * 140 +  # pragma: no mutate
+                 (star.passIn) * 500 + (star.passOver) * 460) // 1000000  # pragma: no mutate
+
+            # Population in people employed.
+            star.starportPop = int(star.starportBudget / 0.2)
+
+        # Note which statistics each star adds to, in add_stats order, then add them all up in one go
+        table = StarTable(stars, self.sophont_populations)
+        all_uwp: dict[tuple[str, str], ObjectStatistics] = {}
+        imp_uwp: dict[tuple[str, str], ObjectStatistics] = {}
+        sectors = [sector for sector in self.galaxy.sectors.values() for _ in sector.worlds]
+        for pos, (star, sector) in enumerate(zip(stars, sectors)):
+            subsector = sector.subsectors[star.subsector()]
+            table.add(pos, sector.stats, True)
+            table.add(pos, self.galaxy.stats)
+            table.add(pos, subsector.stats, True)
+
+            alg_codes = [star.alg_code] if star.alg_base_code == star.alg_code else [star.alg_code, star.alg_base_code]
+            for alg in alg_codes:
+                table.add(pos, self.galaxy.alg[alg].stats, True)
+                table.add(pos, sector.alg[alg].stats, True)
+                table.add(pos, subsector.alg[alg].stats, True)
+
+            if AllyGen.imperial_align(star.alg_code):
+                for uwp in star.uwpCodes.items():
+                    if uwp not in imp_uwp:
+                        imp_uwp[uwp] = self.imp_uwp.stats(*uwp)
+                    table.add(pos, imp_uwp[uwp])
+
+            for uwp in star.uwpCodes.items():
+                if uwp not in all_uwp:
+                    all_uwp[uwp] = self.all_uwp.stats(*uwp)
+                table.add(pos, all_uwp[uwp])
+        table.aggregate()
 
+        for sector in self.galaxy.sectors.values():
             self.per_capita(sector.worlds, sector.stats)  # Per capita sector stats
             sector.alg_sorted = AllyGen.sort_allegiances(sector.alg, ally_match)
             for alg in sector.alg_sorted:
@@ -105,6 +117,19 @@ class StatCalculation(object):
         self.max_tl(algStats, star)
 
     def add_pop_to_sophont(self, stats, star) -> None:
+        for soph_code, population, home in self.sophont_populations(star):
+            # Soph_pct == 'X' is dieback or extinct.
+            if population is None:
+                stats.populations[soph_code].population = -1
+            else:
+                stats.populations[soph_code].add_population(population, home)
+
+    def sophont_populations(self, star) -> list[tuple[str, Optional[int], Optional[Star]]]:
+        """
+        Star's population split by sophont, as (sophont code, population, homeworld) in the order they're added, with a
+        population of None for a dieback or extinct sophont.
+        """
+        result: list[tuple[str, Optional[int], Optional[Star]]] = []
         total_pct = 100.0
         default_soph = 'Huma'
         home = None
@@ -129,10 +154,10 @@ class StatCalculation(object):
 
             # Soph_pct == 'X' is dieback or extinct.
             if old_soph_pct == 'X':
-                stats.populations[soph_code].population = -1
+                result.append((soph_code, None, home))
             # skip the empty worlds
             elif not star.tradeCode.barren:
-                stats.populations[soph_code].add_population(int(star.population * (soph_pct / 100.0)), home)
+                result.append((soph_code, int(star.population * (soph_pct / 100.0)), home))
 
             total_pct -= soph_pct
 
@@ -148,7 +173,8 @@ class StatCalculation(object):
             self.logger.info("{} has a sophont percent just over 100%: {}".format(star, total_pct))
             star.suppress_soph_percent_warning = True
         elif not star.tradeCode.barren:
-            stats.populations[default_soph].add_population(int(star.population * (total_pct / 100.0)), None)
+            result.append((default_soph, int(star.population * (total_pct / 100.0)), None))
+        return result
 
     def add_stats(self, stats, star) -> None:
         stats.population += star.population
@@ -271,7 +297,8 @@ class StatCalculation(object):
         self._write_statistics_to_wiki(ally_count, ally_match, json_data)
 
     def _write_statistics_to_wiki(self, ally_count, ally_match, json_data):
-        wiki = WikiStats(self.galaxy, self.all_uwp, ally_count, ally_match, json_data)  # pragma: no mutate
+        wiki = WikiStats(self.galaxy, self.all_uwp, ally_count, ally_match, json_data,  # pragma: no mutate
+                         workers=self.wiki_workers, manifest=self.wiki_manifest)  # pragma: no mutate
         wiki.write_statistics()  # pragma: no mutate
 
     @staticmethod
@@ -1,6 +1,8 @@
 import functools
+from collections.abc import MutableMapping
 from math import ceil
 import logging
+from typing import Iterator, Optional
 
 from PyRoute.Star import Star
 
@@ -132,3 +134,210 @@ class TradeBalance(dict):
         if name_from <= name_to:
             return (name_from, name_to)
         return (name_to, name_from)
+
+
+class IndexedTradeBalance(MutableMapping):
+    """
+    Drop-in replacement for TradeBalance that stores its balances against small integers, rather than a dict keyed on
+    tuples of region names.  Compared to TradeBalance, this code:
+        Interns each region name, and each pair of region names, the first time it turns up
+        Keeps each region's single-unit imbalance up to date as balances change, rather than summing them up afresh
+        Keeps each region's pairs in the order they were added, so multilateral balancing finds a region's first two
+            positive-balance pairs by walking forward through them, once per balancing run, rather than scanning every
+            pair for every over-threshold region
+        Skips checking keys and values on the log_odd_unit hot path - they're checked when assigned from outside
+    Pairs and regions keep the order TradeBalance's dict would give them, so balancing comes out exactly the same.
+    TradeBalance is kept as the reference implementation.
+    """
+
+    def __init__(self, stat_field=None, region=None, target="passenger", field="sectors", star_field="sector",
+                 target_property="name"):
+        assert isinstance(stat_field, str), "Stat_field must be a string"
+        from PyRoute.AreaItems.Galaxy import Galaxy
+        assert isinstance(region, Galaxy), "Region must be an Galaxy"
+        assert isinstance(target, str)
+        assert isinstance(field, str), "Target field must be a string"
+        self.stat_field = stat_field
+        self.region = region
+        self.target = target
+        self.field = field
+        self.star_field = star_field
+        self.target_property = target_property
+        self.logger = logging.getLogger('PyRoute.TradeBalance')
+        # Total added to region statistics by settling odd units, for the trade calculation's running audit
+        self.stats_added = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        # Region names, and their indexes
+        self._names: list[str] = []
+        self._name_index: dict[str, int] = {}
+        # Pair keys, their indexes, balances and the indexes of the regions at each end
+        self._keys: list[tuple[str, str]] = []
+        self._pair_index: dict[tuple[str, str], int] = {}
+        self._values: list[int] = []
+        self._ends: list[tuple[int, int]] = []
+        # Each region's single-unit imbalance, and the pairs it's at one end of, in the order they were added
+        self._imbalance: list[int] = []
+        self._pairs: list[list[int]] = []
+        self._total = 0
+
+    def __getitem__(self, key) -> int:
+        return self._values[self._pair_index[key]]
+
+    def __setitem__(self, key, value) -> None:
+        TradeBalance._check(key, value)
+        pair = self._pair_index.get(key)
+        if pair is None:
+            pair = self._add_pair(key)
+        self._set_value(pair, value)
+
+    def __delitem__(self, key) -> None:
+        # Rare enough to rebuild from what's left, which keeps regions in the order the remaining pairs give them
+        remaining = [(item, value) for (item, value) in zip(self._keys, self._values) if item != key]
+        if len(remaining) == len(self._keys):
+            raise KeyError(key)
+        self._reset()
+        for item, value in remaining:
+            self._set_value(self._add_pair(item), value)
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key) -> bool:
+        return key in self._pair_index
+
+    def __repr__(self) -> str:
+        return repr(dict(zip(self._keys, self._values)))
+
+    def _add_pair(self, key: tuple[str, str]) -> int:
+        assert key[0] != key[1], "Elements of key must differ"
+        ends = []
+        for name in key:
+            index = self._name_index.get(name)
+            if index is None:
+                index = len(self._names)
+                self._name_index[name] = index
+                self._names.append(name)
+                self._imbalance.append(0)
+                self._pairs.append([])
+            ends.append(index)
+        pair = len(self._keys)
+        self._pair_index[key] = pair
+        self._keys.append(key)
+        self._values.append(0)
+        self._ends.append((ends[0], ends[1]))
+        self._pairs[ends[0]].append(pair)
+        self._pairs[ends[1]].append(pair)
+        return pair
+
+    def _set_value(self, pair: int, value: int) -> None:
+        delta = value - self._values[pair]
+        self._values[pair] = value
+        left, right = self._ends[pair]
+        self._imbalance[left] += delta
+        self._imbalance[right] += delta
+        self._total += delta
+
+    def log_odd_unit(self, star: Star, target: Star) -> None:
+        sector_tuple = self._balance_tuple(
+            star[self.star_field][self.target_property],
+            target[self.star_field][self.target_property]
+        )
+        pair = self._pair_index.get(sector_tuple)
+        if pair is None:
+            pair = self._add_pair(sector_tuple)
+        if 0 < self._values[pair]:
+            star[self.star_field].stats[self.stat_field] += 1
+            target[self.star_field].stats[self.stat_field] += 1
+            self.stats_added += 2
+            self._set_value(pair, self._values[pair] - 1)
+        else:
+            self._set_value(pair, self._values[pair] + 1)
+
+    def single_unit_imbalance(self) -> dict[str, int]:
+        return dict(zip(self._names, self._imbalance))
+
+    def multilateral_balance(self) -> None:
+        imbalance = self._imbalance
+        # if no region has 2 or more half-unit against it, return
+        if 0 == len(imbalance) or 2 > max(imbalance):
+            return
+        values = self._values
+        names = self._names
+        regions = self.region[self.field]
+        # Balances only ever go down from here on, so each region's positive-balance pairs, in order, can be found by
+        # walking forward through its pairs, dropping any that have gone to zero along the way
+        positive = [[pair for pair in pairs if 0 < values[pair]] for pairs in self._pairs]
+        start = [0] * len(names)
+
+        maxloops = max(imbalance)
+        counter = 0
+
+        while 1 < max(imbalance) and counter <= maxloops:  # pragma: no mutate
+            counter += 1
+            for region in range(len(names)):
+                if 2 > imbalance[region]:
+                    continue
+
+                comp = self._first_positive_pairs(positive[region], start, region)
+                if comp is None:
+                    continue
+                regions[names[region]].stats[self.stat_field] += 1
+                self.stats_added += 1
+                self._set_value(comp[0], values[comp[0]] - 1)
+                self._set_value(comp[1], values[comp[1]] - 1)
+            self_max = self.maximum
+            if 1 < self_max:  # pragma: no mutate
+                adjpair = values.index(self_max)
+                adjvalue = values[adjpair] // 2
+                left, right = self._keys[adjpair]
+                regions[left].stats[self.stat_field] += adjvalue
+                regions[right].stats[self.stat_field] += adjvalue
+                self.stats_added += 2 * adjvalue
+                self._set_value(adjpair, values[adjpair] - 2 * adjvalue)
+
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug('Iteration ' + str(counter) + ', sector balance ' + str(self.single_unit_imbalance()))
+
+    def _first_positive_pairs(self, pairs: list[int], start: list[int], region: int) -> Optional[tuple[int, int]]:
+        """
+        First two of region's pairs, in order, whose balances are still positive, or None if there aren't two.  Pairs
+        found to have gone to zero are skipped over for good.
+        """
+        values = self._values
+        first = start[region]
+        while first < len(pairs) and 0 >= values[pairs[first]]:
+            first += 1
+        second = first + 1
+        while second < len(pairs) and 0 >= values[pairs[second]]:
+            second += 1
+        if second >= len(pairs):
+            start[region] = first
+            return None
+        # Move the first pair up next to the second, dropping the zeroed pairs between them
+        pairs[second - 1] = pairs[first]
+        start[region] = second - 1
+        return pairs[second - 1], pairs[second]
+
+    def is_balanced(self) -> None:
+        num_sector = len(self.region[self.field])
+
+        assert 2 > self.maximum, "Uncompensated " + str(self.target) + " imbalance present"
+
+        assert self.sum <= ceil(num_sector / 2), f"Uncompensated multilateral {self.target} imbalance present in {self.field}"
+
+    @property
+    def maximum(self) -> int:
+        if 0 == len(self._values):
+            return 0
+        return max(self._values)
+
+    @property
+    def sum(self) -> int:
+        return self._total
+
+    _balance_tuple = staticmethod(TradeBalance._balance_tuple)
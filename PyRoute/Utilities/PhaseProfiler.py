@@ -0,0 +1,185 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+
+Per-phase timing and profiling for route.py runs.  Each top-level phase is wrapped in PhaseProfiler.phase(), which
+records:
+    Wall time
+    CPU time, including that of any worker processes reaped during the phase
+    Growth in peak resident set size
+    Change in the route calculation's work counters - routes pathfound, penumbra routes, nodes expanded and queued
+Phases named in profile_phases additionally get run under cProfile, or line_profiler if asked for (and installed),
+with the raw profile dumped next to the report.  When no report path is given, phase() does nothing at all.
+"""
+import cProfile
+import importlib
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore
+
+try:
+    from line_profiler import LineProfiler
+except ImportError:
+    LineProfiler = None
+
+
+class PhaseProfiler(object):
+
+    profilers = ['cprofile', 'line']
+
+    def __init__(self, path: Optional[str], profile_phases: Optional[list[str]] = None, profiler: str = 'cprofile',
+                 line_functions: Optional[list[str]] = None):
+        if profiler not in PhaseProfiler.profilers:
+            raise ValueError("Profiler must be one of " + str(PhaseProfiler.profilers))
+        self.path = path
+        self.profile_phases = set(profile_phases) if profile_phases is not None else set()
+        self.profiler = profiler
+        self.line_functions = line_functions if line_functions is not None else []
+        self.counter_source: Optional[Callable[[], dict[str, int]]] = None
+        self.phases: list[dict] = []
+        self.logger = logging.getLogger('PyRoute.PhaseProfiler')
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+
+        profile = self._start_profile(name)
+        counters_before = self._counters()
+        rss_before = self._peak_rss()
+        times_before = os.times()
+        wall_before = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_before
+            times_after = os.times()
+            cpu = sum(times_after[0:4]) - sum(times_before[0:4])
+            rss_after = self._peak_rss()
+            counters_after = self._counters()
+
+            record = {'phase': name, 'wall_seconds': wall, 'cpu_seconds': cpu,
+                      'peak_rss_delta_kb': None if rss_after is None else rss_after - rss_before,
+                      'counters': {key: value - counters_before.get(key, 0) for key, value in counters_after.items()
+                                   if value != counters_before.get(key, 0)}}
+            if profile is not None:
+                record['profile'] = self._finish_profile(name, profile)
+            self.phases.append(record)
+
+    def write_report(self) -> None:
+        """
+        Write the JSON report to path, and a human-readable summary alongside it.
+        """
+        if not self.enabled:
+            return
+        report = {
+            'phases': self.phases,
+            'total': {'wall_seconds': sum(item['wall_seconds'] for item in self.phases),
+                      'cpu_seconds': sum(item['cpu_seconds'] for item in self.phases),
+                      'peak_rss_kb': self._peak_rss()},
+            'counters': self._counters(),
+        }
+        with open(self.path, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+            handle.write('\n')
+
+        summary = self.summary(report)
+        with open(self._sibling_path('.txt'), 'w', encoding='utf-8') as handle:
+            handle.write(summary)
+        for line in summary.splitlines():
+            self.logger.info(line)
+
+    def summary(self, report: dict) -> str:
+        lines = ['{:<20} {:>10} {:>10} {:>12}  {}'.format('phase', 'wall (s)', 'cpu (s)', 'peak rss +MB', 'counters')]
+        for item in report['phases']:
+            rss = '-' if item['peak_rss_delta_kb'] is None else '{:.1f}'.format(item['peak_rss_delta_kb'] / 1024)
+            counters = ', '.join('{} {:,d}'.format(key, value) for key, value in item['counters'].items())
+            lines.append('{:<20} {:>10.3f} {:>10.3f} {:>12}  {}'.format(item['phase'], item['wall_seconds'],
+                                                                        item['cpu_seconds'], rss, counters).rstrip())
+        total = report['total']
+        peak = '-' if total['peak_rss_kb'] is None else '{:.1f}'.format(total['peak_rss_kb'] / 1024)
+        lines.append('{:<20} {:>10.3f} {:>10.3f} {:>12}'.format('total', total['wall_seconds'], total['cpu_seconds'],
+                                                               peak))
+        return '\n'.join(lines) + '\n'
+
+    def _counters(self) -> dict[str, int]:
+        return {} if self.counter_source is None else dict(self.counter_source())
+
+    @staticmethod
+    def _peak_rss() -> Optional[int]:
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS reports bytes, everywhere else kilobytes
+        return peak // 1024 if 'darwin' == sys.platform else peak
+
+    def _sibling_path(self, suffix: str) -> str:
+        return os.path.splitext(self.path)[0] + suffix
+
+    def _start_profile(self, name: str):
+        if name not in self.profile_phases and 'all' not in self.profile_phases:
+            return None
+        if 'line' == self.profiler:
+            if LineProfiler is None:
+                self.logger.warning('line_profiler not installed, not line-profiling ' + name)
+                return None
+            profile = LineProfiler()
+            for dotted in self.line_functions:
+                profile.add_function(self._resolve(dotted))
+            profile.enable_by_count()
+            return profile
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def _finish_profile(self, name: str, profile) -> str:
+        if 'line' == self.profiler:
+            profile.disable_by_count()
+            out_path = self._sibling_path('.' + name + '.lprof')
+            profile.dump_stats(out_path)
+            with open(self._sibling_path('.' + name + '.lprof.txt'), 'w', encoding='utf-8') as handle:
+                profile.print_stats(stream=handle)
+            return out_path
+
+        profile.disable()
+        out_path = self._sibling_path('.' + name + '.prof')
+        profile.dump_stats(out_path)
+        stream = io.StringIO()
+        pstats.Stats(profile, stream=stream).sort_stats('cumulative').print_stats(30)
+        with open(self._sibling_path('.' + name + '.prof.txt'), 'w', encoding='utf-8') as handle:
+            handle.write(stream.getvalue())
+        return out_path
+
+    @staticmethod
+    def _resolve(dotted: str) -> Callable:
+        """
+        Resolve a dotted path, eg PyRoute.Calculation.TradeCalculation.TradeCalculation.get_trade_between, to the
+        function it names.
+        """
+        parts = dotted.split('.')
+        for split in range(len(parts) - 1, 0, -1):
+            try:
+                target = importlib.import_module('.'.join(parts[:split]))
+            except ImportError:
+                continue
+            for attr in parts[split:]:
+                target = getattr(target, attr)
+            return target
+        raise ValueError("Cannot resolve " + dotted + " to a function")
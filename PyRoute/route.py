@@ -18,7 +18,9 @@ from PyRoute.Outputs.DarkModePDFSectorMap import DarkModePDFSectorMap
 from PyRoute.Outputs.LightModePDFSectorMap import LightModePDFSectorMap
 from PyRoute.Outputs.SectorMap import SectorMap
 from PyRoute.Outputs.SubsectorMap import SubsectorMap
+from PyRoute.Pathfinding.LandmarkSchemes.LandmarkRegistry import LandmarkRegistry
 from PyRoute.StatCalculation.StatCalculation import StatCalculation
+from PyRoute.Utilities.PhaseProfiler import PhaseProfiler
 
 logger = logging.getLogger('PyRoute')
 
@@ -53,6 +55,31 @@ def process() -> None:
     cpucount: int = 1 if os.cpu_count() is None else max(1, os.cpu_count() - 1)  # type:ignore[operator]
     route.add_argument('--mp-threads', default=cpucount, type=int,
                        help=f"Number of processes to use for trade-mp processing, default {cpucount}")
+    route.add_argument('--bidirectional-length', dest='bidirectional_length', default=None, type=int,
+                       help='Search trade routes estimated to be at least this many parsecs long from both ends, '
+                            'default [off]')
+    route.add_argument('--optimistic-window', dest='optimistic_window', default=None, type=int,
+                       help='For --routes trade, pathfind this many upcoming routes at a time in parallel over '
+                            '--mp-threads processes, re-running any invalidated by earlier routes.  Output is '
+                            'unchanged.  Default [off]')
+    route.add_argument('--resume', dest='resume_dir', default=None,
+                       help='For --routes trade, checkpoint route processing to this directory, and if it already '
+                            'holds a checkpoint for the same sectors and settings, resume from it.  Default [off]')
+    route.add_argument('--route-cache', dest='route_cache', default=None,
+                       help='For --routes trade, cache final routes in this directory across runs, only pathfinding '
+                            'routes whose neighbouring sectors have changed since the cache was written.  Default '
+                            '[off]')
+    route.add_argument('--component-partition', dest='component_partition', default=False, action='store_true',
+                       help='For --routes trade, process each large connected component\'s routes in its own '
+                            'process, over --mp-threads processes.  Output is unchanged.  Default [off]')
+    route.add_argument('--paranoid', dest='paranoid', default=False, action='store_true',
+                       help='For --routes trade and trade-mp, recount sector and allegiance trade totals in full at '
+                            'every audit during route processing, rather than checking them against running totals.  '
+                            'Default [off]')
+    route.add_argument('--landmarks', dest='landmarks', default=None, type=landmark_spec,
+                       help='Pathfinding landmark scheme, as SCHEME[:k], where k caps the number of landmarks per '
+                            'component.  Schemes: ' + ', '.join(LandmarkRegistry.names()) + ', default ['
+                            + LandmarkRegistry.default + ']')
 
     output = parser.add_argument_group('Output', 'Output options')
 
@@ -71,11 +98,21 @@ def process() -> None:
                         help='Minimum number of worlds in an allegiance for output, default [10]')
     output.add_argument('--json-data', dest='json_data', default=False, action='store_true',
                         help='Dump internal data structures as json for later further processing ')
+    output.add_argument('--wiki-workers', dest='wiki_workers', default=1, type=int,
+                        help='Number of processes to use for rendering sector wiki pages, default [1]')
+    output.add_argument('--wiki-manifest', dest='wiki_manifest', default=False, action='store_true',
+                        help='Keep a manifest of wiki page, list and json content hashes in the output directory, and '
+                             'leave files unchanged since the last run untouched, keeping their modification times.  '
+                             'Also caches compiled wiki templates there.  Default [off]')
 
     source = parser.add_argument_group('Input', 'Source of data options')
     source.add_argument('--input', default='sectors', help='input directory for sectors')
     source.add_argument('--sectors', default=None, help='file with list of sector names to process')
     source.add_argument('--deep-space', dest='deep_space', default=None, help='file with list of deep space stations to process')
+    source.add_argument('--parse-cache', dest='parse_cache', default=None,
+                        help='directory to cache parsed sector data in, re-used while the .sec files are unchanged')
+    source.add_argument('--parse-workers', dest='parse_workers', default=1, type=int,
+                        help='Number of processes to use for parsing sector files, default [1]')
     source.add_argument('sector', nargs='*', help='T5SS sector file(s) to process')
 
     debugging = parser.add_argument_group('Debug', "Debugging flags")
@@ -85,6 +122,15 @@ def process() -> None:
                            help="Fix incorrect pop codes when loading stars")
     debugging.add_argument('--fix-econ', dest="fix_econ", default=False, action=argparse.BooleanOptionalAction,
                            help="Fix incorrect econ codes when loading stars")
+    debugging.add_argument('--profile-report', dest='profile_report', default=None,
+                           help='Write per-phase wall time, CPU time, peak memory growth and route counters to this '
+                                'JSON file, with a text summary alongside')
+    debugging.add_argument('--profile-phase', dest='profile_phase', default=None, action='append',
+                           help='Also profile this phase (or "all") for --profile-report, can be repeated')
+    debugging.add_argument('--profiler', dest='profiler', default='cprofile', choices=PhaseProfiler.profilers,
+                           help='Profiler used for --profile-phase, default [cprofile]')
+    debugging.add_argument('--line-profile', dest='line_profile', default=None, action='append',
+                           help='Dotted path of a function for --profiler line to profile, can be repeated')
 
     parser.add_argument('--version', action='version', version='%(prog)s 0.4')
     parser.add_argument('--log-level', default='INFO')
@@ -131,8 +177,17 @@ def process() -> None:
     readparms = ReadSectorOptions(sectors=sectors_list, pop_code=args.pop_code, ru_calc=args.ru_calc,
                                   route_reuse=args.route_reuse, trade_choice=args.routes, route_btn=args.route_btn,
                                   mp_threads=args.mp_threads, debug_flag=args.debug_flag, fix_pop=args.fix_pop,
-                                  deep_space=deep_space, map_type=args.map_type, fix_econ=args.fix_econ)
-    galaxy.read_sectors(readparms)
+                                  deep_space=deep_space, map_type=args.map_type, fix_econ=args.fix_econ,
+                                  parse_cache=args.parse_cache, parse_workers=args.parse_workers,
+                                  bidirectional_length=args.bidirectional_length,
+                                  optimistic_window=args.optimistic_window, resume_dir=args.resume_dir,
+                                  landmarks=args.landmarks, route_cache=args.route_cache,
+                                  component_partition=args.component_partition, paranoid=args.paranoid)
+    profiler = PhaseProfiler(args.profile_report, args.profile_phase, args.profiler, args.line_profile)
+    with profiler.phase('read_sectors'):
+        galaxy.read_sectors(readparms)
+    profiler.counter_source = galaxy.trade.counters
+    galaxy.trade.collect_diagnostics = profiler.enabled
 
     # galaxy.read_sectors(sectors_list, args.pop_code, args.ru_calc,
     #                    args.route_reuse, args.routes, args.route_btn, args.mp_threads, args.debug_flag,
@@ -140,25 +195,36 @@ def process() -> None:
 
     logger.info("%s sectors read" % len(galaxy.sectors))
 
-    galaxy.generate_routes()
+    with profiler.phase('generate_routes'):
+        galaxy.generate_routes()
 
-    galaxy.set_borders(args.borders, args.ally_match)
+    with profiler.phase('set_borders'):
+        galaxy.set_borders(args.borders, args.ally_match)
 
     if args.owned:
-        galaxy.process_owned_worlds()
+        with profiler.phase('owned_worlds'):
+            galaxy.process_owned_worlds()
 
     if args.trade:
-        galaxy.trade.calculate_routes()
-        galaxy.process_eti()
-        spectrade = SpeculativeTrade(args.speculative_version, galaxy.stars)
-        spectrade.process_tradegoods()
+        with profiler.phase('calculate_routes'):
+            galaxy.trade.calculate_routes()
+        with profiler.phase('process_eti'):
+            galaxy.process_eti()
+        with profiler.phase('speculative_trade'):
+            spectrade = SpeculativeTrade(args.speculative_version, galaxy.stars)
+            spectrade.process_tradegoods()
 
     if args.routes:
-        galaxy.write_routes(args.routes)
+        with profiler.phase('write_routes'):
+            galaxy.write_routes(args.routes)
 
     stats = StatCalculation(galaxy)
-    stats.calculate_statistics(args.ally_match)
-    stats.write_statistics(args.ally_count, args.ally_match, args.json_data)
+    stats.wiki_workers = args.wiki_workers
+    stats.wiki_manifest = args.wiki_manifest
+    with profiler.phase('statistics'):
+        stats.calculate_statistics(args.ally_match)
+    with profiler.phase('write_statistics'):
+        stats.write_statistics(args.ally_count, args.ally_match, args.json_data)
 
     if args.maps:
         maptype = args.map_type
@@ -169,12 +235,15 @@ def process() -> None:
             pdfmap = LightModePDFSectorMap(galaxy, args.routes, args.output, "dense")
         else:
             pdfmap = ClassicModePDFSectorMap(galaxy, args.routes, args.output, "dense")
-        pdfmap.write_maps()
+        with profiler.phase('maps'):
+            pdfmap.write_maps()
 
         if args.subsectors:
             graphMap = SubsectorMap(galaxy, args.routes, galaxy.output_path)
-            graphMap.write_maps()
+            with profiler.phase('subsector_maps'):
+                graphMap.write_maps()
 
+    profiler.write_report()
     logger.info("process complete")
 
 
@@ -191,6 +260,13 @@ def get_sectors(sector, input_dir) -> list[str]:
     return sector_list
 
 
+def landmark_spec(spec: str) -> str:
+    try:
+        return LandmarkRegistry.check_spec(spec)
+    except ValueError as ex:
+        raise argparse.ArgumentTypeError(str(ex)) from None
+
+
 def set_logging(level) -> None:
     logger.setLevel(level)
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
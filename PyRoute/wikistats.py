@@ -6,11 +6,18 @@ Created on Mar 22, 2014
 import os
 
 import logging
-import codecs
+import hashlib
+import json
+from multiprocessing import Pool
+from typing import Optional
+
 import inflect
 import jsonpickle  # type:ignore[import-untyped]
 from networkx.readwrite import json_graph
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+# WikiStats whose sector pages are being rendered, for forked page-rendering workers to pick up
+wikiStats: Optional['WikiStats'] = None
 
 
 class WikiStats(object):
@@ -23,9 +30,17 @@ class WikiStats(object):
                   '!! RU !! Shipyard Capacity (MTons) !! Colonial Army (BEs) ' + \
                   '!! Travellers (M / year) !! SPA Pop !! ETI worlds !! ETI Cargo (tons / year) !! ETI passengers (per year)\n'
 
-    def __init__(self, galaxy, uwp, min_alg_count=10, match_alg='collapse', json_data=False, routes_generated=False):
+    manifest_name = 'wiki_manifest.json'
+    bytecode_cache_name = 'wiki_template_cache'
+
+    def __init__(self, galaxy, uwp, min_alg_count=10, match_alg='collapse', json_data=False, routes_generated=False,
+                 workers=1, manifest=False):
         """
         Constructor
+        :param workers: Number of processes to render sector pages over
+        :param manifest: Keep a manifest of each page's content hash in the output directory, and leave pages whose
+        content is unchanged since the last run alone, so their modification times stay put.  Compiled templates are
+        cached in the output directory too, so later runs skip compiling them
         """
         self.galaxy = galaxy
         self.uwp = uwp
@@ -38,13 +53,28 @@ class WikiStats(object):
         cwd = os.path.dirname(__file__)
         templatedir = cwd + "/templates"
 
+        bytecode_cache = None
+        if manifest:
+            cache_dir = os.path.join(galaxy.output_path, self.bytecode_cache_name)
+            os.makedirs(cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
         self.env = Environment(
             loader=FileSystemLoader(templatedir),
             # loader=PackageLoader('PyRoute', 'templates'),
-            autoescape=select_autoescape(['html', 'xml'])
+            autoescape=select_autoescape(['html', 'xml']),
+            bytecode_cache=bytecode_cache
             )
+        self.workers = max(1, workers)
+        self.manifest = manifest
+        # Content hashes of pages written by the last run, and of those written or left alone by this one
+        self.old_hashes: dict[str, str] = {}
+        self.hashes: dict[str, str] = {}
+        self.unchanged = 0
 
     def write_statistics(self) -> None:
+        if self.manifest:
+            self.read_manifest()
         self.summary_statistics_template()
         self.sector_statistics_template()
         self.subsector_statistics_template()
@@ -62,12 +92,50 @@ class WikiStats(object):
         self.write_summary_lists()
         if self.json_data:
             self.write_json()
+        if self.manifest:
+            self.write_manifest()
 
     def output_template(self, template, filename, parameters) -> None:
         template = self.env.get_template(template)
+        self.write_page(filename, template.render(parameters))
+
+    def write_page(self, filename, content) -> None:
         path = os.path.join(self.galaxy.output_path, filename)
+        if self.manifest:
+            digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+            self.hashes[filename] = digest
+            if self.old_hashes.get(filename) == digest and os.path.exists(path):
+                self.unchanged += 1
+                return
         with open(path, 'w+', encoding='utf-8') as f:
-            f.write(template.render(parameters))
+            f.write(content)
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.galaxy.output_path, self.manifest_name)
+
+    def read_manifest(self) -> None:
+        self.old_hashes = {}
+        self.hashes = {}
+        self.unchanged = 0
+        if not os.path.exists(self.manifest_path):
+            return
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                hashes = json.load(f)
+        except (OSError, ValueError):
+            self.logger.warning("Wiki manifest {} is unreadable, rewriting every page".format(self.manifest_path))
+            return
+        if isinstance(hashes, dict):
+            self.old_hashes = hashes
+
+    def write_manifest(self) -> None:
+        self.logger.info("Wiki pages: {} unchanged, {} written".format(self.unchanged,
+                                                                      len(self.hashes) - self.unchanged))
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.hashes, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
 
     def summary_statistics_template(self) -> None:
         self.output_template('summary.wiki', 'summary.wiki',
@@ -90,11 +158,31 @@ class WikiStats(object):
                               'plural': self.plural})
 
     def sector_data_template(self) -> None:
-        for sector in self.galaxy.sectors.values():
-            self.output_template('sector_data.wiki', sector.sector_name() + " Sector.sector.wiki",
-                                  {"sector": sector})
-            self.output_template('sector_econ.wiki', sector.sector_name() + " Sector.economic.wiki",
-                                 {'sector': sector})
+        names = list(self.galaxy.sectors.keys())
+        if 1 < self.workers and 1 < len(names):
+            global wikiStats
+            # Compile the templates up front, so workers inherit them rather than each compiling their own
+            self.env.get_template('sector_data.wiki')
+            self.env.get_template('sector_econ.wiki')
+            self.logger.info("Rendering {} sector pages over {} processes".format(len(names), self.workers))
+            wikiStats = self
+            try:
+                with Pool(processes=min(self.workers, len(names))) as pool:
+                    pages = pool.map(render_sector_pages, names, chunksize=max(1, len(names) // (4 * self.workers)))
+            finally:
+                wikiStats = None
+        else:
+            pages = [self.sector_pages(name) for name in names]
+        for sector_pages in pages:
+            for filename, content in sector_pages:
+                self.write_page(filename, content)
+
+    def sector_pages(self, name) -> list[tuple[str, str]]:
+        sector = self.galaxy.sectors[name]
+        return [(sector.sector_name() + " Sector.sector.wiki",
+                 self.env.get_template('sector_data.wiki').render({"sector": sector})),
+                (sector.sector_name() + " Sector.economic.wiki",
+                 self.env.get_template('sector_econ.wiki').render({'sector': sector}))]
 
     def allegiance_statistics_template(self) -> None:
         self.output_template('allegiances.wiki', 'allegiances.wiki',
@@ -105,35 +193,30 @@ class WikiStats(object):
                               "min_alg_count": self.min_alg_count})
 
     def write_json(self) -> None:
-        path = os.path.join(self.galaxy.output_path, 'galaxy.json')
         jsonpickle.set_encoder_options('simplejson', sort_keys=True, indent=2)
-        galaxy_json = jsonpickle.encode(self.galaxy, unpicklable=False, max_depth=14)
-        with open(path, 'w+', encoding='utf8') as f:
-            f.write(galaxy_json)
+        self.write_page('galaxy.json', jsonpickle.encode(self.galaxy, unpicklable=False, max_depth=14))
         for sector in self.galaxy.sectors.values():
-            path = os.path.join(self.galaxy.output_path, sector.sector_name() + " Sector.sector.json")
-            sector_json = jsonpickle.encode(sector, unpicklable=False, max_depth=14)
-            with open(path, 'w+', encoding='utf8') as f:
-                f.write(sector_json)
-        path = os.path.join(self.galaxy.output_path, 'ranges.json')
-        with open(path, "w+", encoding='utf8') as f:
-            f.write(jsonpickle.encode(json_graph.node_link_data(self.galaxy.ranges)))
-
-        path = os.path.join(self.galaxy.output_path, 'stars.json')
-        with open(path, "w+", encoding='utf8') as f:
-            f.write(jsonpickle.encode(json_graph.node_link_data(self.galaxy.stars)))
+            self.write_page(sector.sector_name() + " Sector.sector.json",
+                            jsonpickle.encode(sector, unpicklable=False, max_depth=14))
+        self.write_page('ranges.json', jsonpickle.encode(json_graph.node_link_data(self.galaxy.ranges)))
+        self.write_page('stars.json', jsonpickle.encode(json_graph.node_link_data(self.galaxy.stars)))
 
     def write_summary_lists(self) -> None:
-        path = os.path.join(self.galaxy.output_path, 'sectors_list.txt')
-        with open(path, 'w+', encoding="utf-8") as f:
-            for sector in self.galaxy.sectors.values():
-                f.write('[[{} Sector/summary]]\n'.format(sector.sector_name()))
-
-        path = os.path.join(self.galaxy.output_path, 'subsector_list.txt')
-        with codecs.open(path, 'w+', encoding="utf-8") as f:
-            for sector in self.galaxy.sectors.values():
-                for subsector in sector.subsectors.values():
-                    f.write('[[{} Subsector/summary]]\n'.format(subsector.name))
+        self.write_page('sectors_list.txt',
+                        ''.join('[[{} Sector/summary]]\n'.format(sector.sector_name())
+                                for sector in self.galaxy.sectors.values()))
+        self.write_page('subsector_list.txt',
+                        ''.join('[[{} Subsector/summary]]\n'.format(subsector.name)
+                                for sector in self.galaxy.sectors.values()
+                                for subsector in sector.subsectors.values()))
+
+
+def render_sector_pages(name) -> list[tuple[str, str]]:
+    """
+    Render one sector's pages in a forked worker, handing them back to the parent to write.
+    """
+    assert wikiStats is not None, "Sector pages can only be rendered in a worker forked by sector_data_template"
+    return wikiStats.sector_pages(name)
 
 
 def baseN(num, b, numerals="0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ") -> str:
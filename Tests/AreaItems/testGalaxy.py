@@ -3,6 +3,8 @@ Created on Nov 30, 2021
 
 @author: CyberiaResurrection
 """
+import copy
+import multiprocessing
 import os
 from unittest.mock import patch, call, mock_open, MagicMock
 
@@ -548,6 +550,76 @@ class testGalaxy(baseTest):
         galaxy.read_sectors(readparms)
         self.assertEqual({}, ParseStarInput.deep_space)
 
+    def test_read_sectors_4(self) -> None:
+        sourcefile = [
+            self.unpack_filename('DeltaFiles/ReadSectorsDummy1.sec'),
+            self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec'),
+            self.unpack_filename('DeltaFiles/ReadSectorsDummy1.sec'),
+            self.unpack_filename('DeltaFiles/Dagudashaag-Bolivar.sec'),
+        ]
+        sourcefile.append(sourcefile[0].replace('1.sec', '3.sec'))
+
+        args = self._make_args()
+        serial_parms = ReadSectorOptions(sectors=sourcefile, pop_code=args.pop_code, ru_calc=args.ru_calc,
+                                         route_reuse=args.route_reuse, trade_choice=args.routes, route_btn=15,
+                                         fix_pop=True, deep_space={})
+        parallel_parms = ReadSectorOptions(sectors=sourcefile, pop_code=args.pop_code, ru_calc=args.ru_calc,
+                                           route_reuse=args.route_reuse, trade_choice=args.routes, route_btn=15,
+                                           fix_pop=True, deep_space={}, parse_workers=3)
+
+        serial = Galaxy(min_btn=15, max_jump=4)
+        serial.read_sectors(serial_parms)
+        parallel = Galaxy(min_btn=15, max_jump=4)
+        parallel.read_sectors(parallel_parms)
+
+        self.assertEqual(list(serial.sectors.keys()), list(parallel.sectors.keys()))
+        self.assertEqual(list(serial.alg.keys()), list(parallel.alg.keys()))
+        self.assertEqual(66, len(parallel.star_mapping))
+        for index in serial.star_mapping:
+            star = serial.star_mapping[index]
+            other = parallel.star_mapping[index]
+            self.assertEqual(star, other, "Star index " + str(index) + " mismatch")
+            self.assertEqual(star.parse_to_line(), other.parse_to_line())
+            self.assertEqual(str(star.sector), str(other.sector))
+            self.assertIs(parallel.sectors[other.sector.name], other.sector)
+            self.assertEqual(star.tradeCode.sophont_list, other.tradeCode.sophont_list)
+            self.assertEqual(star.allegiance_base.code, other.allegiance_base.code)
+            self.assertEqual((star.wtn, star.gwp, star.ru), (other.wtn, other.gwp, other.ru))
+
+    def test_read_sectors_5(self) -> None:
+        # Spawned workers start afresh, so (with PYTHONHASHSEED unpinned) salt their string hashes differently to the
+        # parent - any hash shipped back with the parsed stars would be stale
+        sourcefile = [
+            self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec'),
+            self.unpack_filename('DeltaFiles/Dagudashaag-Bolivar.sec'),
+        ]
+
+        args = self._make_args()
+        serial_parms = ReadSectorOptions(sectors=sourcefile, pop_code=args.pop_code, ru_calc=args.ru_calc,
+                                         route_reuse=args.route_reuse, trade_choice=args.routes, route_btn=15,
+                                         fix_pop=True, deep_space={})
+        parallel_parms = ReadSectorOptions(sectors=sourcefile, pop_code=args.pop_code, ru_calc=args.ru_calc,
+                                           route_reuse=args.route_reuse, trade_choice=args.routes, route_btn=15,
+                                           fix_pop=True, deep_space={}, parse_workers=2)
+
+        serial = Galaxy(min_btn=15, max_jump=4)
+        serial.read_sectors(serial_parms)
+        parallel = Galaxy(min_btn=15, max_jump=4)
+        with patch('PyRoute.Inputs.ParseSectorInput.Pool', multiprocessing.get_context('spawn').Pool), \
+                patch.dict(os.environ, {'PYTHONHASHSEED': 'random'}):
+            parallel.read_sectors(parallel_parms)
+
+        self.assertEqual(66, len(parallel.star_mapping))
+        parallel_stars = set(parallel.star_mapping.values())
+        for index in serial.star_mapping:
+            star = serial.star_mapping[index]
+            other = parallel.star_mapping[index]
+            self.assertEqual(hash(other._key), hash(other), "Star index " + str(index) + " hash stale")
+            self.assertEqual(hash(star.hex), hash(other.hex), "Star index " + str(index) + " hex hash stale")
+            self.assertEqual(star, other, "Star index " + str(index) + " mismatch")
+            self.assertIn(other, parallel_stars)
+            self.assertEqual(other, copy.deepcopy(other))
+
     def test_set_bounding_sectors_1(self) -> None:
         galaxy = Galaxy(min_btn=15, max_jump=4)
         galaxy.sectors['Core'] = Sector('# Core', '# 0, 0')
@@ -0,0 +1,83 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+"""
+import os
+import tempfile
+
+from benchmarks.pipeline import compare_runs, find_baseline, find_run, load_history, run_pipeline, save_history
+from benchmarks.synthetic_galaxy import SyntheticGalaxy
+from Tests.baseTest import baseTest
+
+
+class testBenchmarkPipeline(baseTest):
+
+    @staticmethod
+    def _run(label: str, phases: dict[str, float], config=None, cpu_count=4) -> dict:
+        return {'label': label, 'commit': None, 'timestamp': None, 'python': '3.11.4', 'platform': 'Linux-x86_64',
+                'cpu_count': cpu_count, 'config': config or {}, 'phases': phases, 'total': sum(phases.values())}
+
+    def test_compare_flags_only_real_regressions(self) -> None:
+        baseline = self._run('base', {'parse': 10.0, 'borders_range': 0.01, 'calculate_routes': 100.0})
+        candidate = self._run('cand', {'parse': 10.5, 'borders_range': 0.03, 'calculate_routes': 130.0,
+                                       'pdf_maps': 4.0})
+
+        rows = {row[0]: row for row in compare_runs(baseline, candidate, 0.1, 0.05)}
+        # Within threshold
+        self.assertFalse(rows['parse'][4])
+        # Tripled, but by less than the absolute floor
+        self.assertFalse(rows['borders_range'][4])
+        self.assertAlmostEqual(0.3, rows['calculate_routes'][3])
+        self.assertTrue(rows['calculate_routes'][4])
+        self.assertTrue(rows['total'][4])
+        # Only timed in one run, so can't be compared
+        self.assertEqual(('pdf_maps', None, 4.0, None, False), rows['pdf_maps'])
+
+    def test_history_round_trip_and_lookup(self) -> None:
+        history = [self._run('nightly', {'parse': 1.0}), self._run('upgrade', {'parse': 2.0}),
+                   self._run('nightly', {'parse': 3.0})]
+        with tempfile.TemporaryDirectory() as scratch:
+            path = os.path.join(scratch, 'history.json')
+            self.assertEqual([], load_history(path))
+            save_history(path, history)
+            self.assertEqual(history, load_history(path))
+            self.assertEqual(['history.json'], os.listdir(scratch))
+
+        self.assertEqual(2, find_run(history, 'nightly'))
+        self.assertEqual(1, find_run(history, 'upgrade'))
+        self.assertEqual(2, find_run(history, '-1'))
+        self.assertEqual(0, find_run(history, '0'))
+        with self.assertRaises(ValueError):
+            find_run(history, 'missing')
+
+    def test_baseline_must_match_settings_and_machine(self) -> None:
+        history = [self._run('nightly', {'parse': 1.0}, {'routes': 'trade'}),
+                   self._run('nightly', {'parse': 1.0}, {'routes': 'trade-mp'}),
+                   self._run('nightly', {'parse': 2.0}, {'routes': 'trade'}, cpu_count=16),
+                   self._run('nightly', {'parse': 3.0}, {'routes': 'trade'})]
+        self.assertEqual(0, find_baseline(history, 3))
+        self.assertIsNone(find_baseline(history, 2))
+        self.assertIsNone(find_baseline(history, 1))
+
+        history.append(dict(history[3], python='3.12.1'))
+        self.assertIsNone(find_baseline(history, 4))
+        history.append(dict(history[3], platform='macOS-14.2-arm64'))
+        self.assertIsNone(find_baseline(history, 5))
+
+    def test_pipeline_times_every_phase(self) -> None:
+        args = self._make_args()
+        args.btn = 13
+        args.max_jump = 4
+        args.route_btn = 8
+        args.maps = False
+        with tempfile.TemporaryDirectory() as scratch:
+            sectors = SyntheticGalaxy(seed=2, density=0.1).write(os.path.join(scratch, 'sectors'))
+            timings, stars = run_pipeline(sectors, args, scratch)
+            self.assertTrue(os.path.exists(os.path.join(scratch, 'summary.wiki')))
+
+        expected = ['parse', 'generate_routes', 'borders_range', 'borders_allygen', 'borders_erode',
+                    'calculate_routes', 'statistics', 'wiki']
+        self.assertEqual(expected, list(timings.keys()))
+        self.assertTrue(all(0 <= elapsed for elapsed in timings.values()))
+        self.assertLess(50, stars)
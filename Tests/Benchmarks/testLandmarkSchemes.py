@@ -0,0 +1,37 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+"""
+import argparse
+
+from benchmarks.landmark_schemes import run_benchmark
+from PyRoute.route import landmark_spec
+from Tests.baseTest import baseTest
+
+
+class testLandmarkSchemes(baseTest):
+
+    def test_benchmark_reports_each_scheme(self) -> None:
+        args = argparse.Namespace(btn=13, max_jump=4, route_btn=8, route_reuse=10, pairs=50, seed=0,
+                                  scheme=['triaxial', 'q:1', 'wtn'])
+        sectors = [self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')]
+        rows, stars, pairs = run_benchmark(sectors, args)
+
+        self.assertLess(0, stars)
+        self.assertEqual(50, pairs)
+        self.assertEqual(['q:1', 'triaxial', 'wtn'], sorted(row['scheme'] for row in rows))
+        # Fastest first
+        totals = [row['total_seconds'] for row in rows]
+        self.assertEqual(sorted(totals), totals)
+        for row in rows:
+            with self.subTest(scheme=row['scheme']):
+                self.assertLess(0, row['landmarks'])
+                self.assertLess(0, row['preprocess_seconds'])
+                self.assertLessEqual(pairs - row['no_path'], row['nodes_expanded'])
+                self.assertLessEqual(row['nodes_expanded'], row['nodes_queued'] + pairs)
+
+    def test_bad_spec_is_rejected(self) -> None:
+        self.assertEqual('triaxial:4', landmark_spec('triaxial:4'))
+        with self.assertRaises(argparse.ArgumentTypeError):
+            landmark_spec('triaxial:none')
@@ -0,0 +1,75 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+"""
+import os
+import tempfile
+
+from benchmarks.synthetic_galaxy import SyntheticGalaxy
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.AreaItems.Sector import Sector
+from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+from PyRoute.DeltaStar import DeltaStar
+from PyRoute.Inputs.ParseSectorInput import ParseSectorInput
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from PyRoute.Inputs.StarlineColumnParser import StarlineColumnParser
+from Tests.baseTest import baseTest
+
+
+class testSyntheticGalaxy(baseTest):
+
+    def test_same_seed_gives_identical_sectors(self) -> None:
+        first = SyntheticGalaxy(seed=17, cols=2, rows=1, density=0.2)
+        second = SyntheticGalaxy(seed=17, cols=2, rows=1, density=0.2)
+        other = SyntheticGalaxy(seed=18, cols=2, rows=1, density=0.2)
+
+        self.assertEqual(first.sector_lines(1, 0), second.sector_lines(1, 0))
+        self.assertNotEqual(first.sector_lines(1, 0), other.sector_lines(1, 0))
+
+    def test_starlines_are_canonical_and_column_aligned(self) -> None:
+        lines = SyntheticGalaxy(seed=3, density=0.2).sector_lines(0, 0)
+        headers, starlines = ParseSectorInput.partition_lines(lines)
+        self.assertLess(100, len(starlines))
+
+        column_parser = StarlineColumnParser.from_headers(headers)
+        self.assertIsNotNone(column_parser)
+        sector = Sector(headers[3], headers[4])
+        for line in starlines:
+            with self.subTest(line=line):
+                star = DeltaStar.parse_line_into_star(line, sector, 'fixed', 'fixed')
+                canonical, msg = star.check_canonical()
+                self.assertTrue(canonical, msg)
+                self.assertIsNotNone(column_parser.parse(ParseStarInput._unpack_starline_pre_tweak(line)))
+
+    def test_allegiance_mix_is_honoured(self) -> None:
+        lines = SyntheticGalaxy(seed=5, density=0.3, allegiances={'ZhCo': 1.0}).sector_lines(0, 0)
+        _, starlines = ParseSectorInput.partition_lines(lines)
+
+        self.assertIn('# Alleg: ZhCo: "Zhodani Consulate"\n', lines)
+        self.assertTrue(all(' ZhCo ' in line for line in starlines))
+
+    def test_generated_galaxy_loads(self) -> None:
+        ParseStarInput.deep_space = {}
+        with tempfile.TemporaryDirectory() as scratch:
+            synthetic = SyntheticGalaxy(seed=1, cols=2, rows=1, density=0.1)
+            sectors = synthetic.write(scratch)
+            self.assertEqual(['Synthetic 0-0.sec', 'Synthetic 1-0.sec'], [os.path.basename(path) for path in sectors])
+
+            readparms = ReadSectorOptions(sectors=sectors, pop_code='scaled', ru_calc='scaled', route_reuse=10,
+                                          trade_choice='trade', route_btn=8)
+            galaxy = Galaxy(min_btn=13, max_jump=4)
+            galaxy.read_sectors(readparms)
+
+        self.assertEqual(synthetic.sector_names(), [sector.name for sector in galaxy.sectors.values()])
+        galaxy.is_well_formed()
+        self.assertLess(150, len(galaxy.star_mapping))
+
+    def test_bad_settings_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            SyntheticGalaxy(density=0)
+        with self.assertRaises(ValueError):
+            SyntheticGalaxy(cols=0)
+        with self.assertRaises(ValueError):
+            SyntheticGalaxy.parse_allegiances('Im:1')
+        self.assertEqual({'ImDd': 0.7, 'NaHu': 1.0}, SyntheticGalaxy.parse_allegiances('ImDd:0.7,NaHu'))
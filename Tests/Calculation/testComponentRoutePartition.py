@@ -0,0 +1,89 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+"""
+import os
+import tempfile
+from unittest.mock import patch
+
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.Calculation.ComponentRoutePartition import ComponentRoutePartition, BALANCES, TRADE_STATS, stat_holders
+from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from Tests.baseTest import baseTest
+
+
+class testComponentRoutePartition(baseTest):
+
+    def setUp(self) -> None:
+        ParseStarInput.deep_space = {}
+        self.sourcefiles = [
+            self.unpack_filename('DeltaFiles/Zarushagar.sec'),
+            self.unpack_filename('DeltaFiles/Dagudashaag.sec')
+        ]
+
+    def _galaxy(self, component_partition=False, route_cache=None) -> Galaxy:
+        ParseStarInput.deep_space = {}
+        readparms = ReadSectorOptions(sectors=self.sourcefiles, pop_code='scaled', ru_calc='scaled',
+                                      route_reuse=10, trade_choice='trade', route_btn=8, mp_threads=2,
+                                      component_partition=component_partition, route_cache=route_cache)
+        # Jump-1 splits the two sectors into well over a hundred components
+        galaxy = Galaxy(min_btn=13, max_jump=1)
+        galaxy.read_sectors(readparms)
+        galaxy.generate_routes()
+        return galaxy
+
+    @staticmethod
+    def _outputs(galaxy, output_dir) -> tuple:
+        os.makedirs(output_dir)
+        galaxy.output_path = output_dir
+        galaxy.write_routes()
+        with open(os.path.join(output_dir, 'stars.txt'), 'rb') as handle:
+            stars = handle.read()
+        with open(os.path.join(output_dir, 'ranges.txt'), 'rb') as handle:
+            ranges = handle.read()
+        stats = [[getattr(item, field) for field in TRADE_STATS] for item in stat_holders(galaxy)]
+        balances = [list(getattr(galaxy.trade, name).items()) for name in BALANCES]
+        return stars, ranges, stats, balances, galaxy.trade.counters()
+
+    def test_partitioned_run_matches_sequential_run(self) -> None:
+        with tempfile.TemporaryDirectory() as scratch:
+            galaxy = self._galaxy()
+            galaxy.trade.calculate_routes()
+            expected = self._outputs(galaxy, os.path.join(scratch, 'sequential'))
+
+            galaxy = self._galaxy(component_partition=True)
+            with patch.object(ComponentRoutePartition, 'run', autospec=True,
+                              side_effect=ComponentRoutePartition.run) as run:
+                galaxy.trade.calculate_routes()
+            run.assert_called_once()
+            actual = self._outputs(galaxy, os.path.join(scratch, 'partitioned'))
+
+            self.assertEqual(expected[0], actual[0], "stars.txt should be unchanged")
+            self.assertEqual(expected[1], actual[1], "ranges.txt should be unchanged")
+            self.assertEqual(expected[2], actual[2], "Trade statistics should be unchanged")
+            self.assertEqual(expected[3], actual[3], "Trade balances, and their order, should be unchanged")
+            self.assertEqual(expected[4], actual[4], "Route counters should be unchanged")
+
+    def test_tasks_split_by_component(self) -> None:
+        galaxy = self._galaxy(component_partition=True)
+        galaxy.trade.calculate_components()
+        btn = [(s, n, d) for (s, n, d) in galaxy.ranges.edges(data=True) if s.component == n.component]
+        partition = ComponentRoutePartition(galaxy.trade, btn, 2)
+
+        positions = [position for task in partition.task_list for position in task]
+        self.assertEqual(list(range(len(btn))), sorted(positions), "Every route should be in exactly one task")
+        sizes = [len(task) for task in partition.task_list]
+        self.assertEqual(sorted(sizes, reverse=True), sizes, "Biggest tasks should be handed out first")
+        for task in partition.task_list:
+            self.assertEqual(sorted(task), task, "Each task's routes should stay in btn order")
+        bundled = [task for task in partition.task_list if 1 < len({btn[position][0].component for position in task})]
+        self.assertGreaterEqual(1, len(bundled), "Small components should all be bundled into one task")
+
+    def test_route_cache_rules_out_partitioning(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            galaxy = self._galaxy(component_partition=True, route_cache=cache_dir)
+            galaxy.trade.calculate_components()
+            btn = [(s, n, d) for (s, n, d) in galaxy.ranges.edges(data=True) if s.component == n.component]
+            self.assertFalse(ComponentRoutePartition(galaxy.trade, btn, 2).applies())
@@ -0,0 +1,65 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+"""
+from unittest.mock import patch
+
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.Calculation.OptimisticRouteWindow import OptimisticRouteWindow
+from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from Tests.baseTest import baseTest
+
+
+class testOptimisticRouteWindow(baseTest):
+
+    def setUp(self) -> None:
+        ParseStarInput.deep_space = {}
+
+    def _run_trade(self, sourcefiles: list[str], optimistic_window=None) -> tuple[list, list]:
+        ParseStarInput.deep_space = {}
+        readparms = ReadSectorOptions(sectors=sourcefiles, pop_code='scaled', ru_calc='scaled', route_reuse=10,
+                                      trade_choice='trade', route_btn=8, mp_threads=2,
+                                      optimistic_window=optimistic_window)
+        galaxy = Galaxy(min_btn=13, max_jump=4)
+        galaxy.read_sectors(readparms)
+        galaxy.output_path = self._make_args().output
+        galaxy.generate_routes()
+        self.assertEqual(optimistic_window, galaxy.trade.optimistic_window)
+        galaxy.trade.calculate_routes()
+
+        stars = [(str(star), star.tradeIn, star.tradeOver, star.passIn, star.passOver)
+                 for star in galaxy.star_mapping.values()]
+        edges = sorted((u, v, data['trade'], data['count'], data['weight'])
+                       for (u, v, data) in galaxy.stars.edges(data=True))
+        return stars, edges
+
+    def test_trade_outputs_unchanged(self) -> None:
+        sourcefiles = [
+            self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec'),
+            self.unpack_filename('DeltaFiles/Dagudashaag-Bolivar.sec')
+        ]
+        expected = self._run_trade(sourcefiles)
+
+        for window_size in [1, 16]:
+            with self.subTest(window_size=window_size):
+                actual = self._run_trade(sourcefiles, window_size)
+                self.assertEqual(expected, actual)
+
+    def test_window_stopped_when_routing_fails(self) -> None:
+        sourcefiles = [self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')]
+        readparms = ReadSectorOptions(sectors=sourcefiles, pop_code='scaled', ru_calc='scaled', route_reuse=10,
+                                      trade_choice='trade', route_btn=8, mp_threads=2, optimistic_window=4)
+        galaxy = Galaxy(min_btn=13, max_jump=4)
+        galaxy.read_sectors(readparms)
+        galaxy.output_path = self._make_args().output
+        galaxy.generate_routes()
+
+        with patch.object(OptimisticRouteWindow, 'get_trade_between', side_effect=RuntimeError("Route blew up")), \
+                patch.object(OptimisticRouteWindow, 'stop', autospec=True,
+                             side_effect=OptimisticRouteWindow.stop) as stop, \
+                self.assertRaises(RuntimeError):
+            galaxy.trade.calculate_routes()
+        self.assertEqual(1, stop.call_count)
+        self.assertIsNone(galaxy.trade.shared_state, "Window's shared state should have been released")
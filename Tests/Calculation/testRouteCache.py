@@ -0,0 +1,100 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+"""
+import os
+import tempfile
+
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.Calculation.RouteCache import RouteCache
+from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from Tests.baseTest import baseTest
+
+
+class testRouteCache(baseTest):
+
+    def setUp(self) -> None:
+        ParseStarInput.deep_space = {}
+        self.sourcefiles = [
+            self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec'),
+            self.unpack_filename('DeltaFiles/Dagudashaag-Bolivar.sec')
+        ]
+
+    def _galaxy(self, route_cache=None, route_reuse=10, sourcefiles=None) -> Galaxy:
+        ParseStarInput.deep_space = {}
+        sourcefiles = self.sourcefiles if sourcefiles is None else sourcefiles
+        readparms = ReadSectorOptions(sectors=sourcefiles, pop_code='scaled', ru_calc='scaled',
+                                      route_reuse=route_reuse, trade_choice='trade', route_btn=8, mp_threads=1,
+                                      route_cache=route_cache)
+        galaxy = Galaxy(min_btn=13, max_jump=4)
+        galaxy.read_sectors(readparms)
+        galaxy.generate_routes()
+        self.assertEqual(route_cache, galaxy.trade.route_cache_dir)
+        return galaxy
+
+    @staticmethod
+    def _route_files(galaxy, output_dir) -> tuple[bytes, bytes]:
+        os.makedirs(output_dir)
+        galaxy.output_path = output_dir
+        galaxy.write_routes()
+        with open(os.path.join(output_dir, 'stars.txt'), 'rb') as handle:
+            stars = handle.read()
+        with open(os.path.join(output_dir, 'ranges.txt'), 'rb') as handle:
+            ranges = handle.read()
+        return stars, ranges
+
+    def test_replaying_unchanged_galaxy_matches_uncached_run(self) -> None:
+        with tempfile.TemporaryDirectory() as scratch:
+            galaxy = self._galaxy()
+            galaxy.trade.calculate_routes()
+            total = galaxy.trade.routes_pathfound
+            expected = self._route_files(galaxy, os.path.join(scratch, 'plain'))
+
+            cache_dir = os.path.join(scratch, 'cache')
+            galaxy = self._galaxy(cache_dir)
+            galaxy.trade.calculate_routes()
+            self.assertEqual(total, galaxy.trade.routes_pathfound)
+            self.assertTrue(os.path.exists(os.path.join(cache_dir, RouteCache.cache_name)))
+            self.assertEqual(expected, self._route_files(galaxy, os.path.join(scratch, 'cold')))
+
+            galaxy = self._galaxy(cache_dir)
+            galaxy.trade.calculate_routes()
+            self.assertEqual(0, galaxy.trade.routes_pathfound)
+            self.assertEqual(expected, self._route_files(galaxy, os.path.join(scratch, 'warm')))
+
+    def test_only_routes_near_changed_sector_are_pathfound(self) -> None:
+        with tempfile.TemporaryDirectory() as scratch:
+            cache_dir = os.path.join(scratch, 'cache')
+            galaxy = self._galaxy(cache_dir)
+            galaxy.trade.calculate_routes()
+            total = galaxy.trade.routes_pathfound
+
+            # Rename one Dagudashaag world - Zarushagar routes are too far away to be affected
+            with open(self.sourcefiles[1], 'r', encoding='utf-8') as handle:
+                lines = handle.readlines()
+            header = [num for (num, line) in enumerate(lines) if line.startswith('Hex')][0]
+            star_line = lines[header + 2]
+            lines[header + 2] = star_line[:5] + 'Renamed' + star_line[12:]
+            changed = os.path.join(scratch, 'Dagudashaag-Bolivar.sec')
+            with open(changed, 'w', encoding='utf-8') as handle:
+                handle.writelines(lines)
+
+            galaxy = self._galaxy(cache_dir, sourcefiles=[self.sourcefiles[0], changed])
+            galaxy.trade.calculate_routes()
+            self.assertLess(0, galaxy.trade.routes_pathfound)
+            self.assertLess(galaxy.trade.routes_pathfound, total)
+
+    def test_cache_for_different_settings_is_ignored(self) -> None:
+        galaxy = self._galaxy(route_reuse=5)
+        galaxy.trade.calculate_routes()
+        total = galaxy.trade.routes_pathfound
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            galaxy = self._galaxy(cache_dir)
+            galaxy.trade.calculate_routes()
+
+            galaxy = self._galaxy(cache_dir, route_reuse=5)
+            galaxy.trade.calculate_routes()
+            self.assertEqual(total, galaxy.trade.routes_pathfound)
@@ -0,0 +1,160 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+"""
+import json
+import os
+import tempfile
+
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.Calculation.RouteCheckpoint import RouteCheckpoint
+from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from Tests.baseTest import baseTest
+
+
+class InterruptedRun(Exception):
+    pass
+
+
+class testRouteCheckpoint(baseTest):
+
+    def setUp(self) -> None:
+        ParseStarInput.deep_space = {}
+        self.sourcefiles = [
+            self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec'),
+            self.unpack_filename('DeltaFiles/Dagudashaag-Bolivar.sec')
+        ]
+
+    def _galaxy(self, resume_dir=None, route_reuse=10) -> Galaxy:
+        ParseStarInput.deep_space = {}
+        readparms = ReadSectorOptions(sectors=self.sourcefiles, pop_code='scaled', ru_calc='scaled',
+                                      route_reuse=route_reuse, trade_choice='trade', route_btn=8, mp_threads=1,
+                                      resume_dir=resume_dir)
+        galaxy = Galaxy(min_btn=13, max_jump=4)
+        galaxy.read_sectors(readparms)
+        galaxy.output_path = self._make_args().output
+        galaxy.generate_routes()
+        self.assertEqual(resume_dir, galaxy.trade.resume_dir)
+        return galaxy
+
+    @staticmethod
+    def _interrupt_after(galaxy, routes) -> None:
+        trade = galaxy.trade
+        get_trade_between = trade.get_trade_between
+        done = []
+
+        def interrupting(star, target):
+            if len(done) == routes:
+                raise InterruptedRun()
+            done.append((star, target))
+            get_trade_between(star, target)
+
+        trade.get_trade_between = interrupting
+
+    @staticmethod
+    def _outputs(galaxy) -> tuple:
+        stars = [(str(star), star.tradeIn, star.tradeOver, star.tradeCount, star.passIn, star.passOver)
+                 for star in galaxy.star_mapping.values()]
+        edges = sorted((u, v, data['trade'], data['count'], data['weight'])
+                       for (u, v, data) in galaxy.stars.edges(data=True))
+        historic = sorted((u, v, data['weight']) for (u, v, data) in galaxy.stars.edges(data=True)
+                          if 'route' in data)
+        ranges = sorted((str(u), str(v), data.get('actual distance'), data.get('jumps'))
+                        for (u, v, data) in galaxy.ranges.edges(data=True))
+        sectors = [(sector.name, sector.stats.trade, sector.stats.tradeExt, sector.stats.passengers)
+                   for sector in galaxy.sectors.values()]
+        trade = galaxy.trade
+        balances = [dict(trade.sector_trade_balance), dict(trade.sector_passenger_balance),
+                    dict(trade.allegiance_trade_balance), dict(trade.allegiance_passenger_balance)]
+        return stars, edges, historic, ranges, sectors, balances, trade.penumbra_routes
+
+    def test_resumed_run_matches_uninterrupted_run(self) -> None:
+        galaxy = self._galaxy()
+        galaxy.trade.calculate_routes()
+        expected = self._outputs(galaxy)
+
+        with tempfile.TemporaryDirectory() as resume_dir:
+            galaxy = self._galaxy(resume_dir)
+            galaxy.trade.checkpoint_interval = 25
+            self._interrupt_after(galaxy, 110)
+            with self.assertRaises(InterruptedRun):
+                galaxy.trade.calculate_routes()
+
+            # Every route completed before the interruption is journalled
+            checkpoint = RouteCheckpoint(resume_dir)
+            with open(checkpoint.journal_path, 'r', encoding='utf-8') as handle:
+                self.assertEqual(110, len(handle.readlines()))
+
+            galaxy = self._galaxy(resume_dir)
+            galaxy.trade.calculate_routes()
+            self.assertEqual(expected, self._outputs(galaxy))
+
+            # Resuming a completed run replays every route
+            galaxy = self._galaxy(resume_dir)
+            galaxy.trade.calculate_routes()
+            self.assertEqual(0, galaxy.trade.routes_pathfound)
+            self.assertEqual(expected, self._outputs(galaxy))
+
+    def test_torn_journal_line_is_dropped(self) -> None:
+        with tempfile.TemporaryDirectory() as resume_dir:
+            galaxy = self._galaxy(resume_dir)
+            galaxy.trade.checkpoint_interval = 10
+            self._interrupt_after(galaxy, 20)
+            with self.assertRaises(InterruptedRun):
+                galaxy.trade.calculate_routes()
+
+            checkpoint = RouteCheckpoint(resume_dir)
+            with open(checkpoint.journal_path, 'a', encoding='utf-8') as handle:
+                handle.write('{"route":[1,')
+            galaxy = self._galaxy(resume_dir)
+            galaxy.trade.calculate_routes()
+
+            with open(checkpoint.header_path, 'r', encoding='utf-8') as handle:
+                header = json.load(handle)
+            with open(checkpoint.journal_path, 'r', encoding='utf-8') as handle:
+                lines = handle.readlines()
+            self.assertEqual(header['routes'], len(lines))
+            for line in lines:
+                self.assertIn('route', json.loads(line))
+
+    def test_mismatched_checkpoint_is_rejected(self) -> None:
+        with tempfile.TemporaryDirectory() as resume_dir:
+            galaxy = self._galaxy(resume_dir)
+            self._interrupt_after(galaxy, 5)
+            with self.assertRaises(InterruptedRun):
+                galaxy.trade.calculate_routes()
+            self.assertTrue(os.path.exists(os.path.join(resume_dir, RouteCheckpoint.header_name)))
+
+            galaxy = self._galaxy(resume_dir, route_reuse=5)
+            with self.assertRaises(ValueError) as ex:
+                galaxy.trade.calculate_routes()
+            msg = str(ex.exception)
+            self.assertEqual("Checkpoint in " + resume_dir + " was written for different sectors or trade settings, "
+                             "not resuming from it", msg)
+
+    def test_edited_sector_data_is_rejected(self) -> None:
+        with tempfile.TemporaryDirectory() as resume_dir:
+            galaxy = self._galaxy(resume_dir)
+            self._interrupt_after(galaxy, 5)
+            with self.assertRaises(InterruptedRun):
+                galaxy.trade.calculate_routes()
+
+            # Same stars, edges and routes, but a star's details have changed
+            galaxy = self._galaxy(resume_dir)
+            galaxy.star_mapping[0].name = 'Renamed'
+            with self.assertRaises(ValueError):
+                galaxy.trade.calculate_routes()
+
+            # Same sector data, but a different starting edge weight
+            galaxy = self._galaxy(resume_dir)
+            u, v, data = next(iter(galaxy.stars.edges(data=True)))
+            data['weight'] += 1
+            with self.assertRaises(ValueError):
+                galaxy.trade.calculate_routes()
+
+            galaxy = self._galaxy(resume_dir)
+            self._interrupt_after(galaxy, 10)
+            with self.assertRaises(InterruptedRun):
+                galaxy.trade.calculate_routes()
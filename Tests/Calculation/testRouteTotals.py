@@ -0,0 +1,82 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.Calculation.RouteTotals import RouteTotals
+from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from Tests.baseTest import baseTest
+
+
+class testRouteTotals(baseTest):
+
+    def setUp(self) -> None:
+        ParseStarInput.deep_space = {}
+        sourcefile = self.unpack_filename('DeltaFiles/duplicate_node_blowup/Trojan Reach.sec')
+        readparms = ReadSectorOptions(sectors=[sourcefile], pop_code='scaled', ru_calc='scaled', route_reuse=10,
+                                      trade_choice='trade', route_btn=8, mp_threads=1)
+        self.galaxy = Galaxy(min_btn=15, max_jump=4)
+        self.galaxy.read_sectors(readparms)
+        self.galaxy.generate_routes()
+        # Two routes sharing their middle star and first hop, so both queued-up adds land on them
+        u, v = next(iter(self.galaxy.stars.edges()))
+        w = next(item for item in self.galaxy.stars.neighbors(v) if item != u)
+        x = next(item for item in self.galaxy.stars.neighbors(v) if item not in (u, w))
+        self.routes = [[u, v, w], [u, v, x]]
+
+    def _add_routes(self, totals) -> None:
+        for (i, route) in enumerate(self.routes):
+            totals.add_route(route, totals.edges(route), 100 * (i + 1) + 1, 10 * (i + 1))
+
+    def test_queued_routes_add_up_on_write_back(self) -> None:
+        totals = RouteTotals(self.galaxy)
+        self._add_routes(totals)
+        mid = self.galaxy.star_mapping[self.routes[0][1]]
+        self.assertEqual(0, mid.tradeOver, "Nothing should be written back before write_back")
+
+        totals.write_back()
+        u, v, w = self.routes[0]
+        x = self.routes[1][2]
+        mapping = self.galaxy.star_mapping
+        self.assertEqual(50 + 100, mapping[u].tradeIn)
+        self.assertEqual(10 + 20, mapping[u].passIn)
+        self.assertEqual(0, mapping[u].tradeCount)
+        self.assertEqual(101 + 201, mapping[v].tradeOver)
+        self.assertEqual(2, mapping[v].tradeCount)
+        self.assertEqual(10 + 20, mapping[v].passOver)
+        self.assertEqual(0, mapping[v].tradeIn)
+        self.assertEqual(50, mapping[w].tradeIn)
+        self.assertEqual(100, mapping[x].tradeIn)
+        self.assertEqual(101 + 201, self.galaxy.stars[u][v]['trade'])
+        self.assertEqual(101, self.galaxy.stars[v][w]['trade'])
+        self.assertEqual(201, self.galaxy.stars[v][x]['trade'])
+
+    def test_flushing_part_way_matches_one_flush(self) -> None:
+        totals = RouteTotals(self.galaxy)
+        self._add_routes(totals)
+        totals.flush()
+        expected = {field: values.copy() for (field, values) in totals.star_values.items()}
+        expected_trade = totals.trade.copy()
+
+        totals = RouteTotals(self.galaxy)
+        totals.flush_size = 3
+        self._add_routes(totals)
+        self.assertEqual([], totals.route_stars, "Queue should have been flushed once it got to flush_size")
+        for field, values in expected.items():
+            self.assertEqual(values.tolist(), totals.star_values[field].tolist(), field)
+        self.assertEqual(expected_trade.tolist(), totals.trade.tolist())
+
+    def test_route_cost_tracks_reweighted_edges(self) -> None:
+        totals = RouteTotals(self.galaxy)
+        route = [self.galaxy.star_mapping[item] for item in self.routes[0]]
+        self.assertEqual(self.galaxy.route_cost(route), totals.route_cost(route))
+
+        edge = totals.edges(self.routes[0])[0]
+        totals.weight[edge] -= (totals.weight[edge] - totals.distance[edge]) / 10
+        totals.count[edge] += 1
+        self.assertNotEqual(self.galaxy.route_cost(route), totals.route_cost(route))
+        totals.write_back()
+        self.assertEqual(self.galaxy.route_cost(route), totals.route_cost(route))
+        self.assertEqual(1, self.galaxy.stars[self.routes[0][0]][self.routes[0][1]]['count'])
@@ -0,0 +1,86 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+"""
+import copy
+from types import SimpleNamespace
+
+import numpy as np
+
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.Calculation.TradeMPSharedState import TradeMPSharedState
+from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from PyRoute.Pathfinding.ApproximateShortestPathForestUnifiedFallback import ApproximateShortestPathForestUnified
+from PyRoute.Pathfinding.DistanceGraph import DistanceGraph
+from Tests.baseTest import baseTest
+
+
+class testTradeMPSharedState(baseTest):
+
+    def setUp(self) -> None:
+        ParseStarInput.deep_space = {}
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        readparms = ReadSectorOptions(sectors=[sourcefile], pop_code='scaled', ru_calc='scaled', route_reuse=10,
+                                      trade_choice='trade', route_btn=8)
+        galaxy = Galaxy(min_btn=13, max_jump=4)
+        galaxy.read_sectors(readparms)
+        galaxy.output_path = self._make_args().output
+        galaxy.generate_routes()
+        galaxy.trade.calculate_components()
+        landmarks, _ = galaxy.trade.get_landmarks(btn=[])
+
+        self.parent = SimpleNamespace(star_graph=DistanceGraph(galaxy.stars),
+                                      shortest_path_tree=ApproximateShortestPathForestUnified(0, galaxy.stars, 0.1,
+                                                                                              sources=landmarks))
+        self.worker = copy.deepcopy(self.parent)
+        self.shared = TradeMPSharedState(self.parent.star_graph, self.parent.shortest_path_tree, publish_batch=2)
+
+    def tearDown(self) -> None:
+        self.worker = None
+        self.shared.close()
+
+    def test_attach_shares_published_copies(self) -> None:
+        generation = self.shared.attach(self.worker)
+        self.assertEqual(0, generation)
+
+        self.assertFalse(np.shares_memory(self.parent.star_graph._weights, self.worker.star_graph._weights))
+        self.assertEqual(list(self.parent.star_graph._weights), list(self.worker.star_graph._weights))
+        self.assertFalse(np.shares_memory(self.parent.shortest_path_tree.distances,
+                                          self.worker.shortest_path_tree.distances))
+        self.assertTrue(np.array_equal(self.parent.shortest_path_tree.distances,
+                                       self.worker.shortest_path_tree.distances))
+
+    def test_parent_updates_only_seen_once_published(self) -> None:
+        self.shared.attach(self.worker)
+        self.parent.star_graph.lighten_edge(1, 11, 10)
+        self.parent.shortest_path_tree.update_edges([(1, 11)])
+
+        self.shared.route_processed()
+        self.shared.attach(self.worker)
+        self.assertNotEqual(list(self.parent.star_graph._weights), list(self.worker.star_graph._weights),
+                            "Update published before batch filled")
+
+        self.shared.route_processed()
+        self.assertEqual(1, self.shared.attach(self.worker))
+        self.assertEqual(list(self.parent.star_graph._weights), list(self.worker.star_graph._weights),
+                         "Update not published once batch filled")
+        self.assertTrue(np.array_equal(self.parent.shortest_path_tree.distances,
+                                       self.worker.shortest_path_tree.distances))
+
+    def test_slot_goes_stale_on_second_publication(self) -> None:
+        generation = self.shared.attach(self.worker)
+        self.assertFalse(self.shared.is_stale(generation))
+
+        self.shared.publish()
+        self.assertFalse(self.shared.is_stale(generation), "Publication into other slot should leave this one valid")
+
+        self.shared.publish()
+        self.assertTrue(self.shared.is_stale(generation), "Second publication should overwrite this slot")
+        self.assertFalse(self.shared.is_stale(self.shared.attach(self.worker)))
+
+    def test_set_distances_rejects_mismatched_shape(self) -> None:
+        tree = self.worker.shortest_path_tree
+        with self.assertRaises(ValueError):
+            tree.set_distances(np.zeros((len(tree.distances) + 1, tree.num_trees)))
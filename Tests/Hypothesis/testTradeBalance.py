@@ -8,7 +8,8 @@ from hypothesis.strategies import text, composite, sampled_from, lists, dictiona
 
 from PyRoute.AreaItems.Galaxy import Galaxy
 from PyRoute.AreaItems.Sector import Sector
-from PyRoute.TradeBalance import TradeBalance
+from PyRoute.Star import Star
+from PyRoute.TradeBalance import TradeBalance, IndexedTradeBalance
 from Tests.baseTest import baseTest
 
 
@@ -26,8 +27,76 @@ def multi_dict(draw) -> SearchStrategy:
     return multidict
 
 
+@composite
+def odd_unit_list(draw) -> SearchStrategy:
+    num_sectors = draw(integers(min_value=2, max_value=8))
+    pair_strat = tuples(integers(min_value=0, max_value=num_sectors - 1),
+                        integers(min_value=0, max_value=num_sectors - 1)).filter(lambda item: item[0] != item[1])
+    return num_sectors, draw(lists(pair_strat, max_size=200))
+
+
 class testTradeBalance(baseTest):
 
+    @staticmethod
+    def _galaxy(names) -> Galaxy:
+        galaxy = Galaxy(8)
+        for name in names:
+            galaxy.sectors[name] = Sector('# ' + name, '# 0, 0')
+        return galaxy
+
+    def _assert_same_balance(self, expected: TradeBalance, actual: IndexedTradeBalance) -> None:
+        self.assertEqual(list(expected.items()), list(actual.items()), "Balances, and their order, should match")
+        self.assertEqual(list(expected.single_unit_imbalance().items()), list(actual.single_unit_imbalance().items()))
+        self.assertEqual(expected.maximum, actual.maximum)
+        self.assertEqual(expected.sum, actual.sum)
+        exp_stats = [(name, sector.stats.tradeExt) for (name, sector) in expected.region.sectors.items()]
+        act_stats = [(name, sector.stats.tradeExt) for (name, sector) in actual.region.sectors.items()]
+        self.assertEqual(exp_stats, act_stats, "Sector statistics should match")
+
+    @given(multi_dict())
+    @example({('000', '001'): 0, ('000', '002'): 2})
+    @example({('8cVH', 'idhC2-TNs'): 1312, ('hnjMin', 'idhC2-TNs'): 1397, ('idhC2-TNs', 'hnjMin'): 376})
+    @settings(suppress_health_check=[HealthCheck(10)], deadline=1000)
+    def test_indexed_multilateral_balance_matches_reference(self, s: dict) -> None:
+        for item in s:
+            assume(item[0] != item[1])
+        names = sorted({name for item in s for name in item})
+
+        expected = TradeBalance(stat_field='tradeExt', region=self._galaxy(names))
+        expected.update(s)
+        actual = IndexedTradeBalance(stat_field='tradeExt', region=self._galaxy(names))
+        actual.update(s)
+        self._assert_same_balance(expected, actual)
+
+        expected.multilateral_balance()
+        actual.multilateral_balance()
+        self._assert_same_balance(expected, actual)
+
+    @given(odd_unit_list())
+    @settings(suppress_health_check=[HealthCheck(10)], deadline=1000)
+    def test_indexed_odd_units_match_reference(self, value) -> None:
+        num_sectors, pairs = value
+        names = ['Sector ' + str(i) for i in range(num_sectors)]
+
+        balances = []
+        for balance_class in [TradeBalance, IndexedTradeBalance]:
+            galaxy = self._galaxy(names)
+            stars = []
+            for name in names:
+                star = Star()
+                star.sector = galaxy.sectors[name]
+                stars.append(star)
+            balance = balance_class(stat_field='tradeExt', region=galaxy)
+            for (left, right) in pairs:
+                balance.log_odd_unit(stars[left], stars[right])
+            balances.append(balance)
+
+        expected, actual = balances
+        self._assert_same_balance(expected, actual)
+        expected.multilateral_balance()
+        actual.multilateral_balance()
+        self._assert_same_balance(expected, actual)
+
     @given(multi_dict())
     @example({('000', '00'): 0, ('000', '0000'): 0})
     @example({('000', '001'): 0, ('000', '002'): 2})
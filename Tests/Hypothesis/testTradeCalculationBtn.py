@@ -121,6 +121,36 @@ class testTradeCalculationBtn(unittest.TestCase):
 
         self.assertEqual(forward_btn, reverse_btn, "Get_btn shouldn't be sensitive to argument ordering")
 
+    @given(star_set(), integers(min_value=1, max_value=25), integers(min_value=1, max_value=1500))
+    @settings(suppress_health_check=[HealthCheck(10)])
+    def test_get_btn_max_distance(self, value, min_btn, distance) -> None:
+        star1_wtn, star1_trade, star1_alleg, star1_pos, star2_wtn, star2_trade, star2_alleg, star2_pos = value
+        sector = Sector('# Core', '# 0, 0')
+
+        star1 = Star()
+        star1.sector = sector
+        star1.position = star1_pos
+        star1.hex = Hex(sector, star1_pos)
+        star1.wtn = star1_wtn
+        star1.tradeCode = TradeCodes(star1_trade)
+        star1.alg_code = star1_alleg
+
+        star2 = Star()
+        star2.sector = sector
+        star2.position = star2_pos
+        star2.hex = Hex(sector, star2_pos)
+        star2.wtn = star2_wtn
+        star2.tradeCode = TradeCodes(star2_trade)
+        star2.alg_code = star2_alleg
+
+        max_distance = RouteCalculation.get_btn_max_distance(star1, star2, min_btn)
+        self.assertEqual(max_distance, RouteCalculation.get_btn_max_distance(star2, star1, min_btn),
+                         "Get_btn_max_distance shouldn't be sensitive to argument ordering")
+        btn = RouteCalculation.get_btn(star1, star2, distance)
+        self.assertEqual(min_btn <= btn, distance <= max_distance,
+                         "Route of " + str(distance) + " parsecs has BTN " + str(btn) + ", but max distance for BTN "
+                         + str(min_btn) + " is " + str(max_distance))
+
     def test_get_btn_pairwise(self) -> None:
         sector = Sector('# Core', '# 0, 0')
         counter = 1
@@ -0,0 +1,152 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+from PyRoute.Inputs.ParseSectorCache import ParseSectorCache
+from PyRoute.Inputs.ParseSectorInput import ParseSectorInput
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from Tests.baseTest import baseTest
+
+
+# Read a sector through the parse cache, then check every star's hashes against freshly-calculated ones
+_HASH_CHECK = """
+import copy, sys
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+from PyRoute.Inputs.ParseSectorInput import ParseSectorInput
+if 'warm' == sys.argv[3]:
+    def blowup(*args, **kwargs):
+        raise AssertionError("Starlines parsed despite cache hit")
+    ParseSectorInput.parse_starlines = blowup
+readparms = ReadSectorOptions(sectors=[sys.argv[1]], pop_code='scaled', ru_calc='scaled', route_btn=15,
+                              parse_cache=sys.argv[2])
+galaxy = Galaxy(min_btn=15, max_jump=4)
+galaxy.read_sectors(readparms)
+for star in galaxy.star_mapping.values():
+    assert hash(star) == hash(star._key), "Stale hash on " + str(star)
+    assert hash(star.hex) == hash((star.hex.position, star.hex.dx, star.hex.dy)), "Stale hex hash on " + str(star)
+    assert star == copy.deepcopy(star), "Deepcopy mismatch on " + str(star)
+    assert star in set(galaxy.star_mapping.values()), "Set membership lost for " + str(star)
+print(galaxy.sectors[list(galaxy.sectors.keys())[0]].name, len(galaxy.star_mapping))
+"""
+
+
+class testParseSectorCache(baseTest):
+
+    def setUp(self) -> None:
+        ParseStarInput.deep_space = {}
+
+    def _read_galaxy(self, sourcefile: list[str], cache_dir=None, pop_code='scaled') -> Galaxy:
+        readparms = ReadSectorOptions(sectors=sourcefile, pop_code=pop_code, ru_calc='scaled', route_btn=15,
+                                      parse_cache=cache_dir)
+        galaxy = Galaxy(min_btn=15, max_jump=4)
+        galaxy.read_sectors(readparms)
+        return galaxy
+
+    @staticmethod
+    def _star_signature(galaxy: Galaxy) -> list[str]:
+        result = []
+        for index in galaxy.star_mapping:
+            star = galaxy.star_mapping[index]
+            line = [star.parse_to_line(), str(star.sector), str(star.allegiance_base), str(star.index),
+                    str(star.hex_position), str(star.tradeCode.sophont_list), str(star.uwpCodes), str(star.gwp),
+                    str(star.wtn), str(star.ru), str(star.population), str(star.budget), str(star.eti_cargo),
+                    str(star.passenger_btn_mod), str(star.is_redzone), str(hash(star))]
+            result.append('|'.join(line))
+        return result
+
+    def test_warm_start_matches_cold_parse(self) -> None:
+        sourcefile = [
+            self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec'),
+            self.unpack_filename('DeltaFiles/Dagudashaag-Bolivar.sec')
+        ]
+        expected = self._star_signature(self._read_galaxy(sourcefile))
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold = self._read_galaxy(sourcefile, cache_dir)
+            self.assertEqual(2, len(os.listdir(cache_dir)))
+            self.assertEqual(expected, self._star_signature(cold))
+
+            warm = self._read_galaxy(sourcefile, cache_dir)
+            self.assertEqual(expected, self._star_signature(warm))
+            self.assertEqual(2, len(os.listdir(cache_dir)))
+
+        for index in warm.star_mapping:
+            star = warm.star_mapping[index]
+            self.assertIsNotNone(star.logger)
+            self.assertTrue(star.is_well_formed())
+            if star.tradeCode.ownedBy is not None and not isinstance(star.tradeCode.ownedBy, str):
+                self.assertIs(star, star.ownedBy, "Self-ownership not preserved for " + str(star))
+
+    def test_warm_start_skips_parser(self) -> None:
+        sourcefile = [self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')]
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self._read_galaxy(sourcefile, cache_dir)
+
+            old_parse = ParseSectorInput.parse_starlines
+
+            def blowup(*args, **kwargs):
+                raise AssertionError("Starlines parsed despite cache hit")
+
+            ParseSectorInput.parse_starlines = blowup
+            try:
+                galaxy = self._read_galaxy(sourcefile, cache_dir)
+            finally:
+                ParseSectorInput.parse_starlines = old_parse
+            self.assertEqual(37, len(galaxy.star_mapping))
+
+    def test_cache_key_depends_on_options(self) -> None:
+        headers = ['# Zarushagar\n']
+        starlines = ['0101 Foo                 A000000-0 ...']
+        with tempfile.TemporaryDirectory() as cache_dir:
+            base = ParseSectorCache(cache_dir, 'scaled', 'scaled')
+            key = base.cache_key(headers, starlines)
+            self.assertEqual(key, ParseSectorCache(cache_dir, 'scaled', 'scaled').cache_key(headers, starlines))
+            self.assertNotEqual(key, ParseSectorCache(cache_dir, 'fixed', 'scaled').cache_key(headers, starlines))
+            self.assertNotEqual(key, ParseSectorCache(cache_dir, 'scaled', 'negative').cache_key(headers, starlines))
+            self.assertNotEqual(key, ParseSectorCache(cache_dir, 'scaled', 'scaled', fix_pop=True).
+                                cache_key(headers, starlines))
+            self.assertNotEqual(key, ParseSectorCache(cache_dir, 'scaled', 'scaled', fix_econ=True).
+                                cache_key(headers, starlines))
+            self.assertNotEqual(key, base.cache_key(headers, starlines, ['0101']))
+            self.assertNotEqual(key, base.cache_key(headers, [starlines[0] + ' ']))
+
+    def test_benford_not_cached(self) -> None:
+        sourcefile = [self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self._read_galaxy(sourcefile, cache_dir, pop_code='benford')
+            self.assertEqual([], os.listdir(cache_dir))
+
+    def test_corrupt_entry_reparsed(self) -> None:
+        sourcefile = [self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            expected = self._star_signature(self._read_galaxy(sourcefile, cache_dir))
+            entry = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+            with open(entry, 'wb') as f:
+                f.write(b'not a cache entry')
+
+            galaxy = self._read_galaxy(sourcefile, cache_dir)
+            self.assertEqual(expected, self._star_signature(galaxy))
+
+    def test_warm_start_in_new_process_recalculates_hashes(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        rootdir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            results = []
+            for seed, start in [('1', 'cold'), ('2', 'warm')]:
+                env = dict(os.environ, PYTHONHASHSEED=seed, PYTHONPATH=rootdir)
+                result = subprocess.run([sys.executable, '-c', _HASH_CHECK, sourcefile, cache_dir, start], env=env,
+                                        cwd=rootdir, capture_output=True, text=True, check=False)
+                self.assertEqual(0, result.returncode, result.stderr)
+                results.append(result.stdout)
+        self.assertEqual(results[0], results[1])
@@ -0,0 +1,88 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+"""
+import glob
+import logging
+import os
+
+from PyRoute.AreaItems.Sector import Sector
+from PyRoute.Inputs.ParseSectorInput import ParseSectorInput
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from PyRoute.Inputs.StarlineColumnParser import StarlineColumnParser
+from PyRoute.Star import Star
+from Tests.baseTest import baseTest
+
+
+class testStarlineColumnParser(baseTest):
+
+    headers = [
+        'Hex  Name                 UWP       Remarks                    {Ix}   (Ex)    [Cx]   N     B  Z PBG W  A    '
+        'Stellar        Routes                                        \n',
+        '---- -------------------- --------- -------------------------- ------ ------- ------ ----- -- - --- -- ---- '
+        '-------------- ----------------------------------------------\n'
+    ]
+
+    def setUp(self) -> None:
+        ParseStarInput.deep_space = {}
+
+    def test_from_headers_no_column_header(self) -> None:
+        self.assertIsNone(StarlineColumnParser.from_headers(['# Zarushagar\n', '# -1,-1\n']))
+
+    def test_from_headers_unknown_columns(self) -> None:
+        headers = ['Hex  Name                 UWP       Remarks\n', '---- -------------------- --------- -------\n']
+        self.assertIsNone(StarlineColumnParser.from_headers(headers))
+
+    def test_parse_well_formed_line(self) -> None:
+        parser = StarlineColumnParser.from_headers(self.headers)
+        self.assertIsNotNone(parser)
+        line = '0109 Zed                  B431721-A Na Po                      { 3 }  (D6C-1) [3A16] B     NS - 104 8  ' \
+               'ImDi G0 III         Xb:0407 Xb:Ilel-2909                          \n'
+        expected = ['0109', 'Zed', 'B431721-A', 'Na Po', '{ 3 } (D6C-1) [3A16]', '{ 3 }', '(D6C-1)', '[3A16]', None,
+                    None, None, 'B', 'NS', '-', '104', '8', 'ImDi', 'G0 III         Xb:0407 Xb:Ilel-2909']
+        self.assertEqual(expected, parser.parse(line))
+
+    def test_parse_misaligned_line_refused(self) -> None:
+        parser = StarlineColumnParser.from_headers(self.headers)
+        line = '0109 Zed                B431721-A Na Po                      { 3 }  (D6C-1) [3A16] B     NS - 104 8  ' \
+               'ImDi G0 III         Xb:0407 Xb:Ilel-2909                          \n'
+        self.assertIsNone(parser.parse(line))
+
+    def test_parse_missing_extensions_refused(self) -> None:
+        parser = StarlineColumnParser.from_headers(self.headers)
+        line = '0109 Zed                  B431721-A Na Po                                           B     NS - 104 8  ' \
+               'ImDi G0 III         Xb:0407 Xb:Ilel-2909                          \n'
+        self.assertIsNone(parser.parse(line))
+
+    def test_differential_against_starline_parser(self) -> None:
+        logging.disable(logging.CRITICAL)
+        deltadir = os.path.dirname(self.unpack_filename('DeltaFiles/Zarushagar.sec'))
+        sources = sorted(glob.glob(os.path.join(deltadir, '**', '*.sec'), recursive=True))
+        self.assertLess(50, len(sources))
+        logger = logging.getLogger('PyRoute.testStarlineColumnParser')
+        sliced_total = 0
+
+        try:
+            for sourcefile in sources:
+                headers, starlines = ParseSectorInput.read_sector_file(sourcefile, logger)
+                parser = StarlineColumnParser.from_headers(headers)
+                if parser is None:
+                    continue
+                try:
+                    sector = Sector(headers[3], headers[4])
+                except (ValueError, IndexError):
+                    sector = Sector('# Dummy', '# 0,0')
+                with self.subTest(sourcefile=os.path.relpath(sourcefile, deltadir)):
+                    for line in starlines:
+                        sliced = parser.parse(ParseStarInput._unpack_starline_pre_tweak(line))
+                        if sliced is None:
+                            continue
+                        sliced_total += 1
+                        expected, _ = ParseStarInput._unpack_starline(Star(), line, sector)
+                        self.assertEqual(expected, sliced, "Fast path mismatch on " + line)
+        finally:
+            logging.disable(logging.NOTSET)
+
+        # The bulk of the test lines are well-formed, so the fast path should be getting a look-in
+        self.assertLess(3000, sliced_total)
@@ -26,7 +26,8 @@ class testLandmarkAvoidHelper(baseTest):
         max_labels = np.ones((num_stars), dtype=float) * float('+inf')
         min_cost = distgraph.min_cost(0, True)
 
-        actual_distances, actual_parents, _, _ = dijkstra_core(distgraph._arcs, distance_labels, 1.0, [source], max_labels, min_cost)
+        actual_distances, actual_parents, _, _ = dijkstra_core(distgraph._indptr, distgraph._indices, distgraph._weights,
+                                                               distance_labels, 1.0, [source], max_labels, min_cost)
         lobound = np.zeros(num_stars, dtype=float)
         expected_weights = actual_distances
         actual_weights = LandmarkAvoidHelper.calc_weights(actual_distances, lobound)
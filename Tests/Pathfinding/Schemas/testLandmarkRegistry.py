@@ -0,0 +1,76 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+"""
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from PyRoute.Pathfinding.DistanceGraph import DistanceGraph
+from PyRoute.Pathfinding.LandmarkSchemes.LandmarkRegistry import LandmarkRegistry
+from PyRoute.Pathfinding.LandmarkSchemes.LandmarksQExtremes import LandmarksQExtremes
+from PyRoute.Pathfinding.LandmarkSchemes.LandmarksTriaxialExtremes import LandmarksTriaxialExtremes
+from Tests.baseTest import baseTest
+
+
+class testLandmarkRegistry(baseTest):
+
+    def setUp(self) -> None:
+        ParseStarInput.deep_space = {}
+
+    def _galaxy(self, landmarks=None) -> Galaxy:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        readparms = ReadSectorOptions(sectors=[sourcefile], trade_choice='trade', route_btn=8, deep_space={},
+                                      landmarks=landmarks)
+        galaxy = Galaxy(min_btn=13, max_jump=4)
+        galaxy.read_sectors(readparms)
+        galaxy.output_path = self._make_args().output
+        galaxy.generate_routes()
+        galaxy.trade.calculate_components()
+        galaxy.trade.star_graph = DistanceGraph(galaxy.stars)
+        return galaxy
+
+    def test_parse_spec(self) -> None:
+        self.assertEqual(('triaxial', None), LandmarkRegistry.parse('triaxial'))
+        self.assertEqual(('q', 1), LandmarkRegistry.parse('q:1'))
+        self.assertEqual('wtn:3', LandmarkRegistry.check_spec('wtn:3'))
+        for spec, msg in [('foo', "Landmark scheme must be one of ['q', 'r', 's', 'triaxial', 'wtn'], not foo"),
+                          ('triaxial:x', "Landmark count in triaxial:x must be an integer"),
+                          ('triaxial:0', "Landmark count in triaxial:0 must be at least 1")]:
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError) as ex:
+                    LandmarkRegistry.parse(spec)
+                self.assertEqual(msg, str(ex.exception))
+
+    def test_default_scheme_matches_triaxial_extremes(self) -> None:
+        galaxy = self._galaxy()
+        self.assertEqual('triaxial', galaxy.trade.landmark_spec)
+        expected = LandmarksTriaxialExtremes(galaxy).get_landmarks(btn=None)
+        self.assertEqual(expected, galaxy.trade.get_landmarks())
+
+        landmarks, component_landmarks = LandmarkRegistry.get_landmarks(galaxy, 'triaxial:3')
+        self.assertEqual(expected[0][:3], landmarks)
+        self.assertEqual(3, len(component_landmarks[0]))
+
+    def test_single_axis_scheme_and_slot_cap(self) -> None:
+        galaxy = self._galaxy(landmarks='q:1')
+        self.assertEqual('q:1', galaxy.trade.landmark_spec)
+        expected = LandmarksQExtremes(galaxy).get_landmarks()
+
+        landmarks, component_landmarks = LandmarkRegistry.get_landmarks(galaxy, 'q')
+        self.assertEqual(expected, landmarks)
+        for component_id in galaxy.trade.components:
+            self.assertEqual({item[component_id] for item in expected}, component_landmarks[component_id])
+
+        landmarks, component_landmarks = galaxy.trade.get_landmarks()
+        self.assertEqual(expected[:1], landmarks)
+        self.assertEqual({expected[0][0]}, component_landmarks[0])
+
+    def test_every_scheme_can_route(self) -> None:
+        for spec in LandmarkRegistry.names() + ['triaxial:2']:
+            with self.subTest(spec=spec):
+                galaxy = self._galaxy(landmarks=spec)
+                galaxy.trade.calculate_routes()
+                # Landmark bounds are approximate, so schemes can settle on different near-shortest routes
+                self.assertLess(0, galaxy.trade.routes_pathfound)
+                self.assertLess(0, sum(data['trade'] for (_, _, data) in galaxy.stars.edges(data=True)))
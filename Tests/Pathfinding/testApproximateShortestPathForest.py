@@ -10,6 +10,8 @@ import networkx as nx
 import numpy as np
 
 from PyRoute.Pathfinding.LandmarkSchemes.LandmarksTriaxialExtremes import LandmarksTriaxialExtremes
+from PyRoute.Pathfinding.ApproximateShortestPathForestUnifiedFallback import ApproximateShortestPathForestUnified as \
+    ApproximateShortestPathForestUnifiedFallback
 from PyRoute.DeltaDebug.DeltaDictionary import SectorDictionary, DeltaDictionary
 from PyRoute.DeltaDebug.DeltaGalaxy import DeltaGalaxy
 from PyRoute.Inputs.ParseStarInput import ParseStarInput
@@ -215,6 +217,67 @@ class testApproximateShortestPathForest(baseTest):
         delta = nubound - oldbound
         self.assertGreater(max(delta), 0, "At least one heuristic value should be improved by extra tree")
 
+    def test_update_edges_only_touches_affected_labels(self) -> None:
+        galaxy = self.set_up_zarushagar_sector()
+        landmarks, _ = LandmarksTriaxialExtremes(galaxy).get_landmarks()
+        graph = galaxy.stars
+        stars = list(graph.nodes)
+
+        approx = ApproximateShortestPathForestUnified(stars[0], graph, 0.2, sources=landmarks)
+        fallback = ApproximateShortestPathForestUnifiedFallback(stars[0], graph, 0.2, sources=landmarks)
+        np.testing.assert_array_equal(fallback.parents, approx.parents)
+        self.assertEqual((len(stars), approx.num_trees), approx.parents.shape)
+
+        # Cheapen every edge along a handful of routes, as route_update_simple() does, updating after each route
+        total = {'trees_updated': 0, 'nodes_queued': 0}
+        for (source, target) in [(stars[0], stars[30]), (stars[5], stars[80]), (stars[0], stars[30])]:
+            route = nx.shortest_path(graph, source, target, weight='weight')
+            edges = list(zip(route[:-1], route[1:]))
+            old_distances = approx.distances.copy()
+            for (start, end) in edges:
+                weight = graph[start][end]['weight']
+                weight -= (weight - graph[start][end]['distance']) / 10
+                graph[start][end]['weight'] = weight
+                approx.lighten_edge(start, end, weight)
+                fallback.lighten_edge(start, end, weight)
+
+            diagnostics = approx.update_edges(edges)
+            fallback_diagnostics = fallback.update_edges(edges)
+            for key in ['trees_updated', 'nodes_queued']:
+                self.assertEqual(diagnostics[key], fallback_diagnostics[key], key)
+            np.testing.assert_array_equal(fallback.distances, approx.distances)
+            np.testing.assert_array_equal(fallback.parents, approx.parents)
+            # Each label change is a queued node, and the nodes queued are a small fraction of the forest
+            changed = np.count_nonzero(old_distances != approx.distances)
+            self.assertLessEqual(changed, diagnostics['nodes_queued'])
+            self.assertLess(diagnostics['nodes_queued'], approx.distances.size // 10)
+            total['trees_updated'] += diagnostics['trees_updated']
+            total['nodes_queued'] += diagnostics['nodes_queued']
+        self.assertLess(0, total['trees_updated'])
+        self.assertLess(0, total['nodes_queued'])
+
+        # Every labelled non-root node's parent is a neighbour whose label, plus the edge weight, bounds its own
+        distances = approx.distances
+        parents = approx.parents
+        for tree in range(approx.num_trees):
+            for node in range(len(stars)):
+                parent = parents[node, tree]
+                if -100 == parent:
+                    self.assertEqual(float('+inf'), distances[node, tree])
+                elif -1 == parent:
+                    self.assertEqual(0, distances[node, tree])
+                else:
+                    self.assertIn(parent, graph[node])
+                    self.assertLessEqual(distances[parent, tree], distances[node, tree])
+                    self.assertLessEqual(distances[node, tree],
+                                         distances[parent, tree] + graph[parent][node]['weight'] + 1e-4)
+
+        # And the lower bounds stay consistent across every edge
+        for (start, end, data) in graph.edges(data=True):
+            finite = np.isfinite(distances[start, :]) & np.isfinite(distances[end, :])
+            delta = np.abs(distances[start, finite] - distances[end, finite])
+            self.assertTrue((delta <= data['weight'] + 1e-4).all(), str((start, end)))
+
     def set_up_zarushagar_sector(self) -> DeltaGalaxy:
         sourcefile = self.unpack_filename('DeltaFiles/Zarushagar.sec')
         sector = SectorDictionary.load_traveller_map_file(sourcefile)
@@ -347,6 +347,34 @@ class testApproximateShortestPathForestUnifiedFallback(baseTest):
         self.assertEqual(0.0, lobound[4])
         self.assertEqual(0.0, lobound[5])
 
+    def test_lower_bound_lazy_matches_bulk(self) -> None:
+        args = self._make_args()
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        readparms = ReadSectorOptions(sectors=[sourcefile], pop_code=args.pop_code, ru_calc=args.ru_calc,
+                                      route_reuse=args.route_reuse, trade_choice=args.routes, route_btn=args.route_btn,
+                                      mp_threads=args.mp_threads, debug_flag=args.debug_flag, fix_pop=False,
+                                      deep_space={}, map_type=args.map_type)
+
+        galaxy = Galaxy(min_btn=15, max_jump=1)
+        galaxy.read_sectors(readparms)
+
+        galaxy.generate_routes()
+        galaxy.trade.calculate_components()
+        landmarks, component_landmarks = galaxy.trade.get_landmarks()
+        shortest_path_tree = ApproximateShortestPathForestUnified(0, galaxy.stars, 0.1, sources=landmarks)
+
+        # Target 2 has some landmarks out of reach, target 1 has none in reach
+        for target in [2, 1, 0]:
+            with self.subTest(target=target):
+                expected = shortest_path_tree.lower_bound_bulk(target)
+                lobound = shortest_path_tree.lower_bound_lazy(target)
+                self.assertEqual(0, lobound.num_known)
+                self.assertEqual(expected[3], lobound[3])
+                np.testing.assert_array_equal(expected[[5, 3, 4]], lobound[np.array([5, 3, 4])])
+                self.assertEqual(3, lobound.num_known)
+                np.testing.assert_array_equal(expected, lobound.bulk())
+                self.assertEqual(len(expected), lobound.num_known)
+
     def test_triangle_upbound_1(self) -> None:
         float64max = np.finfo(np.float64).max
 
@@ -398,6 +426,36 @@ class testApproximateShortestPathForestUnifiedFallback(baseTest):
         self.assertEqual([169.09091186523438, 324.5454406738281, 210.00001525878906, 193.63636779785156],
                          five_dist.tolist())
 
+    def test_update_edges_reports_changed_labels(self) -> None:
+        args = self._make_args()
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        readparms = ReadSectorOptions(sectors=[sourcefile], pop_code=args.pop_code, ru_calc=args.ru_calc,
+                                      route_reuse=args.route_reuse, trade_choice=args.routes, route_btn=args.route_btn,
+                                      mp_threads=args.mp_threads, debug_flag=args.debug_flag, fix_pop=False,
+                                      deep_space={}, map_type=args.map_type)
+
+        galaxy = Galaxy(min_btn=15, max_jump=2)
+        galaxy.read_sectors(readparms)
+        galaxy.generate_routes()
+        galaxy.trade.calculate_components()
+        landmarks, component_landmarks = galaxy.trade.get_landmarks()
+        shortest_path_tree = ApproximateShortestPathForestUnified(0, galaxy.stars, 0.1, sources=landmarks)
+        original = shortest_path_tree.distances.copy()
+        shortest_path_tree.watch_changes()
+
+        shortest_path_tree.lighten_edge(0, 5, galaxy.stars[0][5]['distance'])
+        shortest_path_tree.update_edges([(0, 5)])
+        expected = np.flatnonzero((original != shortest_path_tree.distances).any(axis=1)).tolist()
+        self.assertEqual([0], expected)
+        self.assertEqual(expected, sorted(set(shortest_path_tree.take_changes())))
+        self.assertEqual([], shortest_path_tree.take_changes())
+
+        shortest_path_tree.stop_watching()
+        shortest_path_tree.lighten_edge(0, 5, 1)
+        shortest_path_tree.update_edges([(0, 5)])
+        with self.assertRaises(AssertionError):
+            shortest_path_tree.take_changes()
+
     def test_update_edges_2(self) -> None:
         args = self._make_args()
         sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
@@ -499,7 +557,7 @@ class testApproximateShortestPathForestUnifiedFallback(baseTest):
         landmarks, component_landmarks = galaxy.trade.get_landmarks()
         shortest_path_tree = ApproximateShortestPathForestUnified(0, galaxy.stars, 0.1, sources=landmarks)
         galaxy.stars[0][1]['weight'] = 21.5
-        retval = (shortest_path_tree._distances[:, 0], shortest_path_tree._max_labels[:, 0], None)
+        retval = (shortest_path_tree._distances[:, 0], shortest_path_tree._max_labels[:, 0], {})
         shortest_path_tree.lighten_edge(0, 1, galaxy.stars[0][1]['weight'])
         with patch.object(shortest_path_tree, '_dijkstra', return_value=retval) as mock_method:
             edges = [(1, 0)]
@@ -534,7 +592,7 @@ class testApproximateShortestPathForestUnifiedFallback(baseTest):
         shortest_path_tree.lighten_edge(0, 5, galaxy.stars[0][5]['weight'])
         edges = [(0, 5)]
 
-        retval = (shortest_path_tree._distances[:, 0], shortest_path_tree._max_labels[:, 0], None)
+        retval = (shortest_path_tree._distances[:, 0], shortest_path_tree._max_labels[:, 0], {})
         with patch.object(shortest_path_tree, '_dijkstra', return_value=retval) as mock_dijkstra:
             shortest_path_tree.update_edges(edges)
             mock_dijkstra.assert_called()
@@ -0,0 +1,153 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+"""
+from unittest.mock import patch
+
+import networkx as nx
+import numpy as np
+
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from PyRoute.Pathfinding.DistanceGraph import DistanceGraph
+from PyRoute.Pathfinding.astar_bidirectional_fallback import astar_path_bidirectional as bidirectional_fallback
+from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy as astar_fallback
+from Tests.baseTest import baseTest
+try:
+    from PyRoute.Pathfinding.ApproximateShortestPathForestUnified import ApproximateShortestPathForestUnified
+except ModuleNotFoundError:
+    from PyRoute.Pathfinding.ApproximateShortestPathForestUnifiedFallback import ApproximateShortestPathForestUnified
+except ImportError:
+    from PyRoute.Pathfinding.ApproximateShortestPathForestUnifiedFallback import ApproximateShortestPathForestUnified
+except AttributeError:
+    from PyRoute.Pathfinding.ApproximateShortestPathForestUnifiedFallback import ApproximateShortestPathForestUnified
+try:
+    from PyRoute.Pathfinding.astar_numpy import astar_path_numpy
+    from PyRoute.Pathfinding.astar_bidirectional import astar_path_bidirectional
+except ModuleNotFoundError:
+    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy
+    from PyRoute.Pathfinding.astar_bidirectional_fallback import astar_path_bidirectional
+except ImportError:
+    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy
+    from PyRoute.Pathfinding.astar_bidirectional_fallback import astar_path_bidirectional
+except AttributeError:
+    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy
+    from PyRoute.Pathfinding.astar_bidirectional_fallback import astar_path_bidirectional
+
+
+class ArcGraph:
+
+    def __init__(self, arcs):
+        self._indptr = np.cumsum([0] + [len(row[0]) for row in arcs])
+        self._indices = np.concatenate([row[0] for row in arcs])
+        self._weights = np.concatenate([row[1] for row in arcs])
+
+    def __len__(self):
+        return len(self._indptr) - 1
+
+
+class testAStarBidirectional(baseTest):
+
+    def setUp(self) -> None:
+        ParseStarInput.deep_space = {}
+
+    def _make_galaxy(self, sourcefiles: list[str], bidirectional_length=None) -> Galaxy:
+        readparms = ReadSectorOptions(sectors=sourcefiles, pop_code='scaled', ru_calc='scaled', route_reuse=10,
+                                      trade_choice='trade', route_btn=8, bidirectional_length=bidirectional_length)
+        galaxy = Galaxy(min_btn=13, max_jump=4)
+        galaxy.read_sectors(readparms)
+        galaxy.output_path = self._make_args().output
+        galaxy.generate_routes()
+        return galaxy
+
+    def _all_pairs(self, galaxy: Galaxy, unidirectional, bidirectional) -> int:
+        galaxy.trade.calculate_components()
+        graph = DistanceGraph(galaxy.stars)
+        landmarks, _ = galaxy.trade.get_landmarks(btn=[])
+        forest = ApproximateShortestPathForestUnified(0, galaxy.stars, 0.1, sources=landmarks)
+        checked = 0
+
+        for source in range(len(graph)):
+            for target in range(len(graph)):
+                if source == target or galaxy.star_mapping[source].component != galaxy.star_mapping[target].component:
+                    continue
+                upbound = forest.triangle_upbound(source, target) * 1.005
+                expected = unidirectional(graph, source, target, forest.lower_bound_bulk, upbound=upbound)[0]
+                actual = bidirectional(graph, source, target, forest.lower_bound_bulk, upbound=upbound)[0]
+                self.assertEqual(expected, actual, "Route mismatch between " + str(source) + " and " + str(target))
+                checked += 1
+        return checked
+
+    def test_matches_unidirectional_over_subsector(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        galaxy = self._make_galaxy([sourcefile])
+
+        self.assertLess(500, self._all_pairs(galaxy, astar_path_numpy, astar_path_bidirectional))
+
+    def test_fallback_matches_unidirectional_fallback_over_subsector(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        galaxy = self._make_galaxy([sourcefile])
+
+        self.assertLess(500, self._all_pairs(galaxy, astar_fallback, bidirectional_fallback))
+
+    def test_tied_routes_handed_back(self) -> None:
+        # Two equal-cost routes from 0 to 3, via 1 and via 2 - only the unidirectional search can pick between them
+        arcs = [
+            (np.array([1, 2]), np.array([2.0, 2.0])),
+            (np.array([0, 3]), np.array([2.0, 2.0])),
+            (np.array([0, 3]), np.array([2.0, 2.0])),
+            (np.array([1, 2]), np.array([2.0, 2.0]))
+        ]
+        graph = ArcGraph(arcs)
+
+        def heuristic(target):
+            return np.zeros(len(arcs))
+
+        expected = astar_fallback(graph, 0, 3, heuristic, upbound=10.0)
+        handback = 'PyRoute.Pathfinding.astar_bidirectional_fallback.astar_path_numpy'
+        with patch(handback, wraps=astar_fallback) as unidirectional:
+            actual = bidirectional_fallback(graph, 0, 3, heuristic, upbound=10.0)
+            self.assertEqual(1, unidirectional.call_count)
+        self.assertEqual(expected, actual)
+
+    def test_unique_route_not_handed_back(self) -> None:
+        arcs = [
+            (np.array([1, 2]), np.array([2.0, 3.0])),
+            (np.array([0, 3]), np.array([2.0, 2.0])),
+            (np.array([0, 3]), np.array([3.0, 3.0])),
+            (np.array([1, 2]), np.array([2.0, 3.0]))
+        ]
+        graph = ArcGraph(arcs)
+
+        def heuristic(target):
+            return np.zeros(len(arcs))
+
+        handback = 'PyRoute.Pathfinding.astar_bidirectional_fallback.astar_path_numpy'
+        with patch(handback, side_effect=AssertionError("Route handed back to unidirectional search")):
+            path, diag = bidirectional_fallback(graph, 0, 3, heuristic, upbound=10.0, diagnostics=True)
+        self.assertEqual([0, 1, 3], path)
+        self.assertEqual(2, diag['num_jumps'])
+
+        with self.assertRaises(nx.NetworkXNoPath):
+            bidirectional_fallback(graph, 0, 3, heuristic, upbound=3.0)
+
+    def test_trade_outputs_unchanged(self) -> None:
+        sourcefiles = [
+            self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec'),
+            self.unpack_filename('DeltaFiles/Dagudashaag-Bolivar.sec')
+        ]
+        results = []
+        for bidirectional_length in [None, 0]:
+            ParseStarInput.deep_space = {}
+            galaxy = self._make_galaxy(sourcefiles, bidirectional_length)
+            self.assertEqual(bidirectional_length, galaxy.trade.bidirectional_length)
+            galaxy.trade.calculate_routes()
+            stars = [(str(star), star.tradeIn, star.tradeOver, star.passIn, star.passOver)
+                     for star in galaxy.star_mapping.values()]
+            edges = sorted((u, v, data['trade'], data['count'], data['weight'])
+                           for (u, v, data) in galaxy.stars.edges(data=True))
+            results.append((stars, edges))
+
+        self.assertEqual(results[0], results[1])
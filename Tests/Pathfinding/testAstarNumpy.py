@@ -3,9 +3,13 @@ Created on Sep 21, 2023
 
 @author: CyberiaResurrection
 """
+import networkx as nx
+
 from PyRoute.Pathfinding.DistanceGraph import DistanceGraph
+from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy as astar_path_numpy_fallback
 from PyRoute.DeltaDebug.DeltaDictionary import SectorDictionary, DeltaDictionary
 from PyRoute.DeltaDebug.DeltaGalaxy import DeltaGalaxy
+from PyRoute.Errors.RouteTooLongError import RouteTooLongError
 from PyRoute.Inputs.ParseStarInput import ParseStarInput
 from Tests.baseTest import baseTest
 goodimport = True
@@ -79,3 +83,93 @@ class testAStarNumpy(baseTest):
                                                   diagnostics=True)
         self.assertEqual(exp_route, act_route)
         self.assertEqual(exp_diagnostics, diagnostics)
+
+    def testLazyBoundsMatchBulkBounds(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+
+        sector = SectorDictionary.load_traveller_map_file(sourcefile)
+        delta = DeltaDictionary()
+        delta[sector.name] = sector
+
+        args = self._make_args()
+
+        galaxy = DeltaGalaxy(args.btn, args.max_jump)
+        galaxy.read_sectors(delta, args.pop_code, args.ru_calc,
+                            args.route_reuse, args.routes, args.route_btn, args.mp_threads, args.debug_flag)
+        galaxy.output_path = args.output
+
+        galaxy.generate_routes()
+        galaxy.trade.calculate_components()
+        landmarks, _ = galaxy.trade.get_landmarks()
+        dist_graph = DistanceGraph(galaxy.stars)
+        forest = ApproximateShortestPathForestUnified(0, galaxy.stars, 0.1, sources=landmarks)
+
+        lazy_bounds = []
+
+        def lazy_heuristic(target):
+            bound = forest.lower_bound_lazy(target)
+            lazy_bounds.append(bound)
+            return bound
+
+        for pathfinder in [astar_path_numpy, astar_path_numpy_fallback]:
+            for (source, target) in [(0, 36), (36, 0), (3, 29), (12, 12)]:
+                with self.subTest(pathfinder=pathfinder.__module__, source=source, target=target):
+                    upbound = forest.triangle_upbound(source, target) * 1.005
+                    exp_route, exp_diagnostics = pathfinder(dist_graph, source, target, forest.lower_bound_bulk,
+                                                            upbound=upbound, diagnostics=True)
+                    act_route, diagnostics = pathfinder(dist_graph, source, target, lazy_heuristic, upbound=upbound,
+                                                        diagnostics=True)
+                    self.assertEqual(exp_route, act_route)
+                    self.assertEqual(exp_diagnostics, diagnostics)
+                    # Only the nodes the search looked at get a bound worked out
+                    self.assertLess(lazy_bounds[-1].num_known, len(dist_graph))
+
+    def testRouteLengthCap(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+
+        sector = SectorDictionary.load_traveller_map_file(sourcefile)
+        delta = DeltaDictionary()
+        delta[sector.name] = sector
+
+        args = self._make_args()
+
+        galaxy = DeltaGalaxy(args.btn, args.max_jump)
+        galaxy.read_sectors(delta, args.pop_code, args.ru_calc,
+                            args.route_reuse, args.routes, args.route_btn, args.mp_threads, args.debug_flag)
+        galaxy.output_path = args.output
+
+        galaxy.generate_routes()
+        galaxy.trade.calculate_components()
+        landmarks, _ = galaxy.trade.get_landmarks()
+        dist_graph = DistanceGraph(galaxy.stars)
+        forest = ApproximateShortestPathForestUnified(0, galaxy.stars, 0.1, sources=landmarks)
+        mapping = galaxy.star_mapping
+
+        for pathfinder in [astar_path_numpy, astar_path_numpy_fallback]:
+            for (source, target) in [(0, 36), (36, 0), (3, 29)]:
+                with self.subTest(pathfinder=pathfinder.__module__, source=source, target=target):
+                    upbound = forest.triangle_upbound(source, target) * 1.005
+                    exp_route, exp_diagnostics = pathfinder(dist_graph, source, target, forest.lower_bound_bulk,
+                                                            upbound=upbound, diagnostics=True)
+                    length = sum(mapping[exp_route[i]].distance(mapping[exp_route[i + 1]])
+                                 for i in range(len(exp_route) - 1))
+
+                    # A cap the route fits inside leaves the search untouched
+                    act_route, diagnostics = pathfinder(dist_graph, source, target, forest.lower_bound_bulk,
+                                                        upbound=upbound, diagnostics=True, max_distance=length)
+                    self.assertEqual(exp_route, act_route)
+                    self.assertEqual(exp_diagnostics, diagnostics)
+
+                    # A cap the route doesn't fit inside gives up on it
+                    with self.assertRaises(RouteTooLongError):
+                        pathfinder(dist_graph, source, target, forest.lower_bound_bulk, upbound=upbound,
+                                   max_distance=length - 1)
+                    with self.assertRaises(RouteTooLongError):
+                        pathfinder(dist_graph, source, target, forest.lower_bound_bulk, upbound=upbound,
+                                   max_distance=mapping[source].distance(mapping[target]) - 1)
+
+                    # Running out of upper bound isn't giving up on the route as too long
+                    with self.assertRaises(nx.NetworkXNoPath) as context:
+                        pathfinder(dist_graph, source, target, forest.lower_bound_bulk, upbound=upbound / 2,
+                                   max_distance=length + 1000)
+                    self.assertNotIsInstance(context.exception, RouteTooLongError)
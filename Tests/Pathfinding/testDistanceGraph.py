@@ -48,6 +48,25 @@ class testDistanceGraph(baseTest):
         extended = distgraph.min_cost(0, indirect=True)
         self.assertEqual(expected_extended, list(extended), 'Unexpected indirect min-cost vector after update')
 
+    def test_lighten_edge_reports_changed_arcs(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        galaxy, graph, _, _ = self._setup_graph(sourcefile)
+
+        distgraph = DistanceGraph(graph)
+        distgraph.lighten_edge(1, 11, 40)
+        distgraph.watch_changes()
+        self.assertEqual([], distgraph.take_changes())
+
+        distgraph.lighten_edge(1, 11, 30)
+        distgraph.lighten_edge(0, 5, 20)
+        self.assertEqual([1, 11, 0, 5], distgraph.take_changes())
+        self.assertEqual([], distgraph.take_changes())
+
+        distgraph.stop_watching()
+        distgraph.lighten_edge(1, 11, 20)
+        with self.assertRaises(AssertionError):
+            distgraph.take_changes()
+
     def test_min_cost_in_single_component_with_distances(self) -> None:
         sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
         galaxy, graph, _, _ = self._setup_graph(sourcefile)
@@ -0,0 +1,63 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+"""
+import random
+import unittest
+
+from PyRoute.Pathfinding.indexedheap_fallback import IndexedHeap
+
+
+class testIndexedHeapFallback(unittest.TestCase):
+
+    def test_pop_in_priority_order(self) -> None:
+        for arity in [2, 3, 4, 8]:
+            with self.subTest(arity=arity):
+                rng = random.Random(arity)
+                heap = IndexedHeap(50, arity)
+                priorities = {node: rng.random() for node in range(50)}
+                for node in rng.sample(range(50), 50):
+                    self.assertTrue(heap.push(node, priorities[node]))
+                self.assertEqual(50, len(heap))
+
+                popped = [heap.popmin() for _ in range(50)]
+                self.assertEqual(sorted((value, node) for (node, value) in priorities.items()), popped)
+                self.assertEqual(0, len(heap))
+
+    def test_push_decreases_key_in_place(self) -> None:
+        heap = IndexedHeap(5)
+        heap.push(1, 10.0)
+        heap.push(2, 5.0)
+        heap.push(3, 7.0)
+
+        self.assertTrue(heap.push(1, 2.0), "Smaller priority should replace queued entry")
+        self.assertFalse(heap.push(2, 6.0), "Larger priority should leave queued entry alone")
+        self.assertFalse(heap.push(3, 7.0), "Equal priority should leave queued entry alone")
+        self.assertEqual(3, len(heap))
+        self.assertEqual((2.0, 1), heap.peekmin())
+
+        self.assertEqual([(2.0, 1), (5.0, 2), (7.0, 3)], [heap.popmin() for _ in range(3)])
+
+    def test_popped_node_can_be_requeued(self) -> None:
+        heap = IndexedHeap(3)
+        heap.push(0, 1.0)
+        self.assertIn(0, heap)
+        self.assertEqual((1.0, 0), heap.popmin())
+        self.assertNotIn(0, heap)
+
+        self.assertTrue(heap.push(0, 4.0))
+        self.assertEqual((4.0, 0), heap.popmin())
+
+    def test_clear(self) -> None:
+        heap = IndexedHeap(4)
+        for node in range(4):
+            heap.push(node, (float(node), node))
+        heap.clear()
+        self.assertEqual(0, len(heap))
+        for node in range(4):
+            self.assertNotIn(node, heap)
+
+
+if __name__ == '__main__':
+    unittest.main()
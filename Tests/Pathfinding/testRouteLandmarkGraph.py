@@ -103,6 +103,31 @@ class testRouteLandmarkGraph(baseTest):
         self.assertEqual([1], actual[0], "v - index nodelist not updated")
         self.assertEqual([7.5], actual[1], "v - value list not updated")
 
+    def test_add_edges_past_slack_should_keep_rows_intact(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        graph, _, stars = self._setup_graph(sourcefile)
+        num_stars = len(stars)
+
+        rlg = RouteLandmarkGraph(graph)
+        self.assertEqual(num_stars, len(rlg))
+
+        # Interleave edges on two nodes, so both overflow their slabs and move to the tail more than once
+        expected = {0: [], 1: []}
+        for v in range(2, 2 + 4 * RouteLandmarkGraph.SLACK):
+            for u in expected:
+                rlg.add_edge(u, v, 10 * u + v)
+                expected[u].append(v)
+        rlg.lighten_edge(0, 5, 1.5)
+
+        for u in expected:
+            actual = rlg[u]
+            self.assertEqual(expected[u], list(actual[0]), "Neighbour list mangled for " + str(u))
+            exp_weights = [1.5 if (0 == u and 5 == v) else 10 * u + v for v in expected[u]]
+            self.assertEqual(exp_weights, list(actual[1]), "Weight list mangled for " + str(u))
+            self.assertEqual({v: k for (k, v) in enumerate(expected[u])}, actual[2])
+        for v in range(2, 2 + 4 * RouteLandmarkGraph.SLACK):
+            self.assertEqual([0, 1], list(rlg[v][0]), "Reverse arcs mangled for " + str(v))
+
     def test_verify_position_creation(self) -> None:
         sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
         graph, _, stars = self._setup_graph(sourcefile)
@@ -39,8 +39,9 @@ class testSingleSourceDijkstraCoreFallback(baseTest):
         max_labels = np.ones((graph_len), dtype=float) * float('+inf')
         min_cost = dist_graph.min_cost(0, True)
 
-        nu_labels, nu_parents, nu_max, nu_diagnostics = dijkstra_core(dist_graph._arcs, dist_labels, float(1.0 / 1.1),
-                                                        [source], max_labels, min_cost)
+        nu_labels, nu_parents, nu_max, nu_diagnostics = dijkstra_core(dist_graph._indptr, dist_graph._indices,
+                                                                      dist_graph._weights, dist_labels,
+                                                                      float(1.0 / 1.1), [source], max_labels, min_cost)
         self.assertEqual('int64', str(nu_parents.dtype))
         exp_labels = [0.0, 158.18181818181816, 199.99999999999997, 222.7272727272727, 241.81818181818178,
                       49.090909090909086, 114.54545454545453, 241.81818181818178, 67.27272727272727, 108.18181818181817,
@@ -70,7 +71,7 @@ class testSingleSourceDijkstraCoreFallback(baseTest):
     def test_dijkstra_core_2(self) -> None:
         msg = None
         try:
-            dijkstra_core(None, None, None, None, None, None)
+            dijkstra_core(None, None, None, None, None, None, None, None)
         except ValueError as e:
             msg = str(e)
         self.assertEqual('min_cost must be ndarray', msg)
@@ -79,7 +80,7 @@ class testSingleSourceDijkstraCoreFallback(baseTest):
         msg = None
         array = np.ones(1)
         try:
-            dijkstra_core(None, None, None, None, None, array)
+            dijkstra_core(None, None, None, None, None, None, None, array)
         except ValueError as e:
             msg = str(e)
         self.assertEqual('max_neighbour_labels must be ndarray', msg)
@@ -88,7 +89,7 @@ class testSingleSourceDijkstraCoreFallback(baseTest):
         msg = None
         array = np.ones(1)
         try:
-            dijkstra_core(None, None, None, None, array, array)
+            dijkstra_core(None, None, None, None, None, None, array, array)
         except ValueError as e:
             msg = str(e)
         self.assertEqual('distance_labels must be ndarray', msg)
@@ -97,7 +98,7 @@ class testSingleSourceDijkstraCoreFallback(baseTest):
         msg = None
         array = np.ones(1)
         try:
-            dijkstra_core(None, array, None, None, array, array)
+            dijkstra_core(None, None, None, array, None, None, array, array)
         except ValueError as e:
             msg = str(e)
         self.assertEqual('divisor must be float', msg)
@@ -106,7 +107,7 @@ class testSingleSourceDijkstraCoreFallback(baseTest):
         msg = None
         array = np.ones(1)
         try:
-            dijkstra_core(None, array, 0.0, None, array, array)
+            dijkstra_core(None, None, None, array, 0.0, None, array, array)
         except ValueError as e:
             msg = str(e)
         self.assertEqual('divisor must be positive and <= 1.0', msg)
@@ -115,7 +116,7 @@ class testSingleSourceDijkstraCoreFallback(baseTest):
         msg = None
         array = np.ones(1)
         try:
-            dijkstra_core(None, array, 1.001, None, array, array)
+            dijkstra_core(None, None, None, array, 1.001, None, array, array)
         except ValueError as e:
             msg = str(e)
         self.assertEqual('divisor must be positive and <= 1.0', msg)
@@ -144,7 +145,7 @@ class testSingleSourceDijkstraCoreFallback(baseTest):
         max_labels = np.ones((graph_len), dtype=float) * float('+inf')
         min_cost = dist_graph.min_cost(0, True)
 
-        _, nu_parents, _, _ = dijkstra_core(dist_graph._arcs, dist_labels, 1.0, [source], max_labels, min_cost)
+        _, nu_parents, _, _ = dijkstra_core(dist_graph._indptr, dist_graph._indices, dist_graph._weights, dist_labels, 1.0, [source], max_labels, min_cost)
         exp_parents = [-1, -100, -100, -100, -100, 0, 9, -100, 5, 15, 15, 10, -100, -100, 8, 21, 15, 11, 17, 14, 14, 20,
                        17, -100, 25, 22, 22, -100, -100, 26, -100, -100, -100, -100, -100, -100, -100]
         self.assertEqual(exp_parents, list(nu_parents))
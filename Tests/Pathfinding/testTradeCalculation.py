@@ -3,7 +3,14 @@ Created on Aug 08, 2024
 
 @author: CyberiaResurrection
 """
+import math
+import os
+import tempfile
+from unittest.mock import patch
+
 from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.Calculation.RouteCalculation import RouteCalculation
+from PyRoute.Calculation.TradeCalculation import TradeCalculation
 from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
 from PyRoute.Pathfinding.DistanceGraph import DistanceGraph
 from Tests.baseTest import baseTest
@@ -123,6 +130,9 @@ class testTradeCalculation(baseTest):
         self.assertEqual(50000000, tradeCr, "Unexpected tradeCr value")
         self.assertEqual(500, tradePass, "Unexpected tradePass value")
         self.assertEqual(1000, tradeDton, "Unexpected tradeDton value")
+        # Route totals are only written back to the stars once route processing is done
+        self.assertEqual(0, galaxy.star_mapping[12].tradeOver)
+        galaxy.trade.write_route_totals()
 
         ends = [2, 9]
         mids = [12, 11, 5, 6, 4]
@@ -173,3 +183,67 @@ class testTradeCalculation(baseTest):
         galaxy.read_sectors(readparms)
         galaxy.output_path = args.output
         galaxy.generate_routes()
+
+    def _audit_galaxy(self, paranoid=False) -> Galaxy:
+        sourcefiles = [self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec'),
+                       self.unpack_filename('DeltaFiles/Dagudashaag-Bolivar.sec')]
+        readparms = ReadSectorOptions(sectors=sourcefiles, pop_code='scaled', ru_calc='scaled', route_reuse=10,
+                                      trade_choice='trade', route_btn=8, mp_threads=1, deep_space={},
+                                      paranoid=paranoid)
+        galaxy = Galaxy(min_btn=13, max_jump=4)
+        galaxy.read_sectors(readparms)
+        galaxy.generate_routes()
+        self.assertEqual(paranoid, galaxy.trade.paranoid)
+        return galaxy
+
+    def test_audits_check_running_totals(self) -> None:
+        galaxy = self._audit_galaxy()
+        with patch.object(TradeCalculation, 'cross_check_totals', autospec=True,
+                          side_effect=TradeCalculation.cross_check_totals) as recount, \
+                patch.object(TradeCalculation, 'check_running_totals', autospec=True,
+                             side_effect=TradeCalculation.check_running_totals) as audit:
+            galaxy.trade.calculate_routes()
+        self.assertLess(2, audit.call_count, "Routes should have been audited along the way")
+        # Once to start the running totals off, and once at the end of route processing
+        self.assertEqual(2, recount.call_count)
+
+        galaxy.trade.check_running_totals()
+        galaxy.stats.trade += 1
+        with self.assertRaises(AssertionError) as context:
+            galaxy.trade.check_running_totals()
+        self.assertIn("Sector total trade", str(context.exception))
+
+    def test_paranoid_audits_recount_in_full(self) -> None:
+        galaxy = self._audit_galaxy(paranoid=True)
+        with patch.object(TradeCalculation, 'cross_check_totals', autospec=True,
+                          side_effect=TradeCalculation.cross_check_totals) as recount, \
+                patch.object(TradeCalculation, 'check_running_totals', autospec=True,
+                             side_effect=TradeCalculation.check_running_totals) as audit:
+            galaxy.trade.calculate_routes()
+        self.assertLess(2, audit.call_count, "Routes should have been audited along the way")
+        self.assertEqual(audit.call_count + 1, recount.call_count)
+
+    def _route_stars_file(self, output_path: str) -> tuple[bytes, int]:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar.sec')
+        readparms = ReadSectorOptions(sectors=[sourcefile], pop_code='scaled', ru_calc='scaled', route_reuse=10,
+                                      trade_choice='trade', route_btn=8, mp_threads=1, deep_space={})
+        galaxy = Galaxy(min_btn=13, max_jump=4)
+        galaxy.output_path = output_path
+        galaxy.read_sectors(readparms)
+        galaxy.generate_routes()
+        galaxy.trade.calculate_routes()
+        galaxy.write_routes()
+        with open(os.path.join(output_path, 'stars.txt'), 'rb') as f:
+            return f.read(), galaxy.trade.penumbra_routes
+
+    def test_min_btn_filter_leaves_stars_file_unchanged(self) -> None:
+        # Filtering out routes whose BTN can't survive their length must not change route weights -
+        # filtered routes still have to reheat the upper bound, exactly as they would when pathfound.
+        with tempfile.TemporaryDirectory() as filtered, tempfile.TemporaryDirectory() as unfiltered:
+            expected, expected_penumbra = self._route_stars_file(filtered)
+            with patch.object(RouteCalculation, 'get_btn_max_distance', return_value=math.inf):
+                actual, actual_penumbra = self._route_stars_file(unfiltered)
+
+        self.assertEqual(expected, actual, "stars.txt should not depend on the min-btn route filter")
+        self.assertEqual(expected_penumbra, actual_penumbra, "Filtered routes should still count as penumbra")
+        self.assertLess(0, expected_penumbra)
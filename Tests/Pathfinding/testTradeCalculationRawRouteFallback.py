@@ -30,3 +30,48 @@ class testTradeCalculationRawRouteFallback(baseTest):
         galaxy.trade.calculate_components()
 
         galaxy.trade.calculate_routes()
+
+    def test_base_ranges_match_compiled_version(self) -> None:
+        try:
+            from PyRoute.Pathfinding.TradeCalculationRawRoutes import TradeCalculationRawRoutes as CompiledRawRoutes
+        except ImportError:
+            self.skipTest("Compiled raw routes not built")
+
+        sourcefiles = [
+            self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec'),
+            self.unpack_filename('DeltaFiles/Dagudashaag-Bolivar.sec')
+        ]
+        for min_btn, max_jump in [(13, 4), (11, 2), (15, 6)]:
+            with self.subTest(min_btn=min_btn, max_jump=max_jump):
+                readparms = ReadSectorOptions(sectors=sourcefiles, trade_choice='trade', route_btn=8, deep_space={})
+                galaxy = Galaxy(min_btn=min_btn, max_jump=max_jump)
+                galaxy.read_sectors(readparms)
+                trade = galaxy.trade
+                hiball = [item for item in galaxy.ranges if item.wtn >= trade.min_route_wtn and not item.is_redzone]
+                loball = [item for item in galaxy.ranges if item.wtn < trade.min_route_wtn and not item.is_redzone]
+
+                compiled = CompiledRawRoutes(trade)
+                expected = list(compiled.raw_ranges())
+                expected_first, expected_second = compiled._base_ranges(hiball, max_jump, min_btn)
+                offsets = CompiledRawRoutes._axial_offsets_within(max_jump)
+                lo_ranges = compiled._lo_lo_ranges(loball, offsets) + compiled._hi_lo_ranges(hiball, loball, offsets)
+
+                fallback = TradeCalculationRawRoutes(trade)
+                first, second = fallback._base_ranges(hiball, max_jump, min_btn)
+                self.assertLess(0, len(first))
+                self.assertEqual(expected_first.tolist(), first.tolist())
+                self.assertEqual(expected_second.tolist(), second.tolist())
+                actual = list(TradeCalculationRawRoutes._star_pairs(hiball, first, second, chunk_size=1000))
+                self.assertEqual(expected, actual + lo_ranges)
+                self.assertEqual(len(first), fallback.pairs_added)
+                self.assertLessEqual(fallback.pairs_added, fallback.pairs_kept)
+                self.assertLessEqual(fallback.pairs_kept, fallback.pairs_considered)
+                self.assertLessEqual(fallback.pairs_considered, fallback.pairs_primed)
+
+                # Splitting the compiled scan across threads mustn't change its pairs, their order or its counters
+                counters = (compiled.pairs_primed, compiled.pairs_considered, compiled.pairs_kept)
+                trade.mp_threads = 4
+                threaded_first, threaded_second = compiled._base_ranges(hiball, max_jump, min_btn)
+                self.assertEqual(expected_first.tolist(), threaded_first.tolist())
+                self.assertEqual(expected_second.tolist(), threaded_second.tolist())
+                self.assertEqual(counters, (compiled.pairs_primed, compiled.pairs_considered, compiled.pairs_kept))
@@ -3,7 +3,11 @@ Created on Aug 08, 2024
 
 @author: CyberiaResurrection
 """
+from unittest.mock import patch
+
 from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.Calculation.TradeMPCalculation import TradeMPCalculation
+from PyRoute.Calculation.TradeMPSharedState import TradeMPSharedState
 from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
 from Tests.baseTest import baseTest
 
@@ -52,3 +56,40 @@ class testTradeMPCalculation(baseTest):
         galaxy.generate_routes()
         galaxy.set_borders(args.borders, args.ally_match)
         galaxy.trade.calculate_routes()
+
+    def test_shared_state_closed_when_routing_fails(self) -> None:
+        sourcefiles = [
+            self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec'),
+            self.unpack_filename('DeltaFiles/Dagudashaag-Bolivar.sec')
+        ]
+
+        args = self._make_args()
+        args.route_reuse = 30
+        args.route_btn = 8
+        args.mp_threads = 2
+        args.routes = "trade-mp"
+
+        readparms = ReadSectorOptions(sectors=sourcefiles, pop_code=args.pop_code, ru_calc=args.ru_calc,
+                                      route_reuse=args.route_reuse, trade_choice=args.routes, route_btn=args.route_btn,
+                                      mp_threads=args.mp_threads, debug_flag=args.debug_flag, fix_pop=False,
+                                      deep_space={}, map_type=args.map_type)
+
+        # Skipping the intra-sector pass leaves the failure to the long routes
+        for skip_intrasector in [False, True]:
+            with self.subTest(skip_intrasector=skip_intrasector):
+                galaxy = Galaxy(min_btn=15, max_jump=4)
+                galaxy.read_sectors(readparms)
+                galaxy.output_path = args.output
+                galaxy.generate_routes()
+
+                # A bad route from a child process trips the parent's path check mid-way through processing
+                with patch('PyRoute.Calculation.TradeMPCalculation.is_path', return_value=False), \
+                        patch.object(TradeMPSharedState, 'close', autospec=True,
+                                     side_effect=TradeMPSharedState.close) as close, \
+                        patch.object(TradeMPCalculation, 'start_mp_services', autospec=True,
+                                     side_effect=None if skip_intrasector else TradeMPCalculation.start_mp_services), \
+                        self.assertRaises(AssertionError) as context:
+                    galaxy.trade.calculate_routes()
+                self.assertIn("not a correct path", str(context.exception))
+                self.assertEqual(1, close.call_count)
+                self.assertIsNone(galaxy.trade.shared_state)
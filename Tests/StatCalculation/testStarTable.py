@@ -0,0 +1,75 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+from PyRoute import ObjectStatistics, Star
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.AreaItems.Sector import Sector
+from PyRoute.StatCalculation.StarTable import StarTable
+from PyRoute.StatCalculation.StatCalculation import StatCalculation
+from Tests.baseTest import baseTest
+
+
+class testStarTable(baseTest):
+
+    lines = [
+        "0103 Irkigkhan            B9C4733-9 Fl (Zoid)             { 0 }  (E69+0) [4726]  B    A - 423 8  Im M2 V           ",
+        "0104 Shana Ma             E551112-7 Lo Po                { -3 } (301-3) [1113] B     - - 913 9  Im K2 IV M7 V     ",
+        "0105 Irkigkhan            C9C4833-9 Dolp4 Asla6  FoobX   { 0 }  (E69+0) [4726] B     U - 123 8  Im M2 V           ",
+        "0106 Irkigkhan            C9C4733-9 Fl Huma9 Dolp1 Asla1 { 0 }  (E69+0) [4726] B     NS - 123 8  Im M2 V           ",
+        "0107 Irkigkhan            C9C4833-9 [VargW]              { 0 }  (E69+0) [4726] B     H - 123 8  Im M2 V           ",
+        "0108 Irkigkhan            C9C4833-9 Geon? Zoid0 VargA    { 0 }  (E69+0) [4726] B     - - 123 8  Im M2 V           "
+    ]
+
+    def _stars(self) -> list[Star]:
+        sector = Sector('# Core', '# 0, 0')
+        stars = []
+        for i, line in enumerate(self.lines):
+            star = Star.parse_line_into_star(line, sector, 'fixed', 'fixed')
+            star.tradeIn = 100 * i
+            star.tradeOver = 300 * i
+            star.passIn = 7 * i
+            star.eti_cargo_volume = i % 2
+            star.starportSize = i % 3
+            star.starportPop = i
+            star.col_be = 0.1 * i if 1 != i else 3
+            stars.append(star)
+        return stars
+
+    def test_aggregate_matches_add_stats(self) -> None:
+        galaxy = Galaxy(8, 4)
+        # Every star goes to the first statistics, every other star to the second, each star twice to the third
+        expected = [ObjectStatistics() for _ in range(3)]
+        stat = StatCalculation(galaxy)
+        for pos, star in enumerate(self._stars()):
+            stat.add_stats(expected[0], star)
+            stat.max_tl(expected[0], star)
+            if 0 == pos % 2:
+                stat.add_stats(expected[1], star)
+            stat.add_stats(expected[2], star)
+            stat.add_stats(expected[2], star)
+
+        actual = [ObjectStatistics() for _ in range(3)]
+        stat = StatCalculation(galaxy)
+        table = StarTable(self._stars(), stat.sophont_populations)
+        for pos in range(len(self.lines)):
+            table.add(pos, actual[0], True)
+            if 0 == pos % 2:
+                table.add(pos, actual[1])
+            table.add(pos, actual[2])
+            table.add(pos, actual[2])
+        table.aggregate()
+
+        fields = StarTable.int_fields + StarTable.float_fields + StarTable.counter_fields + ('maxTL', 'maxPop', 'maxPort')
+        for exp_stats, act_stats in zip(expected, actual):
+            for field in fields:
+                self.assertEqual(repr(exp_stats[field]), repr(act_stats[field]), field)
+            self.assertEqual([str(item) for item in exp_stats.homeworlds], [str(item) for item in act_stats.homeworlds])
+            self.assertEqual(list(exp_stats.populations), list(act_stats.populations))
+            for code, population in exp_stats.populations.items():
+                act_population = act_stats.populations[code]
+                self.assertEqual(population.count, act_population.count, code)
+                self.assertEqual(population.population, act_population.population, code)
+                self.assertEqual([str(item) for item in population.homeworlds],
+                                 [str(item) for item in act_population.homeworlds], code)
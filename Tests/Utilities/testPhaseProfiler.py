@@ -0,0 +1,84 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+"""
+import json
+import os
+import tempfile
+import unittest
+
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from PyRoute.Utilities.PhaseProfiler import PhaseProfiler
+from Tests.baseTest import baseTest
+
+
+class testPhaseProfiler(baseTest):
+
+    def test_disabled_profiler_records_nothing(self) -> None:
+        profiler = PhaseProfiler(None)
+        self.assertFalse(profiler.enabled)
+        with profiler.phase('read_sectors'):
+            pass
+        profiler.write_report()
+        self.assertEqual([], profiler.phases)
+
+    def test_bad_profiler_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            PhaseProfiler('report.json', profiler='gprof')
+
+    def test_phases_record_timings_and_counter_deltas(self) -> None:
+        counts = {'routes_pathfound': 5, 'penumbra_routes': 1}
+        with tempfile.TemporaryDirectory() as scratch:
+            path = os.path.join(scratch, 'report.json')
+            profiler = PhaseProfiler(path, profile_phases=['calculate_routes'])
+            profiler.counter_source = lambda: counts
+
+            with profiler.phase('generate_routes'):
+                sum(range(1000))
+            with profiler.phase('calculate_routes'):
+                counts['routes_pathfound'] += 10
+            profiler.write_report()
+
+            with open(path, 'r', encoding='utf-8') as handle:
+                report = json.load(handle)
+            with open(os.path.join(scratch, 'report.txt'), 'r', encoding='utf-8') as handle:
+                summary = handle.read()
+            self.assertTrue(os.path.exists(os.path.join(scratch, 'report.calculate_routes.prof')))
+            self.assertTrue(os.path.exists(os.path.join(scratch, 'report.calculate_routes.prof.txt')))
+
+        self.assertEqual(['generate_routes', 'calculate_routes'], [item['phase'] for item in report['phases']])
+        self.assertEqual({}, report['phases'][0]['counters'])
+        self.assertEqual({'routes_pathfound': 10}, report['phases'][1]['counters'])
+        self.assertNotIn('profile', report['phases'][0])
+        self.assertIn('profile', report['phases'][1])
+        for item in report['phases']:
+            self.assertLessEqual(0, item['wall_seconds'])
+            self.assertLessEqual(0, item['cpu_seconds'])
+        self.assertEqual({'routes_pathfound': 15, 'penumbra_routes': 1}, report['counters'])
+        self.assertIn('calculate_routes', summary)
+        self.assertIn('routes_pathfound 10', summary)
+
+    def test_trade_counters_track_pathfinding(self) -> None:
+        ParseStarInput.deep_space = {}
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        readparms = ReadSectorOptions(sectors=[sourcefile], pop_code='scaled', ru_calc='scaled', route_reuse=10,
+                                      trade_choice='trade', route_btn=8)
+        galaxy = Galaxy(min_btn=13, max_jump=4)
+        galaxy.read_sectors(readparms)
+        galaxy.output_path = self._make_args().output
+        galaxy.generate_routes()
+        galaxy.trade.collect_diagnostics = True
+        galaxy.trade.calculate_routes()
+
+        counters = galaxy.trade.counters()
+        self.assertLess(0, counters['routes_pathfound'])
+        self.assertLessEqual(counters['penumbra_routes'], counters['routes_pathfound'])
+        self.assertLessEqual(counters['routes_pathfound'], counters['nodes_expanded'])
+        self.assertLessEqual(counters['nodes_expanded'], counters['nodes_queued'])
+
+
+if __name__ == '__main__':
+    unittest.main()
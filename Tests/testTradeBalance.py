@@ -1,7 +1,7 @@
 from PyRoute.AreaItems.Galaxy import Galaxy
 from PyRoute.AreaItems.Sector import Sector
 from PyRoute.Star import Star
-from PyRoute.TradeBalance import TradeBalance
+from PyRoute.TradeBalance import TradeBalance, IndexedTradeBalance
 from Tests.baseTest import baseTest
 
 
@@ -315,3 +315,40 @@ class testTradeBalance(baseTest):
         foo.update(update_dict)
 
         foo.is_balanced()
+
+    def test_indexed_trade_balance_bad_key(self) -> None:
+        foo = IndexedTradeBalance(stat_field='passengers', region=Galaxy(8))
+        msg = None
+
+        try:
+            foo[('foo', 'foo')] = 1
+        except AssertionError as e:
+            msg = str(e)
+        self.assertEqual('Elements of key must differ', msg)
+        self.assertEqual(0, len(foo), "Rejected key should not be added")
+
+    def test_indexed_trade_balance_delete(self) -> None:
+        foo = IndexedTradeBalance(stat_field='passengers', region=Galaxy(8))
+        foo.update({('Core', 'Fornast'): 1, ('Delphi', 'Massilia'): 2, ('Core', 'Delphi'): 1})
+
+        del foo[('Core', 'Fornast')]
+        self.assertEqual({('Delphi', 'Massilia'): 2, ('Core', 'Delphi'): 1}, dict(foo))
+        self.assertEqual(3, foo.sum)
+        self.assertEqual({'Delphi': 3, 'Massilia': 2, 'Core': 1}, foo.single_unit_imbalance())
+        with self.assertRaises(KeyError):
+            del foo[('Core', 'Fornast')]
+
+    def test_indexed_trade_balance_counts_stats_added(self) -> None:
+        core = Sector('# Core', '# 0, 0')
+        dagu = Sector('# Dagudashaag', '# -1, 0')
+        star1 = Star()
+        star1.sector = core
+        star2 = Star()
+        star2.sector = dagu
+
+        foo = IndexedTradeBalance(stat_field='tradeExt', region=Galaxy(8))
+        foo.log_odd_unit(star1, star2)
+        self.assertEqual(0, foo.stats_added, "Logging an unmatched odd unit should add nothing to statistics")
+        foo.log_odd_unit(star1, star2)
+        self.assertEqual(2, foo.stats_added, "Settling a pair of odd units should add one to each sector")
+        self.assertEqual(core.stats.tradeExt + dagu.stats.tradeExt, foo.stats_added)
@@ -0,0 +1,90 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+import os
+import tempfile
+from unittest.mock import patch
+
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from PyRoute.StatCalculation.StatCalculation import StatCalculation
+from PyRoute.wikistats import WikiStats
+from Tests.baseTest import baseTest
+
+
+class testWikiStats(baseTest):
+
+    def setUp(self) -> None:
+        ParseStarInput.deep_space = {}
+        sourcefiles = [
+            self.unpack_filename('DeltaFiles/Zarushagar.sec'),
+            self.unpack_filename('DeltaFiles/Dagudashaag.sec')
+        ]
+        readparms = ReadSectorOptions(sectors=sourcefiles, pop_code='scaled', ru_calc='scaled', route_reuse=10,
+                                      trade_choice='trade', route_btn=8, mp_threads=1)
+        self.galaxy = Galaxy(min_btn=15, max_jump=2)
+        self.galaxy.read_sectors(readparms)
+        self.stats = StatCalculation(self.galaxy)
+        self.stats.calculate_statistics('collapse')
+
+    def _write(self, output_path, **kwargs) -> WikiStats:
+        self.galaxy.output_path = output_path
+        wiki = WikiStats(self.galaxy, self.stats.all_uwp, **kwargs)
+        wiki.write_statistics()
+        return wiki
+
+    @staticmethod
+    def _contents(output_path) -> dict[str, bytes]:
+        contents = {}
+        for filename in sorted(os.listdir(output_path)):
+            if filename.endswith(('.wiki', '.txt')):
+                with open(os.path.join(output_path, filename), 'rb') as handle:
+                    contents[filename] = handle.read()
+        return contents
+
+    def test_parallel_sector_pages_match_sequential(self) -> None:
+        with tempfile.TemporaryDirectory() as sequential, tempfile.TemporaryDirectory() as parallel:
+            self._write(sequential)
+            with patch.object(WikiStats, 'sector_pages', autospec=True, side_effect=WikiStats.sector_pages) as pages:
+                self._write(parallel, workers=2)
+            pages.assert_not_called()
+
+            expected = self._contents(sequential)
+            self.assertIn('Zarushagar Sector.sector.wiki', expected)
+            self.assertIn('subsector_list.txt', expected)
+            self.assertEqual(expected, self._contents(parallel))
+
+    def test_manifest_leaves_unchanged_pages_alone(self) -> None:
+        with tempfile.TemporaryDirectory() as output_path:
+            wiki = self._write(output_path, manifest=True)
+            self.assertEqual(0, wiki.unchanged)
+            expected = self._contents(output_path)
+            self.assertEqual(sorted(expected), sorted(wiki.hashes))
+            self.assertTrue(os.path.exists(os.path.join(output_path, WikiStats.manifest_name)))
+            self.assertIn('sectors_list.txt', wiki.hashes)
+            self.assertTrue(os.listdir(os.path.join(output_path, WikiStats.bytecode_cache_name)),
+                            "Compiled templates should be cached in the output directory")
+
+            for filename in expected:
+                os.utime(os.path.join(output_path, filename), (1000000, 1000000))
+            econ_page = os.path.join(output_path, 'Dagudashaag Sector.economic.wiki')
+            os.remove(econ_page)
+
+            wiki = self._write(output_path, manifest=True)
+            self.assertEqual(len(expected) - 1, wiki.unchanged)
+            self.assertEqual(expected, self._contents(output_path))
+            for filename in expected:
+                mtime = os.path.getmtime(os.path.join(output_path, filename))
+                if os.path.join(output_path, filename) == econ_page:
+                    self.assertNotEqual(1000000, mtime, "Missing page should have been written again")
+                else:
+                    self.assertEqual(1000000, mtime, filename + " should have been left alone")
+
+    def test_no_template_cache_without_manifest(self) -> None:
+        with tempfile.TemporaryDirectory() as output_path:
+            wiki = self._write(output_path)
+            self.assertIsNone(wiki.env.bytecode_cache)
+            self.assertFalse(os.path.exists(os.path.join(output_path, WikiStats.bytecode_cache_name)))
@@ -0,0 +1,179 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+
+Benchmark for landmark selection schemes, to pick the fastest scheme and landmark count for a given galaxy rather than
+guessing.  For a fixed galaxy and a fixed random sample of the trade calculation's BTN pairs, each SCHEME[:k] spec
+is timed on:
+    Preprocessing - picking the landmarks, then building the approximate shortest-path forest over them
+    Pathfinding - searching every sampled pair's route with that forest's landmark bounds, against the initial edge
+        weights, recording nodes expanded and queued and wall time
+
+    PYTHONPATH=. python benchmarks/landmark_schemes.py --synthetic 3x3 --pairs 500
+    PYTHONPATH=. python benchmarks/landmark_schemes.py --scheme triaxial --scheme triaxial:6 --scheme q sectors/*.sec
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Optional
+
+import networkx as nx
+
+from benchmarks.synthetic_galaxy import SyntheticGalaxy, parse_grid
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from PyRoute.Pathfinding.DistanceGraph import DistanceGraph
+from PyRoute.Pathfinding.LandmarkSchemes.LandmarkRegistry import LandmarkRegistry
+from PyRoute.route import landmark_spec
+try:
+    from PyRoute.Pathfinding.ApproximateShortestPathForestUnified import ApproximateShortestPathForestUnified
+except ModuleNotFoundError:
+    from PyRoute.Pathfinding.ApproximateShortestPathForestUnifiedFallback import ApproximateShortestPathForestUnified
+except ImportError:
+    from PyRoute.Pathfinding.ApproximateShortestPathForestUnifiedFallback import ApproximateShortestPathForestUnified
+except AttributeError:
+    from PyRoute.Pathfinding.ApproximateShortestPathForestUnifiedFallback import ApproximateShortestPathForestUnified
+try:
+    from PyRoute.Pathfinding.astar_numpy import astar_path_numpy
+except ModuleNotFoundError:
+    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy
+except ImportError:
+    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy
+except AttributeError:
+    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy
+
+
+def load_galaxy(sectors: list[str], args) -> Galaxy:
+    """
+    Read sectors and set up the trade calculation's jump graph, components and BTN pairs, up to the point it would
+    pick landmarks.
+    """
+    ParseStarInput.deep_space = {}
+    galaxy = Galaxy(args.btn, args.max_jump)
+    readparms = ReadSectorOptions(sectors=sectors, pop_code='scaled', ru_calc='scaled', route_reuse=args.route_reuse,
+                                  trade_choice='trade', route_btn=args.route_btn, mp_threads=1, debug_flag=False,
+                                  fix_pop=False, deep_space={}, map_type='classic')
+    galaxy.read_sectors(readparms)
+    galaxy.generate_routes()
+    galaxy.trade.calculate_components()
+    galaxy.trade.star_graph = DistanceGraph(galaxy.stars)
+    return galaxy
+
+
+def btn_pairs(galaxy: Galaxy) -> list[tuple]:
+    """
+    BTN pairs in the order the trade calculation processes them.
+    """
+    btn = [(s, n, d) for (s, n, d) in galaxy.ranges.edges(data=True) if s.component == n.component]
+    btn.sort(key=lambda tn: tn[2]['btn'], reverse=True)
+    return btn
+
+
+def sample_pairs(btn: list[tuple], count: int, seed: int) -> list[tuple[int, int]]:
+    pairs = [(star.index, neighbour.index) for (star, neighbour, _) in btn]
+    if count < len(pairs):
+        pairs = random.Random(seed).sample(pairs, count)
+    return pairs
+
+
+def benchmark_scheme(galaxy: Galaxy, spec: str, btn: list[tuple], pairs: list[tuple[int, int]]) -> dict:
+    """
+    Time spec's landmark preprocessing, then pathfinding over pairs, returning the scheme's results row.
+    """
+    trade = galaxy.trade
+    source = max(galaxy.star_mapping.values(), key=lambda item: item.wtn)
+
+    start = time.perf_counter()
+    landmarks, _ = LandmarkRegistry.get_landmarks(galaxy, spec, btn=btn)
+    forest = ApproximateShortestPathForestUnified(source.index, galaxy.stars, trade.epsilon, sources=landmarks)
+    preprocess = time.perf_counter() - start
+
+    nodes_expanded = 0
+    nodes_queued = 0
+    no_path = 0
+    start = time.perf_counter()
+    for (star, neighbour) in pairs:
+        upbound = forest.triangle_upbound(star, neighbour) * 1.005
+        try:
+            _, diag = astar_path_numpy(trade.star_graph, star, neighbour, forest.lower_bound_lazy, upbound=upbound,
+                                       diagnostics=True)
+        except nx.NetworkXNoPath:
+            no_path += 1
+            continue
+        nodes_expanded += diag['nodes_expanded']
+        nodes_queued += diag['nodes_queued']
+    search = time.perf_counter() - start
+
+    return {'scheme': spec, 'landmarks': forest.num_trees, 'preprocess_seconds': preprocess,
+            'search_seconds': search, 'total_seconds': preprocess + search, 'nodes_expanded': nodes_expanded,
+            'nodes_queued': nodes_queued, 'no_path': no_path}
+
+
+def run_benchmark(sectors: list[str], args) -> tuple[list[dict], int, int]:
+    """
+    Benchmark every scheme in args.scheme, returning the results rows, fastest first, the number of stars and the
+    number of pairs searched.
+    """
+    galaxy = load_galaxy(sectors, args)
+    btn = btn_pairs(galaxy)
+    pairs = sample_pairs(btn, args.pairs, args.seed)
+    specs = args.scheme if args.scheme else LandmarkRegistry.names()
+    rows = [benchmark_scheme(galaxy, spec, btn, pairs) for spec in specs]
+    rows.sort(key=lambda row: row['total_seconds'])
+    return rows, len(galaxy.star_mapping), len(pairs)
+
+
+def print_rows(rows: list[dict]) -> None:
+    print('{:<16} {:>9} {:>13} {:>10} {:>10} {:>14} {:>12}'.format('scheme', 'landmarks', 'preprocess (s)',
+                                                                   'search (s)', 'total (s)', 'nodes expanded',
+                                                                   'nodes queued'))
+    for row in rows:
+        print('{:<16} {:>9} {:>13.3f} {:>10.3f} {:>10.3f} {:>14,d} {:>12,d}'.format(
+            row['scheme'], row['landmarks'], row['preprocess_seconds'], row['search_seconds'], row['total_seconds'],
+            row['nodes_expanded'], row['nodes_queued']))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='PyRoute landmark scheme benchmark.')
+    parser.add_argument('--scheme', default=None, action='append', type=landmark_spec,
+                        help='Landmark scheme, as SCHEME[:k], to benchmark - can be repeated.  Default [every '
+                             'registered scheme: ' + ', '.join(LandmarkRegistry.names()) + ']')
+    parser.add_argument('--pairs', default=1000, type=int, help='Number of BTN pairs to sample, default [1000]')
+    parser.add_argument('--seed', default=0, type=int, help='Random seed for sampling and synthetic galaxies')
+    parser.add_argument('--synthetic', default=None,
+                        help='Benchmark a synthetic galaxy of COLSxROWS sectors instead of sector files')
+    parser.add_argument('--density', default=0.35, type=float,
+                        help='Synthetic galaxy chance of any given hex holding a star, default [0.35]')
+    parser.add_argument('--btn', dest='btn', default=13, type=int, help='Minimum BTN used for route calculation')
+    parser.add_argument('--min-route-btn', dest='route_btn', default=8, type=int,
+                        help='Minimum btn for drawing on the map, default [8]')
+    parser.add_argument('--max-jump', dest='max_jump', default=4, type=int, help='Maximum jump distance, default [4]')
+    parser.add_argument('--route-reuse', dest='route_reuse', default=10, type=int,
+                        help='Scale for reusing routes, which sets the triaxial scheme\'s default landmark count')
+    parser.add_argument('sector', nargs='*', help='T5SS sector file(s) to benchmark')
+    args = parser.parse_args(argv)
+
+    if args.synthetic is None and 0 == len(args.sector):
+        print('Nothing to benchmark - supply sector files or --synthetic', file=sys.stderr)
+        return 2
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as scratch:
+        sectors = args.sector
+        if args.synthetic is not None:
+            cols, rows = parse_grid(args.synthetic)
+            sectors = SyntheticGalaxy(args.seed, cols, rows, args.density).write(os.path.join(scratch, 'sectors'))
+        results, stars, pairs = run_benchmark(sectors, args)
+
+    print('{} stars, {} BTN pairs searched'.format(stars, pairs))
+    print_rows(results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
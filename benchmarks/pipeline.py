@@ -0,0 +1,331 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+
+End-to-end benchmark for the route.py pipeline, with a JSON history of past runs so upgrades can be checked against
+the nightly window before they're rolled out.  This code:
+    Runs the same phases route.py does, timing each separately - parse, generate_routes, each border algorithm in turn,
+        calculate_routes, statistics, wiki templates, PDF sector maps and subsector maps
+    Runs against either real sector files or a synthetic galaxy from synthetic_galaxy.py
+    Appends each run's per-phase times to a history file, along with the settings and code revision it ran against
+    Compares any two runs in the history, flagging phases that slowed by more than a threshold, and exits non-zero
+        if any did
+
+The default history, benchmarks/.history.json, is local to each machine and kept out of git - timings from one box
+say nothing about another, so compare only picks a baseline run on the same platform, CPU count and Python version.
+
+    PYTHONPATH=. python benchmarks/pipeline.py run --synthetic 2x2 --label nightly
+    PYTHONPATH=. python benchmarks/pipeline.py run --no-maps Tests/DeltaFiles/Zarushagar.sec
+    PYTHONPATH=. python benchmarks/pipeline.py compare --threshold 0.1
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+from benchmarks.synthetic_galaxy import SyntheticGalaxy, parse_grid
+from PyRoute.Allies.Borders import Borders
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from PyRoute.Outputs.ClassicModePDFSectorMap import ClassicModePDFSectorMap
+from PyRoute.Outputs.SubsectorMap import SubsectorMap
+from PyRoute.SpeculativeTrade import SpeculativeTrade
+from PyRoute.StatCalculation.StatCalculation import StatCalculation
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(__file__), '.history.json')
+BORDER_ALGORITHMS = ['range', 'allygen', 'erode']
+
+
+@contextmanager
+def time_phase(timings: dict[str, float], phase: str) -> Iterator[None]:
+    start = time.perf_counter()
+    yield
+    timings[phase] = time.perf_counter() - start
+
+
+def run_pipeline(sectors: list[str], args, output_dir: str) -> tuple[dict[str, float], int]:
+    """
+    Run the route.py phases once over sectors, returning each phase's wall time and the number of stars loaded.
+    """
+    timings: dict[str, float] = {}
+    ParseStarInput.deep_space = {}
+    galaxy = Galaxy(args.btn, args.max_jump)
+    galaxy.output_path = output_dir
+    readparms = ReadSectorOptions(sectors=sectors, pop_code='scaled', ru_calc='scaled', route_reuse=10,
+                                  trade_choice=args.routes, route_btn=args.route_btn, mp_threads=args.mp_threads,
+                                  debug_flag=False, fix_pop=False, deep_space={}, map_type='classic')
+
+    with time_phase(timings, 'parse'):
+        galaxy.read_sectors(readparms)
+    with time_phase(timings, 'generate_routes'):
+        galaxy.generate_routes()
+
+    # Each algorithm gets a clean slate, leaving the last one's borders in place for the maps
+    for algorithm in BORDER_ALGORITHMS:
+        galaxy.borders = Borders(galaxy)
+        with time_phase(timings, 'borders_' + algorithm):
+            galaxy.set_borders(algorithm, 'collapse')
+
+    if args.trade:
+        with time_phase(timings, 'calculate_routes'):
+            galaxy.trade.calculate_routes()
+            galaxy.process_eti()
+            SpeculativeTrade('CT', galaxy.stars).process_tradegoods()
+
+    stats = StatCalculation(galaxy)
+    with time_phase(timings, 'statistics'):
+        stats.calculate_statistics('collapse')
+    with time_phase(timings, 'wiki'):
+        stats.write_statistics(10, 'collapse', False)
+
+    if args.maps:
+        with time_phase(timings, 'pdf_maps'):
+            ClassicModePDFSectorMap(galaxy, args.routes, output_dir, 'dense').write_maps()
+        with time_phase(timings, 'subsector_maps'):
+            SubsectorMap(galaxy, args.routes, output_dir).write_maps()
+
+    return timings, len(galaxy.star_mapping)
+
+
+def run_benchmark(args) -> dict:
+    """
+    Run the pipeline args.repeat times, keeping the fastest time seen for each phase, and return the resulting
+    history entry.
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        if args.synthetic is not None:
+            cols, rows = parse_grid(args.synthetic)
+            allegiances = None if args.allegiances is None else SyntheticGalaxy.parse_allegiances(args.allegiances)
+            synthetic = SyntheticGalaxy(args.seed, cols, rows, args.density, allegiances)
+            sectors = synthetic.write(os.path.join(scratch, 'sectors'))
+            source = {'synthetic': args.synthetic, 'seed': args.seed, 'density': args.density,
+                      'allegiances': synthetic.allegiances}
+        else:
+            sectors = args.sector
+            source = {'sectors': [os.path.basename(sector) for sector in sectors]}
+        output_dir = os.path.join(scratch, 'output')
+        os.makedirs(output_dir)
+
+        best: dict[str, float] = {}
+        stars = 0
+        for _ in range(args.repeat):
+            timings, stars = run_pipeline(sectors, args, output_dir)
+            for phase, elapsed in timings.items():
+                best[phase] = min(elapsed, best.get(phase, elapsed))
+
+    config = dict(source)
+    config.update({'routes': args.routes, 'btn': args.btn, 'route_btn': args.route_btn, 'max_jump': args.max_jump,
+                   'mp_threads': args.mp_threads, 'trade': args.trade, 'maps': args.maps})
+    return {
+        'label': args.label,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': config,
+        'stars': stars,
+        'repeat': args.repeat,
+        'phases': best,
+        'total': sum(best.values()),
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def load_history(path: str) -> list[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def save_history(path: str, history: list[dict]) -> None:
+    # Write to a scratch file first, so a crash mid-write can't trash the history
+    scratch = path + '.tmp'
+    with open(scratch, 'w', encoding='utf-8') as handle:
+        json.dump(history, handle, indent=2)
+        handle.write('\n')
+    os.replace(scratch, path)
+
+
+def find_run(history: list[dict], label) -> int:
+    """
+    Return the index of the most recent run with label, or of the run at that position if label is an integer.
+    """
+    try:
+        index = int(label)
+        return index if 0 <= index else len(history) + index
+    except ValueError:
+        pass
+    for index in range(len(history) - 1, -1, -1):
+        if label == history[index]['label']:
+            return index
+    raise ValueError("No run labelled " + label + " in history")
+
+
+def machine_key(run: dict) -> tuple:
+    return run.get('platform'), run.get('cpu_count'), run.get('python')
+
+
+def find_baseline(history: list[dict], cand_index: int) -> Optional[int]:
+    """
+    Return the index of the latest run before cand_index with the same settings, on the same machine setup, or None
+    if there isn't one - anything else isn't a like-for-like comparison.
+    """
+    candidate = history[cand_index]
+    matches = [i for i in range(cand_index) if history[i]['config'] == candidate['config'] and
+               machine_key(history[i]) == machine_key(candidate)]
+    return matches[-1] if matches else None
+
+
+def compare_runs(baseline: dict, candidate: dict, threshold: float, min_seconds: float) -> list[tuple]:
+    """
+    Return (phase, baseline seconds, candidate seconds, relative change, regressed) for every phase either run timed.
+    A phase has regressed if it slowed by more than threshold, as a fraction of the baseline time, _and_ by more than
+    min_seconds, so sub-second jitter on tiny phases doesn't raise false alarms.
+    """
+    rows = []
+    phases = list(baseline['phases'].keys())
+    phases.extend(phase for phase in candidate['phases'] if phase not in baseline['phases'])
+    for phase in phases + ['total']:
+        base = baseline['total'] if 'total' == phase else baseline['phases'].get(phase)
+        cand = candidate['total'] if 'total' == phase else candidate['phases'].get(phase)
+        if base is None or cand is None:
+            rows.append((phase, base, cand, None, False))
+            continue
+        change = (cand - base) / base if 0 < base else 0.0
+        regressed = change > threshold and cand - base > min_seconds
+        rows.append((phase, base, cand, change, regressed))
+    return rows
+
+
+def describe(run: dict) -> str:
+    return '{} ({}, {})'.format(run['label'], run['commit'], run['timestamp'])
+
+
+def run_command(args) -> int:
+    if args.synthetic is None and 0 == len(args.sector):
+        print('Nothing to benchmark - supply sector files or --synthetic', file=sys.stderr)
+        return 2
+    logging.disable(logging.WARNING)
+    entry = run_benchmark(args)
+    history = load_history(args.history)
+    history.append(entry)
+    save_history(args.history, history)
+
+    print('{}: {} stars'.format(describe(entry), entry['stars']))
+    for phase, elapsed in entry['phases'].items():
+        print('{:>16}: {:9.3f}s'.format(phase, elapsed))
+    print('{:>16}: {:9.3f}s'.format('total', entry['total']))
+    return 0
+
+
+def compare_command(args) -> int:
+    history = load_history(args.history)
+    if 2 > len(history):
+        print('Need at least two runs in ' + args.history + ' to compare', file=sys.stderr)
+        return 2
+
+    cand_index = find_run(history, args.candidate)
+    candidate = history[cand_index]
+    if args.baseline is not None:
+        base_index = find_run(history, args.baseline)
+    else:
+        base_index = find_baseline(history, cand_index)
+        if base_index is None:
+            print('No earlier run with the same settings and machine setup as ' + describe(candidate),
+                  file=sys.stderr)
+            return 2
+    baseline = history[base_index]
+
+    print('baseline:  ' + describe(baseline))
+    print('candidate: ' + describe(candidate))
+    rows = compare_runs(baseline, candidate, args.threshold, args.min_seconds)
+    for phase, base, cand, change, regressed in rows:
+        if change is None:
+            print('{:>16}: {:>9} {:>9}'.format(phase, fmt_seconds(base), fmt_seconds(cand)))
+            continue
+        flag = '  REGRESSION' if regressed else ''
+        print('{:>16}: {:>9} {:>9} {:+8.1%}{}'.format(phase, fmt_seconds(base), fmt_seconds(cand), change, flag))
+
+    failed = any(row[4] for row in rows)
+    if args.budget is not None and candidate['total'] > args.budget:
+        print('total {:.1f}s exceeds budget of {:.1f}s'.format(candidate['total'], args.budget))
+        failed = True
+    return 1 if failed else 0
+
+
+def fmt_seconds(value) -> str:
+    return '-' if value is None else '{:.3f}s'.format(value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='PyRoute pipeline benchmark.')
+    parser.add_argument('--history', default=DEFAULT_HISTORY,
+                        help='JSON file of past benchmark runs, default [benchmarks/.history.json]')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Time each pipeline phase and append the results to the history')
+    run.add_argument('--label', default='run', help='Name to record this run under, default [run]')
+    run.add_argument('--repeat', default=1, type=int,
+                     help='Number of times to run the pipeline, keeping the fastest time per phase, default [1]')
+    run.add_argument('--synthetic', default=None,
+                     help='Benchmark a synthetic galaxy of COLSxROWS sectors instead of sector files')
+    run.add_argument('--seed', default=0, type=int, help='Synthetic galaxy random seed, default [0]')
+    run.add_argument('--density', default=0.35, type=float,
+                     help='Synthetic galaxy chance of any given hex holding a star, default [0.35]')
+    run.add_argument('--allegiances', default=None,
+                     help='Synthetic galaxy allegiance mix as CODE:WEIGHT,..., default [ImDd:0.6,CsIm:0.1,NaHu:0.3]')
+    run.add_argument('--routes', dest='routes', default='trade', choices=['trade', 'trade-mp', 'comm', 'xroute'],
+                     help='Route type to be generated, default [trade]')
+    run.add_argument('--btn', dest='btn', default=13, type=int, help='Minimum BTN used for route calculation')
+    run.add_argument('--min-route-btn', dest='route_btn', default=8, type=int,
+                     help='Minimum btn for drawing on the map, default [8]')
+    run.add_argument('--max-jump', dest='max_jump', default=4, type=int, help='Maximum jump distance, default [4]')
+    run.add_argument('--mp-threads', dest='mp_threads', default=max(1, (os.cpu_count() or 1) - 1), type=int,
+                     help='Number of processes for trade-mp routes, default [cpu count - 1]')
+    run.add_argument('--trade', default=True, action=argparse.BooleanOptionalAction,
+                     help='Time the trade route calculation')
+    run.add_argument('--maps', default=True, action=argparse.BooleanOptionalAction,
+                     help='Time PDF sector and subsector map generation')
+    run.add_argument('sector', nargs='*', help='T5SS sector file(s) to benchmark')
+    run.set_defaults(handler=run_command)
+
+    compare = commands.add_parser('compare', help='Compare two runs from the history')
+    compare.add_argument('--candidate', default='-1',
+                         help='Label or history index of the run to check, default [-1], the latest')
+    compare.add_argument('--baseline', default=None,
+                         help='Label or history index of the run to check against, default [latest earlier run with '
+                              'the same settings, platform, CPU count and Python version]')
+    compare.add_argument('--threshold', default=0.1, type=float,
+                         help='Relative slowdown past which a phase is flagged, default [0.1]')
+    compare.add_argument('--min-seconds', dest='min_seconds', default=0.05, type=float,
+                         help='Absolute slowdown, in seconds, a phase must also exceed to be flagged, default [0.05]')
+    compare.add_argument('--budget', default=None, type=float,
+                         help='Also flag the candidate if its total time exceeds this many seconds')
+    compare.set_defaults(handler=compare_command)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+
+Micro-benchmark for starline tokenising - full Lark grammar versus the column-slicing fast path.
+
+    PYTHONPATH=. python benchmarks/starline_parse.py Tests/DeltaFiles/Zarushagar.sec Tests/DeltaFiles/Dagudashaag.sec
+"""
+import argparse
+import logging
+import time
+
+from PyRoute.AreaItems.Sector import Sector
+from PyRoute.Inputs.ParseSectorInput import ParseSectorInput
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from PyRoute.Inputs.StarlineColumnParser import StarlineColumnParser
+from PyRoute.Star import Star
+
+
+def time_path(jobs, use_columns: bool, repeat: int) -> tuple[int, float]:
+    lines = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for sector, parser, starlines in jobs:
+            column_parser = parser if use_columns else None
+            for line in starlines:
+                ParseStarInput._unpack_starline(Star(), line, sector, column_parser)
+                lines += 1
+    return lines, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Starline tokeniser micro-benchmark.')
+    parser.add_argument('--repeat', default=3, type=int, help='Passes over the input files, default [3]')
+    parser.add_argument('sector', nargs='+', help='T5SS sector file(s) to tokenise')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    logger = logging.getLogger('PyRoute.benchmarks')
+    ParseStarInput.deep_space = {}
+
+    jobs = []
+    for filename in args.sector:
+        headers, starlines = ParseSectorInput.read_sector_file(filename, logger)
+        if 5 > len(headers):
+            continue
+        jobs.append((Sector(headers[3], headers[4]), StarlineColumnParser.from_headers(headers), starlines))
+
+    sliced = sum(1 for _, column, starlines in jobs if column is not None
+                 for line in starlines if column.parse(ParseStarInput._unpack_starline_pre_tweak(line)) is not None)
+    total = sum(len(starlines) for _, _, starlines in jobs)
+
+    # Warm up both paths, so grammar construction isn't charged to the first timing
+    time_path(jobs, False, 1)
+
+    for label, use_columns in [('lark', False), ('columns', True)]:
+        lines, elapsed = time_path(jobs, use_columns, args.repeat)
+        print(f"{label:>8}: {lines} lines in {elapsed:.3f}s, {lines / elapsed:,.0f} lines/sec")
+    print(f"fast path accepted {sliced} of {total} lines ({100.0 * sliced / max(1, total):.1f}%)")
+
+
+if __name__ == '__main__':
+    main()
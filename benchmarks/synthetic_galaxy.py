@@ -0,0 +1,226 @@
+"""
+Created on Oct 18, 2026
+
+@author: CyberiaResurrection
+
+Deterministic generator for synthetic T5 sector files, so benchmark runs can be repeated on galaxies of any size,
+star density and allegiance mix without depending on whatever TravellerMap serves up on the day.  This code:
+    Lays sectors out on a grid, and populates each hex with a star with the given probability
+    Carves each sector up between a handful of allegiance "seeds", drawn by weight from the allegiance mix, with every
+        star joining its nearest seed's allegiance - giving contiguous polities for the border generators to chew on
+    Rolls each star's UWP, PBG, bases and stellar data, then pushes the resulting starline through the same
+        canonicalisation the delta debugger uses, so trade codes, Ix, Ex and Cx are all consistent with the UWP
+The same seed and settings always produce byte-identical sector files.
+
+    PYTHONPATH=. python benchmarks/synthetic_galaxy.py --sectors 2x2 --density 0.4 --output /tmp/synthetic
+"""
+import argparse
+import codecs
+import logging
+import os
+import random
+
+from PyRoute.DeltaStar import DeltaStar
+
+# Allegiances used when none are specified - one big polity, its client states, and an independent fringe
+DEFAULT_ALLEGIANCES = {'ImDd': 0.6, 'CsIm': 0.1, 'NaHu': 0.3}
+
+ALLEGIANCE_NAMES = {
+    'ImDd': 'Third Imperium, Domain of Deneb',
+    'ImDi': 'Third Imperium, Domain of Ilelish',
+    'CsIm': 'Client state, Third Imperium',
+    'NaHu': 'Non-Aligned, Human-dominated',
+    'ZhCo': 'Zhodani Consulate',
+    'SwCf': 'Sword Worlds Confederation',
+    'DaCf': 'Darrian Confederation',
+}
+
+SUBSECTOR_LETTERS = 'ABCDEFGHIJKLMNOP'
+SYLLABLES = ['ka', 'ru', 'shi', 'zar', 'den', 'eb', 'lo', 'mi', 'gash', 'ur', 'tel', 'an', 'vo', 'ix', 'pra', 'dun']
+STELLAR = ['G2 V', 'K5 V', 'M3 V', 'F7 V', 'M0 V M4 V', 'K1 V', 'G8 IV', 'M5 V', 'A3 V', 'K0 III']
+STARPORTS = 'AABBCCCDDEEX'
+BASES = ['-', '-', '-', '-', 'N', 'S', 'NS', 'W']
+ZONES = ['-'] * 18 + ['A', 'R']
+EHEX = '0123456789ABCDEFGHJKLMNPQRSTUVWXYZ'
+
+# Sector dimensions, in hexes
+SECTOR_COLS = 32
+SECTOR_ROWS = 40
+
+# Number of allegiance seeds scattered across each sector
+SEEDS_PER_SECTOR = 6
+
+HEADER_LINE = 'Hex  Name                 UWP       Remarks                               {Ix}   (Ex)    [Cx]   N    B  Z PBG W  A    Stellar        Routes                                   \n'
+DASH_LINE = '---- -------------------- --------- ------------------------------------- ------ ------- ------ ---- -- - --- -- ---- -------------- -----------------------------------------\n'
+
+
+class SyntheticGalaxy(object):
+
+    def __init__(self, seed=0, cols=1, rows=1, density=0.35, allegiances=None):
+        if not 0 < density <= 1:
+            raise ValueError("Density must be in (0, 1]")
+        if 1 > cols or 1 > rows:
+            raise ValueError("Galaxy must be at least one sector in each direction")
+        allegiances = DEFAULT_ALLEGIANCES if allegiances is None else allegiances
+        if 0 == len(allegiances) or 0 >= sum(allegiances.values()):
+            raise ValueError("Allegiance mix must have positive total weight")
+        self.seed = seed
+        self.cols = cols
+        self.rows = rows
+        self.density = density
+        self.allegiances = allegiances
+
+    @staticmethod
+    def parse_allegiances(raw: str) -> dict[str, float]:
+        """
+        Turn "ImDd:0.6,NaHu:0.4" into an allegiance-code-to-weight dict.
+        """
+        mix = {}
+        for chunk in raw.split(','):
+            code, _, weight = chunk.partition(':')
+            code = code.strip()
+            if 4 != len(code):
+                raise ValueError("Allegiance code " + code + " must be 4 characters long")
+            mix[code] = float(weight) if weight else 1.0
+        return mix
+
+    def sector_names(self) -> list[str]:
+        return ['Synthetic {}-{}'.format(col, row) for row in range(self.rows) for col in range(self.cols)]
+
+    def write(self, output_dir: str) -> list[str]:
+        """
+        Write one .sec file per sector into output_dir, returning their paths in generation order.
+        """
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        paths = []
+        for row in range(self.rows):
+            for col in range(self.cols):
+                name = 'Synthetic {}-{}'.format(col, row)
+                path = os.path.join(output_dir, name + '.sec')
+                with codecs.open(path, 'w', encoding='utf-8') as handle:
+                    handle.writelines(self.sector_lines(col, row))
+                paths.append(path)
+        return paths
+
+    def sector_lines(self, col: int, row: int) -> list[str]:
+        """
+        Generate a full sector file, headers and all.  Each sector gets its own random stream, keyed on the galaxy seed
+        and the sector's position, so one sector's contents don't depend on how many others were generated first.
+        """
+        rng = random.Random('{}:{}:{}'.format(self.seed, col, row))
+        name = 'Synthetic {}-{}'.format(col, row)
+        # Lay sectors out left to right, top to bottom, as TravellerMap's sector co-ordinates run
+        sector_x = col
+        sector_y = -row
+
+        codes = sorted(self.allegiances.keys())
+        weights = [self.allegiances[code] for code in codes]
+        seeds = [(rng.randint(1, SECTOR_COLS), rng.randint(1, SECTOR_ROWS), rng.choices(codes, weights)[0])
+                 for _ in range(SEEDS_PER_SECTOR)]
+
+        starlines = []
+        used_algs = set()
+        # Canonicalising each starline logs everything it fixes up, which here is noise
+        previous_disable = logging.root.manager.disable
+        logging.disable(logging.CRITICAL)
+        for hex_col in range(1, SECTOR_COLS + 1):
+            for hex_row in range(1, SECTOR_ROWS + 1):
+                if rng.random() >= self.density:
+                    continue
+                alg = min(seeds, key=lambda seed: (seed[0] - hex_col) ** 2 + (seed[1] - hex_row) ** 2)[2]
+                line = self._starline(rng, '{:02d}{:02d}'.format(hex_col, hex_row), alg)
+                if line is None:
+                    continue
+                used_algs.add(alg)
+                starlines.append(line.rstrip() + '\n')
+        logging.disable(previous_disable)
+
+        headers = [
+            '# Generated by PyRoute benchmarks/synthetic_galaxy.py\n',
+            '# Seed: {}, density: {}\n'.format(self.seed, self.density),
+            '\n',
+            '# ' + name + '\n',
+            '# {},{}\n'.format(sector_x, sector_y),
+            '\n',
+            '# Name: ' + name + '\n',
+            '\n',
+            '# Milieu: M1105\n',
+            '\n',
+        ]
+        for i, letter in enumerate(SUBSECTOR_LETTERS):
+            headers.append('# Subsector {}: {} {}\n'.format(letter, name, i + 1))
+        headers.append('\n')
+        for code in sorted(used_algs):
+            headers.append('# Alleg: {}: "{}"\n'.format(code, ALLEGIANCE_NAMES.get(code, code)))
+        headers.append('\n')
+        headers.append(HEADER_LINE)
+        headers.append(DASH_LINE)
+
+        return headers + starlines
+
+    def _starline(self, rng: random.Random, position: str, alg: str):
+        port = rng.choice(STARPORTS)
+        size = max(0, min(10, self._roll(rng) - 2))
+        atmo = 0 if 0 == size else max(0, min(15, self._flux(rng) + size))
+        hydro = 0 if 2 > size else max(0, min(10, self._flux(rng) + atmo))
+        pop = max(0, min(12, self._roll(rng) - 2))
+        gov = 0 if 0 == pop else max(0, min(15, self._flux(rng) + pop))
+        law = 0 if 0 == pop else max(0, min(18, self._flux(rng) + gov))
+        tl = 0 if 0 == pop else max(0, min(17, rng.randint(1, 6) + {'A': 6, 'B': 4, 'C': 2, 'X': -4}.get(port, 0)
+                                                + (1 if 9 <= pop else 0)))
+        uwp = port + ''.join(EHEX[value] for value in [size, atmo, hydro, pop, gov, law]) + '-' + EHEX[tl]
+
+        popm = rng.randint(1, 9) if 0 < pop else 0
+        belts = rng.randint(0, 3)
+        giants = rng.randint(0, 4)
+        worlds = 1 + belts + giants + rng.randint(0, 10)
+        pbg = '{}{}{}'.format(popm, belts, giants)
+
+        economics = '({}{}{}{:+d})'.format(EHEX[rng.randint(2, 12)], EHEX[max(pop - 1, 0)], EHEX[rng.randint(0, 6)],
+                                           rng.randint(-5, 5))
+        social = '[{}{}{}{}]'.format(EHEX[pop], EHEX[pop], EHEX[rng.randint(1, 10)], EHEX[max(1, tl)])
+        base = rng.choice(BASES) if 0 < pop else '-'
+        zone = rng.choice(ZONES)
+        stellar = rng.choice(STELLAR)
+
+        name = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+        line = '{} {:<20} {} {:<38} {:<6} {:<7} {:<6} {:<4} {:<2} {:<1} {} {:<2} {:<4} {:<14}'.format(
+            position, name, uwp, '', '{ 0 }', economics, social, '-', base, zone, pbg, worlds, alg, stellar)
+        return DeltaStar.reduce(line, canonicalise=True)
+
+    @staticmethod
+    def _roll(rng: random.Random) -> int:
+        return rng.randint(1, 6) + rng.randint(1, 6)
+
+    @staticmethod
+    def _flux(rng: random.Random) -> int:
+        return rng.randint(1, 6) - rng.randint(1, 6)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Synthetic T5 sector generator for benchmarking.')
+    parser.add_argument('--seed', default=0, type=int, help='Random seed, default [0]')
+    parser.add_argument('--sectors', default='1x1', help='Sector grid as COLSxROWS, default [1x1]')
+    parser.add_argument('--density', default=0.35, type=float,
+                        help='Chance of any given hex holding a star, default [0.35]')
+    parser.add_argument('--allegiances', default=None,
+                        help='Allegiance mix as CODE:WEIGHT,..., default [ImDd:0.6,CsIm:0.1,NaHu:0.3]')
+    parser.add_argument('--output', default='synthetic', help='Directory to write sector files to')
+    args = parser.parse_args()
+
+    cols, rows = parse_grid(args.sectors)
+    allegiances = None if args.allegiances is None else SyntheticGalaxy.parse_allegiances(args.allegiances)
+    galaxy = SyntheticGalaxy(args.seed, cols, rows, args.density, allegiances)
+    for path in galaxy.write(args.output):
+        print(path)
+
+
+def parse_grid(raw: str) -> tuple[int, int]:
+    cols, _, rows = raw.lower().partition('x')
+    return int(cols), int(rows) if rows else 1
+
+
+if __name__ == '__main__':
+    main()